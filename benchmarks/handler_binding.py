@@ -0,0 +1,115 @@
+"""
+Microbenchmark for the Python-side cost of binding handler arguments.
+
+Measures how long the wrapper that ``Router.add_route`` puts around a handler
+takes per call, on top of the handler itself, for handlers taking 0, 3 and 8
+parameters. Run it on two checkouts to compare them:
+
+    python benchmarks/handler_binding.py [--number 200000]
+
+Only the Python wrapper is measured; the Rust side is not involved beyond
+constructing the ``Request`` object once.
+"""
+
+import argparse
+import logging
+import timeit
+
+from robyn.robyn import Headers, HttpMethod, QueryParams, Request, Url
+from robyn.router import Router
+from robyn.types import PathParams
+
+
+def handler_0():
+    return "ok"
+
+
+def handler_3(request, path_params, user_id: int):
+    return "ok"
+
+
+def handler_8(request, query_params: QueryParams, headers: Headers, path_data: PathParams, body, method, url, user_id: int):
+    return "ok"
+
+
+HANDLERS = {0: handler_0, 3: handler_3, 8: handler_8}
+
+
+def make_request() -> Request:
+    query_params = QueryParams()
+    query_params.set("page", "1")
+    return Request(
+        query_params,
+        Headers({"content-type": "application/json", "user-agent": "bench"}),
+        {"user_id": "42"},
+        '{"name": "robyn"}',
+        "GET",
+        Url("http", "localhost", "/users/42"),
+        {},
+        {},
+        None,
+        "127.0.0.1",
+    )
+
+
+def wrap(handler):
+    router = Router()
+    router.add_route(
+        route_type=HttpMethod.GET,
+        endpoint="/users/:user_id",
+        handler=handler,
+        is_const=False,
+        auth_required=False,
+        openapi_name="",
+        openapi_tags=[],
+        exception_handler=None,
+        injected_dependencies={"router_dependencies": {}, "global_dependencies": {}},
+    )
+    return router.routes[-1].function.handler
+
+
+def per_call_us(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=200_000, help="calls per timing run")
+    args = parser.parse_args()
+    # handler_0 ignores the route's path param on purpose; skip the warning.
+    logging.getLogger("robyn.router").setLevel(logging.ERROR)
+
+    request = make_request()
+    print(f"{'params':>6}  {'wrapped (us)':>12}  {'direct (us)':>11}  {'overhead (us)':>13}")
+    for params, handler in HANDLERS.items():
+        wrapped = wrap(handler)
+        # The executor calls 0-param handlers without the request.
+        if params == 0:
+            wrapped_call, direct_call = wrapped, handler
+        else:
+            direct_args = {"request": request, "path_params": {"user_id": "42"}, "user_id": 42}
+            if params == 8:
+                direct_args = {
+                    "request": request,
+                    "query_params": request.query_params,
+                    "headers": request.headers,
+                    "path_data": request.path_params,
+                    "body": request.body,
+                    "method": request.method,
+                    "url": request.url,
+                    "user_id": 42,
+                }
+
+            def wrapped_call(wrapped=wrapped):
+                return wrapped(request)
+
+            def direct_call(handler=handler, direct_args=direct_args):
+                return handler(**direct_args)
+
+        wrapped_us = per_call_us(wrapped_call, args.number)
+        direct_us = per_call_us(direct_call, args.number)
+        print(f"{params:>6}  {wrapped_us:>12.3f}  {direct_us:>11.3f}  {wrapped_us - direct_us:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
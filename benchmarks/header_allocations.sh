@@ -0,0 +1,112 @@
+#!/bin/sh
+
+# Heap allocations made per request by a dynamic route, counted with valgrind's DHAT.
+# The server is run twice, serving <number> and then 2 x <number> requests, so the
+# allocations made while starting and stopping it cancel out in the difference.
+# Python's small objects come from pymalloc arenas and are mostly not counted, which
+# leaves the allocations of the Rust side: request and response headers, body, routing.
+# Run it on two checkouts (after 'maturin develop --release' in each) to compare them.
+# Unlike timings, the counts are stable from one run to the next.
+
+Help() {
+    echo "Count the heap allocations made per request."
+    echo
+    echo "USAGE:"
+    echo "    header_allocations [-h|m|y] [-n <number>] [-r <route>]"
+    echo
+    echo "OPTIONS:"
+    echo "    -h              Print this help."
+    echo "    -m              Run 'maturin develop --release' to compile the Rust part of Robyn."
+    echo "    -n <number>     Set the number of requests of the first run. [Default: 2000]"
+    echo "    -r <route>      Set the route requested. [Default: /sync/str]"
+    echo "    -y              Skip prompt"
+    exit 0
+}
+
+yes_flag=false
+run_maturin=false
+number=2000
+route=/sync/str
+while getopts hymn:r: opt; do
+    case $opt in
+        h)
+            Help
+            ;;
+        y)
+            yes_flag=true
+            ;;
+        m)
+            run_maturin=true
+            ;;
+        n)
+            number=$OPTARG
+            ;;
+        r)
+            route=$OPTARG
+            ;;
+        ?)
+            echo 'Error in command line parsing' >&2
+            Help
+            exit 1
+            ;;
+    esac
+done
+
+# Prompt user to check if he installed the requirements for running the benchmark
+if [ "$yes_flag" = false ]; then
+    echo "Make sure you are running this in your venv, and that you installed valgrind and 'oha' (using 'cargo install oha')"
+    echo "Do you want to proceed?"
+    while true; do
+        read -p "" yn
+        case $yn in
+            [Yy]* ) break;;
+            [Nn]* ) exit;;
+            * ) echo "Please answer yes or no.";;
+        esac
+    done
+fi
+
+# Compile Rust
+if $run_maturin; then
+    maturin develop --release
+fi
+
+out_dir=$(mktemp -d)
+trap 'rm -rf "$out_dir"' EXIT
+
+# Serve <requests> requests from a single process under DHAT and print the total
+# number of blocks allocated
+count_allocations() {
+    requests=$1
+    out_file="$out_dir/dhat.$requests.json"
+    valgrind --tool=dhat --dhat-out-file="$out_file" \
+        python3 ./integration_tests/base_routes.py --processes 1 --workers 1 --log-level WARNING 2>/dev/null &
+    server=$!
+
+    # The server is slow to start under valgrind
+    until curl -s -o /dev/null "http://localhost:8080$route"; do
+        sleep 1
+    done
+
+    # The headers a browser typically sends
+    oha --no-tui -n "$requests" -c 1 \
+        -H "Accept: text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8" \
+        -H "Accept-Language: en-US,en;q=0.5" \
+        -H "Accept-Encoding: gzip, deflate, br" \
+        -H "User-Agent: Mozilla/5.0 (X11; Linux x86_64; rv:120.0) Gecko/20100101 Firefox/120.0" \
+        -H "Cookie: session=0123456789abcdef" \
+        -H "X-Request-Id: 4b1e9c7a-5f5e-4c0e-9d4e-1c2b3a4d5e6f" \
+        "http://localhost:8080$route" >/dev/null
+
+    kill -INT "$server"
+    wait "$server"
+    python3 -c "import json, sys; print(sum(pp['tbk'] for pp in json.load(open(sys.argv[1]))['pps']))" "$out_file"
+}
+
+first=$(count_allocations "$number")
+second=$(count_allocations "$((number * 2))")
+
+echo "== GET $route"
+echo "Allocations for $number requests: $first"
+echo "Allocations for $((number * 2)) requests: $second"
+echo "Allocations per request: $(((second - first) / number))"
@@ -0,0 +1,90 @@
+#!/bin/sh
+
+# Load benchmark for dynamic routes served by several workers of one process.
+# Every request to a dynamic route goes through the router lookup and the Python
+# handler, so this shows the per-request overhead that the const fast path skips.
+# Run it on two checkouts (after 'maturin develop' in each) to compare them.
+# Results from different machines can't be compared, and runs on the same machine
+# can vary a lot: use a long enough duration and repeat the runs.
+
+Help() {
+    echo "Load benchmark for dynamic routes with several workers."
+    echo
+    echo "USAGE:"
+    echo "    multi_worker [-h|m|y] [-w <workers>] [-c <connections>] [-z <duration>]"
+    echo
+    echo "OPTIONS:"
+    echo "    -h                  Print this help."
+    echo "    -m                  Run 'maturin develop --release' to compile the Rust part of Robyn."
+    echo "    -w <workers>        Set the number of server workers. [Default: 4]"
+    echo "    -c <connections>    Set the number of concurrent connections oha opens. [Default: 64]"
+    echo "    -z <duration>       Set how long oha runs for each route. [Default: 10s]"
+    echo "    -y                  Skip prompt"
+    exit 0
+}
+
+yes_flag=false
+run_maturin=false
+workers=4
+connections=64
+duration=10s
+while getopts hymw:c:z: opt; do
+    case $opt in
+        h)
+            Help
+            ;;
+        y)
+            yes_flag=true
+            ;;
+        m)
+            run_maturin=true
+            ;;
+        w)
+            workers=$OPTARG
+            ;;
+        c)
+            connections=$OPTARG
+            ;;
+        z)
+            duration=$OPTARG
+            ;;
+        ?)
+            echo 'Error in command line parsing' >&2
+            Help
+            exit 1
+            ;;
+    esac
+done
+
+# Prompt user to check if he installed the requirements for running the benchmark
+if [ "$yes_flag" = false ]; then
+    echo "Make sure you are running this in your venv and you installed 'oha' using 'cargo install oha'"
+    echo "Do you want to proceed?"
+    while true; do
+        read -p "" yn
+        case $yn in
+            [Yy]* ) break;;
+            [Nn]* ) exit;;
+            * ) echo "Please answer yes or no.";;
+        esac
+    done
+fi
+
+# Kill subprocesses after exiting the script (python + robyn server)
+# (see https://stackoverflow.com/questions/360201/how-do-i-kill-background-processes-jobs-when-my-shell-script-exits)
+trap "trap - TERM && kill 0" INT TERM EXIT
+
+# Compile Rust
+if $run_maturin; then
+    maturin develop --release
+fi
+
+# Run the server in the background, in a single process
+python3 ./integration_tests/base_routes.py --processes 1 --workers "$workers" --log-level WARNING &
+sleep 2
+
+# Sync and async handlers, without and with a path param
+for route in /sync/str /async/str /sync/param/1 /async/param/1; do
+    echo "== GET $route ($workers workers, $connections connections, $duration)"
+    oha --no-tui -z "$duration" -c "$connections" "http://localhost:8080$route" | grep -E "Requests/sec|Slowest|Fastest|Average"
+done
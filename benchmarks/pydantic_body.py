@@ -0,0 +1,78 @@
+"""
+Microbenchmark for the Pydantic body and response path.
+
+Validates a JSON body into a 50-field model and serializes the model back,
+at 1 KB and 100 KB payloads, the way the router does it and the way it used
+to, when the body reached Pydantic as a decoded ``str`` and the response
+left it as a ``str`` to be encoded again:
+
+    python benchmarks/pydantic_body.py [--number 2000]
+
+Requires pydantic. Only the Python side is measured: the copy of the body
+into ``bytes`` made by ``request.raw_body`` is the same for both paths.
+"""
+
+import argparse
+import timeit
+
+import orjson
+from pydantic import create_model
+
+from robyn.pydantic_support import _ensure_pydantic, dump_pydantic_json, validate_pydantic_body
+
+FIELD_TYPES = (int, float, bool, str, list[str])
+Model = create_model("Model", **{f"field_{i}": (FIELD_TYPES[i % len(FIELD_TYPES)], ...) for i in range(50)})
+
+
+def make_body(size: int) -> bytes:
+    """A valid body for ``Model`` of about ``size`` bytes, most of it in the str fields."""
+    str_fields = [i for i in range(50) if FIELD_TYPES[i % len(FIELD_TYPES)] in (str, list[str])]
+    # Bytes per str field, once encoded
+    length = max(22, (size - 1000) // len(str_fields))
+    data = {}
+    for i in range(50):
+        field_type = FIELD_TYPES[i % len(FIELD_TYPES)]
+        if field_type is int:
+            data[f"field_{i}"] = i * 1000
+        elif field_type is float:
+            data[f"field_{i}"] = i / 7
+        elif field_type is bool:
+            data[f"field_{i}"] = i % 2 == 0
+        elif field_type is str:
+            data[f"field_{i}"] = "é" * (length // 2)
+        else:
+            data[f"field_{i}"] = ["x" * 8] * (length // 11)
+    return orjson.dumps(data)
+
+
+def str_path(body: bytes) -> bytes:
+    validated, _ = validate_pydantic_body(Model, body.decode("utf-8"))
+    return validated.model_dump_json().encode("utf-8")
+
+
+def bytes_path(body: bytes) -> bytes:
+    validated, _ = validate_pydantic_body(Model, body)
+    return dump_pydantic_json(Model, validated)
+
+
+def per_call_us(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=2_000, help="calls per timing run")
+    args = parser.parse_args()
+    _ensure_pydantic()
+
+    print(f"{'payload':>8}  {'str (us)':>9}  {'bytes (us)':>10}  {'speedup':>7}")
+    for size in (1_000, 100_000):
+        body = make_body(size)
+        assert str_path(body) == bytes_path(body)
+        str_us = per_call_us(lambda: str_path(body), args.number)
+        bytes_us = per_call_us(lambda: bytes_path(body), args.number)
+        print(f"{len(body) / 1000:>6.0f}KB  {str_us:>9.1f}  {bytes_us:>10.1f}  {str_us / bytes_us:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
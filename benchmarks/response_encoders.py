@@ -0,0 +1,74 @@
+"""
+Microbenchmark for the encoder compiled from a route's ``response_model``.
+
+Encodes a list of dataclasses holding datetimes and Decimals, the way a
+route with ``response_model=list[Order]`` does it, and the way a handler had
+to before, converting each one with ``dataclasses.asdict`` and the Decimals
+by hand so the result could go through the dict/list path:
+
+    python benchmarks/response_encoders.py [--number 2000]
+
+Only the Python side is measured: both paths hand bytes to the server.
+"""
+
+import argparse
+import dataclasses
+import datetime
+import timeit
+from decimal import Decimal
+
+import orjson
+
+from robyn.encoders import compile_response_encoder
+
+
+@dataclasses.dataclass
+class Line:
+    sku: str
+    quantity: int
+    price: Decimal
+
+
+@dataclasses.dataclass
+class Order:
+    id: int
+    created_at: datetime.datetime
+    lines: list[Line]
+
+
+def make_orders(count: int) -> list[Order]:
+    created_at = datetime.datetime(2024, 5, 1, 12, 30)
+    return [Order(id=i, created_at=created_at, lines=[Line(sku=f"sku-{j}", quantity=j, price=Decimal("9.99")) for j in range(5)]) for i in range(count)]
+
+
+def by_hand(orders: list[Order]) -> bytes:
+    def convert(order: Order) -> dict:
+        data = dataclasses.asdict(order)
+        for line in data["lines"]:
+            line["price"] = str(line["price"])
+        return data
+
+    return orjson.dumps([convert(order) for order in orders])
+
+
+def per_call_us(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=2_000, help="calls per timing run")
+    args = parser.parse_args()
+    encoder = compile_response_encoder(list[Order])
+
+    print(f"{'orders':>6}  {'by hand (us)':>12}  {'encoder (us)':>12}  {'speedup':>7}")
+    for count in (1, 100):
+        orders = make_orders(count)
+        assert by_hand(orders) == encoder(orders)
+        hand_us = per_call_us(lambda: by_hand(orders), args.number)
+        encoder_us = per_call_us(lambda: encoder(orders), args.number)
+        print(f"{count:>6}  {hand_us:>12.1f}  {encoder_us:>12.1f}  {hand_us / encoder_us:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,33 @@
 import asyncio
 import contextvars
 import datetime
+import hashlib
 import json
 import os
 import pathlib
 import tempfile
 import time
 from collections import defaultdict
+from dataclasses import dataclass
+from decimal import Decimal
 from typing import TypedDict
 
 from integration_tests.subroutes import async_auth_subrouter, di_subrouter, inherited_auth_subrouter, static_router, sub_router
-from robyn import Headers, Request, Response, Robyn, SSEMessage, SSEResponse, StreamingResponse, WebSocketDisconnect, jsonify, serve_file, serve_html
+from robyn import (
+    CachePolicy,
+    Headers,
+    Request,
+    Response,
+    Robyn,
+    SSEHub,
+    SSEMessage,
+    SSEResponse,
+    StreamingResponse,
+    WebSocketDisconnect,
+    jsonify,
+    serve_file,
+    serve_html,
+)
 from robyn.authentication import AuthenticationHandler, BearerGetter, Identity
 from robyn.robyn import QueryParams, Url
 from robyn.templating import JinjaTemplate
@@ -190,6 +207,25 @@ async def empty_websocket_on_close(websocket):
     return None
 
 
+# --- WebSocket rooms endpoint ---
+@app.websocket("/web_socket_rooms")
+async def rooms_websocket_endpoint(websocket):
+    try:
+        while True:
+            command, room, *text = (await websocket.receive_text()).split(":", 2)
+            if command == "join":
+                await websocket.join(room)
+                await websocket.send_text(f"joined {room}")
+            elif command == "leave":
+                await websocket.leave(room)
+                await websocket.send_text(f"left {room}")
+            elif command == "say":
+                delivered = await websocket.send_to_room(room, text[0])
+                await websocket.send_text(f"delivered {delivered}")
+    except WebSocketDisconnect:
+        pass
+
+
 # ===== Lifecycle handlers =====
 
 # Observable runtime markers so tests can assert the events actually fired
@@ -771,6 +807,74 @@ def sync_multipart_file_save(request: Request):
     return saved
 
 
+@app.post("/sync/multipart-file/spooled")
+def sync_multipart_file_spooled(request: Request):
+    uploads = {}
+    for file_name, upload in request.files.items():
+        if isinstance(upload, bytes):
+            uploads[file_name] = {"spooled": False, "size": len(upload), "sha256": hashlib.sha256(upload).hexdigest()}
+            continue
+        content = upload.read()
+        uploads[file_name] = {
+            "spooled": True,
+            "size": upload.size,
+            "sha256": hashlib.sha256(content).hexdigest(),
+            "content_type": upload.content_type,
+            "on_disk": os.path.isfile(upload.path),
+        }
+    return {"uploads": uploads, "form_data": request.form_data, "body": request.body}
+
+
+# Streamed request body
+
+
+@app.post("/async/body/stream", stream_body=True)
+async def async_body_stream(request: Request):
+    size = 0
+    digest = hashlib.sha256()
+    async for chunk in request.body_stream:
+        size += len(chunk)
+        digest.update(chunk)
+    return {"size": size, "sha256": digest.hexdigest(), "buffered_body": request.body}
+
+
+@app.put("/async/body/stream/read", stream_body=True)
+async def async_body_stream_read(request: Request):
+    body = await request.body_stream.read()
+    return {"size": len(body)}
+
+
+# Response cache
+
+cached_item_policy = CachePolicy(ttl=60, vary=["accept-language"], max_entries=2)
+cached_item_calls: dict = defaultdict(int)
+
+
+@app.get("/sync/cached/:item_id", cache=cached_item_policy)
+def sync_cached_item(request: Request, item_id: str):
+    cached_item_calls[item_id] += 1
+    return {"item_id": item_id, "calls": cached_item_calls[item_id], "lang": request.headers.get("accept-language")}
+
+
+@app.get("/sync/cache/stats")
+def sync_cached_stats():
+    return cached_item_policy.stats()
+
+
+@app.before_request("/sync/cached/rewrite/:name")
+def rewrite_cached_name(request: Request):
+    target = request.headers.get("x-rewrite-to")
+    if target is None:
+        return request
+    url = Url(request.url.scheme, request.url.host, f"/sync/cached/rewrite/{target}")
+    return Request(request.query_params, request.headers, {}, request.body, request.method, url, {}, {}, None, request.ip_addr)
+
+
+@app.get("/sync/cached/rewrite/:name", cache=CachePolicy(ttl=60))
+def sync_cached_rewrite(name: str):
+    return name
+
+
 # Queries
 
 
@@ -963,6 +1067,25 @@ async def async_request_json_echo_post(request: Request):
     return request.json()
 
 
+@app.post("/sync/request_json/cached")
+def sync_request_json_cached(request: Request, data: JsonBody):
+    parsed_once = data is request.json()
+    request.body = '{"replaced": true}'
+    return {"parsed_once": parsed_once, "after_replace": request.json()}
+
+
+@app.post("/sync/request/lazy/:id")
+def sync_request_lazy_attributes(request: Request):
+    # Converted on first read, then the same object on every read
+    cached = request.headers is request.headers and request.body is request.body and request.path_params is request.path_params
+    before = {"id": request.path_params["id"], "body": request.body, "form_data": request.form_data, "files": request.files}
+    request.headers = Headers({"x-replaced": "yes"})
+    request.body = "replaced"
+    request.path_params = {"id": "replaced"}
+    after = {"id": request.path_params["id"], "body": request.body, "header": request.headers.get("x-replaced")}
+    return {"cached": cached, "before": before, "after": after}
+
+
 # JSON type preservation test
 @app.post("/sync/request_json/types")
 def sync_json_types(request: Request):
@@ -1574,6 +1697,45 @@ def openapi_hidden() -> str:
     return "hidden"
 
 
+# ===== Typed responses encoded with the response_model's compiled encoder =====
+
+
+@dataclass
+class Invoice:
+    number: int
+    total: Decimal
+    issued_at: datetime.datetime
+    tags: list[str]
+
+
+_INVOICE = Invoice(number=7, total=Decimal("19.90"), issued_at=datetime.datetime(2024, 5, 1, 12, 30), tags=["paid"])
+
+
+@app.get("/sync/response_model/dataclass", response_model=Invoice)
+def sync_response_model_dataclass():
+    return _INVOICE
+
+
+@app.get("/async/response_model/dataclass", response_model=Invoice)
+async def async_response_model_dataclass():
+    return _INVOICE
+
+
+@app.get("/sync/response_model/list", response_model=list[Invoice])
+def sync_response_model_list():
+    return [_INVOICE, _INVOICE]
+
+
+@app.post("/sync/response_model/created", response_model=Invoice, status_code=201)
+def sync_response_model_created():
+    return _INVOICE
+
+
+@app.get("/sync/response_model/response", response_model=Invoice)
+def sync_response_model_response():
+    return Response(status_code=404, headers={"Content-Type": "text/plain"}, description="no invoice")
+
+
 # ===== Server-Sent Events (SSE) Routes =====
 
 
@@ -1667,6 +1829,37 @@ async def stream_bytes_async(request):
     )
 
 
+@app.get("/stream/bytes_async/coalesced")
+async def stream_bytes_async_coalesced(request):
+    """Async generator whose ready chunks are sent together."""
+
+    async def gen():
+        for i in range(3):
+            yield bytes([i]) * 4
+
+    return StreamingResponse(
+        gen(),
+        media_type="application/octet-stream",
+        headers=Headers({"Content-Type": "application/octet-stream"}),
+        coalesce=True,
+    )
+
+
+@app.get("/stream/bytes_async/coalesced/empty_items")
+async def stream_bytes_async_coalesced_empty_items(request):
+    """Coalesced async generator with batches made only of empty items."""
+
+    async def gen():
+        yield b""
+        await asyncio.sleep(0.01)
+        yield b"after"
+        yield ""
+        await asyncio.sleep(0.01)
+        yield b"end"
+
+    return StreamingResponse(gen(), media_type="application/octet-stream", coalesce=True)
+
+
 @app.get("/sse/streaming_sync")
 def sse_streaming_sync(request):
     """SSE endpoint to test real-time sync streaming"""
@@ -1748,6 +1941,39 @@ def sse_status_code(request):
     return SSEResponse(event_generator(), status_code=201)
 
 
+sse_hub = SSEHub(buffer_size=16, replay_size=8)
+
+
+@app.get("/sse/hub/:topic")
+def sse_hub_subscribe(request):
+    """SSE endpoint streaming the events published to a hub topic"""
+    return SSEResponse(sse_hub.subscribe(request.path_params["topic"], last_event_id=request.headers.get("last-event-id")))
+
+
+@app.post("/sse/hub/:topic")
+def sse_hub_publish(request):
+    try:
+        delivered = sse_hub.publish(request.path_params["topic"], request.body, event=request.query_params.get("event", None))
+    except ValueError as error:
+        return Response(400, Headers({}), str(error))
+    return {"delivered": delivered, "subscribers": sse_hub.subscriber_count(request.path_params["topic"])}
+
+
+# No replay, and frequent keep-alives so a disconnected client is noticed quickly
+sse_short_lived_hub = SSEHub(replay_size=0, keep_alive=0.2)
+
+
+@app.get("/sse/short_lived/:topic")
+def sse_short_lived_subscribe(request):
+    return SSEResponse(sse_short_lived_hub.subscribe(request.path_params["topic"]))
+
+
+@app.get("/sse/short_lived_stats")
+def sse_short_lived_stats(request):
+    topic = request.query_params.get("topic", "")
+    return {"subscribers": sse_short_lived_hub.subscriber_count(topic), "topics": len(sse_short_lived_hub)}
+
+
 # ===== Easy Access Query/Path Parameters =====
 
 
@@ -0,0 +1,62 @@
+"""
+Standalone Robyn app with response compression enabled, used by the compression
+integration tests. Runs on a separate port (8084) so it doesn't affect base_routes.py.
+"""
+
+import os
+import tempfile
+
+from robyn import Headers, Response, Robyn, StreamingResponse, serve_file
+
+app = Robyn(__file__)
+app.configure_compression(min_size=256)
+
+LARGE_TEXT = "robyn compresses responses in rust. " * 200
+
+TEXT_FILE = os.path.join(tempfile.mkdtemp(), "large.txt")
+with open(TEXT_FILE, "w") as f:
+    f.write(LARGE_TEXT)
+
+
+@app.get("/const", const=True)
+def const_text():
+    return LARGE_TEXT
+
+
+@app.get("/json")
+def large_json():
+    return {"items": [{"id": i, "name": f"item {i}"} for i in range(200)]}
+
+
+@app.get("/small")
+def small_text():
+    return "tiny"
+
+
+@app.get("/png")
+def binary():
+    return Response(status_code=200, headers={"Content-Type": "image/png"}, description=b"\x89PNG" + b"\x00" * 2048)
+
+
+@app.get("/encoded")
+def already_encoded():
+    return Response(status_code=200, headers={"Content-Encoding": "identity"}, description=LARGE_TEXT)
+
+
+@app.get("/file")
+def text_file():
+    return serve_file(TEXT_FILE)
+
+
+@app.get("/stream")
+def stream():
+    def chunks():
+        for i in range(20):
+            yield f"chunk {i}: {LARGE_TEXT[:100]}\n"
+
+    return StreamingResponse(chunks(), media_type="text/plain", headers=Headers({"Content-Type": "text/plain"}))
+
+
+if __name__ == "__main__":
+    port = int(os.getenv("ROBYN_PORT", "8084"))
+    app.start(port=port, _check_port=False)
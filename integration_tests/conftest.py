@@ -72,6 +72,39 @@ def start_server(domain: str, port: int, is_dev: bool = False) -> subprocess.Pop
     return process
 
 
+def start_app_server(app: str, host: str, port: int, *args: str) -> subprocess.Popen:
+    """
+    Start the Robyn app in `app`, a file of this directory, on `host`:`port` with the command
+    line arguments `args`, and wait until it accepts connections. Stop it with `kill_process`.
+
+    The server runs in a POSIX process group of its own, so this doesn't work on Windows.
+    """
+    app_path = os.path.join(pathlib.Path(__file__).parent.resolve(), app)
+    env = os.environ.copy()
+    env["ROBYN_HOST"] = host
+    env["ROBYN_PORT"] = str(port)
+
+    process = subprocess.Popen(["python3", app_path, *args], env=env, preexec_fn=os.setsid)
+
+    timeout = 15
+    start = time.time()
+    while True:
+        if process.poll() is not None:
+            raise RuntimeError(f"{app} exited early with code {process.returncode}")
+        if time.time() - start > timeout:
+            kill_process(process)
+            raise ConnectionError(f"{app} didn't start on {host}:{port}")
+        try:
+            sock = socket.create_connection((host, port), timeout=2)
+            sock.close()
+            break
+        except Exception:
+            time.sleep(0.5)
+
+    time.sleep(1)
+    return process
+
+
 @pytest.fixture(scope="session")
 def session():
     domain = "127.0.0.1"
@@ -0,0 +1,29 @@
+"""
+Standalone Robyn app started with several workers and event loops, used by the
+event loop integration tests. Runs on a separate port (8086) so it doesn't
+conflict with base_routes.py.
+"""
+
+import asyncio
+import os
+import threading
+
+from robyn import Robyn
+
+app = Robyn(__file__)
+
+
+@app.get("/loop")
+async def loop_thread():
+    await asyncio.sleep(0)
+    return threading.current_thread().name
+
+
+@app.get("/sync")
+def sync_handler():
+    return "sync"
+
+
+if __name__ == "__main__":
+    port = int(os.getenv("ROBYN_PORT", "8086"))
+    app.start(port=port, _check_port=False)
@@ -0,0 +1,57 @@
+"""
+Standalone Robyn app with global, route and excluded middlewares, used by the
+middleware chain integration tests. Runs on a separate port (8087) so its
+global middlewares don't apply to base_routes.py.
+"""
+
+import os
+
+from robyn import Request, Response, Robyn
+
+app = Robyn(__file__)
+
+
+@app.before_request(exclude=["/health", "/users/admin"])
+def global_before(request: Request):
+    request.headers.set("x-global-before", "1")
+    return request
+
+
+@app.after_request(exclude=["/health"])
+def global_after(request: Request, response: Response):
+    response.headers.set("x-global-after", "1")
+    response.headers.set("x-handled-by", request.headers.get("x-handled-by") or "none")
+    return response
+
+
+@app.before_request("/items/:id")
+def item_before(request: Request):
+    request.headers.set("x-item-id", request.path_params["id"])
+    return request
+
+
+@app.after_request("/items/:id")
+def item_after(response: Response):
+    response.headers.set("x-item-after", "1")
+    return response
+
+
+@app.get("/health")
+def health(request: Request):
+    return request.headers.get("x-global-before") or "none"
+
+
+@app.get("/items/:id")
+def item(request: Request):
+    request.headers.set("x-handled-by", "item")
+    return f"{request.headers.get('x-global-before')} {request.headers.get('x-item-id')}"
+
+
+@app.get("/users/:id")
+def user(request: Request):
+    return request.headers.get("x-global-before") or "none"
+
+
+if __name__ == "__main__":
+    port = int(os.getenv("ROBYN_PORT", "8087"))
+    app.start(port=port, _check_port=False)
@@ -0,0 +1,34 @@
+"""
+Standalone Robyn app that runs sync handlers on a sync executor, used by the
+sync executor integration tests. Runs on a separate port (8085) with a single
+handler thread so the queue limit is easy to reach.
+"""
+
+import os
+import time
+
+from robyn import Robyn
+
+app = Robyn(__file__)
+app.configure_sync_executor(max_threads=1, queue_depth=1)
+
+
+@app.get("/slow")
+def slow():
+    time.sleep(1)
+    return "slow"
+
+
+@app.get("/fast")
+async def fast():
+    return "fast"
+
+
+@app.get("/items/:item_id")
+def item(item_id: int):
+    return {"item_id": item_id}
+
+
+if __name__ == "__main__":
+    port = int(os.getenv("ROBYN_PORT", "8085"))
+    app.start(port=port, _check_port=False)
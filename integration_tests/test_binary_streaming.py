@@ -19,3 +19,17 @@ def test_stream_bytes_async(session):
     r = requests.get(f"{BASE_URL}/stream/bytes_async", timeout=TIMEOUT)
     assert r.status_code == 200
     assert r.content == EXPECTED
+
+
+def test_stream_bytes_async_coalesced(session):
+    """Coalescing merges chunks but keeps the bytes and their order."""
+    r = requests.get(f"{BASE_URL}/stream/bytes_async/coalesced", timeout=TIMEOUT)
+    assert r.status_code == 200
+    assert r.content == EXPECTED
+
+
+def test_stream_bytes_async_coalesced_empty_items(session):
+    """A batch of only empty items doesn't end a coalesced stream."""
+    r = requests.get(f"{BASE_URL}/stream/bytes_async/coalesced/empty_items", timeout=TIMEOUT)
+    assert r.status_code == 200
+    assert r.content == b"afterend"
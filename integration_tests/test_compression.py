@@ -0,0 +1,133 @@
+"""
+Integration tests for response compression.
+
+These tests spin up a real Robyn server with compression configured and make
+actual HTTP requests, so the negotiation and encoding in Rust are exercised.
+"""
+
+import gzip
+import platform
+
+import pytest
+import requests
+
+from integration_tests.conftest import kill_process, start_app_server
+
+COMPRESSION_PORT = 8084
+COMPRESSION_HOST = "127.0.0.1"
+COMPRESSION_BASE_URL = f"http://{COMPRESSION_HOST}:{COMPRESSION_PORT}"
+REQUEST_TIMEOUT = 5
+
+LARGE_TEXT = "robyn compresses responses in rust. " * 200
+
+
+pytestmark = pytest.mark.skipif(
+    platform.system() == "Windows",
+    reason="compression integration tests use a POSIX-only server-subprocess harness",
+)
+
+
+@pytest.fixture(scope="module")
+def compression_server():
+    process = start_app_server("compression_app.py", COMPRESSION_HOST, COMPRESSION_PORT)
+    yield
+    kill_process(process)
+
+
+def _get_raw(path: str, accept_encoding: str):
+    """GET without letting urllib3 decode the body, returning (response, raw body)."""
+    resp = requests.get(
+        f"{COMPRESSION_BASE_URL}{path}",
+        headers={"Accept-Encoding": accept_encoding},
+        stream=True,
+        timeout=REQUEST_TIMEOUT,
+    )
+    return resp, resp.raw.read(decode_content=False)
+
+
+@pytest.mark.parametrize("path", ["/const", "/json"])
+def test_gzip_is_negotiated(compression_server, path):
+    resp, body = _get_raw(path, "gzip")
+    assert resp.status_code == 200
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert "accept-encoding" in resp.headers["Vary"].lower()
+    decoded = gzip.decompress(body)
+    if path == "/const":
+        assert decoded.decode() == LARGE_TEXT
+    else:
+        assert decoded.startswith(b'{"items"')
+
+
+@pytest.mark.parametrize("path", ["/const", "/json"])
+def test_preferred_algorithm_wins(compression_server, path):
+    resp, _ = _get_raw(path, "gzip, br, zstd")
+    assert resp.headers["Content-Encoding"] == "br"
+
+    resp, _ = _get_raw(path, "gzip;q=1.0, br;q=0.5")
+    assert resp.headers["Content-Encoding"] == "gzip"
+
+
+@pytest.mark.parametrize("path", ["/const", "/json"])
+def test_identity_without_accept_encoding(compression_server, path):
+    resp, body = _get_raw(path, "identity")
+    assert resp.status_code == 200
+    assert "Content-Encoding" not in resp.headers
+    assert "accept-encoding" in resp.headers["Vary"].lower()
+    assert len(body) > 1024
+
+
+@pytest.mark.parametrize("path", ["/small", "/png", "/encoded"])
+def test_uncompressible_responses_are_untouched(compression_server, path):
+    resp, _ = _get_raw(path, "gzip, br")
+    assert resp.status_code == 200
+    assert resp.headers.get("Content-Encoding") in (None, "identity")
+
+
+def test_streaming_response_is_compressed(compression_server):
+    resp, body = _get_raw("/stream", "gzip")
+    assert resp.status_code == 200
+    assert resp.headers["Content-Encoding"] == "gzip"
+    lines = gzip.decompress(body).decode().splitlines()
+    assert len(lines) == 20
+    assert lines[0].startswith("chunk 0:")
+
+
+def test_compressed_file_has_weak_validator_and_no_ranges(compression_server):
+    resp, body = _get_raw("/file", "gzip")
+    assert resp.status_code == 200
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert resp.headers["ETag"].startswith('W/"')
+    assert "Accept-Ranges" not in resp.headers
+    assert gzip.decompress(body).decode() == LARGE_TEXT
+
+    identity, _ = _get_raw("/file", "identity")
+    assert identity.headers["ETag"] == resp.headers["ETag"][2:]
+    assert identity.headers["Accept-Ranges"] == "bytes"
+
+
+def test_conditional_range_on_compressed_file_sends_whole_body(compression_server):
+    compressed, _ = _get_raw("/file", "gzip")
+
+    # Resuming the compressed download: If-Range carries the weak validator,
+    # which must not match, so the whole compressed body is sent again
+    # instead of identity byte offsets.
+    resp = requests.get(
+        f"{COMPRESSION_BASE_URL}/file",
+        headers={"Accept-Encoding": "gzip", "Range": "bytes=100-", "If-Range": compressed.headers["ETag"]},
+        stream=True,
+        timeout=REQUEST_TIMEOUT,
+    )
+    body = resp.raw.read(decode_content=False)
+    assert resp.status_code == 200
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(body).decode() == LARGE_TEXT
+
+    # The identity body's strong validator still gets its range
+    identity, _ = _get_raw("/file", "identity")
+    resp = requests.get(
+        f"{COMPRESSION_BASE_URL}/file",
+        headers={"Accept-Encoding": "identity", "Range": "bytes=100-", "If-Range": identity.headers["ETag"]},
+        timeout=REQUEST_TIMEOUT,
+    )
+    assert resp.status_code == 206
+    assert resp.text == LARGE_TEXT[100:]
@@ -38,6 +38,21 @@ def test_easy_access_bad_type_coercion(session, function_type):
     assert r.status_code == 400
 
 
+@pytest.mark.parametrize("function_type", ["sync", "async"])
+def test_easy_access_bad_type_coercion_message(session, function_type):
+    r = get(f"/easy/{function_type}/abc?q=hello", should_check_response=False)
+    assert r.text == "Invalid value 'abc' for parameter 'id': expected int"
+
+
+@pytest.mark.parametrize("function_type", ["sync", "async"])
+def test_easy_access_int_follows_python_int_rules(session, function_type):
+    r = get(f"/easy/{function_type}/1_000?q=hello&page=%2B2")
+    assert r.json() == {"id": 1000, "q": "hello", "page": 2}
+
+    r = get(f"/easy/{function_type}/1__000?q=hello", should_check_response=False)
+    assert r.status_code == 400
+
+
 # ===== HTTP: Optional params =====
 
 
@@ -0,0 +1,43 @@
+"""
+Integration tests for running several event loops in one process.
+
+These tests spin up a real Robyn server with `--workers 2 --event-loops 2`, so
+async handlers of the two workers must run on two different loop threads.
+"""
+
+import platform
+
+import pytest
+import requests
+
+from integration_tests.conftest import kill_process, start_app_server
+
+EVENT_LOOPS_PORT = 8086
+EVENT_LOOPS_HOST = "127.0.0.1"
+EVENT_LOOPS_BASE_URL = f"http://{EVENT_LOOPS_HOST}:{EVENT_LOOPS_PORT}"
+REQUEST_TIMEOUT = 5
+
+
+pytestmark = pytest.mark.skipif(
+    platform.system() == "Windows",
+    reason="event loop integration tests use a POSIX-only server-subprocess harness",
+)
+
+
+@pytest.fixture(scope="module")
+def event_loops_server():
+    process = start_app_server("event_loops_app.py", EVENT_LOOPS_HOST, EVENT_LOOPS_PORT, "--workers", "2", "--event-loops", "2")
+    yield
+    kill_process(process)
+
+
+def test_async_handlers_use_every_loop(event_loops_server):
+    # Each request opens a new connection, which actix hands to the workers in turn
+    threads = {requests.get(f"{EVENT_LOOPS_BASE_URL}/loop", timeout=REQUEST_TIMEOUT).text for _ in range(20)}
+    assert threads == {"MainThread", "robyn-event-loop-1"}
+
+
+def test_sync_handlers_still_work(event_loops_server):
+    resp = requests.get(f"{EVENT_LOOPS_BASE_URL}/sync", timeout=REQUEST_TIMEOUT)
+    assert resp.status_code == 200
+    assert resp.text == "sync"
@@ -10,3 +10,62 @@ def test_file_download(function_type: str, session):
     assert r.headers.get("Content-Disposition") == "attachment; filename=test.txt"
 
     assert r.text == "This is a test file for the downloading purpose"
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("function_type", ["sync", "async"])
+def test_file_download_is_streamed_from_disk(function_type: str, session):
+    r = get(f"/{function_type}/file/download")
+    assert r.headers.get("Content-Type") == "text/plain"
+    assert r.headers.get("Content-Length") == str(len("This is a test file for the downloading purpose"))
+    assert r.headers.get("ETag") is not None
+    assert r.headers.get("Last-Modified") is not None
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("function_type", ["sync", "async"])
+def test_file_download_single_range(function_type: str, session):
+    r = get(f"/{function_type}/file/download", expected_status_code=206, headers={"Range": "bytes=0-3"})
+    assert r.text == "This"
+    assert r.headers.get("Content-Range") == "bytes 0-3/47"
+    assert r.headers.get("Content-Type") == "text/plain"
+
+
+@pytest.mark.benchmark
+def test_file_download_multiple_ranges(session):
+    r = get("/sync/file/download", expected_status_code=206, headers={"Range": "bytes=0-3,-7"})
+    content_type = r.headers.get("Content-Type")
+    assert content_type.startswith("multipart/byteranges; boundary=")
+    body = r.text
+    assert "Content-Range: bytes 0-3/47\r\n\r\nThis\r\n" in body
+    assert "Content-Range: bytes 40-46/47\r\n\r\npurpose\r\n" in body
+    assert body.endswith(f"--{content_type.split('boundary=')[1]}--\r\n")
+
+
+@pytest.mark.benchmark
+def test_file_download_unsatisfiable_range(session):
+    r = get("/sync/file/download", expected_status_code=416, headers={"Range": "bytes=100-200"})
+    assert r.headers.get("Content-Range") == "bytes */47"
+
+
+@pytest.mark.benchmark
+def test_file_download_if_range(session):
+    etag = get("/sync/file/download").headers["ETag"]
+
+    r = get("/sync/file/download", expected_status_code=206, headers={"Range": "bytes=0-3", "If-Range": etag})
+    assert r.text == "This"
+
+    r = get("/sync/file/download", headers={"Range": "bytes=0-3", "If-Range": '"stale"'})
+    assert r.text == "This is a test file for the downloading purpose"
+
+
+@pytest.mark.benchmark
+def test_file_download_not_modified(session):
+    r = get("/sync/file/download")
+    etag, last_modified = r.headers["ETag"], r.headers["Last-Modified"]
+
+    r = get("/sync/file/download", expected_status_code=304, headers={"If-None-Match": etag})
+    assert r.content == b""
+
+    r = get("/sync/file/download", expected_status_code=304, headers={"If-Modified-Since": last_modified})
+    assert r.content == b""
@@ -0,0 +1,60 @@
+"""
+Integration tests for the middleware chains resolved per route at startup.
+
+Routes whose middlewares don't depend on the request path get their chain
+once; `/users/:id` has an exclusion on `/users/admin` only, so its
+middlewares are still resolved per request.
+"""
+
+import platform
+
+import pytest
+import requests
+
+from integration_tests.conftest import kill_process, start_app_server
+
+CHAIN_PORT = 8087
+CHAIN_HOST = "127.0.0.1"
+CHAIN_BASE_URL = f"http://{CHAIN_HOST}:{CHAIN_PORT}"
+REQUEST_TIMEOUT = 5
+
+
+pytestmark = pytest.mark.skipif(
+    platform.system() == "Windows",
+    reason="middleware chain integration tests use a POSIX-only server-subprocess harness",
+)
+
+
+@pytest.fixture(scope="module")
+def chain_server():
+    process = start_app_server("middleware_chain_app.py", CHAIN_HOST, CHAIN_PORT)
+    yield
+    kill_process(process)
+
+
+def test_global_and_route_middlewares_run_in_order(chain_server):
+    resp = requests.get(f"{CHAIN_BASE_URL}/items/7", timeout=REQUEST_TIMEOUT)
+    assert resp.status_code == 200
+    assert resp.text == "1 7"
+    assert resp.headers["x-global-after"] == "1"
+    assert resp.headers["x-item-after"] == "1"
+
+
+def test_after_middlewares_see_the_handlers_request(chain_server):
+    # The middlewares and the handler share one Python request object
+    resp = requests.get(f"{CHAIN_BASE_URL}/items/7", timeout=REQUEST_TIMEOUT)
+    assert resp.headers["x-handled-by"] == "item"
+
+
+def test_excluded_route_skips_global_middlewares(chain_server):
+    resp = requests.get(f"{CHAIN_BASE_URL}/health", timeout=REQUEST_TIMEOUT)
+    assert resp.text == "none"
+    assert "x-global-after" not in resp.headers
+
+
+@pytest.mark.parametrize("user, expected", [("42", "1"), ("admin", "none")])
+def test_exclusion_on_part_of_a_route(chain_server, user, expected):
+    resp = requests.get(f"{CHAIN_BASE_URL}/users/{user}", timeout=REQUEST_TIMEOUT)
+    assert resp.status_code == 200
+    assert resp.text == expected
+    assert resp.headers["x-global-after"] == "1"
@@ -1,3 +1,5 @@
+import hashlib
+
 import pytest
 
 from integration_tests.helpers.http_methods_helpers import multipart_post
@@ -32,3 +34,31 @@ def test_multipart_file_save(session):
 
     with open(saved["report.bin"]["path"], "rb") as saved_file:
         assert saved_file.read() == UPLOAD_CONTENT
+
+
+def test_multipart_large_file_is_spooled_to_disk(session):
+    # Above the default 1 MiB spool threshold the upload is written to a
+    # temporary file and handed to the handler as an UploadFile.
+    large_content = bytes(range(256)) * 8192  # 2 MiB
+    res = multipart_post(
+        "/sync/multipart-file/spooled",
+        files={
+            "large": ("large.bin", large_content, "application/octet-stream"),
+            "small": ("small.txt", UPLOAD_CONTENT, "text/plain"),
+        },
+    )
+
+    result = res.json()
+    large = result["uploads"]["large.bin"]
+    assert large["spooled"] is True
+    assert large["size"] == len(large_content)
+    assert large["sha256"] == hashlib.sha256(large_content).hexdigest()
+    assert large["content_type"] == "application/octet-stream"
+    assert large["on_disk"] is True
+
+    small = result["uploads"]["small.txt"]
+    assert small["spooled"] is False
+    assert small["sha256"] == hashlib.sha256(UPLOAD_CONTENT).hexdigest()
+
+    # The parts are not duplicated into the request body.
+    assert result["body"] == ""
@@ -17,3 +17,12 @@ def test_post(function_type: str, session):
 def test_post_with_param(function_type: str, session):
     res = post(f"/{function_type}/body", data={"hello": "world"})
     assert res.text == "hello=world"
+
+
+def test_post_lazy_request_attributes_and_reassignment(session):
+    res = post("/sync/request/lazy/7", data="hello")
+    assert res.json() == {
+        "cached": True,
+        "before": {"id": "7", "body": "hello", "form_data": {}, "files": {}},
+        "after": {"id": "replaced", "body": "replaced", "header": "yes"},
+    }
@@ -438,6 +438,16 @@ def test_pydantic_return_model_validation_still_works(function_type: str, sessio
     assert result["error"] == "Validation Error"
 
 
+@pytest.mark.parametrize("function_type", ["sync", "async"])
+def test_pydantic_return_model_non_ascii_round_trip(function_type: str, session):
+    """The body is validated from its raw bytes and the model sent back as bytes."""
+    json_data = {"name": "Zoë Ørsted 山田", "email": "zoe@example.com", "age": 29}
+    res = requests.post(f"{BASE_URL}/{function_type}/pydantic/return_model", json=json_data)
+
+    assert res.status_code == 200
+    assert res.json() == {**json_data, "active": True}
+
+
 # ===== Returning lists of Pydantic models =====
 
 
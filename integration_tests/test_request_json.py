@@ -38,3 +38,8 @@ def test_request_json_method_parity(function_type: str, session):
 
     for response in responses:
         assert response.json() == payload
+
+
+def test_request_json_is_parsed_once(session):
+    response = json_post("/sync/request_json/cached", json_data={"hello": "world"})
+    assert response.json() == {"parsed_once": True, "after_replace": {"replaced": True}}
@@ -0,0 +1,36 @@
+import requests
+
+from integration_tests.helpers.http_methods_helpers import BASE_URL, check_response
+
+
+def test_response_cache(session):
+    first = requests.get(f"{BASE_URL}/sync/cached/a")
+    check_response(first, 200)
+    second = requests.get(f"{BASE_URL}/sync/cached/a")
+    check_response(second, 200)
+    assert second.json() == first.json()
+    assert second.headers["content-type"] == first.headers["content-type"]
+
+    # Query strings and `vary` headers are part of the cache key
+    with_query = requests.get(f"{BASE_URL}/sync/cached/a", params={"page": "2"})
+    assert with_query.json()["calls"] == first.json()["calls"] + 1
+    with_lang = requests.get(f"{BASE_URL}/sync/cached/a", headers={"Accept-Language": "fr"})
+    assert with_lang.json()["lang"] == "fr"
+    assert requests.get(f"{BASE_URL}/sync/cached/a", headers={"Accept-Language": "fr"}).json() == with_lang.json()
+
+    stats = requests.get(f"{BASE_URL}/sync/cache/stats").json()
+    assert stats["hits"] >= 2
+    assert stats["misses"] >= 3
+    # max_entries=2: the third distinct key evicts the least recently used one
+    assert stats["entries"] <= 2
+    assert stats["evictions"] >= 1
+
+
+def test_response_cache_skips_rewritten_requests(session):
+    # A middleware sends this request to /b: its response must not be cached as /a's
+    rewritten = requests.get(f"{BASE_URL}/sync/cached/rewrite/a", headers={"x-rewrite-to": "b"})
+    check_response(rewritten, 200)
+    assert rewritten.text == "b"
+
+    assert requests.get(f"{BASE_URL}/sync/cached/rewrite/a").text == "a"
+    assert requests.get(f"{BASE_URL}/sync/cached/rewrite/a", headers={"x-rewrite-to": "b"}).text == "b"
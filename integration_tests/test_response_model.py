@@ -0,0 +1,31 @@
+import pytest
+
+from integration_tests.helpers.http_methods_helpers import get, post
+
+INVOICE = {"number": 7, "total": "19.90", "issued_at": "2024-05-01T12:30:00", "tags": ["paid"]}
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("function_type", ["sync", "async"])
+def test_response_model_dataclass(function_type: str, session):
+    res = get(f"/{function_type}/response_model/dataclass")
+    assert res.headers["Content-Type"] == "application/json"
+    assert res.json() == INVOICE
+
+
+def test_response_model_list_of_dataclasses(session):
+    res = get("/sync/response_model/list")
+    assert res.headers["Content-Type"] == "application/json"
+    assert res.json() == [INVOICE, INVOICE]
+
+
+def test_response_model_with_status_code(session):
+    res = post("/sync/response_model/created", expected_status_code=201)
+    assert res.headers["Content-Type"] == "application/json"
+    assert res.json() == INVOICE
+
+
+def test_response_model_leaves_explicit_response(session):
+    res = get("/sync/response_model/response", expected_status_code=404)
+    assert res.headers["Content-Type"] == "text/plain"
+    assert res.text == "no invoice"
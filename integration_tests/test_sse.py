@@ -1,4 +1,5 @@
 import json
+import time
 
 import pytest
 import requests
@@ -441,3 +442,62 @@ def test_sse_message_optimization():
     expected_parts = ["event: test\n", "id: 1\n", "retry: 1000\n", "data: Test\n", "\n"]
     for part in expected_parts:
         assert part in result
+
+
+def _read_events(response, count):
+    content = ""
+    for chunk in response.iter_content(chunk_size=1024, decode_unicode=True):
+        if chunk:
+            content += chunk
+        if content.count("\n\n") >= count:
+            break
+    return content
+
+
+def test_sse_hub_delivers_published_events(session):
+    """Test that an event published to a hub topic reaches its subscribers"""
+    subscriber = requests.get(f"{BASE_URL}/sse/hub/live", stream=True, timeout=5)
+    assert subscriber.status_code == 200
+    assert subscriber.headers.get("Content-Type") == "text/event-stream"
+
+    published = requests.post(f"{BASE_URL}/sse/hub/live?event=update", data="first line\nsecond line")
+    assert published.json() == {"delivered": 1, "subscribers": 1}
+
+    content = _read_events(subscriber, 1)
+    subscriber.close()
+    assert "event: update\nid: 1\ndata: first line\ndata: second line\n\n" in content
+
+
+def test_sse_hub_replays_after_last_event_id(session):
+    """Test that a client reconnecting with Last-Event-ID receives the events it missed"""
+    for message in ["one", "two", "three"]:
+        published = requests.post(f"{BASE_URL}/sse/hub/replay", data=message)
+        assert published.json()["delivered"] == 0
+
+    subscriber = requests.get(f"{BASE_URL}/sse/hub/replay", headers={"Last-Event-ID": "1"}, stream=True, timeout=5)
+    content = _read_events(subscriber, 2)
+    subscriber.close()
+    assert content == "id: 2\ndata: two\n\nid: 3\ndata: three\n\n"
+
+
+def test_sse_hub_forgets_disconnected_subscribers(session):
+    """Test that a topic is dropped from the hub once its last subscriber disconnects"""
+    stats_url = f"{BASE_URL}/sse/short_lived_stats?topic=gone"
+    subscriber = requests.get(f"{BASE_URL}/sse/short_lived/gone", stream=True, timeout=5)
+    assert subscriber.status_code == 200
+    assert requests.get(stats_url).json() == {"subscribers": 1, "topics": 1}
+
+    subscriber.close()
+    # The server notices the disconnect on its next keep-alive
+    deadline = time.monotonic() + 5
+    while requests.get(stats_url).json() != {"subscribers": 0, "topics": 0}:
+        assert time.monotonic() < deadline, "the topic outlived its subscribers"
+        time.sleep(0.1)
+
+
+@pytest.mark.parametrize("event", ["update\ndata: injected", "update\r\nid: 99", "update\r"])
+def test_sse_hub_rejects_line_breaks_in_fields(event, session):
+    """Test that a published event name can't inject other fields or events"""
+    published = requests.post(f"{BASE_URL}/sse/hub/injection", params={"event": event}, data="payload")
+    assert published.status_code == 400
+    assert published.text == "event must not contain line breaks"
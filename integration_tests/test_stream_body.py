@@ -0,0 +1,36 @@
+import hashlib
+
+import pytest
+import requests
+
+from integration_tests.helpers.http_methods_helpers import BASE_URL, check_response
+
+
+def _chunks(payload: bytes, size: int):
+    for i in range(0, len(payload), size):
+        yield payload[i : i + size]
+
+
+@pytest.mark.benchmark
+def test_stream_body_chunked_upload(session):
+    payload = bytes(range(256)) * 4096  # 1 MiB, not valid UTF-8
+    res = requests.post(f"{BASE_URL}/async/body/stream", data=_chunks(payload, 64 * 1024))
+    check_response(res, 200)
+
+    result = res.json()
+    assert result["size"] == len(payload)
+    assert result["sha256"] == hashlib.sha256(payload).hexdigest()
+    assert result["buffered_body"] == ""
+
+
+@pytest.mark.benchmark
+def test_stream_body_read(session):
+    res = requests.put(f"{BASE_URL}/async/body/stream/read", data=b"x" * 10_000)
+    check_response(res, 200)
+    assert res.json() == {"size": 10_000}
+
+
+def test_stream_body_empty(session):
+    res = requests.post(f"{BASE_URL}/async/body/stream")
+    check_response(res, 200)
+    assert res.json()["size"] == 0
@@ -0,0 +1,71 @@
+"""
+Integration tests for running sync handlers on a sync executor.
+
+These tests spin up a real Robyn server with one handler thread and a queue of
+one, so a slow sync handler must neither block other requests nor queue up
+more work than allowed.
+"""
+
+import platform
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from integration_tests.conftest import kill_process, start_app_server
+
+SYNC_EXECUTOR_PORT = 8085
+SYNC_EXECUTOR_HOST = "127.0.0.1"
+SYNC_EXECUTOR_BASE_URL = f"http://{SYNC_EXECUTOR_HOST}:{SYNC_EXECUTOR_PORT}"
+REQUEST_TIMEOUT = 5
+
+
+pytestmark = pytest.mark.skipif(
+    platform.system() == "Windows",
+    reason="sync executor integration tests use a POSIX-only server-subprocess harness",
+)
+
+
+@pytest.fixture(scope="module")
+def sync_executor_server():
+    process = start_app_server("sync_executor_app.py", SYNC_EXECUTOR_HOST, SYNC_EXECUTOR_PORT)
+    yield
+    kill_process(process)
+
+
+def _get(path: str):
+    return requests.get(f"{SYNC_EXECUTOR_BASE_URL}{path}", timeout=REQUEST_TIMEOUT)
+
+
+def test_sync_handler_runs_on_executor(sync_executor_server):
+    resp = _get("/items/7")
+    assert resp.status_code == 200
+    assert resp.json() == {"item_id": 7}
+
+    resp = _get("/items/seven")
+    assert resp.status_code == 400
+
+
+def test_slow_sync_handler_does_not_block_other_requests(sync_executor_server):
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        slow = pool.submit(_get, "/slow")
+        time.sleep(0.2)
+
+        start = time.monotonic()
+        resp = _get("/fast")
+        elapsed = time.monotonic() - start
+
+        assert resp.text == "fast"
+        assert elapsed < 0.5
+        assert slow.result().text == "slow"
+
+
+def test_full_queue_returns_503(sync_executor_server):
+    # One handler runs, one waits in the queue, the rest are rejected
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        responses = list(pool.map(_get, ["/slow"] * 4))
+
+    statuses = sorted(resp.status_code for resp in responses)
+    assert statuses.count(200) >= 2
+    assert 503 in statuses
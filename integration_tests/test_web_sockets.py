@@ -117,3 +117,31 @@ def test_websocket_binary_echo(session):
         assert data == payload
     finally:
         ws.close()
+
+
+def test_websocket_rooms(session):
+    """A message sent to a room reaches its members only, until they leave."""
+    alice = create_connection(f"{BASE_URL}/web_socket_rooms")
+    bob = create_connection(f"{BASE_URL}/web_socket_rooms")
+    carol = create_connection(f"{BASE_URL}/web_socket_rooms")
+    try:
+        for ws in (alice, bob):
+            ws.send("join:lobby")
+            assert ws.recv() == "joined lobby"
+        carol.send("join:kitchen")
+        assert carol.recv() == "joined kitchen"
+
+        alice.send("say:lobby:hello lobby")
+        assert sorted([alice.recv(), alice.recv()]) == ["delivered 2", "hello lobby"]
+        assert bob.recv() == "hello lobby"
+
+        bob.send("leave:lobby")
+        assert bob.recv() == "left lobby"
+        alice.send("say:lobby:anyone?")
+        assert sorted([alice.recv(), alice.recv()]) == ["anyone?", "delivered 1"]
+
+        carol.send("say:kitchen:just me")
+        assert sorted([carol.recv(), carol.recv()]) == ["delivered 1", "just me"]
+    finally:
+        for ws in (alice, bob, carol):
+            ws.close()
@@ -0,0 +1,114 @@
+"""
+Integration tests for the WebSocket queue limits.
+
+These tests spin up a real Robyn server whose connections buffer at most two
+received messages, so a client flooding a handler that doesn't read must be
+disconnected instead of growing the queue. They buffer at most four messages
+to send too, so a client that doesn't read a flood must be disconnected, or
+miss messages with the "drop" policy.
+"""
+
+import platform
+import time
+
+import pytest
+import requests
+from websocket import ABNF, create_connection
+
+from integration_tests.conftest import kill_process, start_app_server
+
+WEBSOCKET_LIMITS_PORT = 8088
+WEBSOCKET_LIMITS_HOST = "127.0.0.1"
+WEBSOCKET_LIMITS_BASE_URL = f"http://{WEBSOCKET_LIMITS_HOST}:{WEBSOCKET_LIMITS_PORT}"
+WEBSOCKET_LIMITS_WS_URL = f"ws://{WEBSOCKET_LIMITS_HOST}:{WEBSOCKET_LIMITS_PORT}"
+WEBSOCKET_DROP_PORT = 8089
+WEBSOCKET_DROP_BASE_URL = f"http://{WEBSOCKET_LIMITS_HOST}:{WEBSOCKET_DROP_PORT}"
+WEBSOCKET_DROP_WS_URL = f"ws://{WEBSOCKET_LIMITS_HOST}:{WEBSOCKET_DROP_PORT}"
+REQUEST_TIMEOUT = 5
+# Sent by the /flood endpoint of websocket_limits_app.py
+FLOOD_MESSAGES = 128
+
+
+pytestmark = pytest.mark.skipif(
+    platform.system() == "Windows",
+    reason="WebSocket limits integration tests use a POSIX-only server-subprocess harness",
+)
+
+
+@pytest.fixture(scope="module")
+def websocket_limits_server():
+    process = start_app_server("websocket_limits_app.py", WEBSOCKET_LIMITS_HOST, WEBSOCKET_LIMITS_PORT)
+    yield
+    kill_process(process)
+
+
+@pytest.fixture(scope="module")
+def websocket_drop_server():
+    process = start_app_server("websocket_limits_app.py", WEBSOCKET_LIMITS_HOST, WEBSOCKET_DROP_PORT, "--outbound-policy", "drop")
+    yield
+    kill_process(process)
+
+
+def get_stat(base_url: str, name: str) -> int:
+    return requests.get(f"{base_url}/stats", timeout=REQUEST_TIMEOUT).json()[name]
+
+
+def wait_for_stat(base_url: str, name: str, above: int) -> int:
+    """Poll the server's stats until `name` exceeds `above`, returning its last value."""
+    deadline = time.time() + 10
+    while True:
+        value = get_stat(base_url, name)
+        if value > above or time.time() > deadline:
+            return value
+        time.sleep(0.2)
+
+
+def test_full_inbound_queue_closes_with_policy_violation(websocket_limits_server):
+    ws = create_connection(f"{WEBSOCKET_LIMITS_WS_URL}/slow_reader", timeout=REQUEST_TIMEOUT)
+    for i in range(10):
+        ws.send(f"message {i}")
+
+    opcode, data = ws.recv_data(control_frame=True)
+    ws.close()
+    assert opcode == ABNF.OPCODE_CLOSE
+    assert int.from_bytes(data[:2], "big") == 1008
+
+    stats = requests.get(f"{WEBSOCKET_LIMITS_BASE_URL}/stats", timeout=REQUEST_TIMEOUT).json()
+    assert stats["closed"] >= 1
+
+
+def test_reading_handler_stays_connected(websocket_limits_server):
+    ws = create_connection(f"{WEBSOCKET_LIMITS_WS_URL}/echo", timeout=REQUEST_TIMEOUT)
+    for i in range(10):
+        ws.send(f"message {i}")
+        assert ws.recv() == f"message {i}"
+    ws.close()
+
+
+def test_full_outbound_queue_closes_with_try_again_later(websocket_limits_server):
+    closed = get_stat(WEBSOCKET_LIMITS_BASE_URL, "closed")
+    ws = create_connection(f"{WEBSOCKET_LIMITS_WS_URL}/flood", timeout=REQUEST_TIMEOUT)
+    ws.send("start")
+    # Don't read until the server gave up on this client
+    assert wait_for_stat(WEBSOCKET_LIMITS_BASE_URL, "closed", above=closed) > closed
+
+    received = 0
+    opcode, data = ws.recv_data(control_frame=True)
+    while opcode == ABNF.OPCODE_TEXT:
+        received += 1
+        opcode, data = ws.recv_data(control_frame=True)
+    ws.close()
+    assert opcode == ABNF.OPCODE_CLOSE
+    assert int.from_bytes(data[:2], "big") == 1013
+    assert received < FLOOD_MESSAGES
+
+
+def test_full_outbound_queue_drops_messages(websocket_drop_server):
+    ws = create_connection(f"{WEBSOCKET_DROP_WS_URL}/flood", timeout=REQUEST_TIMEOUT)
+    ws.send("start")
+    assert wait_for_stat(WEBSOCKET_DROP_BASE_URL, "dropped_outbound", above=0) > 0
+
+    # Still connected: what was queued before the queue filled up arrives
+    opcode, _ = ws.recv_data(control_frame=True)
+    ws.close()
+    assert opcode == ABNF.OPCODE_TEXT
@@ -0,0 +1,53 @@
+"""
+Standalone Robyn app with tiny WebSocket queue limits, used by the WebSocket
+limits integration tests. Runs on a separate port (8088) so a handler that
+never reads can overflow its inbound queue, and a client that doesn't read
+its outbound one. `--outbound-policy drop` switches the outbound policy.
+"""
+
+import argparse
+import asyncio
+import os
+
+from robyn import Robyn
+
+# More than the kernel buffers on both ends of a loopback connection hold
+FLOOD_MESSAGES = 128
+FLOOD_MESSAGE = "x" * 256 * 1024
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--outbound-policy", default="close")
+outbound_policy = parser.parse_known_args()[0].outbound_policy
+
+app = Robyn(__file__)
+limits = app.configure_websocket_limits(inbound_queue=2, inbound_policy="close", outbound_queue=4, outbound_policy=outbound_policy)
+
+
+@app.websocket("/slow_reader")
+async def slow_reader(websocket):
+    await asyncio.sleep(30)
+
+
+@app.websocket("/echo")
+async def echo(websocket):
+    while True:
+        message = await websocket.receive_text()
+        await websocket.send_text(message)
+
+
+@app.websocket("/flood")
+async def flood(websocket):
+    await websocket.receive_text()
+    for _ in range(FLOOD_MESSAGES):
+        await websocket.send_text(FLOOD_MESSAGE)
+    await asyncio.sleep(30)
+
+
+@app.get("/stats")
+def stats():
+    return limits.stats()
+
+
+if __name__ == "__main__":
+    port = int(os.getenv("ROBYN_PORT", "8088"))
+    app.start(port=port, _check_port=False)
@@ -11,7 +11,7 @@ from typing import Any
 import multiprocess as mp  # type: ignore
 
 from robyn import status_codes
-from robyn.argument_parser import Config
+from robyn.argument_parser import Config, is_gil_disabled
 from robyn.authentication import AuthenticationHandler
 from robyn.dependency_injection import DependencyMap
 from robyn.env_populator import load_vars
@@ -23,9 +23,23 @@ from robyn.openapi import OpenAPI, RouteOpenAPIMeta
 from robyn.processpool import run_processes
 from robyn.reloader import compile_rust_files
 from robyn.responses import SSEMessage, SSEResponse, StreamingResponse, html, serve_file, serve_html
-from robyn.robyn import FunctionInfo, Headers, HttpMethod, Request, Response, WebSocketConnector, get_version
+from robyn.robyn import (
+    CachePolicy,
+    Compression,
+    FunctionInfo,
+    Headers,
+    HttpMethod,
+    Request,
+    Response,
+    SSEHub,
+    SyncExecutor,
+    WebSocketConnector,
+    WebSocketLimits,
+    get_version,
+)
 from robyn.router import MiddlewareRouter, MiddlewareType, Router, WebSocketRouter
 from robyn.session import Session, SessionManager
+from robyn.session_stores import FileSessionStore, MemorySessionStore, RedisSessionStore, SessionStore
 from robyn.testing import TestClient
 from robyn.types import Directory, JsonBody, RequestBody, RequestMethod, RequestURL
 from robyn.ws import WebSocketAdapter, WebSocketDisconnect, create_websocket_decorator
@@ -70,6 +84,17 @@ def _normalize_endpoint(endpoint: str | None, treat_empty_as_root: bool = False)
     return endpoint
 
 
+def _normalize_excluded_routes(exclude: list[str] | None) -> list[str] | None:
+    """Normalize the routes a global middleware is excluded from, dropping duplicates."""
+    if not exclude:
+        return None
+
+    routes = [_normalize_endpoint(route) for route in exclude]
+    if None in routes:
+        raise ValueError("Excluded routes cannot be blank, do specify '/' for root endpoint")
+    return list(dict.fromkeys(routes))  # type: ignore[arg-type]
+
+
 def _looks_like_module_reference(value: object) -> bool:
     """Heuristic to tell a legacy ``__name__``/``__file__`` argument apart from a
     modern route prefix, used only to keep the old SubRouter signature working.
@@ -138,6 +163,9 @@ class BaseRobyn(ABC):
         self.exception_handler: Callable | None = None
         self.authentication_handler: AuthenticationHandler | None = None
         self.session_manager: SessionManager | None = None
+        self.compression: Compression | None = None
+        self.sync_executor: SyncExecutor | None = None
+        self.websocket_limits: WebSocketLimits | None = None
         self.included_routers: list[SubRouter] = []
         self._mcp_app: MCPApp | None = None
         self._added_routes: set[str] = set()
@@ -182,6 +210,8 @@ class BaseRobyn(ABC):
         responses: dict[int | str, Any] | None = None,
         deprecated: bool = False,
         include_in_schema: bool = True,
+        stream_body: bool = False,
+        cache: CachePolicy | None = None,
     ):
         """
         Connect a URI to a handler
@@ -198,6 +228,8 @@ class BaseRobyn(ABC):
         :param responses dict|None: additional documented responses keyed by status code
         :param deprecated bool: marks the operation as deprecated in the openapi spec
         :param include_in_schema bool: when False the route is omitted from the openapi spec
+        :param stream_body bool: when True the request body is not buffered; an async handler reads it from request.body_stream
+        :param cache CachePolicy|None: cache the route's 200 responses in the server, following the given policy
         """
         injected_dependencies = self.dependencies.get_dependency_map(self)
 
@@ -252,6 +284,8 @@ class BaseRobyn(ABC):
             exception_handler=self.exception_handler,
             injected_dependencies=injected_dependencies,
             openapi_metadata=openapi_metadata,
+            stream_body=stream_body,
+            cache=cache,
         )
 
         logger.info("Added route %s %s", route_type, normalized_endpoint)
@@ -275,21 +309,45 @@ class BaseRobyn(ABC):
         """
         self.dependencies.add_global_dependency(**kwargs)
 
-    def before_request(self, endpoint: str | None = None) -> Callable[..., None]:
+    def before_request(
+        self,
+        endpoint: str | None = None,
+        exclude: list[str] | None = None,
+        skip_const_routes: bool = False,
+    ) -> Callable[..., None]:
         """
         You can use the @app.before_request decorator to call a method before routing to the specified endpoint
 
         :param endpoint str|None: endpoint to server the route. If None, the middleware will be applied to all the routes.
+        :param exclude list[str]|None: routes a global middleware is not applied to, e.g. "/health" or "/static/*path"
+        :param skip_const_routes bool: when True a global middleware is not applied to const routes, which stay on the fast path
         """
-        return self.middleware_router.add_middleware(MiddlewareType.BEFORE_REQUEST, _normalize_endpoint(endpoint))
+        return self.middleware_router.add_middleware(
+            MiddlewareType.BEFORE_REQUEST,
+            _normalize_endpoint(endpoint),
+            _normalize_excluded_routes(exclude),
+            skip_const_routes,
+        )
 
-    def after_request(self, endpoint: str | None = None) -> Callable[..., None]:
+    def after_request(
+        self,
+        endpoint: str | None = None,
+        exclude: list[str] | None = None,
+        skip_const_routes: bool = False,
+    ) -> Callable[..., None]:
         """
         You can use the @app.after_request decorator to call a method after routing to the specified endpoint
 
         :param endpoint str|None: endpoint to server the route. If None, the middleware will be applied to all the routes.
+        :param exclude list[str]|None: routes a global middleware is not applied to, e.g. "/health" or "/static/*path"
+        :param skip_const_routes bool: when True a global middleware is not applied to const routes, which stay on the fast path
         """
-        return self.middleware_router.add_middleware(MiddlewareType.AFTER_REQUEST, _normalize_endpoint(endpoint))
+        return self.middleware_router.add_middleware(
+            MiddlewareType.AFTER_REQUEST,
+            _normalize_endpoint(endpoint),
+            _normalize_excluded_routes(exclude),
+            skip_const_routes,
+        )
 
     def serve_directory(
         self,
@@ -419,6 +477,7 @@ class BaseRobyn(ABC):
         responses: dict[int | str, Any] | None = None,
         deprecated: bool = False,
         include_in_schema: bool = True,
+        cache: CachePolicy | None = None,
     ):
         """
         The @app.get decorator to add a route with the GET method
@@ -428,6 +487,7 @@ class BaseRobyn(ABC):
         :param auth_required bool: represents if the route needs authentication or not
         :param openapi_name: str -- the name of the endpoint in the openapi spec
         :param openapi_tags: list[str] -- for grouping of endpoints in the openapi spec
+        :param cache: CachePolicy | None -- cache the responses of the route in the server
         """
 
         def inner(handler):
@@ -444,6 +504,7 @@ class BaseRobyn(ABC):
                 responses=responses,
                 deprecated=deprecated,
                 include_in_schema=include_in_schema,
+                cache=cache,
             )
 
         return inner
@@ -459,6 +520,7 @@ class BaseRobyn(ABC):
         responses: dict[int | str, Any] | None = None,
         deprecated: bool = False,
         include_in_schema: bool = True,
+        stream_body: bool = False,
     ):
         """
         The @app.post decorator to add a route with POST method
@@ -467,6 +529,7 @@ class BaseRobyn(ABC):
         :param auth_required bool: represents if the route needs authentication or not
         :param openapi_name: str -- the name of the endpoint in the openapi spec
         :param openapi_tags: list[str] -- for grouping of endpoints in the openapi spec
+        :param stream_body bool: stream the request body to an async handler through request.body_stream instead of buffering it
         """
 
         def inner(handler):
@@ -482,6 +545,7 @@ class BaseRobyn(ABC):
                 responses=responses,
                 deprecated=deprecated,
                 include_in_schema=include_in_schema,
+                stream_body=stream_body,
             )
 
         return inner
@@ -497,6 +561,7 @@ class BaseRobyn(ABC):
         responses: dict[int | str, Any] | None = None,
         deprecated: bool = False,
         include_in_schema: bool = True,
+        stream_body: bool = False,
     ):
         """
         The @app.put decorator to add a get route with PUT method
@@ -505,6 +570,7 @@ class BaseRobyn(ABC):
         :param auth_required bool: represents if the route needs authentication or not
         :param openapi_name: str -- the name of the endpoint in the openapi spec
         :param openapi_tags: list[str] -- for grouping of endpoints in the openapi spec
+        :param stream_body bool: stream the request body to an async handler through request.body_stream instead of buffering it
         """
 
         def inner(handler):
@@ -520,6 +586,7 @@ class BaseRobyn(ABC):
                 responses=responses,
                 deprecated=deprecated,
                 include_in_schema=include_in_schema,
+                stream_body=stream_body,
             )
 
         return inner
@@ -535,6 +602,7 @@ class BaseRobyn(ABC):
         responses: dict[int | str, Any] | None = None,
         deprecated: bool = False,
         include_in_schema: bool = True,
+        stream_body: bool = False,
     ):
         """
         The @app.delete decorator to add a route with DELETE method
@@ -543,6 +611,7 @@ class BaseRobyn(ABC):
         :param auth_required bool: represents if the route needs authentication or not
         :param openapi_name: str -- the name of the endpoint in the openapi spec
         :param openapi_tags: list[str] -- for grouping of endpoints in the openapi spec
+        :param stream_body bool: stream the request body to an async handler through request.body_stream instead of buffering it
         """
 
         def inner(handler):
@@ -558,6 +627,7 @@ class BaseRobyn(ABC):
                 responses=responses,
                 deprecated=deprecated,
                 include_in_schema=include_in_schema,
+                stream_body=stream_body,
             )
 
         return inner
@@ -573,6 +643,7 @@ class BaseRobyn(ABC):
         responses: dict[int | str, Any] | None = None,
         deprecated: bool = False,
         include_in_schema: bool = True,
+        stream_body: bool = False,
     ):
         """
         The @app.patch decorator to add a route with PATCH method
@@ -581,6 +652,7 @@ class BaseRobyn(ABC):
         :param auth_required bool: represents if the route needs authentication or not
         :param openapi_name: str -- the name of the endpoint in the openapi spec
         :param openapi_tags: list[str] -- for grouping of endpoints in the openapi spec
+        :param stream_body bool: stream the request body to an async handler through request.body_stream instead of buffering it
         """
 
         def inner(handler):
@@ -596,6 +668,7 @@ class BaseRobyn(ABC):
                 responses=responses,
                 deprecated=deprecated,
                 include_in_schema=include_in_schema,
+                stream_body=stream_body,
             )
 
         return inner
@@ -863,6 +936,7 @@ class BaseRobyn(ABC):
         secure: bool = False,
         http_only: bool = True,
         same_site: str = "Lax",
+        store: SessionStore | None = None,
     ) -> SessionManager:
         """
         Enable signed-cookie sessions for the application.
@@ -875,7 +949,8 @@ class BaseRobyn(ABC):
 
         The session is stored client-side in a tamper-proof signed cookie, so no
         server-side store is needed. The payload is signed, not encrypted — do
-        not store secrets in it.
+        not store secrets in it. With a ``store``, the data stays on the server
+        and the cookie only carries a signed, opaque session id.
 
         :param secret_key: key used to sign the session cookie. Keep it secret and stable across restarts.
         :param cookie_name: name of the session cookie (default ``"session"``).
@@ -885,6 +960,7 @@ class BaseRobyn(ABC):
         :param secure: only send the cookie over HTTPS.
         :param http_only: hide the cookie from JavaScript (recommended).
         :param same_site: ``"Strict"``, ``"Lax"`` or ``"None"``.
+        :param store: a :class:`SessionStore` keeping the sessions server-side, e.g. ``RedisSessionStore(url)``.
         :returns: the configured :class:`SessionManager`.
         :raises RuntimeError: if sessions are already configured on this app.
         """
@@ -903,25 +979,113 @@ class BaseRobyn(ABC):
             secure=secure,
             http_only=http_only,
             same_site=same_site,
+            store=store,
         )
         self.session_manager = manager
 
-        @self.before_request()
-        def _robyn_load_session(request: Request):
-            # request.session is shared by reference through the request phases,
-            # so handler mutations are visible when we save it below.
-            request.session = manager.load(request)
-            return request
+        # Const routes are answered without a request object, so they never
+        # read or modify the session.
+        if store is None:
+
+            @self.before_request(skip_const_routes=True)
+            def _robyn_load_session(request: Request):
+                # request.session is shared by reference through the request phases,
+                # so handler mutations are visible when we save it below.
+                request.session = manager.load(request)
+                return request
 
-        @self.after_request()
-        def _robyn_save_session(request: Request, response: Response):
-            session = request.session
-            if session is not None:
-                manager.save(session, response)
-            return response
+            @self.after_request(skip_const_routes=True)
+            def _robyn_save_session(request: Request, response: Response):
+                session = request.session
+                if session is not None:
+                    manager.save(session, response)
+                return response
+
+        else:
+            # A store may do network I/O, which is awaited on the event loop
+            @self.before_request(skip_const_routes=True)
+            async def _robyn_load_session(request: Request):
+                request.session = await manager.load_async(request)
+                return request
+
+            @self.after_request(skip_const_routes=True)
+            async def _robyn_save_session(request: Request, response: Response):
+                session = request.session
+                if session is not None:
+                    await manager.save_async(session, response)
+                return response
 
         return manager
 
+    def configure_compression(
+        self,
+        algorithms: list[str] | None = None,
+        level: int | None = None,
+        min_size: int = 1024,
+        content_types: list[str] | None = None,
+    ) -> Compression:
+        """
+        Compress responses in the server, based on the request's ``Accept-Encoding``.
+
+        Const route responses are compressed once at startup, other responses as they
+        are sent, including streamed ones. Responses that already carry a
+        ``Content-Encoding``, partial content and bodies smaller than ``min_size`` are
+        left untouched.
+
+        :param algorithms: encodings to offer, in order of preference, among ``"br"``, ``"zstd"`` and ``"gzip"`` (default: all of them).
+        :param level: compression level, clamped to each algorithm's range. ``None`` uses a fast default per algorithm.
+        :param min_size: smallest body, in bytes, worth compressing.
+        :param content_types: content types to compress; ``"text/*"`` matches every subtype. Defaults to text, JSON, JavaScript, XML and SVG.
+        :returns: the configured :class:`Compression`.
+        """
+        self.compression = Compression(algorithms, level, min_size, content_types)
+        return self.compression
+
+    def configure_sync_executor(self, max_threads: int = 32, idle_timeout: int = 30, queue_depth: int = 1024) -> SyncExecutor:
+        """
+        Run sync route handlers on a pool of threads instead of the server's worker threads.
+
+        By default a sync handler runs on the worker that accepted the request, so a
+        handler blocked on I/O holds up every other request of that worker. With an
+        executor, each process queues sync handlers to its own pool, which grows up to
+        ``max_threads`` and shrinks again when threads stay idle. Requests arriving while
+        ``queue_depth`` handlers are already waiting get a 503 without running any Python.
+        Async handlers and middlewares are not affected.
+
+        :param max_threads: most threads running sync handlers at once, per process.
+        :param idle_timeout: seconds an extra thread waits for work before it exits.
+        :param queue_depth: most handlers waiting for a thread before requests are rejected.
+        :returns: the configured :class:`SyncExecutor`.
+        """
+        self.sync_executor = SyncExecutor(max_threads, idle_timeout, queue_depth)
+        return self.sync_executor
+
+    def configure_websocket_limits(
+        self,
+        inbound_queue: int = 1024,
+        outbound_queue: int = 1024,
+        inbound_policy: str = "block",
+        outbound_policy: str = "close",
+    ) -> WebSocketLimits:
+        """
+        Bound the message queues of every WebSocket connection.
+
+        Messages a client sends wait in its inbound queue until the handler reads them,
+        and messages sent to a client wait in its outbound queue until they are written
+        to its socket. Without bounds, a client flooding the server or reading too slowly
+        would grow them until the worker runs out of memory, so the default limits apply
+        even when this is not called.
+
+        :param inbound_queue: most received messages waiting for the handler, per connection.
+        :param outbound_queue: most messages waiting to be written to a client, per connection.
+        :param inbound_policy: when the inbound queue is full, ``"block"`` stops reading from the client until the handler
+            catches up, ``"drop"`` drops the message and ``"close"`` closes the connection with 1008.
+        :param outbound_policy: when the outbound queue is full, ``"drop"`` drops the message and ``"close"`` closes the connection with 1013.
+        :returns: the configured :class:`WebSocketLimits`, whose ``stats()`` counts the dropped messages and closed connections.
+        """
+        self.websocket_limits = WebSocketLimits(inbound_queue, outbound_queue, inbound_policy, outbound_policy)
+        return self.websocket_limits
+
     @property
     def mcp(self):
         """
@@ -993,6 +1157,8 @@ class Robyn(BaseRobyn):
 
         logger.info("Robyn version: %s", __version__)
         logger.info("Starting server at http://%s:%s", host, port)
+        if is_gil_disabled():
+            logger.info("Free-threaded Python: the %s workers of each process run Python in parallel", self.config.workers)
 
         allow_connection_pickling = getattr(mp, "allow_connection_pickling", None)
         if callable(allow_connection_pickling):
@@ -1015,6 +1181,10 @@ class Robyn(BaseRobyn):
             open_browser,
             client_timeout,
             keep_alive_timeout,
+            self.compression,
+            self.sync_executor,
+            self.websocket_limits,
+            self.config.event_loops,
         )
 
 
@@ -1131,7 +1301,9 @@ def ALLOW_CORS(app: Robyn, origins: list[str] | str, headers: list[str] | str |
         headers = list(set(default_headers + headers))
         headers = ", ".join(headers)
 
-    @app.before_request()
+    # With every origin allowed the middleware only answers preflight requests,
+    # which const routes never receive, so they can stay on the fast path.
+    @app.before_request(skip_const_routes="*" in origins)
     def cors_middleware(request):
         origin = request.headers.get("Origin")
 
@@ -1179,6 +1351,7 @@ __all__ = [
     "StreamingResponse",
     "SSEResponse",
     "SSEMessage",
+    "SSEHub",
     "ALLOW_CORS",
     "SubRouter",
     "AuthenticationHandler",
@@ -1194,4 +1367,12 @@ __all__ = [
     "RequestURL",
     "Session",
     "SessionManager",
+    "SessionStore",
+    "MemorySessionStore",
+    "FileSessionStore",
+    "RedisSessionStore",
+    "CachePolicy",
+    "Compression",
+    "SyncExecutor",
+    "WebSocketLimits",
 ]
@@ -10,6 +10,8 @@ import logging
 import types
 from typing import Any, Dict, Optional, Set, Tuple, Union, get_args, get_origin
 
+from robyn.robyn import TypedParam
+
 _logger = logging.getLogger(__name__)
 
 _MISSING = object()
@@ -167,6 +169,49 @@ def resolve_individual_params(
     return resolved
 
 
+# Scalar annotations the Rust executor coerces itself, see `typed_param_spec`.
+_NATIVE_PARAM_KINDS = ((str, "str"), (int, "int"), (float, "float"), (bool, "bool"))
+
+
+def typed_param_spec(param: inspect.Parameter, route_param_names: Set[str]) -> Optional[TypedParam]:
+    """
+    Describe an individual path/query parameter for the Rust executor.
+
+    The executor coerces ``str``/``int``/``float``/``bool`` parameters (and
+    ``list[T]``/``Optional[T]`` of those) from the raw path and query params
+    before the handler is called, answering invalid input with the same 400
+    as ``resolve_individual_params``. Returns None for any other annotation,
+    which is then resolved in Python.
+    """
+    annotation = param.annotation
+    if annotation is inspect.Parameter.empty:
+        annotation = str
+
+    inner_type, is_optional = unwrap_optional(annotation)
+    is_list = is_list_type(inner_type)
+    elem_type = get_list_element_type(inner_type) if is_list else inner_type
+    from_path = param.name in route_param_names
+
+    # A list path param is coerced with list(value) in Python; leave it there.
+    if is_list and from_path:
+        return None
+
+    kind = next((name for native_type, name in _NATIVE_PARAM_KINDS if elem_type is native_type), None)
+    if kind is None:
+        return None
+
+    has_default = param.default is not inspect.Parameter.empty
+    return TypedParam(
+        param.name,
+        kind,
+        from_path,
+        is_list=is_list,
+        is_optional=is_optional,
+        default=param.default if has_default else None,
+        has_default=has_default,
+    )
+
+
 def parse_route_param_names(endpoint: str) -> Set[str]:
     """
     Extract parameter names from a route endpoint pattern.
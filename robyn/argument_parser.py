@@ -1,5 +1,11 @@
 import argparse
 import os
+import sys
+
+
+def is_gil_disabled() -> bool:
+    """Whether this is a free-threaded interpreter running without the GIL."""
+    return not getattr(sys, "_is_gil_enabled", lambda: True)()
 
 
 class Config:
@@ -20,6 +26,14 @@ class Config:
             required=False,
             help="Choose the number of workers. [Default: 1]",
         )
+        parser.add_argument(
+            "--event-loops",
+            dest="event_loops",
+            type=int,
+            default=None,
+            required=False,
+            help="Choose the number of event loops per process for async handlers, shared by the workers. [Default: 1]",
+        )
         parser.add_argument(
             "--dev",
             dest="dev",
@@ -90,6 +104,7 @@ class Config:
         self.dev = args.dev
         self.processes = args.processes
         self.workers = args.workers
+        self.event_loops = args.event_loops
         self.create = args.create
         self.docs = args.docs
         self.open_browser = args.open_browser
@@ -104,12 +119,20 @@ class Config:
             # doing this here before every other check
             # so that processes, workers and log_level can be overridden
             cpu_count: int = os.cpu_count() or 1
-            self.processes = self.processes or ((cpu_count * 2) + 1) or 1
-            self.workers = self.workers or 2
+            if is_gil_disabled():
+                # Threads run Python in parallel, so a single process with a
+                # worker and an event loop per core avoids copying the app
+                self.processes = self.processes or 1
+                self.workers = self.workers or cpu_count
+                self.event_loops = self.event_loops or self.workers
+            else:
+                self.processes = self.processes or ((cpu_count * 2) + 1) or 1
+                self.workers = self.workers or 2
             self.log_level = self.log_level or "WARNING"
 
         self.processes = self.processes or 1
         self.workers = self.workers or 1
+        self.event_loops = self.event_loops or 1
 
         # find something that ends with .py in unknown_args
         for arg in unknown_args:
@@ -123,6 +146,9 @@ class Config:
         if self.dev and (self.processes != 1 or self.workers != 1):
             raise ValueError("--processes and --workers shouldn't be used with --dev")
 
+        if self.event_loops > self.workers:
+            raise ValueError("--event-loops can't be greater than --workers")
+
         if self.dev and self.log_level is None:
             self.log_level = "DEBUG"
         elif self.log_level is None:
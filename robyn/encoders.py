@@ -0,0 +1,111 @@
+"""
+JSON encoders compiled from a route's ``response_model``.
+
+The encoder is chosen once, when the route is registered, and travels with
+the handler to the Rust executor. A value returned by the handler is handed
+to it as is, so no Python ``Response`` is built around it.
+
+msgspec is never imported here: a ``Struct`` response model can only exist
+once the application imported msgspec itself.
+"""
+
+import dataclasses
+import sys
+import typing
+from collections.abc import Hashable, Mapping
+from decimal import Decimal
+from functools import partial
+from typing import Any, Callable, Optional
+
+import orjson
+
+from robyn.pydantic_support import is_pydantic_model
+
+__all__ = ["ResponseEncoder", "compile_response_encoder"]
+
+ResponseEncoder = Callable[[Any], bytes]
+
+# Response models the executor already serializes without an encoder
+_PLAIN_MODELS = (Any, str, bytes)
+
+
+def _default(value: Any) -> Any:
+    """Encode the values orjson has no native representation for."""
+    if isinstance(value, Decimal):
+        # Kept exact, like Pydantic and msgspec do
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    # numpy arrays orjson can't read in place (non-contiguous, object dtype)
+    tolist = getattr(value, "tolist", None)
+    if callable(tolist):
+        return tolist()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def _msgspec_struct():
+    msgspec = sys.modules.get("msgspec")
+    return None if msgspec is None else msgspec.Struct
+
+
+def _nested_types(annotation: Any) -> list:
+    """The types an annotation is built from: generic arguments and fields."""
+    args = [arg for arg in typing.get_args(annotation) if arg is not Ellipsis]
+    if args:
+        return args
+    if dataclasses.is_dataclass(annotation) or typing.is_typeddict(annotation):
+        try:
+            return list(typing.get_type_hints(annotation).values())
+        except Exception:
+            # Forward references that can't be resolved: nothing to inspect
+            return []
+    return []
+
+
+def _walk(annotation: Any, seen: set):
+    """Every type reachable from ``annotation``, each visited once."""
+    if isinstance(annotation, Hashable):
+        if annotation in seen:
+            return
+        seen.add(annotation)
+    yield annotation
+    for nested in _nested_types(annotation):
+        yield from _walk(nested, seen)
+
+
+def _has_non_str_keys(annotation: Any) -> bool:
+    origin = typing.get_origin(annotation)
+    if origin is None or not isinstance(origin, type) or not issubclass(origin, Mapping):
+        return False
+    args = typing.get_args(annotation)
+    return bool(args) and args[0] is not str
+
+
+def compile_response_encoder(response_model: Any) -> Optional[ResponseEncoder]:
+    """Build the encoder for the values a route returns as ``response_model``.
+
+    msgspec ``Struct`` models are encoded by a ``msgspec.json.Encoder``. Other
+    models (dataclasses, TypedDicts, containers of them, datetimes, UUIDs,
+    enums, numpy arrays) are encoded by ``orjson.dumps`` with the options the
+    model needs; ``Decimal`` is encoded as a string and sets as lists.
+
+    Returns None when the route doesn't need one: no ``response_model``, a
+    Pydantic model, which keeps its own serializer, or ``str``/``bytes``/``Any``.
+    """
+    if response_model is None or response_model in _PLAIN_MODELS:
+        return None
+
+    types = list(_walk(response_model, set()))
+    if any(is_pydantic_model(t) for t in types):
+        return None
+
+    struct = _msgspec_struct()
+    if struct is not None and any(isinstance(t, type) and issubclass(t, struct) for t in types):
+        import msgspec
+
+        return msgspec.json.Encoder(enc_hook=_default).encode
+
+    option = orjson.OPT_SERIALIZE_NUMPY
+    if any(_has_non_str_keys(t) for t in types):
+        option |= orjson.OPT_NON_STR_KEYS
+    return partial(orjson.dumps, default=_default, option=option)
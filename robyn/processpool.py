@@ -5,9 +5,10 @@ import webbrowser
 
 from multiprocess import Process  # type: ignore
 
+from robyn.argument_parser import is_gil_disabled
 from robyn.events import Events
 from robyn.logger import logger
-from robyn.robyn import FunctionInfo, Headers, Server, SocketHeld
+from robyn.robyn import Compression, FunctionInfo, Headers, Server, SocketHeld, SyncExecutor, WebSocketLimits
 from robyn.router import GlobalMiddleware, Route, RouteMiddleware
 from robyn.types import Directory
 
@@ -29,6 +30,10 @@ def run_processes(
     open_browser: bool,
     client_timeout: int = 30,
     keep_alive_timeout: int = 20,
+    compression: Compression | None = None,
+    sync_executor: SyncExecutor | None = None,
+    websocket_limits: WebSocketLimits | None = None,
+    event_loops: int = 1,
 ) -> list[Process]:
     socket = SocketHeld(url, port)
 
@@ -47,6 +52,10 @@ def run_processes(
         excluded_response_headers_paths,
         client_timeout,
         keep_alive_timeout,
+        compression,
+        sync_executor,
+        websocket_limits,
+        event_loops,
     )
 
     def terminating_signal_handler(_sig, _frame):
@@ -83,6 +92,10 @@ def init_processpool(
     excluded_response_headers_paths: list[str] | None,
     client_timeout: int = 30,
     keep_alive_timeout: int = 20,
+    compression: Compression | None = None,
+    sync_executor: SyncExecutor | None = None,
+    websocket_limits: WebSocketLimits | None = None,
+    event_loops: int = 1,
 ) -> list[Process]:
     process_pool: list = []
     if sys.platform.startswith("win32") or processes == 1:
@@ -100,6 +113,10 @@ def init_processpool(
             excluded_response_headers_paths,
             client_timeout,
             keep_alive_timeout,
+            compression,
+            sync_executor,
+            websocket_limits,
+            event_loops,
         )
 
         return process_pool
@@ -122,6 +139,10 @@ def init_processpool(
                 excluded_response_headers_paths,
                 client_timeout,
                 keep_alive_timeout,
+                compression,
+                sync_executor,
+                websocket_limits,
+                event_loops,
             ),
         )
         process.start()
@@ -131,7 +152,9 @@ def init_processpool(
 
 
 def initialize_event_loop():
-    if sys.platform.startswith("win32") or sys.platform.startswith("linux-cross"):
+    # Importing an extension that isn't marked free-threading safe would turn the
+    # GIL back on, so free-threaded interpreters keep the native asyncio loop
+    if sys.platform.startswith("win32") or sys.platform.startswith("linux-cross") or is_gil_disabled():
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
         return loop
@@ -160,6 +183,10 @@ def spawn_process(
     excluded_response_headers_paths: list[str] | None,
     client_timeout: int = 30,
     keep_alive_timeout: int = 20,
+    compression: Compression | None = None,
+    sync_executor: SyncExecutor | None = None,
+    websocket_limits: WebSocketLimits | None = None,
+    event_loops: int = 1,
 ):
     """
     This function is called by the main process handler to create a server runtime.
@@ -191,11 +218,20 @@ def spawn_process(
 
     server.set_response_headers_exclude_paths(excluded_response_headers_paths)
 
+    if compression is not None:
+        server.set_compression(compression)
+
+    if sync_executor is not None:
+        server.set_sync_executor(sync_executor)
+
+    if websocket_limits is not None:
+        server.set_websocket_limits(websocket_limits)
+
     for route in routes:
-        server.add_route(route.route_type, route.route, route.function, route.is_const)
+        server.add_route(route.route_type, route.route, route.function, route.is_const, route.stream_body, route.cache)
 
-    for middleware_type, middleware_function in global_middlewares:
-        server.add_global_middleware(middleware_type, middleware_function)
+    for middleware in global_middlewares:
+        server.add_global_middleware(middleware.middleware_type, middleware.function, middleware.skip_const_routes, list(middleware.exclude))
 
     for middleware_type, endpoint, function, route_type in route_middlewares:
         server.add_middleware_route(middleware_type, endpoint, function, route_type)
@@ -216,7 +252,7 @@ def spawn_process(
         )
 
     try:
-        server.start(socket, workers)
+        server.start(socket, workers, event_loops)
         loop = asyncio.get_event_loop()
         loop.run_forever()
     except KeyboardInterrupt:
@@ -20,6 +20,7 @@ __all__ = [
     "validate_pydantic_body",
     "get_pydantic_openapi_schema",
     "serialize_pydantic_response",
+    "dump_pydantic_json",
     "check_pydantic_installed_for_handler",
     "PydanticBodyValidationError",
     "PydanticNotInstalledError",
@@ -28,23 +29,29 @@ __all__ = [
 
 _BaseModel = None
 _ValidationError = None
+_TypeAdapter = None
 _pydantic_checked = False
 
+# TypeAdapters serializing each response type, built on first use
+_json_adapters: dict = {}
+
 
 def _ensure_pydantic():
     """Lazy-load pydantic classes. Called at most once."""
-    global _BaseModel, _ValidationError, _pydantic_checked
+    global _BaseModel, _ValidationError, _TypeAdapter, _pydantic_checked
     if _pydantic_checked:
         return
     _pydantic_checked = True
     try:
-        from pydantic import BaseModel, ValidationError
+        from pydantic import BaseModel, TypeAdapter, ValidationError
 
         _BaseModel = BaseModel
         _ValidationError = ValidationError
+        _TypeAdapter = TypeAdapter
     except ImportError:
         _BaseModel = None
         _ValidationError = None
+        _TypeAdapter = None
 
 
 def is_pydantic_available() -> bool:
@@ -118,7 +125,8 @@ def validate_pydantic_body(model_class, body: Any) -> Tuple[Any, Optional[dict]]
 
     Uses model_validate_json for maximum performance — single-pass
     parse+validate without an intermediate dict.  model_validate_json
-    accepts str, bytes, and bytearray natively.
+    accepts str, bytes, and bytearray natively, so the router passes
+    ``request.raw_body`` and the body is never decoded to a str.
 
     This function is only called from the request hot path *after*
     _ensure_pydantic() has already been called at registration time,
@@ -157,8 +165,18 @@ def get_pydantic_openapi_schema(model_class) -> Tuple[dict, dict]:
     return full_schema, component_schemas
 
 
-def serialize_pydantic_response(res) -> Optional[str]:
-    """Serialize a Pydantic model (or list of models) to a JSON string.
+def dump_pydantic_json(annotation, value) -> bytes:
+    """Serialize *value* as *annotation* to JSON bytes, like ``model_dump_json``
+    but without decoding the result to a str, which the response body would
+    only encode back."""
+    adapter = _json_adapters.get(annotation)
+    if adapter is None:
+        adapter = _json_adapters[annotation] = _TypeAdapter(annotation)
+    return adapter.dump_json(value)
+
+
+def serialize_pydantic_response(res) -> Optional[bytes]:
+    """Serialize a Pydantic model (or list of models) to JSON bytes.
 
     Returns None when *res* is not a Pydantic type so the caller can fall
     through to other serialisation paths.
@@ -170,9 +188,12 @@ def serialize_pydantic_response(res) -> Optional[str]:
     if _BaseModel is None:
         return None
     if isinstance(res, _BaseModel):
-        return res.model_dump_json()
+        return dump_pydantic_json(type(res), res)
     if isinstance(res, list) and res and isinstance(res[0], _BaseModel):
-        return orjson.dumps([item.model_dump(mode="python") for item in res]).decode("utf-8")
+        model = type(res[0])
+        if all(type(item) is model for item in res):
+            return dump_pydantic_json(list[model], res)
+        return orjson.dumps([item.model_dump(mode="python") for item in res])
     return None
 
 
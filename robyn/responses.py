@@ -5,7 +5,7 @@ import threading
 import weakref
 from typing import AsyncGenerator, Generator, Optional, Union
 
-from robyn.robyn import Headers, Response
+from robyn.robyn import Headers, Response, SSESubscription
 
 
 class FileResponse:
@@ -55,7 +55,8 @@ def serve_file(file_path: str, file_name: str | None = None) -> FileResponse:
 
     mime_type = mimetypes.guess_type(file_name)[0]
 
-    headers = Headers({"Content-Type": mime_type})
+    # Without a guess, the server derives the Content-Type from the file itself.
+    headers = Headers({"Content-Type": mime_type} if mime_type else {})
     headers.append("Content-Disposition", f"attachment; filename={file_name}")
 
     return FileResponse(
@@ -67,6 +68,9 @@ def serve_file(file_path: str, file_name: str | None = None) -> FileResponse:
 class AsyncGeneratorWrapper:
     """Drive an async generator through Robyn's synchronous streaming protocol.
 
+    ``StreamingResponse`` only uses it outside a running event loop, i.e. in
+    sync handlers. In async handlers the server awaits the generator directly.
+
     The generator is driven on the event loop that was running when the
     ``StreamingResponse`` was constructed — i.e. the handler's loop. That keeps
     any async resources created in the handler (DB sessions, HTTP clients) on
@@ -156,12 +160,20 @@ class StreamingResponse:
         status_code: int | None = None,
         headers: Headers | None = None,
         media_type: str = "text/event-stream",
+        coalesce: bool = False,
     ):
-        # Convert async generator to sync generator if needed
-        # The Rust implementation detects async generators but falls back to Python wrapper
+        """
+        :param content: generator or async generator yielding str or bytes chunks
+        :param coalesce: send the items an async generator has ready at once as a single chunk
+        """
         if hasattr(content, "__anext__"):
-            # This is an async generator - wrap it with optimized wrapper
-            self.content = AsyncGeneratorWrapper(content)
+            try:
+                # In an async handler the server awaits the generator on the handler's loop
+                asyncio.get_running_loop()
+                self.content = content
+            except RuntimeError:
+                # In a sync handler there is no loop to await it on
+                self.content = AsyncGeneratorWrapper(content)
         else:
             # This is a sync generator - use as is
             self.content = content
@@ -169,6 +181,7 @@ class StreamingResponse:
         self.status_code = status_code or 200
         self.headers = headers or Headers({})
         self.media_type = media_type
+        self.coalesce = coalesce
 
         # Set default SSE headers
         if media_type == "text/event-stream":
@@ -177,19 +190,21 @@ class StreamingResponse:
 
 
 def SSEResponse(
-    content: Generator[str | bytes, None, None] | AsyncGenerator[str | bytes, None],
+    content: Generator[str | bytes, None, None] | AsyncGenerator[str | bytes, None] | SSESubscription,
     status_code: int | None = None,
     headers: Headers | None = None,
+    coalesce: bool = False,
 ) -> StreamingResponse:
     """
     Create a Server-Sent Events (SSE) streaming response.
 
-    :param content: Generator or AsyncGenerator yielding SSE-formatted strings
+    :param content: Generator or AsyncGenerator yielding SSE-formatted strings, or an SSEHub subscription
     :param status_code: HTTP status code (default: 200)
     :param headers: Additional headers
+    :param coalesce: send the messages an async generator has ready at once as a single chunk
     :return: StreamingResponse configured for SSE
     """
-    return StreamingResponse(content=content, status_code=status_code, headers=headers, media_type="text/event-stream")
+    return StreamingResponse(content=content, status_code=status_code, headers=headers, media_type="text/event-stream", coalesce=coalesce)
 
 
 def SSEMessage(data: str, event: str | None = None, id: str | None = None, retry: int | None = None) -> str:
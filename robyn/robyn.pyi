@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Callable, overload
 
@@ -62,6 +62,8 @@ class FunctionInfo:
         number_of_params (int): The number of parameters the function has
         args (dict): The arguments of the function
         kwargs (dict): The keyword arguments of the function
+        typed_params (list[TypedParam]): The path/query params coerced before the function is called
+        encoder (Callable[[Any], bytes] | None): Encodes the values the function returns to JSON, compiled from the route's response_model
     """
 
     handler: Callable
@@ -69,6 +71,211 @@ class FunctionInfo:
     number_of_params: int
     args: dict
     kwargs: dict
+    typed_params: list[TypedParam] = field(default_factory=list)
+    encoder: Callable[[Any], bytes] | None = None
+
+class TypedParam:
+    """
+    A path or query parameter that is coerced to its annotated type in Rust before
+    the handler is called. Invalid or missing values are answered with a 400.
+
+    Attributes:
+        name (str): The name of the handler parameter
+        kind (str): The scalar type: "str", "int", "float" or "bool"
+        from_path (bool): Whether the parameter is looked up in the path params first
+        is_list (bool): Whether every value of a repeated query param is collected
+        is_optional (bool): Whether a missing value becomes None
+    """
+
+    name: str
+    kind: str
+    from_path: bool
+    is_list: bool
+    is_optional: bool
+
+    def __init__(
+        self,
+        name: str,
+        kind: str,
+        from_path: bool,
+        is_list: bool = False,
+        is_optional: bool = False,
+        default: Any = None,
+        has_default: bool = False,
+    ) -> None:
+        pass
+
+class CachePolicy:
+    """
+    Caching rules for a GET route, e.g. @app.get("/items/:id", cache=CachePolicy(ttl=30)).
+    Cached responses are served by the server without calling the handler.
+
+    Attributes:
+        ttl (float): How long a response is served from the cache, in seconds
+        vary (list[str]): Request headers whose values are part of the cache key
+        max_entries (int): How many responses are kept before the least recently used is evicted
+        query_params (list[str] | None): The query params that are part of the cache key, all of them when None
+    """
+
+    ttl: float
+    vary: list[str]
+    max_entries: int
+    query_params: list[str] | None
+
+    def __init__(
+        self,
+        ttl: float,
+        vary: list[str] = [],
+        max_entries: int = 10000,
+        query_params: list[str] | None = None,
+    ) -> None:
+        pass
+    def stats(self) -> dict[str, int]:
+        """
+        The number of cache hits, misses, evictions and cached responses in this process.
+        """
+        pass
+    def clear(self) -> None:
+        """
+        Drop every cached response.
+        """
+        pass
+
+class SyncExecutor:
+    """
+    Thread pool settings for sync handlers, created by app.configure_sync_executor().
+
+    Attributes:
+        max_threads (int): The most threads running sync handlers at once, per process
+        idle_timeout (int): The seconds an extra thread waits for work before it exits
+        queue_depth (int): The most handlers waiting for a thread before requests get a 503
+    """
+
+    max_threads: int
+    idle_timeout: int
+    queue_depth: int
+
+    def __init__(self, max_threads: int = 32, idle_timeout: int = 30, queue_depth: int = 1024) -> None:
+        pass
+
+class WebSocketLimits:
+    """
+    Message queue limits for WebSocket connections, created by app.configure_websocket_limits().
+
+    Attributes:
+        inbound_queue (int): The most received messages waiting for the handler, per connection
+        outbound_queue (int): The most messages waiting to be written to a client, per connection
+        inbound_policy (str): What happens when the inbound queue is full: "block", "drop" or "close" (with 1008)
+        outbound_policy (str): What happens when the outbound queue is full: "drop" or "close" (with 1013)
+    """
+
+    inbound_queue: int
+    outbound_queue: int
+    inbound_policy: str
+    outbound_policy: str
+
+    def __init__(
+        self,
+        inbound_queue: int = 1024,
+        outbound_queue: int = 1024,
+        inbound_policy: str = "block",
+        outbound_policy: str = "close",
+    ) -> None:
+        pass
+    def stats(self) -> dict[str, int]:
+        """
+        The number of messages dropped from full inbound and outbound queues, and of connections closed because of one, in this process.
+        """
+        pass
+
+class Compression:
+    """
+    Response compression settings, created by app.configure_compression().
+
+    Attributes:
+        algorithms (list[str]): The encodings offered, in order of preference: "br", "zstd" and/or "gzip"
+        level (int | None): The compression level, clamped to each algorithm's range
+        min_size (int): The smallest body, in bytes, that is compressed
+        content_types (list[str]): The content types that are compressed; "text/*" matches every subtype
+    """
+
+    algorithms: list[str]
+    level: int | None
+    min_size: int
+    content_types: list[str]
+
+    def __init__(
+        self,
+        algorithms: list[str] | None = None,
+        level: int | None = None,
+        min_size: int = 1024,
+        content_types: list[str] | None = None,
+    ) -> None:
+        pass
+
+class SSESubscription:
+    """
+    A client's subscription to a topic of an SSEHub. Return it in an SSEResponse to stream its events.
+    """
+
+class SSEHub:
+    """
+    Server-sent events published once and delivered to every subscriber of a topic, in this process.
+
+    Attributes:
+        buffer_size (int): The most events buffered for a subscriber that reads slower than they are published
+        replay_size (int): The most recent events of each topic kept for clients reconnecting with a Last-Event-ID
+        slow_consumer (str): What happens when a subscriber's buffer is full: "drop_oldest" or "disconnect"
+        keep_alive (float): The seconds an idle stream waits before a keep-alive comment is sent
+        replay_ttl (float): The seconds a published event is kept for replay
+    """
+
+    buffer_size: int
+    replay_size: int
+    slow_consumer: str
+    keep_alive: float
+    replay_ttl: float
+
+    def __init__(
+        self,
+        buffer_size: int = 256,
+        replay_size: int = 1024,
+        slow_consumer: str = "drop_oldest",
+        keep_alive: float = 15.0,
+        replay_ttl: float = 300.0,
+    ) -> None:
+        pass
+    def publish(
+        self,
+        topic: str,
+        data: str | bytes,
+        event: str | None = None,
+        id: str | None = None,
+        retry: int | None = None,
+    ) -> int:
+        """
+        Publish an event to every subscriber of the topic. Events without an id are numbered per topic.
+        Raises ValueError if event or id contain a line break.
+
+        Returns:
+            int: The number of subscribers the event was queued for
+        """
+        pass
+    def subscribe(self, topic: str, last_event_id: str | None = None) -> SSESubscription:
+        """
+        Subscribe to the topic, first replaying the retained events published after last_event_id.
+        """
+        pass
+    def subscriber_count(self, topic: str) -> int:
+        """
+        The number of clients connected to the topic.
+        """
+        pass
+    def __len__(self) -> int:
+        """
+        The number of topics with subscribers or events to replay.
+        """
+        pass
 
 @dataclass
 class Url:
@@ -438,6 +645,56 @@ class Headers:
         """
         pass
 
+class BodyStream:
+    """
+    The request body of a route registered with stream_body=True, read from the
+    socket while the handler consumes it.
+
+    Usage:
+        async for chunk in request.body_stream:
+            ...
+    """
+
+    def __aiter__(self) -> BodyStream:
+        pass
+    async def __anext__(self) -> bytes:
+        pass
+    async def read(self) -> bytes:
+        """
+        Read the remaining chunks of the body into a single bytes object.
+        """
+        pass
+
+class UploadFile:
+    """
+    An uploaded multipart file larger than ROBYN_UPLOAD_SPOOL_THRESHOLD, spooled to a
+    temporary file instead of being kept in memory. The temporary file is removed once
+    the object is garbage collected.
+
+    Attributes:
+        filename (str): The file name sent by the client
+        content_type (str | None): The content type of the part, if sent
+        size (int): The size of the file in bytes
+        path (str): The path of the temporary file
+    """
+
+    filename: str
+    content_type: str | None
+    size: int
+    path: str
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Read up to size bytes from the current position, or everything left if size is negative.
+        """
+        pass
+    def seek(self, offset: int, whence: int = 0) -> int:
+        pass
+    def tell(self) -> int:
+        pass
+    def __len__(self) -> int:
+        pass
+
 @dataclass
 class Request:
     """
@@ -448,27 +705,34 @@ class Request:
         headers Headers: The headers of the request. e.g. Headers({"Content-Type": "application/json"})
         path_params (dict[str, str]): The parameters of the request. e.g. /user/:id -> {"id": "123"}
         body (str | bytes): The body of the request. If the request is a JSON, it will be a dict.
+            Empty for multipart requests, whose fields are available in form_data and files.
+        raw_body (bytes): The body of the request as bytes, without decoding it to a str.
         method (str): The method of the request. e.g. GET, POST, PUT etc.
         url (Url): The url of the request. e.g. https://localhost/user
         form_data (dict[str, str]): The form data of the request. e.g. {"name": "John"}
-        files (dict[str, bytes]): The files of the request. e.g. {"file": b"file"}
+        files (dict[str, bytes | UploadFile]): The files of the request. e.g. {"file": b"file"}.
+            Files larger than ROBYN_UPLOAD_SPOOL_THRESHOLD are spooled to disk and given as UploadFile.
         ip_addr (str | None): The IP Address of the client
         identity (Identity | None): The identity of the client
         session (Any | None): The session for the request (a robyn.session.Session),
             populated when app.configure_sessions(...) is enabled.
+        body_stream (BodyStream | None): The streamed request body for routes registered with
+            stream_body=True. body is left empty for these routes.
     """
 
     query_params: QueryParams
     headers: Headers
     path_params: dict[str, str]
     body: str | bytes
+    raw_body: bytes
     method: str
     url: Url
     form_data: dict[str, str]
-    files: dict[str, bytes]
+    files: dict[str, bytes | UploadFile]
     ip_addr: str | None
     identity: Identity | None
     session: Any | None
+    body_stream: BodyStream | None
 
     def json(self) -> dict | list:
         """
@@ -482,7 +746,10 @@ class Request:
         - array -> list
         - object -> dict
 
-        Nested structures are handled recursively up to a maximum depth of 128.
+        The body is parsed with orjson, straight from the request bytes, up to a
+        nesting depth of 1024. The result is cached: later calls, including the
+        ones binding ``JsonBody`` and ``TypedDict`` parameters, return the same
+        object until the body is replaced.
 
         Raises:
             ValueError: If the body is not valid JSON.
@@ -500,7 +767,7 @@ class Response:
         headers (Headers): The response headers. The constructor accepts Headers, dict, or None.
         description (str | bytes): Legacy supported name for the response body. Prefer body for new code.
         body (str | bytes): Preferred name for the response body in the constructor.
-        file_path (str | None): The file path of the response. e.g. /home/user/file.txt
+        file_path (str | None): The file path of the response. e.g. /home/user/file.txt. The file is streamed from disk when the response is sent.
         cookies (Cookies): The cookies to set in the response.
     """
 
@@ -574,16 +841,29 @@ class Server:
         pass
     def set_response_headers_exclude_paths(self, excluded_response_headers_paths: list[str] | None = None):
         pass
-
+    def set_compression(self, compression: Compression) -> None:
+        pass
+    def set_sync_executor(self, sync_executor: SyncExecutor) -> None:
+        pass
+    def set_websocket_limits(self, limits: WebSocketLimits) -> None:
+        pass
     def add_route(
         self,
         route_type: HttpMethod,
         route: str,
         function: FunctionInfo,
         is_const: bool,
+        stream_body: bool = False,
+        cache: CachePolicy | None = None,
     ) -> None:
         pass
-    def add_global_middleware(self, middleware_type: MiddlewareType, function: FunctionInfo) -> None:
+    def add_global_middleware(
+        self,
+        middleware_type: MiddlewareType,
+        function: FunctionInfo,
+        skip_const_routes: bool = False,
+        excluded_routes: list[str] = [],
+    ) -> None:
         pass
     def add_middleware_route(
         self,
@@ -606,7 +886,7 @@ class Server:
         use_channel: bool,
     ) -> None:
         pass
-    def start(self, socket: SocketHeld, workers: int, client_timeout: int, keep_alive_timeout: int) -> None:
+    def start(self, socket: SocketHeld, workers: int, event_loops: int = 1) -> None:
         pass
 
 class WebSocketConnector:
@@ -694,6 +974,45 @@ class WebSocketConnector:
             data (bytes): The binary payload to broadcast
         """
         pass
+    def join_room(self, room: str) -> None:
+        """
+        Adds the client to a room of its endpoint.
+
+        Args:
+            room (str): The name of the room
+        """
+        pass
+    def leave_room(self, room: str) -> None:
+        """
+        Removes the client from a room of its endpoint.
+
+        Args:
+            room (str): The name of the room
+        """
+        pass
+    async def async_send_to_room(self, room: str, message: str | bytes, exclude_self: bool = False) -> int:
+        """
+        Sends a message to every client in a room, as a text frame for str and a binary frame for bytes.
+
+        Args:
+            room (str): The name of the room
+            message (str | bytes): The message to send
+            exclude_self (bool): Whether to skip this client
+
+        Returns:
+            int: The number of clients the message was queued for
+        """
+        pass
+    def sync_send_to_room(self, room: str, message: str | bytes, exclude_self: bool = False) -> None:
+        """
+        Sends a message to every client in a room, as a text frame for str and a binary frame for bytes.
+
+        Args:
+            room (str): The name of the room
+            message (str | bytes): The message to send
+            exclude_self (bool): Whether to skip this client
+        """
+        pass
     def close(self) -> None:
         """
         Closes the connection.
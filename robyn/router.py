@@ -2,25 +2,28 @@ import inspect
 import logging
 from collections.abc import Callable, Mapping
 from functools import wraps
+from operator import attrgetter
 from types import CoroutineType
-from typing import NamedTuple, is_typeddict
+from typing import Any, NamedTuple, is_typeddict
 
 from robyn import status_codes
-from robyn._param_utils import QueryParamValidationError, parse_route_param_names, resolve_individual_params
+from robyn._param_utils import QueryParamValidationError, parse_route_param_names, resolve_individual_params, typed_param_spec
 from robyn.authentication import AuthenticationHandler, AuthenticationNotConfiguredError
 from robyn.dependency_injection import DependencyMap
+from robyn.encoders import compile_response_encoder
 from robyn.jsonify import jsonify
 from robyn.openapi import OpenAPI, RouteOpenAPIMeta
 from robyn.pydantic_support import (
     PydanticBodyValidationError,
     check_pydantic_installed_for_handler,
     detect_pydantic_params,
+    dump_pydantic_json,
     is_pydantic_model,
     serialize_pydantic_response,
     validate_pydantic_body,
 )
 from robyn.responses import FileResponse, StreamingResponse
-from robyn.robyn import FunctionInfo, Headers, HttpMethod, Identity, MiddlewareType, QueryParams, Request, Response, Url
+from robyn.robyn import CachePolicy, FunctionInfo, Headers, HttpMethod, Identity, MiddlewareType, QueryParams, Request, Response, Url
 from robyn.types import Body, Files, FormData, IPAddress, JsonBody, Method, PathParams
 
 _logger = logging.getLogger(__name__)
@@ -34,9 +37,131 @@ _logger = logging.getLogger(__name__)
 # never receive the Response and can't mutate it either.
 _JSON_HEADERS = Headers({"Content-Type": "application/json"})
 _TEXT_HEADERS = Headers({"Content-Type": "text/plain"})
+# Returns a route's response encoder leaves to the usual formatting
+_FORMATTED_RETURN_TYPES = (Response, StreamingResponse, FileResponse, str, bytes, tuple)
 _REQUEST_PARAM_NAMES = {"r", "req", "request"}
 _PATH_PARAMS_PARAM_NAMES = {"path_params"}
 _PATH_PARAM_ACCESS_TYPES = (Request, PathParams)
+# Request attributes a handler can receive by parameter name. The Rust side
+# only converts an attribute when it is first read, so a handler only pays
+# for the attributes its signature asks for.
+_REQUEST_ATTRIBUTE_NAMES = (
+    "query_params",
+    "headers",
+    "path_params",
+    "body",
+    "method",
+    "url",
+    "ip_addr",
+    "identity",
+    "form_data",
+    "files",
+)
+# Annotations that bind a request attribute regardless of the parameter name.
+_REQUEST_ATTRIBUTE_TYPES = {
+    QueryParams: "query_params",
+    Headers: "headers",
+    PathParams: "path_params",
+    Body: "body",
+    Method: "method",
+    Url: "url",
+    FormData: "form_data",
+    Files: "files",
+    IPAddress: "ip_addr",
+    Identity: "identity",
+}
+_DEPENDENCY_PARAM_NAMES = ("router_dependencies", "global_dependencies")
+
+
+class _InvalidJsonBodyError(ValueError):
+    """Raised while binding a JSON body parameter when the body is not valid JSON."""
+
+
+def _request_itself(request: Request) -> Request:
+    return request
+
+
+def _json_body(request: Request):
+    try:
+        return request.json()
+    except ValueError as e:
+        raise _InvalidJsonBodyError(f"Invalid JSON body: {e}") from e
+
+
+def _pydantic_body(model_class):
+    def extract(request: Request):
+        validated, error = validate_pydantic_body(model_class, request.raw_body)
+        if error is not None:
+            raise PydanticBodyValidationError(error)
+        return validated
+
+    return extract
+
+
+def _typed_extractor(annotation) -> Callable[[Request], Any] | None:
+    """Return the extractor for a parameter bound by its type annotation, if any."""
+    if annotation is Request:
+        return _request_itself
+    for attribute_type, name in _REQUEST_ATTRIBUTE_TYPES.items():
+        if annotation is attribute_type:
+            return attrgetter(name)
+    if inspect.isclass(annotation):
+        if issubclass(annotation, JsonBody):
+            return _json_body
+        if issubclass(annotation, Body):
+            return attrgetter("body")
+        if issubclass(annotation, QueryParams):
+            return attrgetter("query_params")
+        if is_typeddict(annotation):
+            return _json_body
+    return None
+
+
+def compile_param_binders(
+    handler_params: Mapping[str, inspect.Parameter],
+    pydantic_params: Mapping[str, type],
+    injected_dependencies: dict,
+) -> tuple[list[tuple[str, Callable[[Request], Any]]], dict[str, inspect.Parameter]]:
+    """
+    Work out once, at registration, how each handler parameter gets its value.
+
+    Parameters are bound, in order of precedence, by type annotation, as a
+    Pydantic body model, by reserved name (``request``, ``headers``, ...) and
+    finally as an individual path/query parameter.
+
+    Returns:
+        ``(binders, individual_params)``: ``(name, extractor)`` pairs for the
+        parameters taken from the request or the injected dependencies, and the
+        parameters left to ``resolve_individual_params``.
+    """
+    binders = []
+    bound = set()
+
+    def bind(name: str, extractor: Callable[[Request], Any]) -> None:
+        binders.append((name, extractor))
+        bound.add(name)
+
+    for name, param in handler_params.items():
+        extractor = _typed_extractor(param.annotation)
+        if extractor is not None:
+            bind(name, extractor)
+
+    for name, model_class in pydantic_params.items():
+        if name not in bound:
+            bind(name, _pydantic_body(model_class))
+
+    for name in handler_params:
+        if name in bound:
+            continue
+        if name in _REQUEST_PARAM_NAMES:
+            bind(name, _request_itself)
+        elif name in _REQUEST_ATTRIBUTE_NAMES:
+            bind(name, attrgetter(name))
+        elif name in _DEPENDENCY_PARAM_NAMES:
+            bind(name, lambda _request, name=name: injected_dependencies[name])
+
+    individual_params = {name: param for name, param in handler_params.items() if name not in bound}
+    return binders, individual_params
 
 
 def lower_http_method(method: HttpMethod):
@@ -52,6 +177,8 @@ class Route(NamedTuple):
     openapi_name: str
     openapi_tags: list[str]
     openapi_metadata: RouteOpenAPIMeta = RouteOpenAPIMeta()
+    stream_body: bool = False
+    cache: CachePolicy | None = None
 
 
 class RouteMiddleware(NamedTuple):
@@ -64,6 +191,8 @@ class RouteMiddleware(NamedTuple):
 class GlobalMiddleware(NamedTuple):
     middleware_type: MiddlewareType
     function: FunctionInfo
+    skip_const_routes: bool = False
+    exclude: tuple[str, ...] = ()
 
 
 class BaseRouter:
@@ -134,8 +263,9 @@ class Router(BaseRouter):
             response: Response = Response(
                 status_code=res.status_code,
                 headers=res.headers,
-                description=res.file_path,
+                description="",
             )
+            # Only the path is recorded; the file is streamed from disk when sent.
             response.file_path = res.file_path
             return response
 
@@ -166,10 +296,21 @@ class Router(BaseRouter):
             return Response(
                 status_code=default_status_code or status_codes.HTTP_200_OK,
                 headers=_JSON_HEADERS,
-                description=validated.model_dump_json(),
+                description=dump_pydantic_json(response_model, validated),
             )
         return result
 
+    def _encode_response(self, result, encoder, default_status_code):
+        """Hand a return value to the route's compiled response encoder.
+
+        With the default status code the value is returned as is and the Rust
+        executor calls the encoder; a route ``status_code`` needs a ``Response``
+        built around the encoded bytes here.
+        """
+        if default_status_code is None:
+            return result
+        return Response(status_code=default_status_code, headers=_JSON_HEADERS, description=encoder(result))
+
     def _coerce_status_code(self, formatted, default_status_code):
         """Apply the route's default ``status_code`` to a non-Response return.
 
@@ -197,13 +338,28 @@ class Router(BaseRouter):
         exception_handler: Callable | None,
         injected_dependencies: dict,
         openapi_metadata: RouteOpenAPIMeta | None = None,
+        stream_body: bool = False,
+        cache: CachePolicy | None = None,
     ) -> Callable | CoroutineType:
+        # A streamed body is pumped from the socket while the handler awaits
+        # chunks, which a sync handler blocking the worker would never see.
+        if stream_body and not inspect.iscoroutinefunction(handler):
+            raise ValueError(f"Handler '{handler.__name__}' for {endpoint} must be async to use stream_body=True")
+        if stream_body and is_const:
+            raise ValueError(f"Route {endpoint} cannot be both const and stream_body=True")
+        if cache is not None and is_const:
+            raise ValueError(f"Route {endpoint} cannot be both const and cached")
+        if cache is not None and lower_http_method(route_type) not in ("get", "head"):
+            raise ValueError(f"Only GET and HEAD routes can be cached, got {route_type} {endpoint}")
+
         # Pre-compute handler signature ONCE at registration time.
         # This avoids calling inspect.signature() on every request.
         if openapi_metadata is None:
             openapi_metadata = RouteOpenAPIMeta()
         default_status_code = openapi_metadata.status_code
         response_model = openapi_metadata.response_model
+        # Chosen once here; the executor calls it on every value the handler returns
+        response_encoder = compile_response_encoder(response_model)
 
         route_param_names = parse_route_param_names(endpoint)
         handler_params = inspect.signature(handler).parameters
@@ -232,114 +388,35 @@ class Router(BaseRouter):
                 route_type,
             )
 
-        def wrapped_handler(*args, **kwargs):
-            request = next(filter(lambda it: isinstance(it, Request), args), None)
+        # Bind parameters once here so a request is a straight walk over the
+        # extractors instead of re-inspecting the signature.
+        param_binders, individual_params = compile_param_binders(handler_params, pydantic_params, injected_dependencies)
+        # Individual params the Rust executor coerces and passes in as keyword arguments.
+        typed_params = [spec for spec in (typed_param_spec(param, route_param_names) for param in individual_params.values()) if spec is not None]
 
-            if not request or (len(handler_params) == 1 and next(iter(handler_params)) is Request):
+        def wrapped_handler(*args, **kwargs):
+            request = next((arg for arg in args if isinstance(arg, Request)), None)
+            if request is None:
                 return handler(*args, **kwargs)
 
-            type_mapping = {
-                "request": Request,
-                "query_params": QueryParams,
-                "headers": Headers,
-                "path_params": PathParams,
-                "body": Body,
-                "method": Method,
-                "url": Url,
-                "form_data": FormData,
-                "files": Files,
-                "ip_addr": IPAddress,
-                "identity": Identity,
-            }
-
-            # Phase 1: Type-annotated request components
-            type_filtered_params = {}
-
-            for handler_param in iter(handler_params):
-                for type_name in type_mapping:
-                    handler_param_type = handler_params[handler_param].annotation
-                    handler_param_name = handler_params[handler_param].name
-                    if handler_param_type is Request:
-                        type_filtered_params[handler_param_name] = request
-                    elif handler_param_type is type_mapping[type_name]:
-                        type_filtered_params[handler_param_name] = getattr(request, type_name)
-                    elif inspect.isclass(handler_param_type):
-                        if issubclass(handler_param_type, JsonBody):
-                            try:
-                                type_filtered_params[handler_param_name] = request.json()
-                            except ValueError as e:
-                                return Response(
-                                    status_code=status_codes.HTTP_400_BAD_REQUEST,
-                                    headers=_JSON_HEADERS,
-                                    description=jsonify({"error": f"Invalid JSON body: {e}"}),
-                                )
-                        elif issubclass(handler_param_type, Body):
-                            type_filtered_params[handler_param_name] = request.body
-                        elif issubclass(handler_param_type, QueryParams):
-                            type_filtered_params[handler_param_name] = request.query_params
-                        elif is_typeddict(handler_param_type):
-                            try:
-                                type_filtered_params[handler_param_name] = request.json()
-                            except ValueError as e:
-                                return Response(
-                                    status_code=status_codes.HTTP_400_BAD_REQUEST,
-                                    headers=_JSON_HEADERS,
-                                    description=jsonify({"error": f"Invalid JSON body: {e}"}),
-                                )
-
-            # Phase 1.5: Pydantic model body params (only runs if handler uses pydantic)
-            if pydantic_params:
-                for param_name, model_class in pydantic_params.items():
-                    if param_name in type_filtered_params:
-                        continue
-                    validated, error = validate_pydantic_body(model_class, request.body)
-                    if error is not None:
-                        raise PydanticBodyValidationError(error)
-                    type_filtered_params[param_name] = validated
-
-            # Phase 2: Reserved-name request components
-            request_components = {
-                "r": request,
-                "req": request,
-                "request": request,
-                "query_params": request.query_params,
-                "headers": request.headers,
-                "path_params": request.path_params,
-                "body": request.body,
-                "method": request.method,
-                "url": request.url,
-                "ip_addr": request.ip_addr,
-                "identity": request.identity,
-                "form_data": request.form_data,
-                "files": request.files,
-                "router_dependencies": injected_dependencies["router_dependencies"],
-                "global_dependencies": injected_dependencies["global_dependencies"],
-                **kwargs,
-            }
-
-            name_filtered_params = {k: v for k, v in request_components.items() if k in handler_params and k not in type_filtered_params}
-
-            filtered_params = dict(**type_filtered_params, **name_filtered_params)
-
-            # Phase 3: Individual path/query param resolution
-            unresolved_names = set(handler_params) - set(filtered_params)
-            if unresolved_names:
-                unresolved = {name: handler_params[name] for name in unresolved_names}
-                individual_params = resolve_individual_params(
-                    unresolved,
-                    request.query_params,
-                    request.path_params,
-                    route_param_names,
-                )
-                filtered_params.update(individual_params)
+            params = {name: extract(request) for name, extract in param_binders}
+            if kwargs:
+                # Injected dependencies and typed params resolved by the executor.
+                params.update(kwargs)
+            if individual_params:
+                unresolved = {name: param for name, param in individual_params.items() if name not in params}
+                if unresolved:
+                    params.update(resolve_individual_params(unresolved, request.query_params, request.path_params, route_param_names))
 
-            return handler(**filtered_params)
+            return handler(**params)
 
         @wraps(handler)
         async def async_inner_handler(*args, **kwargs):
             try:
                 result = await wrapped_handler(*args, **kwargs)
-                if response_model is not None or default_status_code is not None:
+                if response_encoder is not None and not isinstance(result, _FORMATTED_RETURN_TYPES):
+                    response = self._encode_response(result, response_encoder, default_status_code)
+                elif response_model is not None or default_status_code is not None:
                     result = self._apply_response_model(result, response_model, default_status_code)
                     response = self._coerce_status_code(self._format_response(result), default_status_code)
                 else:
@@ -350,6 +427,12 @@ class Router(BaseRouter):
                     headers=_TEXT_HEADERS,
                     description=str(err),
                 )
+            except _InvalidJsonBodyError as err:
+                response = Response(
+                    status_code=status_codes.HTTP_400_BAD_REQUEST,
+                    headers=_JSON_HEADERS,
+                    description=jsonify({"error": str(err)}),
+                )
             except PydanticBodyValidationError as err:
                 response = Response(
                     status_code=status_codes.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -368,7 +451,9 @@ class Router(BaseRouter):
         def inner_handler(*args, **kwargs):
             try:
                 result = wrapped_handler(*args, **kwargs)
-                if response_model is not None or default_status_code is not None:
+                if response_encoder is not None and not isinstance(result, _FORMATTED_RETURN_TYPES):
+                    response = self._encode_response(result, response_encoder, default_status_code)
+                elif response_model is not None or default_status_code is not None:
                     result = self._apply_response_model(result, response_model, default_status_code)
                     response = self._coerce_status_code(self._format_response(result), default_status_code)
                 else:
@@ -379,6 +464,12 @@ class Router(BaseRouter):
                     headers=_TEXT_HEADERS,
                     description=str(err),
                 )
+            except _InvalidJsonBodyError as err:
+                response = Response(
+                    status_code=status_codes.HTTP_400_BAD_REQUEST,
+                    headers=_JSON_HEADERS,
+                    description=jsonify({"error": str(err)}),
+                )
             except PydanticBodyValidationError as err:
                 response = Response(
                     status_code=status_codes.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -409,8 +500,10 @@ class Router(BaseRouter):
                 len(params),
                 params,
                 new_injected_dependencies,
+                typed_params,
+                response_encoder,
             )
-            self.routes.append(Route(route_type, endpoint, function, is_const, auth_required, openapi_name, openapi_tags, openapi_metadata))
+            self.routes.append(Route(route_type, endpoint, function, is_const, auth_required, openapi_name, openapi_tags, openapi_metadata, stream_body, cache))
             return async_inner_handler
         else:
             function = FunctionInfo(
@@ -419,8 +512,10 @@ class Router(BaseRouter):
                 len(params),
                 params,
                 new_injected_dependencies,
+                typed_params,
+                response_encoder,
             )
-            self.routes.append(Route(route_type, endpoint, function, is_const, auth_required, openapi_name, openapi_tags, openapi_metadata))
+            self.routes.append(Route(route_type, endpoint, function, is_const, auth_required, openapi_name, openapi_tags, openapi_metadata, stream_body, cache))
             return inner_handler
 
     def prepare_routes_openapi(self, openapi: OpenAPI, included_routers: list) -> None:
@@ -552,7 +647,13 @@ class MiddlewareRouter(BaseRouter):
     # These inner functions are basically a wrapper around the closure(decorator) being returned.
     # They take a handler, convert it into a closure and return the arguments.
     # Arguments are returned as they could be modified by the middlewares.
-    def add_middleware(self, middleware_type: MiddlewareType, endpoint: str | None) -> Callable[..., None]:
+    def add_middleware(
+        self,
+        middleware_type: MiddlewareType,
+        endpoint: str | None,
+        exclude: list[str] | None = None,
+        skip_const_routes: bool = False,
+    ) -> Callable[..., None]:
         """
         This method adds a middleware to the router.
 
@@ -565,10 +666,17 @@ class MiddlewareRouter(BaseRouter):
         Args:
             middleware_type: The type of middleware to add (before_request, after_request).
             endpoint: The endpoint to add the middleware to. If None, the middleware is added as a global middleware.
+            exclude: Route patterns a global middleware does not run for, e.g. "/health" or "/static/*path".
+            skip_const_routes: Whether a global middleware skips const routes, which then keep being served
+                without entering Python.
 
         Returns:
             A decorator that takes a handler and adds it as a middleware.
         """
+        if endpoint is not None and (exclude or skip_const_routes):
+            raise ValueError("exclude and skip_const_routes only apply to global middlewares")
+        excluded_routes = tuple(exclude) if exclude else ()
+
         # no dependency injection here
         injected_dependencies: dict = {}
 
@@ -613,6 +721,8 @@ class MiddlewareRouter(BaseRouter):
                                 params,
                                 injected_dependencies,
                             ),
+                            skip_const_routes,
+                            excluded_routes,
                         )
                     )
                 else:
@@ -626,6 +736,8 @@ class MiddlewareRouter(BaseRouter):
                                 params,
                                 injected_dependencies,
                             ),
+                            skip_const_routes,
+                            excluded_routes,
                         )
                     )
 
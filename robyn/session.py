@@ -23,6 +23,11 @@ The cookie is (re)written automatically after the handler runs, but only when
 the session was actually modified. The :class:`Session` is shared by reference
 across the request phases through ``request.session``, so this works on every
 supported Python version with no ``contextvars`` dependency.
+
+To keep the data on the server instead, pass a :class:`~robyn.session_stores.SessionStore`:
+the cookie then only carries a signed, opaque session id::
+
+    app.configure_sessions(secret_key="change-me", store=MemorySessionStore())
 """
 
 import base64
@@ -31,10 +36,15 @@ import hmac
 import json
 import logging
 import math
+import secrets
 import time
 from collections.abc import MutableMapping
 from typing import Any, Optional
 
+import orjson
+
+from robyn.session_stores import SessionStore, is_valid_session_id
+
 _logger = logging.getLogger(__name__)
 
 # Largest cookie most browsers will store (4 KB) minus headroom for the cookie
@@ -47,6 +57,12 @@ __all__ = [
     "SessionManager",
 ]
 
+# Canonical JSON of session data: what a store keeps, and the snapshot changes
+# are detected against. Sorted keys, so rebuilding the same data in another
+# order isn't a change.
+_JSON_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+_EMPTY_PAYLOAD = b"{}"
+
 
 def _b64encode(raw: bytes) -> str:
     return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
@@ -99,22 +115,28 @@ class Session(MutableMapping):
     ``session["items"].append(x)``) are still caught because :meth:`is_modified`
     also compares the current contents against a snapshot taken at load time. You
     can also force a write by setting ``session.modified = True``.
+
+    A session kept in a :class:`~robyn.session_stores.SessionStore` has a
+    :attr:`session_id`, None until it is first saved.
     """
 
-    __slots__ = ("_data", "modified", "_snapshot")
+    __slots__ = ("_data", "modified", "_snapshot", "session_id")
 
-    def __init__(self, data: Optional[dict] = None) -> None:
+    def __init__(self, data: Optional[dict] = None, *, session_id: Optional[str] = None, snapshot: Optional[bytes] = None) -> None:
         self._data: dict = dict(data) if data else {}
         #: True once the session has been explicitly mutated during this request.
         self.modified: bool = False
+        #: The id of the session in its store, None for cookie sessions and new sessions.
+        self.session_id: Optional[str] = session_id
         # Canonical snapshot of the loaded data, used to detect nested mutations
-        # that bypass __setitem__/__delitem__.
-        self._snapshot: Optional[str] = self._canonical()
+        # that bypass __setitem__/__delitem__. A session loaded from a store is
+        # given the payload it was read from instead of serializing it again.
+        self._snapshot: Optional[bytes] = self._canonical() if snapshot is None else snapshot
 
-    def _canonical(self) -> Optional[str]:
+    def _canonical(self) -> Optional[bytes]:
         """Order-independent JSON of the data, or None if it is not serializable."""
         try:
-            return json.dumps(self._data, sort_keys=True, separators=(",", ":"))
+            return orjson.dumps(self._data, option=_JSON_OPTIONS)
         except TypeError:
             # Non-serializable content -> treat as changed so save() runs and
             # surfaces a clear error rather than silently dropping the write.
@@ -164,6 +186,10 @@ class SessionManager:
     This is the lower-level primitive behind :meth:`Robyn.configure_sessions`.
     It can also be used directly (``load(request)`` / ``save(session, response)``)
     when you want explicit control instead of the automatic middleware.
+
+    With a ``store``, the data is kept in the store and the cookie only carries
+    the signed session id; sessions are then loaded and saved with
+    ``await load_async(request)`` / ``await save_async(session, response)``.
     """
 
     def __init__(
@@ -177,10 +203,12 @@ class SessionManager:
         secure: bool = False,
         http_only: bool = True,
         same_site: str = "Lax",
+        store: Optional[SessionStore] = None,
     ) -> None:
         if not secret_key:
             raise ValueError("configure_sessions() requires a non-empty secret_key")
         self._signer = _Signer(secret_key)
+        self.store = store
         self.cookie_name = cookie_name
         self.max_age = max_age
         self.path = path
@@ -230,6 +258,7 @@ class SessionManager:
 
     def load(self, request) -> Session:
         """Build the :class:`Session` for ``request`` from its signed cookie."""
+        self._require_cookie_sessions("load")
         raw = _read_cookie(request, self.cookie_name)
         if raw is None:
             return Session()
@@ -237,20 +266,12 @@ class SessionManager:
 
     def save(self, session: Session, response) -> None:
         """Write ``session`` back onto ``response`` as a cookie, if it changed."""
+        self._require_cookie_sessions("save")
         if not session.is_modified():
             return
         if len(session) == 0:
             # Session was emptied/cleared -> expire the cookie in the browser.
-            response.set_cookie(
-                key=self.cookie_name,
-                value="",
-                path=self.path,
-                domain=self.domain,
-                max_age=0,
-                secure=self.secure,
-                http_only=self.http_only,
-                same_site=self.same_site,
-            )
+            self._expire_cookie(response)
             return
         value = self.dumps(session)
         if len(value) > _MAX_COOKIE_SIZE:
@@ -258,6 +279,60 @@ class SessionManager:
                 "Robyn session cookie is %d bytes, larger than the ~4KB most browsers store; it may be dropped. Store less data in the session.",
                 len(value),
             )
+        self._set_cookie(response, value)
+
+    async def load_async(self, request) -> Session:
+        """Build the :class:`Session` for ``request``, reading it from the store if there is one."""
+        if self.store is None:
+            return self.load(request)
+        raw = _read_cookie(request, self.cookie_name)
+        signed_id = self._signer.unsign(raw) if raw else None
+        if signed_id is None:
+            return Session(snapshot=_EMPTY_PAYLOAD)
+        session_id = signed_id.decode("ascii", "replace")
+        if not is_valid_session_id(session_id):
+            return Session(snapshot=_EMPTY_PAYLOAD)
+        payload = await self.store.get(session_id)
+        if payload is None:
+            # Expired or evicted: a new id is issued if the session is saved
+            return Session(snapshot=_EMPTY_PAYLOAD)
+        try:
+            data = orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            data = None
+        if not isinstance(data, dict):
+            return Session(snapshot=_EMPTY_PAYLOAD)
+        return Session(data, session_id=session_id, snapshot=payload)
+
+    async def save_async(self, session: Session, response) -> None:
+        """Write ``session`` back to the store and ``response``, if it changed."""
+        if self.store is None:
+            self.save(session, response)
+            return
+        # Serialized once, both to detect a change and to be written
+        try:
+            payload = orjson.dumps(session._data, option=_JSON_OPTIONS)
+        except TypeError as exc:
+            raise TypeError(f"Session data must be JSON-serializable to be stored: {exc}") from exc
+        if not session.modified and payload == session._snapshot:
+            return
+        if len(session) == 0:
+            if session.session_id is not None:
+                await self.store.delete(session.session_id)
+                session.session_id = None
+            self._expire_cookie(response)
+            return
+        if session.session_id is None:
+            session.session_id = secrets.token_urlsafe(32)
+        await self.store.set(session.session_id, payload, self.max_age)
+        # Set again on every write so that the cookie expires with the stored session
+        self._set_cookie(response, self._signer.sign(session.session_id.encode("ascii")))
+
+    def _require_cookie_sessions(self, method: str) -> None:
+        if self.store is not None:
+            raise RuntimeError(f"SessionManager.{method}() can't read or write a session store; await {method}_async() instead")
+
+    def _set_cookie(self, response, value: str) -> None:
         response.set_cookie(
             key=self.cookie_name,
             value=value,
@@ -269,6 +344,18 @@ class SessionManager:
             same_site=self.same_site,
         )
 
+    def _expire_cookie(self, response) -> None:
+        response.set_cookie(
+            key=self.cookie_name,
+            value="",
+            path=self.path,
+            domain=self.domain,
+            max_age=0,
+            secure=self.secure,
+            http_only=self.http_only,
+            same_site=self.same_site,
+        )
+
 
 def _normalize_same_site(value: Optional[str]) -> Optional[str]:
     """Normalize SameSite to the capitalization Robyn's cookie layer expects."""
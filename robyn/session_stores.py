@@ -0,0 +1,414 @@
+"""
+Server-side stores for Robyn sessions.
+
+With a store, the session cookie only carries a signed, opaque session id and
+the data stays on the server, so a session can grow past what fits in a
+cookie without inflating every request::
+
+    from robyn import RedisSessionStore
+
+    app.configure_sessions(secret_key="change-me", store=RedisSessionStore("redis://localhost:6379/0"))
+
+A session is only written back to its store when the handler changed it.
+
+- :class:`MemorySessionStore` keeps the sessions of the current process, least
+  recently used first out.
+- :class:`FileSessionStore` keeps one file per session in a directory, shared by
+  every process of a host.
+- :class:`RedisSessionStore` talks to any server speaking the Redis protocol
+  (Redis, Valkey, KeyDB, ...) over a small pool of connections.
+"""
+
+import asyncio
+import os
+import re
+import secrets
+import ssl
+import struct
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional
+from urllib.parse import unquote, urlsplit
+
+__all__ = [
+    "SessionStore",
+    "SessionStoreError",
+    "MemorySessionStore",
+    "FileSessionStore",
+    "RedisSessionStore",
+]
+
+# The ids SessionManager generates (secrets.token_urlsafe). Anything else is
+# never looked up, so an id can't escape a store's key space.
+_SESSION_ID = re.compile(r"[A-Za-z0-9_-]{16,128}")
+
+
+def is_valid_session_id(session_id: str) -> bool:
+    return _SESSION_ID.fullmatch(session_id) is not None
+
+
+class SessionStoreError(Exception):
+    """Raised when a session store can't read or write a session."""
+
+
+class SessionStore(ABC):
+    """
+    Where server-side sessions are kept, as serialized bytes keyed by session id.
+
+    Subclass it to keep sessions anywhere else. The methods are coroutines so
+    that stores can do network I/O; they are awaited by the session middleware.
+    """
+
+    @abstractmethod
+    async def get(self, session_id: str) -> Optional[bytes]:
+        """The payload stored for ``session_id``, or None if it is unknown or expired."""
+
+    @abstractmethod
+    async def set(self, session_id: str, payload: bytes, max_age: Optional[int]) -> None:
+        """Store ``payload`` for ``session_id``, expiring it after ``max_age`` seconds (never when None)."""
+
+    @abstractmethod
+    async def delete(self, session_id: str) -> None:
+        """Forget ``session_id``. Unknown ids are ignored."""
+
+    async def close(self) -> None:
+        """Release the resources held by the store, e.g. from a shutdown handler."""
+
+
+class MemorySessionStore(SessionStore):
+    """
+    Sessions kept in the memory of the current process.
+
+    Once ``max_entries`` sessions are stored, the least recently used one is
+    dropped to make room. Each process has its own sessions, so use it with a
+    single process (``--processes 1``) or for tests.
+    """
+
+    def __init__(self, max_entries: int = 10_000) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be greater than 0")
+        self.max_entries = max_entries
+        # session id -> (payload, monotonic expiry or None), least recently used first
+        self._entries: OrderedDict[str, tuple[bytes, Optional[float]]] = OrderedDict()
+        # Sessions can also be loaded and saved outside the event loop's thread
+        self._lock = threading.Lock()
+
+    async def get(self, session_id: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return None
+            payload, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[session_id]
+                return None
+            self._entries.move_to_end(session_id)
+            return payload
+
+    async def set(self, session_id: str, payload: bytes, max_age: Optional[int]) -> None:
+        expires_at = None if max_age is None else time.monotonic() + max_age
+        with self._lock:
+            self._entries[session_id] = (payload, expires_at)
+            self._entries.move_to_end(session_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._entries.pop(session_id, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Expiry (a Unix timestamp, 0 for none) written before the payload of a session file
+_EXPIRY = struct.Struct("!d")
+
+
+class FileSessionStore(SessionStore):
+    """
+    Sessions kept as files in ``directory``, one per session.
+
+    Every process of the host shares them. A session file is replaced
+    atomically when it is written, so a reader never sees half of one. Files
+    are read and written on a worker thread, so disk I/O doesn't hold up the
+    event loop. Expired files are removed when they are read; call
+    :meth:`purge_expired` periodically to remove the sessions that are never
+    read again.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = os.path.abspath(directory)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, session_id: str) -> str:
+        if not is_valid_session_id(session_id):
+            raise ValueError(f"Invalid session id: {session_id!r}")
+        return os.path.join(self.directory, session_id)
+
+    async def get(self, session_id: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self._read, self._path(session_id))
+
+    async def set(self, session_id: str, payload: bytes, max_age: Optional[int]) -> None:
+        expires_at = 0.0 if max_age is None else time.time() + max_age
+        await asyncio.to_thread(self._write, self._path(session_id), payload, expires_at)
+
+    async def delete(self, session_id: str) -> None:
+        await asyncio.to_thread(_remove, self._path(session_id))
+
+    @staticmethod
+    def _read(path: str) -> Optional[bytes]:
+        try:
+            with open(path, "rb") as file:
+                content = file.read()
+        except FileNotFoundError:
+            return None
+        if len(content) < _EXPIRY.size:
+            return None
+        (expires_at,) = _EXPIRY.unpack_from(content)
+        if expires_at and expires_at <= time.time():
+            _remove(path)
+            return None
+        return content[_EXPIRY.size :]
+
+    @staticmethod
+    def _write(path: str, payload: bytes, expires_at: float) -> None:
+        # Session ids have no dots, so a temporary file never takes a session's name
+        temporary = f"{path}.{secrets.token_hex(4)}"
+        try:
+            with open(temporary, "wb") as file:
+                file.write(_EXPIRY.pack(expires_at))
+                file.write(payload)
+            os.replace(temporary, path)
+        except BaseException:
+            _remove(temporary)
+            raise
+
+    def purge_expired(self) -> int:
+        """Remove the files of expired sessions. Returns how many were removed."""
+        now = time.time()
+        removed = 0
+        for entry in os.scandir(self.directory):
+            if not is_valid_session_id(entry.name):
+                continue
+            try:
+                with open(entry.path, "rb") as file:
+                    header = file.read(_EXPIRY.size)
+            except FileNotFoundError:
+                continue
+            if len(header) < _EXPIRY.size:
+                continue
+            (expires_at,) = _EXPIRY.unpack(header)
+            if expires_at and expires_at <= now:
+                _remove(entry.path)
+                removed += 1
+        return removed
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _encode_command(args: tuple) -> bytes:
+    """A command in the Redis serialization protocol (RESP)."""
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if isinstance(arg, str):
+            arg = arg.encode("utf-8")
+        elif isinstance(arg, int):
+            arg = str(arg).encode("ascii")
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+
+class _RedisConnection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._reader = reader
+        self._writer = writer
+
+    async def execute(self, *args) -> Any:
+        """Send a command and read its reply. An error reply is returned, not raised."""
+        self._writer.write(_encode_command(args))
+        await self._writer.drain()
+        return await self._read_reply()
+
+    async def _read_reply(self) -> Any:
+        line = await self._reader.readuntil(b"\r\n")
+        kind, value = line[:1], line[1:-2]
+        if kind == b"+":
+            return value
+        if kind == b"-":
+            return SessionStoreError(value.decode("utf-8", "replace"))
+        if kind == b":":
+            return int(value)
+        if kind == b"$":
+            length = int(value)
+            if length < 0:
+                return None
+            return (await self._reader.readexactly(length + 2))[:-2]
+        if kind == b"*":
+            length = int(value)
+            if length < 0:
+                return None
+            return [await self._read_reply() for _ in range(length)]
+        # Out of sync with the server: the connection can't be reused
+        raise ConnectionError(f"Unexpected reply from Redis: {line!r}")
+
+    def close(self) -> None:
+        try:
+            self._writer.close()
+        except RuntimeError:
+            # Its event loop is already closed
+            pass
+
+
+class _ConnectionPool:
+    """The idle connections of one event loop, and the slots bounding how many it opens."""
+
+    __slots__ = ("idle", "slots")
+
+    def __init__(self, size: int) -> None:
+        self.idle: list[_RedisConnection] = []
+        self.slots = asyncio.Semaphore(size)
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Sessions kept in Redis, or any server speaking its protocol.
+
+    ``url`` is ``redis://[[username]:password@]host[:port][/db]``, or
+    ``rediss://`` for TLS. Each event loop of the process (``--event-loops``)
+    gets its own pool: up to ``pool_size`` connections are opened, when first
+    needed, and reused across its requests; a request waits for a free one
+    beyond that. Sessions expire with Redis's own ``EX``.
+    """
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        *,
+        pool_size: int = 10,
+        key_prefix: str = "robyn:session:",
+        timeout: float = 5.0,
+    ) -> None:
+        parsed = urlsplit(url)
+        if parsed.scheme not in ("redis", "rediss"):
+            raise ValueError(f"Unsupported Redis URL scheme: {parsed.scheme!r} (expected redis or rediss)")
+        if pool_size <= 0:
+            raise ValueError("pool_size must be greater than 0")
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.username = unquote(parsed.username) if parsed.username else None
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.tls = parsed.scheme == "rediss"
+        self.pool_size = pool_size
+        self.key_prefix = key_prefix
+        self.timeout = timeout
+        # event loop -> its pool. Not weakly keyed: pooled connections hold on to their loop
+        self._pools: dict[asyncio.AbstractEventLoop, _ConnectionPool] = {}
+        self._pools_lock = threading.Lock()
+
+    async def get(self, session_id: str) -> Optional[bytes]:
+        return await self._execute("GET", self.key_prefix + session_id)
+
+    async def set(self, session_id: str, payload: bytes, max_age: Optional[int]) -> None:
+        key = self.key_prefix + session_id
+        if max_age is None:
+            await self._execute("SET", key, payload)
+        elif max_age > 0:
+            await self._execute("SET", key, payload, "EX", int(max_age))
+        else:
+            # Redis refuses an expiry that has already passed
+            await self._execute("DEL", key)
+
+    async def delete(self, session_id: str) -> None:
+        await self._execute("DEL", self.key_prefix + session_id)
+
+    async def close(self) -> None:
+        current = asyncio.get_running_loop()
+        with self._pools_lock:
+            pools, self._pools = self._pools, {}
+        for loop, pool in pools.items():
+            idle, pool.idle = pool.idle, []
+            for connection in idle:
+                if loop is current:
+                    connection.close()
+                elif not loop.is_closed():
+                    # A connection is only closed from the thread running its loop
+                    try:
+                        loop.call_soon_threadsafe(connection.close)
+                    except RuntimeError:
+                        # The loop closed in the meantime, taking the connection with it
+                        break
+
+    def _pool(self) -> "_ConnectionPool":
+        # Connections belong to the event loop they were opened on
+        loop = asyncio.get_running_loop()
+        pool = self._pools.get(loop)
+        if pool is None:
+            with self._pools_lock:
+                pool = self._pools.get(loop)
+                if pool is None:
+                    for closed in [other for other in self._pools if other.is_closed()]:
+                        del self._pools[closed]
+                    pool = self._pools[loop] = _ConnectionPool(self.pool_size)
+        return pool
+
+    async def _connect(self) -> _RedisConnection:
+        context = ssl.create_default_context() if self.tls else None
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port, ssl=context), self.timeout)
+        except (OSError, asyncio.TimeoutError) as exc:
+            raise SessionStoreError(f"Could not connect to Redis at {self.host}:{self.port}: {exc}") from exc
+        connection = _RedisConnection(reader, writer)
+        setup = []
+        if self.password is not None:
+            setup.append(("AUTH", self.username, self.password) if self.username else ("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        for command in setup:
+            try:
+                reply = await asyncio.wait_for(connection.execute(*command), self.timeout)
+            except asyncio.TimeoutError as exc:
+                connection.close()
+                raise self._timed_out() from exc
+            if isinstance(reply, SessionStoreError):
+                connection.close()
+                raise reply
+        return connection
+
+    def _timed_out(self) -> SessionStoreError:
+        return SessionStoreError(f"Redis at {self.host}:{self.port} did not reply within {self.timeout} seconds")
+
+    async def _execute(self, *args) -> Any:
+        pool = self._pool()
+        async with pool.slots:
+            # An idle connection the server has since closed is retried once on a new one
+            for retry in (False, True):
+                reused = bool(pool.idle) and not retry
+                connection = pool.idle.pop() if reused else await self._connect()
+                try:
+                    reply = await asyncio.wait_for(connection.execute(*args), self.timeout)
+                except (ConnectionError, asyncio.IncompleteReadError) as exc:
+                    connection.close()
+                    if reused:
+                        continue
+                    raise SessionStoreError(f"Lost the connection to Redis at {self.host}:{self.port}: {exc}") from exc
+                except asyncio.TimeoutError as exc:
+                    # A late reply would be read as the next command's
+                    connection.close()
+                    raise self._timed_out() from exc
+                except BaseException:
+                    # Cancelled mid-reply: the connection is out of sync
+                    connection.close()
+                    raise
+                pool.idle.append(connection)
+                if isinstance(reply, SessionStoreError):
+                    raise reply
+                return reply
@@ -102,6 +102,26 @@ class _RouteTable:
         return None, {}
 
 
+class _BodyStream:
+    """In-memory stand-in for the server's ``BodyStream`` (``stream_body=True`` routes)."""
+
+    def __init__(self, body: Union[str, bytes]) -> None:
+        self._body = body.encode("utf-8") if isinstance(body, str) else body
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> bytes:
+        if not self._body:
+            raise StopAsyncIteration
+        chunk, self._body = self._body, b""
+        return chunk
+
+    async def read(self) -> bytes:
+        chunk, self._body = self._body, b""
+        return chunk
+
+
 # ---------------------------------------------------------------------------
 # TestClient
 # ---------------------------------------------------------------------------
@@ -144,13 +164,17 @@ class TestClient:
     def _build(self) -> None:
         for route in self.app.router.get_routes():
             method = _method_str(route.route_type)
-            self._http_routes.setdefault(method, _RouteTable()).add(route.route, route.function)
+            self._http_routes.setdefault(method, _RouteTable()).add(route.route, route)
 
         for mw in self.app.middleware_router.get_global_middlewares():
+            excluded = _RouteTable()
+            for excluded_route in mw.exclude:
+                excluded.add(excluded_route, True)
+            entry = (mw.function, mw.skip_const_routes, excluded)
             if mw.middleware_type == MiddlewareType.BEFORE_REQUEST:
-                self._global_before.append(mw.function)
+                self._global_before.append(entry)
             else:
-                self._global_after.append(mw.function)
+                self._global_after.append(entry)
 
         for mw in self.app.middleware_router.get_route_middlewares():
             mw_method = _method_str(mw.route_type)
@@ -214,11 +238,19 @@ class TestClient:
             "127.0.0.1",
         )
 
+    @staticmethod
+    def _global_middlewares_for(middlewares: list, path: str, is_const_route: bool) -> list:
+        return [mw_fn for mw_fn, skip_const_routes, excluded in middlewares if not (is_const_route and skip_const_routes) and excluded.match(path)[0] is None]
+
     def _execute(self, method: str, path: str, **kwargs) -> TestResponse:
         request = self._build_request(method, path, **kwargs)
 
+        route_table = self._http_routes.get(method)
+        matched_route = route_table.match(path)[0] if route_table is not None else None
+        is_const_route = matched_route is not None and matched_route.is_const
+
         # ---- before middlewares (global) ----------------------------------
-        for mw_fn in self._global_before:
+        for mw_fn in self._global_middlewares_for(self._global_before, path, is_const_route):
             result = self._call(mw_fn, request)
             if result is not None:
                 if isinstance(result, Response):
@@ -238,31 +270,23 @@ class TestClient:
                     request = result
 
         # ---- route match --------------------------------------------------
-        route_table = self._http_routes.get(method)
         if route_table is None:
             return TestResponse(status_code=404, headers=Headers({}), _body=b"Not Found")
 
-        fn_info, path_params = route_table.match(path)
-        if fn_info is None:
+        route, path_params = route_table.match(path)
+        if route is None:
             return TestResponse(status_code=404, headers=Headers({}), _body=b"Not Found")
 
+        fn_info = route.function
         request.path_params = path_params
+        if route.stream_body:
+            request.body_stream = _BodyStream(request.body)
+            request.body = ""
 
         # ---- execute handler ----------------------------------------------
         response = self._call(fn_info, request)
-
         if not isinstance(response, Response):
-            if isinstance(response, (dict, list)):
-                body = json.dumps(response).encode("utf-8")
-            elif isinstance(response, bytes):
-                body = response
-            else:
-                body = str(response).encode("utf-8")
-            return TestResponse(
-                status_code=200,
-                headers=Headers({}),
-                _body=body,
-            )
+            response = self._to_response(response, fn_info.encoder)
 
         # ---- merge global response headers --------------------------------
         excluded = self.app.excluded_response_headers_paths or []
@@ -276,7 +300,7 @@ class TestClient:
                     resp_headers.append(key, val)
 
         # ---- after middlewares (global) -----------------------------------
-        for mw_fn in self._global_after:
+        for mw_fn in self._global_middlewares_for(self._global_after, path, is_const_route):
             response = self._call_after_mw(mw_fn, request, response)
 
         # ---- after middleware (route-specific) ----------------------------
@@ -297,10 +321,30 @@ class TestClient:
             return result
         return response
 
+    @staticmethod
+    def _to_response(result: Any, encoder: Any) -> Response:
+        """Build the response the server makes of a value a handler returned,
+        with the route's ``response_model`` encoder if it has one."""
+        if isinstance(result, str):
+            return Response(status_code=200, headers=Headers({"Content-Type": "text/plain"}), description=result.encode("utf-8"))
+        if isinstance(result, bytes):
+            return Response(status_code=200, headers=Headers({"Content-Type": "application/octet-stream"}), description=result)
+        if encoder is not None:
+            body = encoder(result)
+        elif isinstance(result, (dict, list)):
+            body = json.dumps(result).encode("utf-8")
+        else:
+            return Response(status_code=200, headers=Headers({"Content-Type": "text/plain"}), description=str(result).encode("utf-8"))
+        return Response(status_code=200, headers=Headers({"Content-Type": "application/json"}), description=body)
+
     @staticmethod
     def _to_test_response(response: Response) -> TestResponse:
         body = response.description
-        if isinstance(body, str):
+        if response.file_path:
+            # File responses are streamed from disk by the server.
+            with open(response.file_path, "rb") as f:
+                body = f.read()
+        elif isinstance(body, str):
             body = body.encode("utf-8")
         elif isinstance(body, (dict, list)):
             body = json.dumps(body).encode("utf-8")
@@ -81,6 +81,23 @@ class WebSocketAdapter:
         else:
             await self._connector.async_broadcast(data)
 
+    async def join(self, room: str):
+        """Add this connection to ``room``. Rooms belong to the endpoint and
+        are left automatically when the connection closes."""
+        self._connector.join_room(room)
+
+    async def leave(self, room: str):
+        """Remove this connection from ``room``."""
+        self._connector.leave_room(room)
+
+    async def send_to_room(self, room: str, data, exclude_self: bool = False) -> int:
+        """Send to every connection in ``room`` with a single call; the frame is
+        shared by all of them. ``bytes`` are sent as a binary frame, ``str`` as
+        a text frame. Returns the number of connections it was queued for."""
+        if isinstance(data, bytearray):
+            data = bytes(data)
+        return await self._connector.async_send_to_room(room, data, exclude_self)
+
     async def close(self):
         """Close the WebSocket connection."""
         self._connector.close()
@@ -10,6 +10,7 @@ use std::ffi::CString;
 static CONTEXTVARS: PyOnceLock<Py<PyAny>> = PyOnceLock::new();
 static CONTEXT: PyOnceLock<Py<PyAny>> = PyOnceLock::new();
 static RUN_IN_CONTEXT: PyOnceLock<Py<PyAny>> = PyOnceLock::new();
+static NEXT_READY: PyOnceLock<Py<PyAny>> = PyOnceLock::new();
 
 fn contextvars(py: Python<'_>) -> PyResult<&Bound<'_, PyAny>> {
     Ok(CONTEXTVARS
@@ -83,3 +84,40 @@ pub(crate) fn run_in_context_helper<'py>(py: Python<'py>) -> PyResult<&'py Bound
         })?
         .bind(py))
 }
+
+/// Python coroutine function `_next_ready(iterator, pending, max_items)` that
+/// awaits the next item of an async iterator, then takes the items that
+/// follow as long as they are ready without waiting, up to `max_items`.
+///
+/// An item counts as ready when producing it takes a single pass of the
+/// event loop. The first one that isn't is left running as a task and
+/// returned as `pending`, to be awaited first on the next call. Returns
+/// `(items, pending, exhausted)`.
+pub(crate) fn next_ready_helper<'py>(py: Python<'py>) -> PyResult<&'py Bound<'py, PyAny>> {
+    const SOURCE: &str = "import asyncio\n\
+                          async def _next_ready(iterator, pending, max_items):\n    \
+                              items = []\n    \
+                              try:\n        \
+                                  items.append(await (pending if pending is not None else iterator.__anext__()))\n        \
+                                  while len(items) < max_items:\n            \
+                                      task = asyncio.ensure_future(iterator.__anext__())\n            \
+                                      await asyncio.sleep(0)\n            \
+                                      if not task.done():\n                \
+                                          return items, task, False\n            \
+                                      items.append(task.result())\n    \
+                              except StopAsyncIteration:\n        \
+                                  return items, None, True\n    \
+                              return items, None, False\n";
+
+    Ok(NEXT_READY
+        .get_or_try_init(py, || -> PyResult<Py<PyAny>> {
+            let module = PyModule::from_code(
+                py,
+                &CString::new(SOURCE).unwrap(),
+                &CString::new("robyn_next_ready.py").unwrap(),
+                &CString::new("_robyn_next_ready").unwrap(),
+            )?;
+            Ok(module.getattr("_next_ready")?.unbind())
+        })?
+        .bind(py))
+}
@@ -90,11 +90,35 @@ pub(crate) struct BlockingRunnerPool {
     idle_timeout: time::Duration,
     spawning: atomic::AtomicBool,
     spawn_tick: atomic::AtomicU64,
+    eager: bool,
 }
 
 impl BlockingRunnerPool {
     pub fn new(max_threads: usize, idle_timeout: u64) -> Self {
-        let (qtx, qrx) = channel::unbounded();
+        Self::with_queue(channel::unbounded(), max_threads, idle_timeout, false)
+    }
+
+    /// A pool whose queue holds at most `queue_size` pending tasks, for use
+    /// with [`BlockingRunnerPool::try_run`]. Its tasks may run for long, so a
+    /// thread is added as soon as one task is waiting, without throttling.
+    pub fn bounded(max_threads: usize, idle_timeout: u64, queue_size: usize) -> Self {
+        Self::with_queue(
+            channel::bounded(queue_size),
+            max_threads,
+            idle_timeout,
+            true,
+        )
+    }
+
+    fn with_queue(
+        (qtx, qrx): (
+            channel::Sender<BlockingTask>,
+            channel::Receiver<BlockingTask>,
+        ),
+        max_threads: usize,
+        idle_timeout: u64,
+        eager: bool,
+    ) -> Self {
         let ret = Self {
             queue: qtx,
             tq: qrx.clone(),
@@ -104,6 +128,7 @@ impl BlockingRunnerPool {
             spawning: false.into(),
             spawn_tick: 0.into(),
             idle_timeout: time::Duration::from_secs(idle_timeout),
+            eager,
         };
 
         // always spawn the first thread
@@ -115,7 +140,7 @@ impl BlockingRunnerPool {
     #[inline(always)]
     fn spawn_thread(&self) {
         let tick = self.birth.elapsed().as_micros() as u64;
-        if tick - self.spawn_tick.load(atomic::Ordering::Relaxed) < 350 {
+        if !self.eager && tick - self.spawn_tick.load(atomic::Ordering::Relaxed) < 350 {
             return;
         }
         if self
@@ -153,10 +178,28 @@ impl BlockingRunnerPool {
         T: FnOnce(Python) + Send + 'static,
     {
         self.queue.send(BlockingTask::new(task))?;
-        if self.queue.len() > 1 && self.threads.load(atomic::Ordering::Acquire) < self.tmax {
+        self.scale();
+        Ok(())
+    }
+
+    /// Like [`BlockingRunnerPool::run`], but fails instead of waiting when
+    /// the queue of a bounded pool is full.
+    #[inline]
+    pub fn try_run<T>(&self, task: T) -> Result<(), channel::TrySendError<BlockingTask>>
+    where
+        T: FnOnce(Python) + Send + 'static,
+    {
+        self.queue.try_send(BlockingTask::new(task))?;
+        self.scale();
+        Ok(())
+    }
+
+    #[inline(always)]
+    fn scale(&self) {
+        let waiting = if self.eager { 0 } else { 1 };
+        if self.queue.len() > waiting && self.threads.load(atomic::Ordering::Acquire) < self.tmax {
             self.spawn_thread();
         }
-        Ok(())
     }
 }
 
@@ -0,0 +1,434 @@
+use std::cell::RefCell;
+use std::io::{self, Write};
+use std::pin::Pin;
+use std::rc::Rc;
+use std::task::{Context, Poll};
+
+use actix_http::body::{BodySize, BoxBody, MessageBody};
+use actix_http::StatusCode;
+use actix_web::http::header::{
+    HeaderMap, HeaderValue, ACCEPT_ENCODING, ACCEPT_RANGES, CONTENT_ENCODING, CONTENT_LENGTH,
+    CONTENT_RANGE, CONTENT_TYPE, ETAG, VARY,
+};
+use actix_web::web::Bytes;
+use actix_web::HttpResponse;
+use pyo3::exceptions::PyValueError;
+use pyo3::prelude::*;
+
+const DEFAULT_ALGORITHMS: [&str; 3] = ["br", "zstd", "gzip"];
+const DEFAULT_CONTENT_TYPES: [&str; 5] = [
+    "text/*",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+];
+
+/// A content coding Robyn can produce.
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum Encoding {
+    Brotli,
+    Zstd,
+    Gzip,
+}
+
+impl Encoding {
+    fn from_name(name: &str) -> Option<Self> {
+        match name {
+            "br" => Some(Encoding::Brotli),
+            "zstd" => Some(Encoding::Zstd),
+            "gzip" => Some(Encoding::Gzip),
+            _ => None,
+        }
+    }
+
+    pub fn as_str(self) -> &'static str {
+        match self {
+            Encoding::Brotli => "br",
+            Encoding::Zstd => "zstd",
+            Encoding::Gzip => "gzip",
+        }
+    }
+}
+
+/// Response compression settings: `app.configure_compression(...)`.
+///
+/// Bodies are compressed with the first of `algorithms` the client accepts
+/// (highest `q` value first), when their content type is in `content_types`
+/// and they are at least `min_size` bytes long. `level` is clamped to the
+/// range of each algorithm; every algorithm uses a fast default without it.
+#[pyclass(frozen)]
+#[derive(Debug, Clone)]
+pub struct Compression {
+    #[pyo3(get)]
+    pub algorithms: Vec<String>,
+    #[pyo3(get)]
+    pub level: Option<u32>,
+    #[pyo3(get)]
+    pub min_size: usize,
+    #[pyo3(get)]
+    pub content_types: Vec<String>,
+    encodings: Vec<Encoding>,
+}
+
+#[pymethods]
+impl Compression {
+    #[new]
+    #[pyo3(signature = (algorithms=None, level=None, min_size=1024, content_types=None))]
+    pub fn new(
+        algorithms: Option<Vec<String>>,
+        level: Option<u32>,
+        min_size: usize,
+        content_types: Option<Vec<String>>,
+    ) -> PyResult<Self> {
+        let algorithms = algorithms
+            .unwrap_or_else(|| DEFAULT_ALGORITHMS.iter().map(|a| a.to_string()).collect());
+        let mut encodings = Vec::with_capacity(algorithms.len());
+        for algorithm in &algorithms {
+            let encoding = Encoding::from_name(&algorithm.to_lowercase()).ok_or_else(|| {
+                PyValueError::new_err(format!(
+                    "Unsupported compression algorithm: {} (expected br, zstd or gzip)",
+                    algorithm
+                ))
+            })?;
+            if !encodings.contains(&encoding) {
+                encodings.push(encoding);
+            }
+        }
+        if encodings.is_empty() {
+            return Err(PyValueError::new_err(
+                "At least one compression algorithm is required",
+            ));
+        }
+
+        let content_types = content_types
+            .unwrap_or_else(|| {
+                DEFAULT_CONTENT_TYPES
+                    .iter()
+                    .map(|t| t.to_string())
+                    .collect()
+            })
+            .iter()
+            .map(|content_type| content_type.trim().to_lowercase())
+            .collect();
+
+        Ok(Self {
+            algorithms: encodings.iter().map(|e| e.as_str().to_string()).collect(),
+            level,
+            min_size,
+            content_types,
+            encodings,
+        })
+    }
+
+    pub fn __repr__(&self) -> String {
+        format!(
+            "Compression(algorithms={:?}, level={:?}, min_size={}, content_types={:?})",
+            self.algorithms, self.level, self.min_size, self.content_types
+        )
+    }
+}
+
+impl Compression {
+    pub fn encodings(&self) -> &[Encoding] {
+        &self.encodings
+    }
+
+    /// Pick the encoding for a request from its `Accept-Encoding` header.
+    pub fn negotiate(&self, request_headers: &HeaderMap) -> Option<Encoding> {
+        let accept_encoding = request_headers.get(ACCEPT_ENCODING)?.to_str().ok()?;
+        let mut best: Option<(Encoding, f32)> = None;
+        for &encoding in &self.encodings {
+            let quality = accepted_quality(accept_encoding, encoding.as_str());
+            // Ties keep the server's order of preference
+            if quality > 0.0 && best.map_or(true, |(_, best_quality)| quality > best_quality) {
+                best = Some((encoding, quality));
+            }
+        }
+        best.map(|(encoding, _)| encoding)
+    }
+
+    /// Whether a response is worth compressing, ignoring what the client accepts.
+    pub fn is_compressible(
+        &self,
+        status: StatusCode,
+        headers: &HeaderMap,
+        body_size: BodySize,
+    ) -> bool {
+        if status.is_informational()
+            || status == StatusCode::NO_CONTENT
+            || status == StatusCode::PARTIAL_CONTENT
+            || status == StatusCode::NOT_MODIFIED
+            || headers.contains_key(CONTENT_ENCODING)
+            || headers.contains_key(CONTENT_RANGE)
+        {
+            return false;
+        }
+        match body_size {
+            BodySize::None => return false,
+            BodySize::Sized(size) if (size as usize) < self.min_size => return false,
+            _ => {}
+        }
+        headers
+            .get(CONTENT_TYPE)
+            .and_then(|content_type| content_type.to_str().ok())
+            .is_some_and(|content_type| self.allows_content_type(content_type))
+    }
+
+    fn allows_content_type(&self, content_type: &str) -> bool {
+        let essence = content_type
+            .split(';')
+            .next()
+            .unwrap_or_default()
+            .trim()
+            .to_ascii_lowercase();
+        self.content_types.iter().any(|allowed| {
+            match allowed.strip_suffix('*') {
+                // "text/*" matches every subtype
+                Some(prefix) => essence.starts_with(prefix),
+                None => essence == *allowed,
+            }
+        })
+    }
+
+    /// Compress a whole body at once.
+    pub fn compress(&self, encoding: Encoding, body: &[u8]) -> io::Result<Bytes> {
+        let mut encoder = StreamEncoder::new(encoding, self.level)?;
+        let head = encoder.encode(body, false)?;
+        let tail = encoder.finish()?;
+        if head.is_empty() {
+            return Ok(tail);
+        }
+        let mut compressed = Vec::with_capacity(head.len() + tail.len());
+        compressed.extend_from_slice(&head);
+        compressed.extend_from_slice(&tail);
+        Ok(Bytes::from(compressed))
+    }
+
+    /// Compress `response` for the encoding `request_headers` accept, if it is
+    /// compressible. Bodies that are not in memory are compressed as they are
+    /// streamed, flushing every chunk so streamed events are not held back.
+    pub fn compress_response(
+        &self,
+        request_headers: &HeaderMap,
+        response: HttpResponse,
+    ) -> HttpResponse {
+        if !self.is_compressible(
+            response.status(),
+            response.headers(),
+            response.body().size(),
+        ) {
+            return response;
+        }
+
+        let encoding = self.negotiate(request_headers);
+        let (mut head, body) = response.into_parts();
+        head.headers_mut()
+            .append(VARY, HeaderValue::from_static("accept-encoding"));
+        let Some(encoding) = encoding else {
+            return head.set_body(body);
+        };
+
+        let body = match body.try_into_bytes() {
+            Ok(bytes) => match self.compress(encoding, &bytes) {
+                Ok(compressed) => BoxBody::new(compressed),
+                Err(e) => {
+                    log::error!("Failed to compress response: {}", e);
+                    return head.set_body(BoxBody::new(bytes));
+                }
+            },
+            Err(body) => match StreamEncoder::new(encoding, self.level) {
+                Ok(encoder) => BoxBody::new(CompressedBody {
+                    inner: body,
+                    encoder: Some(encoder),
+                }),
+                Err(e) => {
+                    log::error!("Failed to compress response: {}", e);
+                    return head.set_body(body);
+                }
+            },
+        };
+
+        let headers = head.headers_mut();
+        headers.remove(CONTENT_LENGTH);
+        headers.insert(
+            CONTENT_ENCODING,
+            HeaderValue::from_static(encoding.as_str()),
+        );
+        weaken_validators(headers);
+        head.set_body(body)
+    }
+}
+
+/// Byte ranges are served from the identity body (files), so a compressed
+/// body can't advertise them, nor share a strong `ETag` with the identity
+/// body: `If-Range` only matches strong validators, and a client resuming a
+/// compressed download would splice identity bytes into it. The weak `ETag`
+/// still answers `If-None-Match`.
+fn weaken_validators(headers: &mut HeaderMap) {
+    headers.remove(ACCEPT_RANGES);
+    let weak = headers
+        .get(ETAG)
+        .and_then(|etag| etag.to_str().ok())
+        .filter(|etag| etag.starts_with('"'))
+        .and_then(|etag| HeaderValue::from_str(&format!("W/{}", etag)).ok());
+    if let Some(weak) = weak {
+        headers.insert(ETAG, weak);
+    }
+}
+
+/// The `q` value `accept_encoding` gives to `coding`, 0 when it is not accepted.
+fn accepted_quality(accept_encoding: &str, coding: &str) -> f32 {
+    let mut wildcard = None;
+    for item in accept_encoding.split(',') {
+        let mut params = item.split(';');
+        let name = params.next().unwrap_or_default().trim();
+        let quality = params
+            .find_map(|param| {
+                let (key, value) = param.split_once('=')?;
+                key.trim()
+                    .eq_ignore_ascii_case("q")
+                    .then(|| value.trim().parse::<f32>().ok())
+                    .flatten()
+            })
+            .unwrap_or(1.0);
+        if name.eq_ignore_ascii_case(coding) {
+            return quality;
+        }
+        if name == "*" {
+            wildcard = Some(quality);
+        }
+    }
+    wildcard.unwrap_or(0.0)
+}
+
+/// A `Write` target the encoders share with `StreamEncoder`, so output can be
+/// taken after every flush.
+#[derive(Clone, Default)]
+struct SharedBuffer(Rc<RefCell<Vec<u8>>>);
+
+impl SharedBuffer {
+    fn take(&self) -> Bytes {
+        Bytes::from(std::mem::take(&mut *self.0.borrow_mut()))
+    }
+}
+
+impl Write for SharedBuffer {
+    fn write(&mut self, buf: &[u8]) -> io::Result<usize> {
+        self.0.borrow_mut().extend_from_slice(buf);
+        Ok(buf.len())
+    }
+
+    fn flush(&mut self) -> io::Result<()> {
+        Ok(())
+    }
+}
+
+enum Encoder {
+    Brotli(Box<brotli::CompressorWriter<SharedBuffer>>),
+    Zstd(zstd::stream::write::Encoder<'static, SharedBuffer>),
+    Gzip(flate2::write::GzEncoder<SharedBuffer>),
+}
+
+/// Incremental encoder: `encode` returns the compressed bytes produced so far.
+struct StreamEncoder {
+    encoder: Encoder,
+    output: SharedBuffer,
+}
+
+impl StreamEncoder {
+    fn new(encoding: Encoding, level: Option<u32>) -> io::Result<Self> {
+        let output = SharedBuffer::default();
+        let encoder = match encoding {
+            Encoding::Brotli => Encoder::Brotli(Box::new(brotli::CompressorWriter::new(
+                output.clone(),
+                4096,
+                level.map_or(4, |level| level.min(11)),
+                22,
+            ))),
+            Encoding::Zstd => Encoder::Zstd(zstd::stream::write::Encoder::new(
+                output.clone(),
+                level.map_or(3, |level| level.clamp(1, 22) as i32),
+            )?),
+            Encoding::Gzip => Encoder::Gzip(flate2::write::GzEncoder::new(
+                output.clone(),
+                flate2::Compression::new(level.map_or(6, |level| level.min(9))),
+            )),
+        };
+        Ok(Self { encoder, output })
+    }
+
+    /// Compress `chunk`; with `flush` everything written so far can be
+    /// decoded from the output.
+    fn encode(&mut self, chunk: &[u8], flush: bool) -> io::Result<Bytes> {
+        let encoder: &mut dyn Write = match &mut self.encoder {
+            Encoder::Brotli(encoder) => encoder.as_mut(),
+            Encoder::Zstd(encoder) => encoder,
+            Encoder::Gzip(encoder) => encoder,
+        };
+        encoder.write_all(chunk)?;
+        if flush {
+            encoder.flush()?;
+        }
+        Ok(self.output.take())
+    }
+
+    fn finish(self) -> io::Result<Bytes> {
+        match self.encoder {
+            Encoder::Brotli(encoder) => {
+                encoder.into_inner();
+            }
+            Encoder::Zstd(encoder) => {
+                encoder.finish()?;
+            }
+            Encoder::Gzip(encoder) => {
+                encoder.finish()?;
+            }
+        }
+        Ok(self.output.take())
+    }
+}
+
+/// A streamed body compressed chunk by chunk.
+struct CompressedBody {
+    inner: BoxBody,
+    encoder: Option<StreamEncoder>,
+}
+
+impl MessageBody for CompressedBody {
+    type Error = Box<dyn std::error::Error>;
+
+    fn size(&self) -> BodySize {
+        BodySize::Stream
+    }
+
+    fn poll_next(
+        self: Pin<&mut Self>,
+        cx: &mut Context<'_>,
+    ) -> Poll<Option<Result<Bytes, Self::Error>>> {
+        let this = self.get_mut();
+        loop {
+            let Some(encoder) = this.encoder.as_mut() else {
+                return Poll::Ready(None);
+            };
+            match Pin::new(&mut this.inner).poll_next(cx) {
+                Poll::Pending => return Poll::Pending,
+                Poll::Ready(Some(Ok(chunk))) => match encoder.encode(&chunk, true) {
+                    // Small chunks may not produce output until the next flush
+                    Ok(compressed) if compressed.is_empty() => continue,
+                    Ok(compressed) => return Poll::Ready(Some(Ok(compressed))),
+                    Err(e) => return Poll::Ready(Some(Err(e.into()))),
+                },
+                Poll::Ready(Some(Err(e))) => return Poll::Ready(Some(Err(e))),
+                Poll::Ready(None) => {
+                    let encoder = this.encoder.take().expect("encoder is set until the end");
+                    return match encoder.finish() {
+                        Ok(compressed) if compressed.is_empty() => Poll::Ready(None),
+                        Ok(compressed) => Poll::Ready(Some(Ok(compressed))),
+                        Err(e) => Poll::Ready(Some(Err(e.into()))),
+                    };
+                }
+            }
+        }
+    }
+}
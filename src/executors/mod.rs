@@ -1,8 +1,11 @@
+pub mod sync_executor;
 #[deny(clippy::if_same_then_else)]
 pub mod web_socket_executors;
 
+use std::collections::HashMap;
 use std::sync::Arc;
 
+use actix_http::header::CONTENT_TYPE;
 use anyhow::Result;
 use pyo3::prelude::*;
 use pyo3::sync::PyOnceLock;
@@ -11,13 +14,15 @@ use pyo3::{BoundObject, IntoPyObject};
 use pyo3_async_runtimes::TaskLocals;
 
 use crate::asyncio::run_in_context_helper;
+use crate::blocking::BlockingRunnerPool;
 use crate::types::cookie::Cookies;
 use crate::types::headers::Headers;
 use crate::types::response::PyResponse;
 use crate::types::{
     function_info::FunctionInfo,
-    request::Request,
+    request::{PyRequest, SharedRequest},
     response::{Response, ResponseType, StreamingResponse},
+    typed_param::{resolve_typed_params, ParamValue, TypedParam},
     MiddlewareReturn,
 };
 
@@ -33,34 +38,34 @@ fn orjson_dumps<'py>(py: Python<'py>) -> PyResult<&'py Bound<'py, PyAny>> {
         .bind(py))
 }
 
+/// Cached `robyn.responses.StreamingResponse` class, which routes with an
+/// encoder must not encode.
+static STREAMING_RESPONSE: PyOnceLock<Py<PyAny>> = PyOnceLock::new();
+
+fn streaming_response_class<'py>(py: Python<'py>) -> PyResult<&'py Bound<'py, PyAny>> {
+    Ok(STREAMING_RESPONSE
+        .get_or_try_init(py, || -> PyResult<Py<PyAny>> {
+            Ok(py
+                .import("robyn.responses")?
+                .getattr("StreamingResponse")?
+                .unbind())
+        })?
+        .bind(py))
+}
+
 #[inline]
 fn json_headers() -> Headers {
-    let h = Headers::default();
-    h.headers
-        .entry("content-type".to_string())
-        .or_default()
-        .push("application/json".to_string());
-    h
+    Headers::from_static(CONTENT_TYPE, "application/json")
 }
 
 #[inline]
 fn text_plain_headers() -> Headers {
-    let h = Headers::default();
-    h.headers
-        .entry("content-type".to_string())
-        .or_default()
-        .push("text/plain".to_string());
-    h
+    Headers::from_static(CONTENT_TYPE, "text/plain")
 }
 
 #[inline]
 fn octet_stream_headers() -> Headers {
-    let h = Headers::default();
-    h.headers
-        .entry("content-type".to_string())
-        .or_default()
-        .push("application/octet-stream".to_string());
-    h
+    Headers::from_static(CONTENT_TYPE, "application/octet-stream")
 }
 
 #[inline]
@@ -75,15 +80,32 @@ fn response_from_bytes(body: Vec<u8>, headers: Headers) -> Response {
     }
 }
 
+/// A JSON response holding the bytes an encoder returned.
+#[inline]
+fn json_response(encoded: Bound<'_, PyAny>) -> PyResult<ResponseType> {
+    let bytes = encoded.downcast::<PyBytes>()?.as_bytes().to_vec();
+    Ok(ResponseType::Standard(response_from_bytes(
+        bytes,
+        json_headers(),
+    )))
+}
+
 /// Try every fast path before falling back to the generic `FromPyObject for
 /// Response` conversion. Order matters:
 ///   1. `#[pyclass] Response`  — read fields from the Rust struct directly.
 ///   2. `dict`/`list`          — hand to orjson, skip Python-side wrapping.
 ///   3. `str`/`bytes`          — wrap in a preset Response.
-///   4. `StreamingResponse`    — existing extract path.
-///   5. Fallback               — `FromPyObject` chain (handles subclasses).
+///   4. Route encoder          — any other value, for routes compiled with one.
+///   5. `StreamingResponse`    — existing extract path.
+///   6. Fallback               — `FromPyObject` chain (handles subclasses).
+///
+/// `encoder` is the route's compiled `response_model` encoder, which also
+/// replaces the default `orjson.dumps` for dicts and lists.
 #[inline]
-fn extract_response_type_fast(output: &Bound<'_, PyAny>) -> PyResult<ResponseType> {
+fn extract_response_type_fast(
+    output: &Bound<'_, PyAny>,
+    encoder: Option<&Py<PyAny>>,
+) -> PyResult<ResponseType> {
     let py = output.py();
 
     // 1. PyResponse pyclass downcast — zero getattr calls.
@@ -111,13 +133,11 @@ fn extract_response_type_fast(output: &Bound<'_, PyAny>) -> PyResult<ResponseTyp
     //    `isinstance(res, (dict, list, ...))` check; orjson serializes
     //    dict/list subclasses as their base type by default.
     if output.downcast::<PyDict>().is_ok() || output.downcast::<PyList>().is_ok() {
-        let dumps = orjson_dumps(py)?;
-        let encoded = dumps.call1((output,))?;
-        let bytes = encoded.downcast::<PyBytes>()?.as_bytes().to_vec();
-        return Ok(ResponseType::Standard(response_from_bytes(
-            bytes,
-            json_headers(),
-        )));
+        let encoded = match encoder {
+            Some(encoder) => encoder.bind(py).call1((output,))?,
+            None => orjson_dumps(py)?.call1((output,))?,
+        };
+        return json_response(encoded);
     }
 
     // 3. Bare str/bytes — `downcast` (subclass-aware) to match the Python
@@ -137,12 +157,22 @@ fn extract_response_type_fast(output: &Bound<'_, PyAny>) -> PyResult<ResponseTyp
         )));
     }
 
-    // 4. StreamingResponse (duck-typed via `content`/`media_type` attrs).
+    // 4. The route's encoder takes any other value the handler returned,
+    //    unless it is a response the handler built itself.
+    if let Some(encoder) = encoder {
+        if !output.is_instance_of::<PyResponse>()
+            && !output.is_instance(streaming_response_class(py)?)?
+        {
+            return json_response(encoder.bind(py).call1((output,))?);
+        }
+    }
+
+    // 5. StreamingResponse (duck-typed via `content`/`media_type` attrs).
     if let Ok(streaming) = output.extract::<StreamingResponse>() {
         return Ok(ResponseType::Streaming(streaming));
     }
 
-    // 5. Slow-path fallback: anything that implements the Response protocol
+    // 6. Slow-path fallback: anything that implements the Response protocol
     //    (e.g. user subclasses) still works through the getattr chain.
     match output.extract::<Response>() {
         Ok(response) => Ok(ResponseType::Standard(response)),
@@ -157,6 +187,7 @@ fn get_function_output<'a, T>(
     function: &'a FunctionInfo,
     py: Python<'a>,
     function_args: &T,
+    params: Option<&Bound<'a, PyDict>>,
 ) -> Result<pyo3::Bound<'a, pyo3::PyAny>, PyErr>
 where
     T: Clone + for<'py> IntoPyObject<'py>,
@@ -169,7 +200,9 @@ where
         return handler.call0();
     }
 
-    let kwargs = function.kwargs.bind(py);
+    // Typed path/query params resolved by the executor come with the
+    // injected dependencies as keyword arguments.
+    let kwargs = params.unwrap_or_else(|| function.kwargs.bind(py));
     let function_args: Py<PyAny> = function_args
         .clone()
         .into_pyobject(py)
@@ -183,7 +216,7 @@ where
         .unbind();
 
     match function.number_of_params {
-        1 => {
+        1 if params.is_none() => {
             if pyo3::types::PyDictMethods::get_item(kwargs, "global_dependencies")
                 .is_ok_and(|it| !it.is_none())
                 || pyo3::types::PyDictMethods::get_item(kwargs, "router_dependencies")
@@ -209,6 +242,7 @@ fn get_function_output_in_context<'a, T>(
     py: Python<'a>,
     ctx: &Bound<'a, PyAny>,
     function_args: &T,
+    params: Option<&Bound<'a, PyDict>>,
 ) -> Result<pyo3::Bound<'a, pyo3::PyAny>, PyErr>
 where
     T: Clone + for<'py> IntoPyObject<'py>,
@@ -220,7 +254,9 @@ where
         return ctx.call_method1("run", (handler,));
     }
 
-    let kwargs = function.kwargs.bind(py);
+    // Typed path/query params resolved by the executor come with the
+    // injected dependencies as keyword arguments.
+    let kwargs = params.unwrap_or_else(|| function.kwargs.bind(py));
     let function_args: Py<PyAny> = function_args
         .clone()
         .into_pyobject(py)
@@ -234,7 +270,7 @@ where
         .unbind();
 
     match function.number_of_params {
-        1 => {
+        1 if params.is_none() => {
             if pyo3::types::PyDictMethods::get_item(kwargs, "global_dependencies")
                 .is_ok_and(|it| !it.is_none())
                 || pyo3::types::PyDictMethods::get_item(kwargs, "router_dependencies")
@@ -265,22 +301,31 @@ fn wrap_coro_in_context<'a>(
     run_in_context_helper(py)?.call1((coroutine, ctx))
 }
 
-// Execute the middleware function
-// type T can be either Request (before middleware) or Response (after middleware)
+/// Read what a middleware returned: a response ends the request, a request
+/// is handed to the next phase as it is.
+#[inline]
+fn extract_middleware_return(output: &Bound<'_, PyAny>) -> Result<MiddlewareReturn> {
+    // Try response extraction first, then request
+    match output.extract::<Response>() {
+        Ok(response) => Ok(MiddlewareReturn::Response(response)),
+        Err(_) => match output.downcast::<PyRequest>() {
+            Ok(request) => Ok(MiddlewareReturn::Request(request.clone().unbind())),
+            Err(e) => Err(PyErr::from(e).into()),
+        },
+    }
+}
+
+// Execute the before_request middleware function
 // Return type can either be a Request or a Response, we wrap it inside an enum for easier handling
 #[inline]
-pub async fn execute_middleware_function<T>(
-    input: &T,
+pub async fn execute_middleware_function(
+    request: &Py<PyRequest>,
     function: &FunctionInfo,
     context: Option<&Py<PyAny>>,
-) -> Result<MiddlewareReturn>
-where
-    T: Clone + for<'a, 'py> FromPyObject<'a, 'py> + for<'py> IntoPyObject<'py>,
-    for<'py> <T as IntoPyObject<'py>>::Error: std::fmt::Debug,
-{
+) -> Result<MiddlewareReturn> {
     if function.is_async {
         let output: Py<PyAny> = Python::with_gil(|py| -> PyResult<_> {
-            let coroutine = get_function_output(function, py, input)?;
+            let coroutine = get_function_output(function, py, request, None)?;
             let awaitable = match context {
                 Some(ctx) => wrap_coro_in_context(py, ctx.bind(py), coroutine)?,
                 None => coroutine,
@@ -289,30 +334,17 @@ where
         })?
         .await?;
 
-        Python::with_gil(|py| -> Result<MiddlewareReturn> {
-            // Try response extraction first, then request
-            match output.extract::<Response>(py) {
-                Ok(response) => Ok(MiddlewareReturn::Response(response)),
-                Err(_) => match output.extract::<Request>(py) {
-                    Ok(request) => Ok(MiddlewareReturn::Request(request)),
-                    Err(e) => Err(e.into()),
-                },
-            }
-        })
+        Python::with_gil(|py| extract_middleware_return(output.bind(py)))
     } else {
         Python::with_gil(|py| -> Result<MiddlewareReturn> {
             let output = match context {
-                Some(ctx) => get_function_output_in_context(function, py, ctx.bind(py), input)?,
-                None => get_function_output(function, py, input)?,
+                Some(ctx) => {
+                    get_function_output_in_context(function, py, ctx.bind(py), request, None)?
+                }
+                None => get_function_output(function, py, request, None)?,
             };
 
-            match output.extract::<Response>() {
-                Ok(response) => Ok(MiddlewareReturn::Response(response)),
-                Err(_) => match output.extract::<Request>() {
-                    Ok(request) => Ok(MiddlewareReturn::Request(request)),
-                    Err(e) => Err(e.into()),
-                },
-            }
+            extract_middleware_return(&output)
         })
     }
 }
@@ -465,7 +497,7 @@ where
 // Execute the after_request middleware function with both request and response
 #[inline]
 pub async fn execute_after_middleware_function(
-    request: &Request,
+    request: &Py<PyRequest>,
     response: &Response,
     function: &FunctionInfo,
     context: Option<&Py<PyAny>>,
@@ -481,16 +513,7 @@ pub async fn execute_after_middleware_function(
         })?
         .await?;
 
-        Python::with_gil(|py| -> Result<MiddlewareReturn> {
-            // Try response extraction first, then request
-            match output.extract::<Response>(py) {
-                Ok(response) => Ok(MiddlewareReturn::Response(response)),
-                Err(_) => match output.extract::<Request>(py) {
-                    Ok(request) => Ok(MiddlewareReturn::Request(request)),
-                    Err(e) => Err(e.into()),
-                },
-            }
-        })
+        Python::with_gil(|py| extract_middleware_return(output.bind(py)))
     } else {
         Python::with_gil(|py| -> Result<MiddlewareReturn> {
             let output = match context {
@@ -504,54 +527,198 @@ pub async fn execute_after_middleware_function(
                 None => get_function_output_with_two_args(function, py, request, response)?,
             };
 
-            match output.extract::<Response>() {
-                Ok(response) => Ok(MiddlewareReturn::Response(response)),
-                Err(_) => match output.extract::<Request>() {
-                    Ok(request) => Ok(MiddlewareReturn::Request(request)),
-                    Err(e) => Err(e.into()),
-                },
-            }
+            extract_middleware_return(&output)
         })
     }
 }
 
+/// Give the request the path params of its route and coerce the handler's
+/// typed params from them and the query string. `Err` carries the message of
+/// a 400 response.
+#[inline]
+fn bind_route_params<'a>(
+    py: Python,
+    request: &mut SharedRequest,
+    route_params: HashMap<String, String>,
+    function: &'a FunctionInfo,
+) -> PyResult<Result<Vec<(&'a TypedParam, ParamValue)>, String>> {
+    Ok(match request {
+        SharedRequest::Rust(request) => {
+            request.path_params = route_params;
+            resolve_typed_params(
+                &function.typed_params,
+                &request.path_params,
+                &request.query_params,
+            )
+        }
+        SharedRequest::Python(request) => {
+            let mut request = request.bind(py).try_borrow_mut()?;
+            let params =
+                resolve_typed_params(&function.typed_params, &route_params, &request.query_params);
+            request.replace_path_params(route_params);
+            params
+        }
+    })
+}
+
+/// The request argument of a handler. 0-param handlers are called without
+/// it, so the request isn't converted for them.
+#[inline]
+fn handler_request(
+    py: Python,
+    function: &FunctionInfo,
+    request: &mut SharedRequest,
+) -> PyResult<Py<PyAny>> {
+    if function.number_of_params == 0 {
+        return Ok(py.None());
+    }
+    Ok(request.to_py(py)?.into_any())
+}
+
+/// Call a sync handler, inside `context` when there is one.
+#[inline]
+fn call_sync_http_function(
+    py: Python,
+    request: &mut SharedRequest,
+    route_params: HashMap<String, String>,
+    function: &FunctionInfo,
+    context: Option<&Py<PyAny>>,
+) -> PyResult<ResponseType> {
+    let params = match bind_route_params(py, request, route_params, function)? {
+        Ok(params) => params,
+        Err(detail) => return Ok(ResponseType::Standard(bad_request(detail))),
+    };
+    let params = handler_params(function, py, params)?;
+    let request = handler_request(py, function, request)?;
+    let output = match context {
+        Some(ctx) => {
+            get_function_output_in_context(function, py, ctx.bind(py), &request, params.as_ref())?
+        }
+        None => get_function_output(function, py, &request, params.as_ref())?,
+    };
+    extract_response_type_bound(output, function.encoder.as_ref())
+}
+
 #[inline]
 pub async fn execute_http_function(
-    request: &Request,
+    request: &mut SharedRequest,
+    route_params: HashMap<String, String>,
     function: &FunctionInfo,
     context: Option<&Py<PyAny>>,
 ) -> PyResult<ResponseType> {
     if function.is_async {
-        let output = Python::with_gil(|py| -> PyResult<_> {
-            let coroutine = get_function_output(function, py, request)?;
+        let awaitable = Python::with_gil(|py| -> PyResult<_> {
+            // Invalid typed params are answered with a 400 without calling
+            // the handler
+            let params = match bind_route_params(py, request, route_params, function)? {
+                Ok(params) => params,
+                Err(detail) => return Ok(Err(bad_request(detail))),
+            };
+            let params = handler_params(function, py, params)?;
+            let request = handler_request(py, function, request)?;
+            let coroutine = get_function_output(function, py, &request, params.as_ref())?;
             let awaitable = match context {
                 Some(ctx) => wrap_coro_in_context(py, ctx.bind(py), coroutine)?,
                 None => coroutine,
             };
-            pyo3_async_runtimes::tokio::into_future(awaitable)
-        })?
-        .await?;
-
-        Python::with_gil(|py| extract_response_type(output, py))
+            pyo3_async_runtimes::tokio::into_future(awaitable).map(Ok)
+        })?;
+        let output = match awaitable {
+            Ok(awaitable) => awaitable.await?,
+            Err(response) => return Ok(ResponseType::Standard(response)),
+        };
+
+        Python::with_gil(|py| extract_response_type(output, py, function.encoder.as_ref()))
     } else {
-        Python::with_gil(|py| {
-            let output = match context {
-                Some(ctx) => get_function_output_in_context(function, py, ctx.bind(py), request)?,
-                None => get_function_output(function, py, request)?,
-            };
-            extract_response_type_bound(output)
-        })
+        Python::with_gil(|py| call_sync_http_function(py, request, route_params, function, context))
     }
 }
 
+/// The outcome of handing a sync handler to the sync executor.
+pub enum Offloaded {
+    /// The handler ran. The request and its context are handed back for the
+    /// after middlewares.
+    Done(SharedRequest, Py<PyAny>, PyResult<ResponseType>),
+    /// The executor's queue is full.
+    Rejected,
+    /// The pool dropped the task before answering.
+    Lost,
+}
+
+/// Run a sync handler on `pool` instead of the actix worker thread.
+///
+/// The request and its context are moved to the pool thread and moved back
+/// with the result, so the worker never waits for the GIL. Typed params are
+/// coerced there as well, since the request may already be a Python object.
+pub async fn execute_sync_http_function(
+    pool: &BlockingRunnerPool,
+    mut request: SharedRequest,
+    route_params: HashMap<String, String>,
+    function: Arc<FunctionInfo>,
+    context: Py<PyAny>,
+) -> Offloaded {
+    let (tx, rx) = tokio::sync::oneshot::channel();
+    let task = move |py: Python| {
+        let result =
+            call_sync_http_function(py, &mut request, route_params, &function, Some(&context));
+        let _ = tx.send((request, context, result));
+    };
+
+    match pool.try_run(task) {
+        Ok(()) => match rx.await {
+            Ok((request, context, result)) => Offloaded::Done(request, context, result),
+            Err(_) => Offloaded::Lost,
+        },
+        Err(crossbeam_channel::TrySendError::Full(_)) => Offloaded::Rejected,
+        Err(crossbeam_channel::TrySendError::Disconnected(_)) => Offloaded::Lost,
+    }
+}
+
+/// Keyword arguments for a handler with typed params: the injected
+/// dependencies plus the coerced values. `None` when there are no typed params.
 #[inline]
-fn extract_response_type(output: Py<PyAny>, py: Python) -> PyResult<ResponseType> {
-    extract_response_type_fast(output.bind(py))
+fn handler_params<'py>(
+    function: &FunctionInfo,
+    py: Python<'py>,
+    params: Vec<(&TypedParam, ParamValue)>,
+) -> PyResult<Option<Bound<'py, PyDict>>> {
+    if params.is_empty() {
+        return Ok(None);
+    }
+    let kwargs = function.kwargs.bind(py).copy()?;
+    for (param, value) in params {
+        kwargs.set_item(&param.name, value.into_py_value(py, param)?)?;
+    }
+    Ok(Some(kwargs))
 }
 
 #[inline]
-fn extract_response_type_bound(output: pyo3::Bound<'_, pyo3::PyAny>) -> PyResult<ResponseType> {
-    extract_response_type_fast(&output)
+fn bad_request(detail: String) -> Response {
+    Response {
+        status_code: 400,
+        response_type: "text".to_string(),
+        headers: text_plain_headers(),
+        description: detail.into_bytes(),
+        file_path: None,
+        cookies: Cookies::default(),
+    }
+}
+
+#[inline]
+fn extract_response_type(
+    output: Py<PyAny>,
+    py: Python,
+    encoder: Option<&Py<PyAny>>,
+) -> PyResult<ResponseType> {
+    extract_response_type_fast(output.bind(py), encoder)
+}
+
+#[inline]
+fn extract_response_type_bound(
+    output: pyo3::Bound<'_, pyo3::PyAny>,
+    encoder: Option<&Py<PyAny>>,
+) -> PyResult<ResponseType> {
+    extract_response_type_fast(&output, encoder)
 }
 
 pub async fn execute_startup_handler(
@@ -0,0 +1,56 @@
+use pyo3::exceptions::PyValueError;
+use pyo3::prelude::*;
+
+use crate::blocking::BlockingRunnerPool;
+
+/// Where sync handlers run: `app.configure_sync_executor(max_threads=32)`.
+///
+/// Without it, sync handlers are called on the actix worker thread that
+/// accepted the request, so a handler blocked on I/O stalls every other
+/// connection of that worker. With it, they are queued to a pool of Python
+/// threads that grows up to `max_threads` and shrinks back after
+/// `idle_timeout` seconds without work. Requests that find `queue_depth`
+/// handlers already waiting are answered with a 503.
+#[pyclass(frozen)]
+#[derive(Debug, Clone)]
+pub struct SyncExecutor {
+    #[pyo3(get)]
+    pub max_threads: usize,
+    #[pyo3(get)]
+    pub idle_timeout: u64,
+    #[pyo3(get)]
+    pub queue_depth: usize,
+}
+
+#[pymethods]
+impl SyncExecutor {
+    #[new]
+    #[pyo3(signature = (max_threads=32, idle_timeout=30, queue_depth=1024))]
+    pub fn new(max_threads: usize, idle_timeout: u64, queue_depth: usize) -> PyResult<Self> {
+        if max_threads == 0 {
+            return Err(PyValueError::new_err("max_threads must be greater than 0"));
+        }
+        if queue_depth == 0 {
+            return Err(PyValueError::new_err("queue_depth must be greater than 0"));
+        }
+        Ok(Self {
+            max_threads,
+            idle_timeout,
+            queue_depth,
+        })
+    }
+
+    pub fn __repr__(&self) -> String {
+        format!(
+            "SyncExecutor(max_threads={}, idle_timeout={}, queue_depth={})",
+            self.max_threads, self.idle_timeout, self.queue_depth
+        )
+    }
+}
+
+impl SyncExecutor {
+    /// Start the thread pool. Each server process builds its own.
+    pub(crate) fn build_pool(&self) -> BlockingRunnerPool {
+        BlockingRunnerPool::bounded(self.max_threads, self.idle_timeout, self.queue_depth)
+    }
+}
@@ -0,0 +1,348 @@
+use std::collections::VecDeque;
+use std::fs::Metadata;
+use std::io::{self, SeekFrom};
+use std::path::Path;
+use std::pin::Pin;
+use std::time::{SystemTime, UNIX_EPOCH};
+
+use actix_files::{file_extension_to_mime, HttpRange};
+use actix_http::body::{self, SizedStream};
+use actix_web::http::header::{
+    self, EntityTag, Header, HttpDate, IfMatch, IfModifiedSince, IfNoneMatch, IfRange,
+    IfUnmodifiedSince,
+};
+use actix_web::http::{Method, StatusCode};
+use actix_web::{web::Bytes, HttpRequest, HttpResponse, HttpResponseBuilder};
+use futures::Stream;
+use tokio::io::{AsyncReadExt, AsyncSeekExt};
+
+/// Size of the chunks a file body is read from disk in.
+const CHUNK_SIZE: u64 = 64 * 1024;
+
+/// Upper bound on the number of ranges served as `multipart/byteranges`.
+/// Requests asking for more get the whole file, which RFC 9110 allows.
+const MAX_RANGES: usize = 32;
+
+type FileStream = Pin<Box<dyn Stream<Item = Result<Bytes, io::Error>>>>;
+
+/// A piece of a file response body: either literal bytes (multipart framing)
+/// or a span of the file that is read lazily.
+enum Segment {
+    Bytes(Bytes),
+    File { offset: u64, length: u64 },
+}
+
+impl Segment {
+    fn len(&self) -> u64 {
+        match self {
+            Segment::Bytes(bytes) => bytes.len() as u64,
+            Segment::File { length, .. } => *length,
+        }
+    }
+}
+
+enum Precondition {
+    Passed,
+    Failed,
+    NotModified,
+}
+
+/// Build a response that streams `file_path` straight from disk
+///
+/// The body is read in chunks while the response is being written instead of
+/// being loaded into memory (and into a Python `bytes` object) up front.
+/// Conditional requests (`If-Match`, `If-None-Match`, `If-Modified-Since`,
+/// `If-Unmodified-Since`) are answered with 304/412 without touching the body,
+/// and `Range` requests (guarded by `If-Range`) get a 206 with either a single
+/// range or a `multipart/byteranges` body.
+///
+/// # Arguments
+///
+/// * `file_path` - The file path that we want to serve
+/// * `content_type` - The content type set by the handler, guessed from the extension if missing
+/// * `req` - The request the file is served for
+///
+pub fn file_response(
+    file_path: &str,
+    content_type: Option<&str>,
+    req: &HttpRequest,
+) -> io::Result<HttpResponse> {
+    let file = std::fs::File::open(file_path)?;
+    let metadata = file.metadata()?;
+    if !metadata.is_file() {
+        return Err(io::Error::new(
+            io::ErrorKind::NotFound,
+            format!("{} is not a file", file_path),
+        ));
+    }
+
+    let len = metadata.len();
+    let (etag, last_modified) = validators(&metadata);
+    let content_type = content_type
+        .map(str::to_owned)
+        .unwrap_or_else(|| guess_content_type(file_path));
+
+    let mut builder = HttpResponseBuilder::new(StatusCode::OK);
+    if let Some(etag) = &etag {
+        builder.insert_header((header::ETAG, etag.to_string()));
+    }
+    if let Some(last_modified) = last_modified {
+        builder.insert_header((header::LAST_MODIFIED, last_modified.to_string()));
+    }
+    builder.insert_header((header::ACCEPT_RANGES, "bytes"));
+
+    match evaluate_preconditions(req, etag.as_ref(), last_modified) {
+        Precondition::Failed => {
+            return Ok(builder.status(StatusCode::PRECONDITION_FAILED).finish());
+        }
+        Precondition::NotModified => {
+            return Ok(builder
+                .status(StatusCode::NOT_MODIFIED)
+                .body(body::None::new()));
+        }
+        Precondition::Passed => {}
+    }
+
+    let ranges = match range_header(req, etag.as_ref(), last_modified) {
+        None => None,
+        Some(range) => match HttpRange::parse(range, len) {
+            Ok(ranges) => Some(ranges),
+            Err(_) => {
+                builder.insert_header((header::CONTENT_RANGE, format!("bytes */{}", len)));
+                return Ok(builder.status(StatusCode::RANGE_NOT_SATISFIABLE).finish());
+            }
+        },
+    };
+
+    let file = tokio::fs::File::from_std(file);
+    let segments = match ranges.as_deref() {
+        Some([range]) => {
+            builder
+                .status(StatusCode::PARTIAL_CONTENT)
+                .insert_header((header::CONTENT_RANGE, content_range(range, len)))
+                .insert_header((header::CONTENT_TYPE, content_type));
+            vec![Segment::File {
+                offset: range.start,
+                length: range.length,
+            }]
+        }
+        Some(ranges) if ranges.len() <= MAX_RANGES => {
+            let boundary = uuid::Uuid::new_v4().simple().to_string();
+            builder.status(StatusCode::PARTIAL_CONTENT).insert_header((
+                header::CONTENT_TYPE,
+                format!("multipart/byteranges; boundary={}", boundary),
+            ));
+            multipart_segments(ranges, len, &content_type, &boundary)
+        }
+        _ => {
+            builder.insert_header((header::CONTENT_TYPE, content_type));
+            vec![Segment::File {
+                offset: 0,
+                length: len,
+            }]
+        }
+    };
+
+    Ok(builder.body(segments_body(file, segments)))
+}
+
+fn guess_content_type(file_path: &str) -> String {
+    let extension = Path::new(file_path)
+        .extension()
+        .and_then(|ext| ext.to_str())
+        .unwrap_or_default();
+    file_extension_to_mime(extension).to_string()
+}
+
+/// Compute the `ETag` and `Last-Modified` validators from the file metadata.
+///
+/// The ETag uses the same format as actix-files, so files served by a handler
+/// and by an `add_directory` mount hand out comparable validators.
+fn validators(metadata: &Metadata) -> (Option<EntityTag>, Option<HttpDate>) {
+    let modified = metadata.modified().ok();
+    let etag = modified
+        .and_then(|mtime| mtime.duration_since(UNIX_EPOCH).ok())
+        .map(|dur| {
+            EntityTag::new_strong(format!(
+                "{:x}:{:x}:{:x}:{:x}",
+                inode(metadata),
+                metadata.len(),
+                dur.as_secs(),
+                dur.subsec_nanos()
+            ))
+        });
+    (etag, modified.map(HttpDate::from))
+}
+
+#[cfg(unix)]
+fn inode(metadata: &Metadata) -> u64 {
+    use std::os::unix::fs::MetadataExt;
+    metadata.ino()
+}
+
+#[cfg(not(unix))]
+fn inode(_metadata: &Metadata) -> u64 {
+    0
+}
+
+/// HTTP dates only carry whole seconds, so compare at that precision.
+fn unix_secs(date: HttpDate) -> u64 {
+    SystemTime::from(date)
+        .duration_since(UNIX_EPOCH)
+        .map(|dur| dur.as_secs())
+        .unwrap_or_default()
+}
+
+fn typed_header<H: Header>(req: &HttpRequest) -> Option<H> {
+    if !req.headers().contains_key(H::name()) {
+        return None;
+    }
+    H::parse(req).ok()
+}
+
+/// Evaluate the request preconditions in the order given by RFC 9110 §13.2.2.
+fn evaluate_preconditions(
+    req: &HttpRequest,
+    etag: Option<&EntityTag>,
+    last_modified: Option<HttpDate>,
+) -> Precondition {
+    if let Some(if_match) = typed_header::<IfMatch>(req) {
+        let matches = match if_match {
+            IfMatch::Any => true,
+            IfMatch::Items(items) => {
+                etag.is_some_and(|etag| items.iter().any(|item| item.strong_eq(etag)))
+            }
+        };
+        if !matches {
+            return Precondition::Failed;
+        }
+    } else if let Some(IfUnmodifiedSince(since)) = typed_header::<IfUnmodifiedSince>(req) {
+        if last_modified.is_some_and(|modified| unix_secs(modified) > unix_secs(since)) {
+            return Precondition::Failed;
+        }
+    }
+
+    let is_read = req.method() == Method::GET || req.method() == Method::HEAD;
+    if let Some(if_none_match) = typed_header::<IfNoneMatch>(req) {
+        let matches = match if_none_match {
+            IfNoneMatch::Any => true,
+            IfNoneMatch::Items(items) => {
+                etag.is_some_and(|etag| items.iter().any(|item| item.weak_eq(etag)))
+            }
+        };
+        if matches {
+            return if is_read {
+                Precondition::NotModified
+            } else {
+                Precondition::Failed
+            };
+        }
+    } else if let Some(IfModifiedSince(since)) = typed_header::<IfModifiedSince>(req) {
+        if is_read && last_modified.is_some_and(|modified| unix_secs(modified) <= unix_secs(since))
+        {
+            return Precondition::NotModified;
+        }
+    }
+
+    Precondition::Passed
+}
+
+/// Return the `Range` header to honour, if any. A range is only served for GET
+/// requests, and only while the `If-Range` validator (if sent) still matches;
+/// otherwise the whole, current file is sent.
+fn range_header<'a>(
+    req: &'a HttpRequest,
+    etag: Option<&EntityTag>,
+    last_modified: Option<HttpDate>,
+) -> Option<&'a str> {
+    if req.method() != Method::GET {
+        return None;
+    }
+    let range = req.headers().get(header::RANGE)?.to_str().ok()?;
+
+    if req.headers().contains_key(header::IF_RANGE) {
+        let fresh = match typed_header::<IfRange>(req) {
+            Some(IfRange::EntityTag(tag)) => etag.is_some_and(|etag| tag.strong_eq(etag)),
+            Some(IfRange::Date(date)) => {
+                last_modified.is_some_and(|modified| unix_secs(modified) == unix_secs(date))
+            }
+            None => false,
+        };
+        if !fresh {
+            return None;
+        }
+    }
+
+    Some(range)
+}
+
+fn content_range(range: &HttpRange, len: u64) -> String {
+    format!(
+        "bytes {}-{}/{}",
+        range.start,
+        range.start + range.length - 1,
+        len
+    )
+}
+
+fn multipart_segments(
+    ranges: &[HttpRange],
+    len: u64,
+    content_type: &str,
+    boundary: &str,
+) -> Vec<Segment> {
+    let mut segments = Vec::with_capacity(ranges.len() * 2 + 1);
+    for range in ranges {
+        segments.push(Segment::Bytes(Bytes::from(format!(
+            "\r\n--{}\r\nContent-Type: {}\r\nContent-Range: {}\r\n\r\n",
+            boundary,
+            content_type,
+            content_range(range, len)
+        ))));
+        segments.push(Segment::File {
+            offset: range.start,
+            length: range.length,
+        });
+    }
+    segments.push(Segment::Bytes(Bytes::from(format!(
+        "\r\n--{}--\r\n",
+        boundary
+    ))));
+    segments
+}
+
+fn segments_body(file: tokio::fs::File, segments: Vec<Segment>) -> SizedStream<FileStream> {
+    let size = segments.iter().map(Segment::len).sum();
+    let stream: FileStream = Box::pin(futures::stream::try_unfold(
+        (file, VecDeque::from(segments)),
+        |(file, segments)| next_chunk(file, segments),
+    ));
+    SizedStream::new(size, stream)
+}
+
+async fn next_chunk(
+    mut file: tokio::fs::File,
+    mut segments: VecDeque<Segment>,
+) -> io::Result<Option<(Bytes, (tokio::fs::File, VecDeque<Segment>))>> {
+    loop {
+        match segments.pop_front() {
+            None => return Ok(None),
+            Some(Segment::Bytes(bytes)) => return Ok(Some((bytes, (file, segments)))),
+            Some(Segment::File { length: 0, .. }) => continue,
+            Some(Segment::File { offset, length }) => {
+                let chunk_len = length.min(CHUNK_SIZE);
+                file.seek(SeekFrom::Start(offset)).await?;
+                let mut chunk = vec![0; chunk_len as usize];
+                file.read_exact(&mut chunk).await?;
+
+                if length > chunk_len {
+                    segments.push_front(Segment::File {
+                        offset: offset + chunk_len,
+                        length: length - chunk_len,
+                    });
+                }
+                return Ok(Some((Bytes::from(chunk), (file, segments))));
+            }
+        }
+    }
+}
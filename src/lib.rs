@@ -1,6 +1,7 @@
 mod asyncio;
 mod blocking;
 mod callbacks;
+mod compression;
 mod conversion;
 mod executors;
 mod io_helpers;
@@ -11,12 +12,16 @@ mod shared_socket;
 mod types;
 mod websockets;
 
+use compression::Compression;
+use executors::sync_executor::SyncExecutor;
 use server::Server;
 use shared_socket::SocketHeld;
 
 // pyO3 module
 use pyo3::prelude::*;
 use types::{
+    body_stream::BodyStream,
+    cache_policy::CachePolicy,
     cookie::{Cookie, Cookies, CookiesIter},
     function_info::{FunctionInfo, MiddlewareType},
     headers::Headers,
@@ -24,17 +29,23 @@ use types::{
     multimap::QueryParams,
     request::PyRequest,
     response::{PyResponse, PyStreamingResponse},
+    sse_hub::{SSEHub, SSESubscription},
+    typed_param::TypedParam,
+    upload_file::UploadFile,
     HttpMethod, Url,
 };
 
-use websockets::{registry::WebSocketRegistry, WebSocketChannel, WebSocketConnector};
+use websockets::{
+    limits::WebSocketLimits, registry::WebSocketRegistry, WebSocketChannel, WebSocketConnector,
+};
 
 #[pyfunction]
 fn get_version() -> String {
     env!("CARGO_PKG_VERSION").into()
 }
 
-#[pymodule]
+// Every pyclass is Sync, so the module runs without the GIL on free-threaded builds
+#[pymodule(gil_used = false)]
 pub fn robyn(_py: Python, m: &Bound<'_, PyModule>) -> PyResult<()> {
     // the pymodule class/function to make the rustPyFunctions available
     m.add_function(wrap_pyfunction!(get_version, m)?)?;
@@ -47,12 +58,21 @@ pub fn robyn(_py: Python, m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_class::<WebSocketRegistry>()?;
     m.add_class::<WebSocketConnector>()?;
     m.add_class::<WebSocketChannel>()?;
+    m.add_class::<WebSocketLimits>()?;
     m.add_class::<SocketHeld>()?;
     m.add_class::<FunctionInfo>()?;
+    m.add_class::<TypedParam>()?;
+    m.add_class::<CachePolicy>()?;
+    m.add_class::<Compression>()?;
+    m.add_class::<SyncExecutor>()?;
     m.add_class::<Identity>()?;
     m.add_class::<PyRequest>()?;
+    m.add_class::<BodyStream>()?;
+    m.add_class::<UploadFile>()?;
     m.add_class::<PyResponse>()?;
     m.add_class::<PyStreamingResponse>()?;
+    m.add_class::<SSEHub>()?;
+    m.add_class::<SSESubscription>()?;
     m.add_class::<Url>()?;
     m.add_class::<QueryParams>()?;
     m.add_class::<MiddlewareType>()?;
@@ -1,14 +1,16 @@
-use actix_http::StatusCode;
+use actix_http::{body::BodySize, StatusCode};
+use actix_web::http::header::{HeaderMap, HeaderName, HeaderValue, CONTENT_ENCODING, VARY};
 use actix_web::{web::Bytes, HttpResponse, HttpResponseBuilder};
 use parking_lot::RwLock;
 use std::collections::HashMap;
 use std::sync::Arc;
 
+use crate::compression::{Compression, Encoding};
 use crate::executors::execute_http_function;
 use crate::types::cookie::Cookies;
 use crate::types::function_info::FunctionInfo;
 use crate::types::headers::Headers;
-use crate::types::request::Request;
+use crate::types::request::{Request, SharedRequest};
 use crate::types::response::Response;
 use crate::types::HttpMethod;
 use anyhow::Context;
@@ -27,16 +29,16 @@ pub struct CachedResponse {
     pub headers: Arc<Vec<(String, String)>>,
     pub body: Bytes,
     route_header_count: usize,
+    // The body precompressed with each configured encoding, empty when the
+    // response is not compressible or compression is off
+    compressed: Arc<Vec<(Encoding, Bytes)>>,
 }
 
 impl CachedResponse {
-    fn from_response(response: &Response) -> Self {
+    pub(crate) fn from_response(response: &Response) -> Self {
         let mut headers = Vec::new();
-        for entry in response.headers.headers.iter() {
-            let (key, values) = entry.pair();
-            for value in values {
-                headers.push((key.clone(), value.clone()));
-            }
+        for (key, value) in response.headers.iter() {
+            headers.push((key.to_string(), value.to_string()));
         }
         for (name, cookie) in &response.cookies.cookies {
             if let Ok(header_value) = cookie.to_header_value(name) {
@@ -44,30 +46,141 @@ impl CachedResponse {
             }
         }
         let route_header_count = headers.len();
+        // Const routes are evaluated once, so a file response is read a single
+        // time here rather than being streamed from disk on every request.
+        let body = match &response.file_path {
+            Some(file_path) => match std::fs::read(file_path) {
+                Ok(content) => Bytes::from(content),
+                Err(e) => {
+                    log::error!("Failed to read file '{}' for const route: {}", file_path, e);
+                    Bytes::new()
+                }
+            },
+            None => Bytes::from(response.description.clone()),
+        };
         Self {
             status: StatusCode::from_u16(response.status_code)
                 .unwrap_or(StatusCode::INTERNAL_SERVER_ERROR),
             headers: Arc::new(headers),
-            body: Bytes::from(response.description.clone()),
+            body,
             route_header_count,
+            compressed: Arc::new(Vec::new()),
         }
     }
 
+    /// The full response, with the precompressed body for `encoding` when
+    /// there is one.
+    #[inline(always)]
+    pub fn to_http_response(&self, encoding: Option<Encoding>) -> HttpResponse {
+        self.build_http_response(self.headers.len(), encoding)
+    }
+
     #[inline(always)]
-    pub fn to_http_response(&self) -> HttpResponse {
+    pub fn to_http_response_without_global_headers(
+        &self,
+        encoding: Option<Encoding>,
+    ) -> HttpResponse {
+        self.build_http_response(self.route_header_count, encoding)
+    }
+
+    #[inline(always)]
+    fn build_http_response(&self, header_count: usize, encoding: Option<Encoding>) -> HttpResponse {
         let mut builder = HttpResponseBuilder::new(self.status);
-        for (k, v) in self.headers.as_ref() {
+        for (k, v) in self.headers.iter().take(header_count) {
             builder.append_header((k.as_str(), v.as_str()));
         }
-        builder.body(self.body.clone())
+        if self.compressed.is_empty() {
+            return builder.body(self.body.clone());
+        }
+
+        builder.append_header((VARY, "accept-encoding"));
+        let compressed = encoding.and_then(|encoding| {
+            self.compressed
+                .iter()
+                .find(|(compressed_encoding, _)| *compressed_encoding == encoding)
+        });
+        match compressed {
+            Some((encoding, body)) => {
+                builder.insert_header((CONTENT_ENCODING, encoding.as_str()));
+                builder.body(body.clone())
+            }
+            None => builder.body(self.body.clone()),
+        }
     }
 
-    #[inline(always)]
-    pub fn to_http_response_without_global_headers(&self) -> HttpResponse {
+    /// Compress the body with every encoding of `compression`, if the
+    /// response is compressible.
+    fn precompress(&self, compression: &Compression) -> Vec<(Encoding, Bytes)> {
+        let mut headers = HeaderMap::new();
+        for (k, v) in self.headers.iter() {
+            if let (Ok(name), Ok(value)) = (
+                HeaderName::from_bytes(k.as_bytes()),
+                HeaderValue::from_str(v),
+            ) {
+                headers.append(name, value);
+            }
+        }
+        let body_size = BodySize::Sized(self.body.len() as u64);
+        if !compression.is_compressible(self.status, &headers, body_size) {
+            return Vec::new();
+        }
+
+        compression
+            .encodings()
+            .iter()
+            .filter_map(
+                |&encoding| match compression.compress(encoding, &self.body) {
+                    Ok(body) => Some((encoding, body)),
+                    Err(e) => {
+                        log::error!("Failed to precompress const route response: {}", e);
+                        None
+                    }
+                },
+            )
+            .collect()
+    }
+
+    /// Convert back to a `Response`, for the paths that still run middlewares.
+    /// Only the route's own headers are kept: global response headers are
+    /// applied again by the caller.
+    pub fn to_response(&self) -> Response {
+        let mut response = Response {
+            status_code: self.status.as_u16(),
+            response_type: "text".to_string(),
+            headers: Headers::new(None),
+            description: self.body.to_vec(),
+            file_path: None,
+            cookies: Cookies::new(),
+        };
+        for (k, v) in self.headers.iter().take(self.route_header_count) {
+            response.headers.set(k.clone(), v.clone());
+        }
+        response
+    }
+
+    /// Build the response for a cache hit served without going through
+    /// `index`: global response headers the route did not set are added,
+    /// unless the path is excluded from them.
+    pub fn to_http_response_with_global_headers(
+        &self,
+        global_headers: Option<&Headers>,
+    ) -> HttpResponse {
         let mut builder = HttpResponseBuilder::new(self.status);
-        for (k, v) in self.headers.as_ref().iter().take(self.route_header_count) {
+        for (k, v) in self.headers.as_ref() {
             builder.append_header((k.as_str(), v.as_str()));
         }
+        if let Some(global_headers) = global_headers {
+            for (key, value) in global_headers.iter() {
+                if self
+                    .headers
+                    .iter()
+                    .any(|(k, _)| k.eq_ignore_ascii_case(key))
+                {
+                    continue;
+                }
+                builder.append_header((key, value));
+            }
+        }
         builder.body(self.body.clone())
     }
 }
@@ -104,7 +217,8 @@ impl Router<Response, HttpMethod> for ConstRouter {
             event_loop.context("Event loop must be provided to add a route to the const router")?;
 
         pyo3_async_runtimes::tokio::run_until_complete(event_loop, async move {
-            let output = execute_http_function(&Request::default(), &function, None)
+            let mut request = SharedRequest::Rust(Request::default());
+            let output = execute_http_function(&mut request, HashMap::new(), &function, None)
                 .await
                 .unwrap();
             match output {
@@ -170,22 +284,33 @@ impl ConstRouter {
     /// Bake global response headers into all cached responses.
     /// Called once at server start, after global headers are set.
     pub fn bake_global_headers(&self, global_headers: &Headers) {
-        let mut extra_headers: Vec<(String, String)> = Vec::new();
-        for entry in global_headers.headers.iter() {
-            let (key, values) = entry.pair();
-            for value in values {
-                extra_headers.push((key.clone(), value.clone()));
-            }
-        }
+        let extra_headers: Vec<(String, String)> = global_headers
+            .iter()
+            .map(|(key, value)| (key.to_string(), value.to_string()))
+            .collect();
         if extra_headers.is_empty() {
             return;
         }
+        self.update_cached_routes(|cached| {
+            let mut combined = cached.headers.as_ref().clone();
+            combined.extend(extra_headers.iter().cloned());
+            cached.headers = Arc::new(combined);
+        });
+    }
+
+    /// Precompress all cached responses with every configured encoding.
+    /// Called once at server start, after global headers are baked.
+    pub fn bake_compression(&self, compression: &Compression) {
+        self.update_cached_routes(|cached| {
+            cached.compressed = Arc::new(cached.precompress(compression));
+        });
+    }
+
+    fn update_cached_routes(&self, update: impl Fn(&mut CachedResponse)) {
         for (method, fast_table) in &self.fast_routes {
             let mut map = fast_table.write();
             for cached in map.values_mut() {
-                let mut combined = cached.headers.as_ref().clone();
-                combined.extend(extra_headers.iter().cloned());
-                cached.headers = Arc::new(combined);
+                update(cached);
             }
 
             if let Some(route_table) = self.routes.get(method) {
@@ -1,23 +1,54 @@
 use parking_lot::RwLock;
 use pyo3::{Bound, Python};
 use std::collections::HashMap;
+use std::sync::atomic::{AtomicBool, Ordering};
+use std::sync::{Arc, OnceLock};
 
 use matchit::Router as MatchItRouter;
 
 use anyhow::{Context, Result};
 
+use crate::routers::middleware_router::{MiddlewareChain, MiddlewareRouter};
 use crate::routers::Router;
+use crate::types::cache_policy::ResponseCache;
 use crate::types::function_info::FunctionInfo;
 use crate::types::HttpMethod;
 
-type RouteMap = RwLock<MatchItRouter<FunctionInfo>>;
+// Handlers are shared behind an `Arc`, so a lookup only bumps a Rust
+// refcount and never needs the GIL.
+type RouteMap = RwLock<MatchItRouter<Arc<RouteEntry>>>;
+
+/// A route's handler and the middlewares that run around it.
+pub struct RouteEntry {
+    pub function: Arc<FunctionInfo>,
+    // Resolved once the server starts, see `resolve_middleware_chains`
+    middlewares: OnceLock<MiddlewareChain>,
+}
+
+impl RouteEntry {
+    /// The route's middlewares, unless they have to be resolved per request.
+    #[inline]
+    pub fn middlewares(&self) -> Option<&MiddlewareChain> {
+        self.middlewares.get()
+    }
+}
 
 /// Contains the thread safe hashmaps of different routes
 pub struct HttpRouter {
     routes: HashMap<HttpMethod, RouteMap>,
+    // Every route with its template, which matchit can't list
+    entries: RwLock<Vec<(HttpMethod, String, Arc<RouteEntry>)>>,
+    // Routes registered with `stream_body=True`. Looked up before the request
+    // body is read, so kept apart from `routes` to avoid cloning FunctionInfo.
+    streaming_routes: HashMap<HttpMethod, RwLock<MatchItRouter<()>>>,
+    has_streaming_routes: AtomicBool,
+    // Response caches of routes registered with a `CachePolicy`, looked up
+    // before entering Python so a hit never takes the GIL.
+    cached_routes: HashMap<HttpMethod, RwLock<MatchItRouter<Arc<ResponseCache>>>>,
+    has_cached_routes: AtomicBool,
 }
 
-impl Router<(FunctionInfo, HashMap<String, String>), HttpMethod> for HttpRouter {
+impl Router<(Arc<FunctionInfo>, HashMap<String, String>), HttpMethod> for HttpRouter {
     fn add_route<'py>(
         &self,
         _py: Python,
@@ -28,8 +59,16 @@ impl Router<(FunctionInfo, HashMap<String, String>), HttpMethod> for HttpRouter
     ) -> Result<()> {
         let table = self.routes.get(route_type).context("No relevant map")?;
 
-        // try removing unwrap here
-        table.write().insert(route.to_string(), function)?;
+        let entry = Arc::new(RouteEntry {
+            function: Arc::new(function),
+            middlewares: OnceLock::new(),
+        });
+        table
+            .write()
+            .insert(route.to_string(), Arc::clone(&entry))?;
+        self.entries
+            .write()
+            .push((route_type.clone(), route.to_string(), entry));
 
         Ok(())
     }
@@ -38,7 +77,48 @@ impl Router<(FunctionInfo, HashMap<String, String>), HttpMethod> for HttpRouter
         &self,
         route_method: &HttpMethod,
         route: &str,
-    ) -> Option<(FunctionInfo, HashMap<String, String>)> {
+    ) -> Option<(Arc<FunctionInfo>, HashMap<String, String>)> {
+        self.get_route_entry(route_method, route)
+            .map(|(entry, route_params)| (Arc::clone(&entry.function), route_params))
+    }
+}
+
+impl HttpRouter {
+    pub fn new() -> Self {
+        let mut routes = HashMap::new();
+        let mut streaming_routes = HashMap::new();
+        let mut cached_routes = HashMap::new();
+        for method in [
+            HttpMethod::GET,
+            HttpMethod::POST,
+            HttpMethod::PUT,
+            HttpMethod::DELETE,
+            HttpMethod::PATCH,
+            HttpMethod::HEAD,
+            HttpMethod::OPTIONS,
+            HttpMethod::CONNECT,
+            HttpMethod::TRACE,
+        ] {
+            routes.insert(method.clone(), RwLock::new(MatchItRouter::new()));
+            streaming_routes.insert(method.clone(), RwLock::new(MatchItRouter::new()));
+            cached_routes.insert(method, RwLock::new(MatchItRouter::new()));
+        }
+        Self {
+            routes,
+            entries: RwLock::new(Vec::new()),
+            streaming_routes,
+            has_streaming_routes: AtomicBool::new(false),
+            cached_routes,
+            has_cached_routes: AtomicBool::new(false),
+        }
+    }
+
+    /// The route matching `route`, with its path params.
+    pub fn get_route_entry(
+        &self,
+        route_method: &HttpMethod,
+        route: &str,
+    ) -> Option<(Arc<RouteEntry>, HashMap<String, String>)> {
         let table = self.routes.get(route_method)?;
 
         let table_lock = table.read();
@@ -50,26 +130,74 @@ impl Router<(FunctionInfo, HashMap<String, String>), HttpMethod> for HttpRouter
                 route_params.insert(key.to_string(), value.to_string());
             }
 
-            let function_info = Python::with_gil(|_| res.value.to_owned());
-            return Some((function_info, route_params));
+            return Some((Arc::clone(res.value), route_params));
         }
 
         None
     }
-}
 
-impl HttpRouter {
-    pub fn new() -> Self {
-        let mut routes = HashMap::new();
-        routes.insert(HttpMethod::GET, RwLock::new(MatchItRouter::new()));
-        routes.insert(HttpMethod::POST, RwLock::new(MatchItRouter::new()));
-        routes.insert(HttpMethod::PUT, RwLock::new(MatchItRouter::new()));
-        routes.insert(HttpMethod::DELETE, RwLock::new(MatchItRouter::new()));
-        routes.insert(HttpMethod::PATCH, RwLock::new(MatchItRouter::new()));
-        routes.insert(HttpMethod::HEAD, RwLock::new(MatchItRouter::new()));
-        routes.insert(HttpMethod::OPTIONS, RwLock::new(MatchItRouter::new()));
-        routes.insert(HttpMethod::CONNECT, RwLock::new(MatchItRouter::new()));
-        routes.insert(HttpMethod::TRACE, RwLock::new(MatchItRouter::new()));
-        Self { routes }
+    /// Resolve the middlewares of every route once, so requests don't have to
+    /// look them up. Called when the server starts, after every middleware
+    /// has been registered.
+    pub fn resolve_middleware_chains(&self, middleware_router: &MiddlewareRouter) {
+        for (method, route, entry) in self.entries.read().iter() {
+            if let Some(chain) = middleware_router.resolve_chain(&method.to_string(), route) {
+                let _ = entry.middlewares.set(chain);
+            }
+        }
+    }
+
+    /// Mark a route as receiving its request body as a stream.
+    pub fn add_streaming_route(&self, route_type: &HttpMethod, route: &str) -> Result<()> {
+        let table = self
+            .streaming_routes
+            .get(route_type)
+            .context("No relevant map")?;
+        table.write().insert(route.to_string(), ())?;
+        self.has_streaming_routes.store(true, Ordering::Release);
+        Ok(())
+    }
+
+    /// Whether the request body for `route` should be streamed to the handler
+    /// instead of being read up front.
+    #[inline]
+    pub fn is_streaming_route(&self, route_method: &HttpMethod, route: &str) -> bool {
+        if !self.has_streaming_routes.load(Ordering::Acquire) {
+            return false;
+        }
+        self.streaming_routes
+            .get(route_method)
+            .is_some_and(|table| table.read().at(route).is_ok())
+    }
+
+    /// Attach a response cache to a route.
+    pub fn add_cached_route(
+        &self,
+        route_type: &HttpMethod,
+        route: &str,
+        cache: Arc<ResponseCache>,
+    ) -> Result<()> {
+        let table = self
+            .cached_routes
+            .get(route_type)
+            .context("No relevant map")?;
+        table.write().insert(route.to_string(), cache)?;
+        self.has_cached_routes.store(true, Ordering::Release);
+        Ok(())
+    }
+
+    /// The response cache of `route`, if it was registered with one.
+    #[inline]
+    pub fn get_response_cache(
+        &self,
+        route_method: &HttpMethod,
+        route: &str,
+    ) -> Option<Arc<ResponseCache>> {
+        if !self.has_cached_routes.load(Ordering::Acquire) {
+            return None;
+        }
+        let table = self.cached_routes.get(route_method)?;
+        let table_lock = table.read();
+        table_lock.at(route).ok().map(|res| Arc::clone(res.value))
     }
 }
@@ -1,6 +1,6 @@
 use std::collections::HashMap;
 use std::sync::atomic::{AtomicBool, Ordering};
-use std::sync::RwLock;
+use std::sync::{Arc, RwLock};
 
 use anyhow::{Context, Error, Result};
 use matchit::Router as MatchItRouter;
@@ -13,15 +13,66 @@ use crate::types::function_info::{FunctionInfo, MiddlewareType};
 // `auth_required` handler plus a custom `@before_request`), so each route
 // template maps to a *list* of middlewares run in registration order (#1158,
 // #828). matchit stores a single value per template, hence the Vec.
-type RouteMap = RwLock<MatchItRouter<Vec<FunctionInfo>>>;
+type RouteMap = RwLock<MatchItRouter<Vec<Arc<FunctionInfo>>>>;
+
+/// A global middleware and the routes it opts out of.
+struct GlobalMiddleware {
+    function: Arc<FunctionInfo>,
+    skip_const_routes: bool,
+    // Route templates (`/health`, `/static/*path`) the middleware does not run for
+    excluded: Option<MatchItRouter<()>>,
+    excluded_routes: Vec<String>,
+}
+
+impl GlobalMiddleware {
+    fn applies_to(&self, route: &str, is_const_route: bool) -> bool {
+        if is_const_route && self.skip_const_routes {
+            return false;
+        }
+        !self
+            .excluded
+            .as_ref()
+            .is_some_and(|excluded| excluded.at(route).is_ok())
+    }
+
+    /// Whether the middleware runs for every path of the route template
+    /// `route` (`Some(true)`), for none of them (`Some(false)`), or only for
+    /// some (`None`).
+    fn applies_to_template(&self, route: &str) -> Option<bool> {
+        let mut applies = true;
+        for excluded in &self.excluded_routes {
+            if excluded == route {
+                applies = false;
+            } else if may_overlap(excluded, route) {
+                return None;
+            }
+        }
+        Some(applies)
+    }
+}
+
+/// The middlewares that run around a route, in order: the global ones first,
+/// then the route's own.
+pub struct MiddlewareChain {
+    pub before: Vec<Arc<FunctionInfo>>,
+    pub after: Vec<Arc<FunctionInfo>>,
+    /// Whether a route middleware runs before the handler, in which case the
+    /// before middlewares see the route's path params.
+    pub has_route_before: bool,
+}
 
 pub struct MiddlewareRouter {
-    globals: HashMap<MiddlewareType, RwLock<Vec<FunctionInfo>>>,
+    globals: HashMap<MiddlewareType, RwLock<Vec<GlobalMiddleware>>>,
     routes: HashMap<MiddlewareType, RouteMap>,
+    // The templates registered in `routes`, which matchit can't list
+    route_templates: HashMap<MiddlewareType, RwLock<Vec<String>>>,
     has_middleware: AtomicBool,
+    has_route_middleware: AtomicBool,
 }
 
-impl Router<(Vec<FunctionInfo>, HashMap<String, String>), MiddlewareType> for MiddlewareRouter {
+impl Router<(Vec<Arc<FunctionInfo>>, HashMap<String, String>), MiddlewareType>
+    for MiddlewareRouter
+{
     fn add_route<'py>(
         &self,
         _py: Python,
@@ -36,12 +87,20 @@ impl Router<(Vec<FunctionInfo>, HashMap<String, String>), MiddlewareType> for Mi
         // Append to the existing chain if this route template is already
         // registered, otherwise start a new one. Registering the same route
         // template twice used to panic on the matchit insert conflict (#1158).
+        let function = Arc::new(function);
         if table.at(route).is_ok() {
             table.at_mut(route).unwrap().value.push(function);
         } else {
             table.insert(route.to_string(), vec![function])?;
+            self.route_templates
+                .get(route_type)
+                .context("No relevant map")?
+                .write()
+                .unwrap()
+                .push(route.to_string());
         }
         self.has_middleware.store(true, Ordering::Release);
+        self.has_route_middleware.store(true, Ordering::Release);
 
         Ok(())
     }
@@ -50,7 +109,7 @@ impl Router<(Vec<FunctionInfo>, HashMap<String, String>), MiddlewareType> for Mi
         &self,
         route_method: &MiddlewareType,
         route: &str,
-    ) -> Option<(Vec<FunctionInfo>, HashMap<String, String>)> {
+    ) -> Option<(Vec<Arc<FunctionInfo>>, HashMap<String, String>)> {
         let table = self.routes.get(route_method)?;
 
         let table_lock = table.read().ok()?;
@@ -60,9 +119,7 @@ impl Router<(Vec<FunctionInfo>, HashMap<String, String>), MiddlewareType> for Mi
             route_params.insert(key.to_string(), value.to_string());
         }
 
-        let functions = Python::with_gil(|_| res.value.to_owned());
-
-        Some((functions, route_params))
+        Some((res.value.clone(), route_params))
     }
 }
 
@@ -80,10 +137,15 @@ impl MiddlewareRouter {
             MiddlewareType::AfterRequest,
             RwLock::new(MatchItRouter::new()),
         );
+        let mut route_templates = HashMap::new();
+        route_templates.insert(MiddlewareType::BeforeRequest, RwLock::new(vec![]));
+        route_templates.insert(MiddlewareType::AfterRequest, RwLock::new(vec![]));
         Self {
             globals,
             routes,
+            route_templates,
             has_middleware: AtomicBool::new(false),
+            has_route_middleware: AtomicBool::new(false),
         }
     }
 
@@ -91,27 +153,145 @@ impl MiddlewareRouter {
         &self,
         middleware_type: &MiddlewareType,
         function: FunctionInfo,
+        skip_const_routes: bool,
+        excluded_routes: &[String],
     ) -> Result<()> {
+        let excluded = if excluded_routes.is_empty() {
+            None
+        } else {
+            let mut excluded = MatchItRouter::new();
+            for route in excluded_routes {
+                excluded.insert(route.clone(), ())?;
+            }
+            Some(excluded)
+        };
+
         self.globals
             .get(middleware_type)
             .context("No relevant map")?
             .write()
             .unwrap()
-            .push(function);
+            .push(GlobalMiddleware {
+                function: Arc::new(function),
+                skip_const_routes,
+                excluded,
+                excluded_routes: excluded_routes.to_vec(),
+            });
         self.has_middleware.store(true, Ordering::Release);
         Ok(())
     }
 
-    pub fn get_global_middlewares(&self, middleware_type: &MiddlewareType) -> Vec<FunctionInfo> {
+    /// The global middlewares of `middleware_type` that run for `route`.
+    pub fn get_global_middlewares(
+        &self,
+        middleware_type: &MiddlewareType,
+        route: &str,
+        is_const_route: bool,
+    ) -> Vec<Arc<FunctionInfo>> {
         self.globals
             .get(middleware_type)
             .unwrap()
             .read()
             .unwrap()
-            .to_vec()
+            .iter()
+            .filter(|middleware| middleware.applies_to(route, is_const_route))
+            .map(|middleware| middleware.function.clone())
+            .collect()
+    }
+
+    /// The middlewares that run for every request to the route template
+    /// `route`, resolved once so requests don't have to look them up.
+    ///
+    /// `None` when they depend on the request's path: a route middleware or
+    /// an exclusion on some of the route's paths only, e.g. `/users/admin`
+    /// for the route `/users/:id`. Such routes keep resolving middlewares
+    /// per request.
+    pub fn resolve_chain(&self, method: &str, route: &str) -> Option<MiddlewareChain> {
+        let route_with_method = format!("{}{}", method, route);
+        let mut chain = MiddlewareChain {
+            before: Vec::new(),
+            after: Vec::new(),
+            has_route_before: false,
+        };
+
+        for (middleware_type, functions) in [
+            (MiddlewareType::BeforeRequest, &mut chain.before),
+            (MiddlewareType::AfterRequest, &mut chain.after),
+        ] {
+            for middleware in self.globals.get(&middleware_type)?.read().unwrap().iter() {
+                if middleware.applies_to_template(route)? {
+                    functions.push(Arc::clone(&middleware.function));
+                }
+            }
+            let global_count = functions.len();
+
+            let templates = self.route_templates.get(&middleware_type)?.read().unwrap();
+            for template in templates.iter() {
+                if *template == route_with_method {
+                    let table = self.routes.get(&middleware_type)?.read().unwrap();
+                    functions.extend(table.at(template).ok()?.value.iter().cloned());
+                } else if may_overlap(template, &route_with_method) {
+                    return None;
+                }
+            }
+            if middleware_type == MiddlewareType::BeforeRequest {
+                chain.has_route_before = functions.len() > global_count;
+            }
+        }
+
+        Some(chain)
     }
 
     pub fn has_any_middleware(&self) -> bool {
         self.has_middleware.load(Ordering::Acquire)
     }
+
+    /// Whether any middleware runs for the const route at `route`, in which
+    /// case the request cannot be answered from the const fast path.
+    ///
+    /// `method` and `route` are joined the way route middlewares are keyed.
+    pub fn has_middleware_for_const_route(&self, method: &str, route: &str) -> bool {
+        if !self.has_any_middleware() {
+            return false;
+        }
+
+        if self.has_route_middleware.load(Ordering::Acquire) {
+            let route_with_method = format!("{}{}", method, route);
+            if self
+                .routes
+                .values()
+                .any(|table| table.read().unwrap().at(&route_with_method).is_ok())
+            {
+                return true;
+            }
+        }
+
+        self.globals.values().any(|globals| {
+            globals
+                .read()
+                .unwrap()
+                .iter()
+                .any(|middleware| middleware.applies_to(route, true))
+        })
+    }
+}
+
+/// Whether some path could match both route templates. Catch-all segments
+/// are assumed to overlap with anything.
+fn may_overlap(a: &str, b: &str) -> bool {
+    let (mut a, mut b) = (a.split('/'), b.split('/'));
+    loop {
+        match (a.next(), b.next()) {
+            (None, None) => return true,
+            (Some(x), Some(y)) => {
+                if x.contains('*') || y.contains('*') {
+                    return true;
+                }
+                if x != y && !x.contains(':') && !y.contains(':') {
+                    return false;
+                }
+            }
+            (Some(rest), None) | (None, Some(rest)) => return rest.contains('*'),
+        }
+    }
 }
@@ -1,25 +1,29 @@
+use crate::blocking::BlockingRunnerPool;
+use crate::compression::Compression;
+use crate::executors::sync_executor::SyncExecutor;
 use crate::executors::{
     execute_after_middleware_function, execute_http_function, execute_middleware_function,
-    execute_startup_handler,
+    execute_startup_handler, execute_sync_http_function, Offloaded,
 };
 
 use crate::routers::const_router::ConstRouter;
 use crate::routers::Router;
 
-use crate::routers::http_router::HttpRouter;
+use crate::routers::http_router::{HttpRouter, RouteEntry};
 use crate::routers::{middleware_router::MiddlewareRouter, web_socket_router::WebSocketRouter};
 use crate::shared_socket::SocketHeld;
-use crate::types::cookie::Cookies;
+use crate::types::cache_policy::CachePolicy;
 use crate::types::function_info::{FunctionInfo, MiddlewareType};
 use crate::types::headers::Headers;
-use crate::types::request::Request;
+use crate::types::request::{route_path, MultipartConfig, Request, SharedRequest};
 use crate::types::response::{Response, ResponseType};
 use crate::types::HttpMethod;
 use crate::types::MiddlewareReturn;
-use crate::websockets::start_web_socket;
+use crate::websockets::{limits::WebSocketLimits, start_web_socket};
 
-use std::sync::atomic::AtomicBool;
+use std::borrow::Cow;
 use std::sync::atomic::Ordering::{Relaxed, SeqCst};
+use std::sync::atomic::{AtomicBool, AtomicUsize};
 use std::sync::{Arc, RwLock};
 
 use std::process::exit;
@@ -34,13 +38,19 @@ use once_cell::sync::OnceCell;
 use pyo3::exceptions::PyValueError;
 use pyo3::prelude::*;
 use pyo3::pycell::PyRef;
+use pyo3::types::PyDict;
 use pyo3_async_runtimes::TaskLocals;
 
 const MAX_PAYLOAD_SIZE: &str = "ROBYN_MAX_PAYLOAD_SIZE";
 const DEFAULT_MAX_PAYLOAD_SIZE: usize = 1_000_000; // 1Mb
+const UPLOAD_SPOOL_THRESHOLD: &str = "ROBYN_UPLOAD_SPOOL_THRESHOLD";
+const DEFAULT_UPLOAD_SPOOL_THRESHOLD: usize = 1_048_576; // 1MiB
 
 static STARTED: AtomicBool = AtomicBool::new(false);
 
+// One entry per event loop of the process; the first one runs on the main thread
+static TASK_LOCALS: OnceCell<Vec<TaskLocals>> = OnceCell::new();
+
 #[derive(Clone)]
 struct Directory {
     route: String,
@@ -61,6 +71,9 @@ pub struct Server {
     startup_handler: Option<Arc<FunctionInfo>>,
     shutdown_handler: Option<Arc<FunctionInfo>>,
     excluded_response_headers_paths: Option<Vec<String>>,
+    compression: Option<Arc<Compression>>,
+    sync_executor: Option<SyncExecutor>,
+    websocket_limits: WebSocketLimits,
 }
 
 #[pymethods]
@@ -78,18 +91,25 @@ impl Server {
             startup_handler: None,
             shutdown_handler: None,
             excluded_response_headers_paths: None,
+            compression: None,
+            sync_executor: None,
+            websocket_limits: WebSocketLimits::default(),
         }
     }
 
+    #[pyo3(signature = (socket, workers, event_loops=1))]
     pub fn start(
         &mut self,
         _py: Python,
         socket: PyRef<SocketHeld>,
         workers: usize,
+        event_loops: usize,
     ) -> PyResult<()> {
         pyo3_log::init();
 
-        static TASK_LOCALS: OnceCell<TaskLocals> = OnceCell::new();
+        if event_loops == 0 {
+            return Err(PyValueError::new_err("event_loops must be greater than 0"));
+        }
 
         if STARTED
             .compare_exchange(false, true, SeqCst, Relaxed)
@@ -116,12 +136,37 @@ impl Server {
         let shutdown_handler = self.shutdown_handler.clone();
 
         let excluded_response_headers_paths = self.excluded_response_headers_paths.clone();
-
+        let compression = self.compression.clone();
+        let websocket_limits = self.websocket_limits.clone();
+        let sync_pool = self
+            .sync_executor
+            .as_ref()
+            .map(|executor| Arc::new(executor.build_pool()));
+
+        // The main thread runs the first loop; every other loop gets a daemon
+        // thread of its own. Workers are spread over the loops, so more loops
+        // than workers would never be used.
+        let event_loops = event_loops.min(workers).max(1);
+        let threading = _py.import("threading")?;
+        let mut loops = vec![event_loop.clone()];
+        for i in 1..event_loops {
+            let extra_loop = asyncio.call_method0("new_event_loop")?;
+            let kwargs = PyDict::new(_py);
+            kwargs.set_item("target", extra_loop.getattr("run_forever")?)?;
+            kwargs.set_item("name", format!("robyn-event-loop-{i}"))?;
+            kwargs.set_item("daemon", true)?;
+            threading
+                .call_method("Thread", (), Some(&kwargs))?
+                .call_method0("start")?;
+            loops.push(extra_loop);
+        }
         let _ = TASK_LOCALS.get_or_try_init(|| {
-            Python::with_gil(|py| {
-                pyo3_async_runtimes::TaskLocals::new(event_loop.clone().into()).copy_context(py)
-            })
+            loops
+                .into_iter()
+                .map(|event_loop| TaskLocals::new(event_loop).copy_context(_py))
+                .collect::<PyResult<Vec<_>>>()
         });
+        let next_loop = Arc::new(AtomicUsize::new(0));
 
         let max_payload_size = env::var(MAX_PAYLOAD_SIZE)
             .unwrap_or(DEFAULT_MAX_PAYLOAD_SIZE.to_string())
@@ -133,20 +178,39 @@ impl Server {
                 ))
             })?;
 
+        let multipart_config = MultipartConfig {
+            spool_threshold: env::var(UPLOAD_SPOOL_THRESHOLD)
+                .unwrap_or(DEFAULT_UPLOAD_SPOOL_THRESHOLD.to_string())
+                .trim()
+                .parse::<usize>()
+                .map_err(|e| {
+                    PyValueError::new_err(format!(
+                        "Failed to parse environment variable {UPLOAD_SPOOL_THRESHOLD} - {e}"
+                    ))
+                })?,
+        };
+
         thread::spawn(move || {
             actix_web::rt::System::new().block_on(async move {
-                let task_locals = Python::with_gil(|py| TASK_LOCALS.get().unwrap().clone_ref(py));
+                let task_locals = task_locals(0);
                 execute_startup_handler(startup_handler, &task_locals)
                     .await
                     .unwrap();
 
-                if !middleware_router.has_any_middleware() {
-                    const_router.bake_global_headers(&global_response_headers);
+                // The slow path only reuses the route's own headers, so baking
+                // is safe even when middlewares exist.
+                const_router.bake_global_headers(&global_response_headers);
+                if let Some(compression) = &compression {
+                    const_router.bake_compression(compression);
                 }
+                router.resolve_middleware_chains(&middleware_router);
 
                 HttpServer::new(move || {
                     let mut app = App::new();
 
+                    // Every request of this worker runs its coroutines on the same loop
+                    let loop_index = next_loop.fetch_add(1, Relaxed) % event_loops;
+
                     let directories = directories.read().unwrap();
 
                     // this loop matches three types of directory serving
@@ -199,26 +263,29 @@ impl Server {
                         .app_data(web::Data::new(Arc::clone(&middleware_router)))
                         .app_data(web::Data::new(Arc::clone(&global_request_headers)))
                         .app_data(web::Data::new(Arc::clone(&global_response_headers)))
-                        .app_data(web::Data::new(excluded_response_headers_paths.clone()));
+                        .app_data(web::Data::new(excluded_response_headers_paths.clone()))
+                        .app_data(web::Data::new(multipart_config))
+                        .app_data(web::Data::new(compression.clone()))
+                        .app_data(web::Data::new(sync_pool.clone()));
 
                     let web_socket_map = web_socket_router.get_web_socket_map();
                     for (elem, value) in (web_socket_map.read()).iter() {
                         let endpoint = elem.clone();
                         let path_params = value.clone();
                         let endpoint_for_closure = endpoint.clone();
+                        let websocket_limits = websocket_limits.clone();
                         app = app.route(
                             &endpoint,
                             web::get().to(move |stream: web::Payload, req: HttpRequest| {
                                 let endpoint_copy = endpoint_for_closure.clone();
-                                let task_locals =
-                                    Python::with_gil(|py| TASK_LOCALS.get().unwrap().clone_ref(py));
                                 start_web_socket(
                                     req,
                                     stream,
                                     path_params.clone(),
-                                    task_locals,
+                                    task_locals(loop_index),
                                     endpoint_copy.to_string(),
                                     max_payload_size,
+                                    websocket_limits.clone(),
                                 )
                             }),
                         );
@@ -235,35 +302,79 @@ impl Server {
                                   response_headers_exclude_paths: web::Data<
                                 Option<Vec<String>>,
                             >,
+                                  multipart_config: web::Data<MultipartConfig>,
+                                  compression: web::Data<Option<Arc<Compression>>>,
+                                  sync_pool: web::Data<Option<Arc<BlockingRunnerPool>>>,
                                   req: HttpRequest| async move {
-                                // Fast path: const routes bypass request parsing, Python, and middleware
-                                // Only safe when no middlewares are registered (checked dynamically via AtomicBool)
-                                if !middleware_router.has_any_middleware() {
-                                    if let Ok(http_method) =
-                                        HttpMethod::from_actix_method(req.method())
+                                // Fast path: const routes bypass request parsing, Python, and middleware.
+                                // Only taken when no middleware runs for the route: global middlewares
+                                // may opt out of const routes or exclude paths.
+                                if let Ok(http_method) = HttpMethod::from_actix_method(req.method())
+                                {
+                                    if let Some(cached) = const_router
+                                        .get_cached_route(&http_method, req.uri().path())
                                     {
-                                        if let Some(cached) = const_router
-                                            .get_cached_route(&http_method, req.uri().path())
-                                        {
+                                        if !middleware_router.has_middleware_for_const_route(
+                                            req.method().as_str(),
+                                            req.uri().path(),
+                                        ) {
+                                            // Const responses are precompressed at startup
+                                            let encoding = compression
+                                                .get_ref()
+                                                .as_deref()
+                                                .and_then(|compression| {
+                                                    compression.negotiate(req.headers())
+                                                });
                                             if let Some(ref excluded) =
                                                 *response_headers_exclude_paths.get_ref()
                                             {
                                                 if excluded.contains(&req.uri().path().to_owned()) {
                                                     return cached
-                                                        .to_http_response_without_global_headers();
+                                                        .to_http_response_without_global_headers(
+                                                            encoding,
+                                                        );
                                                 }
                                             }
-                                            return cached.to_http_response();
+                                            return cached.to_http_response(encoding);
+                                        }
+                                    }
+
+                                    // Cached dynamic route responses are served the same way,
+                                    // as long as no middleware is registered at all
+                                    if !middleware_router.has_any_middleware() {
+                                        if let Some(cache) = router.get_response_cache(
+                                            &http_method,
+                                            route_path(req.path()),
+                                        ) {
+                                            if let Some(cached) = cache.get(&cache.key(&req)) {
+                                                let is_excluded = response_headers_exclude_paths
+                                                    .get_ref()
+                                                    .as_ref()
+                                                    .is_some_and(|excluded| {
+                                                        excluded.iter().any(|p| p == req.path())
+                                                    });
+                                                let response = cached
+                                                    .to_http_response_with_global_headers(
+                                                        (!is_excluded).then_some(
+                                                            global_response_headers
+                                                                .get_ref()
+                                                                .as_ref(),
+                                                        ),
+                                                    );
+                                                return compress_response(
+                                                    compression.get_ref(),
+                                                    &req,
+                                                    response,
+                                                );
+                                            }
                                         }
                                     }
                                 }
 
-                                // Normal path: dynamic routes (and const routes when middlewares exist) require Python
+                                // Normal path: dynamic routes (and const routes some middleware runs for) require Python
                                 let req_ref = req.clone();
-                                let task_locals =
-                                    Python::with_gil(|py| TASK_LOCALS.get().unwrap().clone_ref(py));
                                 let response = pyo3_async_runtimes::tokio::scope_local(
-                                    task_locals,
+                                    task_locals(loop_index),
                                     async move {
                                         index(
                                             router,
@@ -273,13 +384,19 @@ impl Server {
                                             global_request_headers,
                                             global_response_headers,
                                             response_headers_exclude_paths,
+                                            multipart_config,
+                                            sync_pool,
                                             req,
                                         )
                                         .await
                                     },
                                 )
                                 .await;
-                                response.respond_to(&req_ref)
+                                compress_response(
+                                    compression.get_ref(),
+                                    &req_ref,
+                                    response.respond_to(&req_ref),
+                                )
                             },
                         ))
                 })
@@ -298,8 +415,7 @@ impl Server {
         if event_loop.is_err() {
             if let Some(function) = shutdown_handler {
                 if function.is_async {
-                    let task_locals =
-                        Python::with_gil(|py| TASK_LOCALS.get().unwrap().clone_ref(py));
+                    let task_locals = task_locals(0);
 
                     pyo3_async_runtimes::tokio::run_until_complete(
                         task_locals.event_loop(_py),
@@ -335,16 +451,14 @@ impl Server {
         });
     }
 
-    /// Removes a new request header to our concurrent hashmap
-    /// this can be called after the server has started.
-    pub fn remove_header(&self, key: &str) {
-        self.global_request_headers.headers.remove(key);
+    /// Removes a global request header
+    pub fn remove_header(&mut self, key: &str) {
+        Arc::make_mut(&mut self.global_request_headers).remove(key);
     }
 
-    /// Removes a new response header to our concurrent hashmap
-    /// this can be called after the server has started.
-    pub fn remove_response_header(&self, key: &str) {
-        self.global_response_headers.headers.remove(key);
+    /// Removes a global response header
+    pub fn remove_response_header(&mut self, key: &str) {
+        Arc::make_mut(&mut self.global_response_headers).remove(key);
     }
 
     pub fn apply_request_headers(&mut self, headers: &Headers) {
@@ -355,6 +469,21 @@ impl Server {
         self.global_response_headers = Arc::new(headers.clone());
     }
 
+    /// Compress responses following `compression`
+    pub fn set_compression(&mut self, compression: &Compression) {
+        self.compression = Some(Arc::new(compression.clone()));
+    }
+
+    /// Run sync handlers on a thread pool following `sync_executor`
+    pub fn set_sync_executor(&mut self, sync_executor: &SyncExecutor) {
+        self.sync_executor = Some(sync_executor.clone());
+    }
+
+    /// Bound the message queues of WebSocket connections following `limits`
+    pub fn set_websocket_limits(&mut self, limits: &WebSocketLimits) {
+        self.websocket_limits = limits.clone();
+    }
+
     pub fn set_response_headers_exclude_paths(
         &mut self,
         excluded_response_headers_paths: Option<Vec<String>>,
@@ -364,6 +493,8 @@ impl Server {
 
     /// Add a new route to the routing tables
     /// can be called after the server has been started
+    #[pyo3(signature = (route_type, route, function, is_const, stream_body=false, cache=None))]
+    #[allow(clippy::too_many_arguments)]
     pub fn add_route(
         &self,
         py: Python,
@@ -371,8 +502,23 @@ impl Server {
         route: &str,
         function: FunctionInfo,
         is_const: bool,
+        stream_body: bool,
+        cache: Option<Py<CachePolicy>>,
     ) {
         self._add_route(py, route_type, route, &function, is_const);
+
+        if stream_body && !is_const {
+            if let Err(e) = self.router.add_streaming_route(route_type, route) {
+                log::debug!("Error adding streaming route {}", e);
+            }
+        }
+
+        if let Some(policy) = cache.filter(|_| !is_const) {
+            let cache = Arc::clone(&policy.get().cache);
+            if let Err(e) = self.router.add_cached_route(route_type, route, cache) {
+                log::debug!("Error adding cached route {}", e);
+            }
+        }
     }
 
     fn _add_route(
@@ -414,10 +560,22 @@ impl Server {
 
     /// Add a new global middleware
     /// can be called after the server has been started
-    pub fn add_global_middleware(&self, middleware_type: &MiddlewareType, function: FunctionInfo) {
+    #[pyo3(signature = (middleware_type, function, skip_const_routes=false, excluded_routes=Vec::new()))]
+    pub fn add_global_middleware(
+        &self,
+        middleware_type: &MiddlewareType,
+        function: FunctionInfo,
+        skip_const_routes: bool,
+        excluded_routes: Vec<String>,
+    ) -> PyResult<()> {
         self.middleware_router
-            .add_global_middleware(middleware_type, function)
-            .unwrap();
+            .add_global_middleware(
+                middleware_type,
+                function,
+                skip_const_routes,
+                &excluded_routes,
+            )
+            .map_err(|e| PyValueError::new_err(format!("Invalid middleware exclusion: {}", e)))
     }
 
     /// Add a new route to the routing tables
@@ -480,6 +638,25 @@ impl Default for Server {
     }
 }
 
+/// The task locals of the process' event loop number `loop_index`.
+#[inline]
+fn task_locals(loop_index: usize) -> TaskLocals {
+    Python::with_gil(|py| TASK_LOCALS.get().unwrap()[loop_index].clone_ref(py))
+}
+
+/// Compress `response` when compression is configured.
+#[inline]
+fn compress_response(
+    compression: &Option<Arc<Compression>>,
+    req: &HttpRequest,
+    response: HttpResponse,
+) -> HttpResponse {
+    match compression {
+        Some(compression) => compression.compress_response(req.headers(), response),
+        None => response,
+    }
+}
+
 async fn index(
     router: web::Data<Arc<HttpRouter>>,
     const_router: web::Data<Arc<ConstRouter>>,
@@ -488,6 +665,8 @@ async fn index(
     global_request_headers: web::Data<Arc<Headers>>,
     global_response_headers: web::Data<Arc<Headers>>,
     excluded_response_headers_paths: web::Data<Option<Vec<String>>>,
+    multipart_config: web::Data<MultipartConfig>,
+    sync_pool: web::Data<Option<Arc<BlockingRunnerPool>>>,
     req: HttpRequest,
 ) -> ResponseType {
     if !HttpMethod::is_supported(req.method()) {
@@ -499,16 +678,30 @@ async fn index(
         Err(_) => return ResponseType::Standard(Response::method_not_allowed(None)),
     };
 
-    let mut request: Request =
-        match Request::from_actix_request(&req, payload, &global_request_headers).await {
-            Ok(r) => r,
-            Err(e) => {
-                error!("Failed to parse request for `{}`: {}", req.path(), e);
-                return ResponseType::Standard(Response::internal_server_error(None));
-            }
-        };
+    let stream_body = router.is_streaming_route(&http_method, route_path(req.path()));
+    let mut request: Request = match Request::from_actix_request(
+        &req,
+        payload,
+        &global_request_headers,
+        stream_body,
+        &multipart_config,
+    )
+    .await
+    {
+        Ok(r) => r,
+        Err(e) => {
+            error!("Failed to parse request for `{}`: {}", req.path(), e);
+            return ResponseType::Standard(Response::internal_server_error(None));
+        }
+    };
 
-    let route = format!("{}{}", req.method(), request.url.path);
+    // Keyed on the request as received, before any middleware modifies it
+    let response_cache = router
+        .get_response_cache(&http_method, &request.url.path)
+        .map(|cache| {
+            let key = cache.key(&req);
+            (cache, key)
+        });
 
     // Allocate a single `contextvars.Context` for the full request lifecycle so
     // that writes made by a `before_request` hook are visible to the route
@@ -520,31 +713,83 @@ async fn index(
     // (which run via `ctx.run(...)`): without a fresh context, a `ContextVar`
     // written inside a handler would persist in the worker thread's current
     // context and leak into the next request on that thread.
-    let request_context: Py<PyAny> = match Python::with_gil(crate::asyncio::new_context) {
+    let mut request_context: Py<PyAny> = match Python::with_gil(crate::asyncio::new_context) {
         Ok(ctx) => ctx,
         Err(e) => {
             error!("Failed to create request contextvars context: {}", e);
             return ResponseType::Standard(Response::internal_server_error(None));
         }
     };
-    let ctx_ref = Some(&request_context);
 
     // Before middleware
-    let before_middlewares =
-        middleware_router.get_global_middlewares(&MiddlewareType::BeforeRequest);
-    let route_before = middleware_router.get_route(&MiddlewareType::BeforeRequest, &route);
+    let is_const_route = const_router
+        .get_cached_route(&http_method, &request.url.path)
+        .is_some();
+    let path = request.url.path.clone();
+    let (route_entry, mut route_params) = router.get_route_entry(&http_method, &path).unzip();
+    // Most routes have their middlewares resolved at startup; the others,
+    // and const routes, look them up on every request
+    let chain = route_entry
+        .as_deref()
+        .filter(|_| !is_const_route)
+        .and_then(RouteEntry::middlewares);
+    let mut route_key: Option<String> = None;
+
+    let all_before: Cow<[Arc<FunctionInfo>]> = match chain {
+        Some(chain) => {
+            if chain.has_route_before {
+                request.path_params = route_params.clone().unwrap_or_default();
+            }
+            Cow::Borrowed(&chain.before)
+        }
+        None => {
+            let route = route_key.insert(format!("{}{}", req.method(), path));
+            let mut all_before = middleware_router.get_global_middlewares(
+                &MiddlewareType::BeforeRequest,
+                &path,
+                is_const_route,
+            );
+            if let Some((functions, route_params)) =
+                middleware_router.get_route(&MiddlewareType::BeforeRequest, route)
+            {
+                all_before.extend(functions);
+                request.path_params = route_params;
+            }
+            Cow::Owned(all_before)
+        }
+    };
+
+    // From here on the request is converted to Python at most once, and the
+    // middlewares and the handler all share that object
+    let mut request = SharedRequest::Rust(request);
+    // Set when a middleware returns a request for another path
+    let mut rewritten_path: Option<String> = None;
 
     let mut early_response: Option<Response> = None;
-    if !before_middlewares.is_empty() || route_before.is_some() {
-        let mut all_before = before_middlewares;
-        if let Some((functions, route_params)) = route_before {
-            all_before.extend(functions);
-            request.path_params = route_params;
-        }
-        for before_middleware in all_before {
-            request = match execute_middleware_function(&request, &before_middleware, ctx_ref).await
+    if !all_before.is_empty() {
+        let mut py_request = match Python::with_gil(|py| request.to_py(py)) {
+            Ok(py_request) => py_request,
+            Err(e) => {
+                error!("Failed to convert request for `{}`: {}", path, e);
+                return ResponseType::Standard(Response::internal_server_error(None));
+            }
+        };
+        for before_middleware in all_before.iter() {
+            match execute_middleware_function(
+                &py_request,
+                before_middleware,
+                Some(&request_context),
+            )
+            .await
             {
-                Ok(MiddlewareReturn::Request(r)) => r,
+                Ok(MiddlewareReturn::Request(r)) => {
+                    // Middlewares usually hand back the request they were given
+                    if r.as_ptr() != py_request.as_ptr() {
+                        let new_path = Python::with_gil(|py| r.borrow(py).url.path.clone());
+                        rewritten_path = Some(new_path).filter(|new_path| *new_path != path);
+                    }
+                    py_request = r;
+                }
                 Ok(MiddlewareReturn::Response(r)) => {
                     early_response = Some(r);
                     break;
@@ -556,38 +801,97 @@ async fn index(
                     };
                     error!(
                         "Error executing before middleware for `{}`: {}",
-                        request.url.path, msg
+                        rewritten_path.as_deref().unwrap_or(&path),
+                        msg
                     );
                     return ResponseType::Standard(Response::internal_server_error(None));
                 }
             };
         }
+        request = SharedRequest::Python(py_request);
     }
+    let url_path = rewritten_path.as_deref().unwrap_or(&path);
+    // The cache policy and key belong to the path as received: a rewritten
+    // request is neither served from the cache nor stored in it
+    let response_cache = response_cache.filter(|_| rewritten_path.is_none());
 
     let mut response = if let Some(r) = early_response {
         ResponseType::Standard(r)
-    } else if let Some(cached) = const_router.get_cached_route(&http_method, &request.url.path) {
-        let mut resp = Response {
-            status_code: cached.status.as_u16(),
-            response_type: "text".to_string(),
-            headers: Headers::new(None),
-            description: cached.body.to_vec(),
-            file_path: None,
-            cookies: Cookies::new(),
-        };
-        for (k, v) in cached.headers.as_ref() {
-            resp.headers.set(k.clone(), v.clone());
-        }
-        ResponseType::Standard(resp)
-    } else if let Some((function, route_params)) = router.get_route(&http_method, &request.url.path)
+    } else if let Some(cached) = const_router.get_cached_route(&http_method, url_path) {
+        ResponseType::Standard(cached.to_response())
+    } else if let Some(cached) = response_cache
+        .as_ref()
+        // Without middlewares the default service has already missed the cache
+        .filter(|_| middleware_router.has_any_middleware())
+        .and_then(|(cache, key)| cache.get(key))
     {
-        request.path_params = route_params;
-        match execute_http_function(&request, &function, ctx_ref).await {
-            Ok(r) => r,
+        ResponseType::Standard(cached.to_response())
+    } else if let Some((function, route_params)) = if rewritten_path.is_none() {
+        // Unless a middleware rewrote the path, the route was found above
+        route_entry
+            .as_ref()
+            .zip(route_params.take())
+            .map(|(entry, route_params)| (Arc::clone(&entry.function), route_params))
+    } else {
+        router.get_route(&http_method, url_path)
+    } {
+        let result = match sync_pool.get_ref() {
+            // Sync handlers run on the executor's threads, so a slow one does
+            // not hold up the other requests of this worker
+            Some(pool) if !function.is_async => {
+                match execute_sync_http_function(
+                    pool,
+                    request,
+                    route_params,
+                    function,
+                    request_context,
+                )
+                .await
+                {
+                    Offloaded::Done(handed_back, context, result) => {
+                        request = handed_back;
+                        request_context = context;
+                        result
+                    }
+                    Offloaded::Rejected => {
+                        let mut response = Response::service_unavailable(None);
+                        let is_excluded = excluded_response_headers_paths
+                            .get_ref()
+                            .as_ref()
+                            .is_some_and(|paths| paths.iter().any(|p| p == req.path()));
+                        if !is_excluded {
+                            response.headers.set_missing(&global_response_headers);
+                        }
+                        return ResponseType::Standard(response);
+                    }
+                    Offloaded::Lost => {
+                        error!("Sync executor dropped the handler for `{}`", req.path());
+                        return ResponseType::Standard(Response::internal_server_error(None));
+                    }
+                }
+            }
+            _ => {
+                execute_http_function(
+                    &mut request,
+                    route_params,
+                    &function,
+                    Some(&request_context),
+                )
+                .await
+            }
+        };
+        match result {
+            Ok(r) => {
+                if let (Some((cache, key)), ResponseType::Standard(response)) = (response_cache, &r)
+                {
+                    cache.insert(key, response);
+                }
+                r
+            }
             Err(e) => {
                 error!(
                     "Error executing route function for `{}`: {}",
-                    request.url.path,
+                    url_path,
                     get_traceback(&e)
                 );
                 ResponseType::Standard(Response::internal_server_error(None))
@@ -600,28 +904,46 @@ async fn index(
     let is_excluded = excluded_response_headers_paths
         .get_ref()
         .as_ref()
-        .is_some_and(|paths| paths.contains(&request.url.path));
+        .is_some_and(|paths| paths.iter().any(|p| p == url_path));
 
     if !is_excluded {
         response.headers_mut().set_missing(&global_response_headers);
     }
 
     // After middleware
-    let after_middlewares = middleware_router.get_global_middlewares(&MiddlewareType::AfterRequest);
-    let route_after = middleware_router.get_route(&MiddlewareType::AfterRequest, &route);
-
-    if !after_middlewares.is_empty() || route_after.is_some() {
-        let mut all_after = after_middlewares;
-        if let Some((functions, _)) = route_after {
-            all_after.extend(functions);
+    let all_after: Cow<[Arc<FunctionInfo>]> = match chain.filter(|_| rewritten_path.is_none()) {
+        Some(chain) => Cow::Borrowed(&chain.after),
+        None => {
+            let route = route_key.unwrap_or_else(|| format!("{}{}", req.method(), path));
+            let mut all_after = middleware_router.get_global_middlewares(
+                &MiddlewareType::AfterRequest,
+                url_path,
+                is_const_route,
+            );
+            if let Some((functions, _)) =
+                middleware_router.get_route(&MiddlewareType::AfterRequest, &route)
+            {
+                all_after.extend(functions);
+            }
+            Cow::Owned(all_after)
         }
-        for after_middleware in all_after {
+    };
+
+    if !all_after.is_empty() {
+        let py_request = match Python::with_gil(|py| request.to_py(py)) {
+            Ok(py_request) => py_request,
+            Err(e) => {
+                error!("Failed to convert request for `{}`: {}", url_path, e);
+                return ResponseType::Standard(Response::internal_server_error(None));
+            }
+        };
+        for after_middleware in all_after.iter() {
             if let ResponseType::Standard(std_response) = response {
                 response = match execute_after_middleware_function(
-                    &request,
+                    &py_request,
                     &std_response,
-                    &after_middleware,
-                    ctx_ref,
+                    after_middleware,
+                    Some(&request_context),
                 )
                 .await
                 {
@@ -637,7 +959,7 @@ async fn index(
                         };
                         error!(
                             "Error executing after middleware for `{}`: {}",
-                            request.url.path, msg
+                            url_path, msg
                         );
                         return ResponseType::Standard(Response::internal_server_error(Some(
                             &std_response.headers,
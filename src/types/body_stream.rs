@@ -0,0 +1,88 @@
+use std::sync::Arc;
+
+use actix_web::web::{self, Bytes, BytesMut};
+use futures_util::StreamExt as _;
+use pyo3::exceptions::{PyIOError, PyStopAsyncIteration};
+use pyo3::prelude::*;
+use pyo3::types::PyBytes;
+use tokio::sync::{mpsc, Mutex};
+
+/// Number of chunks buffered between the socket and the handler. Once the
+/// handler stops consuming, the payload stops being read, so a slow consumer
+/// applies backpressure to the client instead of growing memory.
+const BODY_STREAM_BUFFER: usize = 8;
+
+type Chunk = Result<Bytes, String>;
+
+/// A request body that is read from the socket while the handler consumes it.
+/// Python handlers iterate it with `async for chunk in request.body_stream`,
+/// or collect whatever is left with `await request.body_stream.read()`.
+#[pyclass]
+#[derive(Clone)]
+pub struct BodyStream {
+    receiver: Arc<Mutex<mpsc::Receiver<Chunk>>>,
+}
+
+impl BodyStream {
+    /// Start pumping `payload` into the stream.
+    ///
+    /// `web::Payload` is bound to the actix worker thread, so it is drained by
+    /// a task spawned on that worker and handed over through a bounded channel.
+    pub fn from_payload(mut payload: web::Payload) -> Self {
+        let (sender, receiver) = mpsc::channel::<Chunk>(BODY_STREAM_BUFFER);
+
+        actix_web::rt::spawn(async move {
+            while let Some(chunk) = payload.next().await {
+                let chunk = chunk.map_err(|e| e.to_string());
+                let failed = chunk.is_err();
+                // The handler dropped the stream, stop reading the payload.
+                if sender.send(chunk).await.is_err() || failed {
+                    break;
+                }
+            }
+        });
+
+        Self {
+            receiver: Arc::new(Mutex::new(receiver)),
+        }
+    }
+}
+
+fn body_stream_error(error: String) -> PyErr {
+    PyIOError::new_err(format!("Failed to read request body: {}", error))
+}
+
+#[pymethods]
+impl BodyStream {
+    fn __aiter__(slf: PyRef<'_, Self>) -> PyRef<'_, Self> {
+        slf
+    }
+
+    /// Await the next chunk of the body as `bytes`.
+    fn __anext__<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyAny>> {
+        let receiver = self.receiver.clone();
+        pyo3_async_runtimes::tokio::future_into_py(py, async move {
+            let next = receiver.lock().await.recv().await;
+            match next {
+                Some(Ok(chunk)) => {
+                    Python::with_gil(|py| Ok(PyBytes::new(py, &chunk).into_any().unbind()))
+                }
+                Some(Err(e)) => Err(body_stream_error(e)),
+                None => Err(PyStopAsyncIteration::new_err(())),
+            }
+        })
+    }
+
+    /// Await the remaining chunks of the body and return them as one `bytes`.
+    fn read<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyAny>> {
+        let receiver = self.receiver.clone();
+        pyo3_async_runtimes::tokio::future_into_py(py, async move {
+            let mut rx = receiver.lock().await;
+            let mut body = BytesMut::new();
+            while let Some(chunk) = rx.recv().await {
+                body.extend_from_slice(&chunk.map_err(body_stream_error)?);
+            }
+            Python::with_gil(|py| Ok(PyBytes::new(py, &body).into_any().unbind()))
+        })
+    }
+}
@@ -0,0 +1,245 @@
+use std::collections::hash_map::DefaultHasher;
+use std::hash::{Hash, Hasher};
+use std::num::NonZeroUsize;
+use std::sync::atomic::{AtomicU64, Ordering};
+use std::sync::Arc;
+use std::time::{Duration, Instant};
+
+use actix_web::HttpRequest;
+use lru::LruCache;
+use parking_lot::Mutex;
+use pyo3::exceptions::PyValueError;
+use pyo3::prelude::*;
+use pyo3::types::PyDict;
+
+use crate::routers::const_router::CachedResponse;
+use crate::types::response::Response;
+
+/// Upper bound on the number of independently locked LRU shards.
+const MAX_SHARDS: usize = 16;
+
+/// Caching rules for a route: `@app.get("/items/:id", cache=CachePolicy(ttl=30))`.
+///
+/// Responses are keyed by method, path, the query string (or only the
+/// `query_params` listed) and the request headers named in `vary`. Only 200
+/// responses without cookies are stored. A policy owns its cache, so the
+/// counters reflect every route it is attached to in the current process.
+#[pyclass(frozen)]
+pub struct CachePolicy {
+    #[pyo3(get)]
+    pub ttl: f64,
+    #[pyo3(get)]
+    pub vary: Vec<String>,
+    #[pyo3(get)]
+    pub max_entries: usize,
+    #[pyo3(get)]
+    pub query_params: Option<Vec<String>>,
+    pub cache: Arc<ResponseCache>,
+}
+
+#[pymethods]
+impl CachePolicy {
+    #[new]
+    #[pyo3(signature = (ttl, vary=Vec::new(), max_entries=10_000, query_params=None))]
+    pub fn new(
+        ttl: f64,
+        vary: Vec<String>,
+        max_entries: usize,
+        query_params: Option<Vec<String>>,
+    ) -> PyResult<Self> {
+        if !(ttl > 0.0 && ttl.is_finite()) {
+            return Err(PyValueError::new_err(
+                "ttl must be a positive number of seconds",
+            ));
+        }
+        let capacity = NonZeroUsize::new(max_entries)
+            .ok_or_else(|| PyValueError::new_err("max_entries must be greater than 0"))?;
+
+        let vary: Vec<String> = vary.iter().map(|name| name.to_lowercase()).collect();
+        let mut selected_query_params = query_params.clone();
+        if let Some(names) = selected_query_params.as_mut() {
+            names.sort();
+            names.dedup();
+        }
+
+        let cache = ResponseCache::new(
+            Duration::from_secs_f64(ttl),
+            capacity,
+            vary.clone(),
+            selected_query_params,
+        );
+        Ok(Self {
+            ttl,
+            vary,
+            max_entries,
+            query_params,
+            cache: Arc::new(cache),
+        })
+    }
+
+    /// The hit/miss/eviction counters and the number of cached responses.
+    pub fn stats<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyDict>> {
+        let stats = PyDict::new(py);
+        stats.set_item("hits", self.cache.hits.load(Ordering::Relaxed))?;
+        stats.set_item("misses", self.cache.misses.load(Ordering::Relaxed))?;
+        stats.set_item("evictions", self.cache.evictions.load(Ordering::Relaxed))?;
+        stats.set_item("entries", self.cache.len())?;
+        Ok(stats)
+    }
+
+    /// Drop every cached response.
+    pub fn clear(&self) {
+        self.cache.clear();
+    }
+
+    pub fn __repr__(&self) -> String {
+        format!(
+            "CachePolicy(ttl={}, vary={:?}, max_entries={}, query_params={:?})",
+            self.ttl, self.vary, self.max_entries, self.query_params
+        )
+    }
+}
+
+struct Entry {
+    response: CachedResponse,
+    expires_at: Instant,
+}
+
+/// A sharded LRU cache of route responses with a fixed time to live.
+///
+/// Lookups only take the lock of one shard and never need the GIL, so a hit
+/// is served straight from the actix worker.
+pub struct ResponseCache {
+    ttl: Duration,
+    vary: Vec<String>,
+    query_params: Option<Vec<String>>,
+    shards: Vec<Mutex<LruCache<String, Entry>>>,
+    hits: AtomicU64,
+    misses: AtomicU64,
+    evictions: AtomicU64,
+}
+
+impl ResponseCache {
+    fn new(
+        ttl: Duration,
+        max_entries: NonZeroUsize,
+        vary: Vec<String>,
+        query_params: Option<Vec<String>>,
+    ) -> Self {
+        let shard_count = max_entries.get().min(MAX_SHARDS);
+        let shard_capacity =
+            NonZeroUsize::new(max_entries.get().div_ceil(shard_count)).unwrap_or(NonZeroUsize::MIN);
+        Self {
+            ttl,
+            vary,
+            query_params,
+            shards: (0..shard_count)
+                .map(|_| Mutex::new(LruCache::new(shard_capacity)))
+                .collect(),
+            hits: AtomicU64::new(0),
+            misses: AtomicU64::new(0),
+            evictions: AtomicU64::new(0),
+        }
+    }
+
+    fn shard(&self, key: &str) -> &Mutex<LruCache<String, Entry>> {
+        let mut hasher = DefaultHasher::new();
+        key.hash(&mut hasher);
+        &self.shards[hasher.finish() as usize % self.shards.len()]
+    }
+
+    /// The cache key for `req`: method, path, the selected query params and
+    /// the `vary` headers, separated by bytes that cannot appear in them.
+    pub fn key(&self, req: &HttpRequest) -> String {
+        let mut key = String::with_capacity(64);
+        key.push_str(req.method().as_str());
+        key.push('\0');
+        key.push_str(req.path());
+        key.push('\0');
+
+        let query = req.query_string();
+        match &self.query_params {
+            None => key.push_str(query),
+            Some(names) => {
+                for name in names {
+                    for pair in query.split('&') {
+                        let (param, value) = pair.split_once('=').unwrap_or((pair, ""));
+                        if param == name {
+                            key.push_str(name);
+                            key.push('=');
+                            key.push_str(value);
+                            key.push('&');
+                        }
+                    }
+                }
+            }
+        }
+
+        for name in &self.vary {
+            key.push('\0');
+            for (i, value) in req.headers().get_all(name.as_str()).enumerate() {
+                if i > 0 {
+                    key.push(',');
+                }
+                key.push_str(&String::from_utf8_lossy(value.as_bytes()));
+            }
+        }
+        key
+    }
+
+    pub fn get(&self, key: &str) -> Option<CachedResponse> {
+        let mut shard = self.shard(key).lock();
+        let (fresh, expired) = match shard.get(key) {
+            Some(entry) if entry.expires_at > Instant::now() => {
+                (Some(entry.response.clone()), false)
+            }
+            Some(_) => (None, true),
+            None => (None, false),
+        };
+        if expired {
+            shard.pop(key);
+        }
+        drop(shard);
+
+        let counter = if fresh.is_some() {
+            &self.hits
+        } else {
+            &self.misses
+        };
+        counter.fetch_add(1, Ordering::Relaxed);
+        fresh
+    }
+
+    /// Store `response` if it is cacheable: a plain 200 without cookies.
+    pub fn insert(&self, key: String, response: &Response) {
+        if response.status_code != 200
+            || response.file_path.is_some()
+            || !response.cookies.cookies.is_empty()
+            || response.headers.contains_key("set-cookie")
+        {
+            return;
+        }
+
+        let entry = Entry {
+            response: CachedResponse::from_response(response),
+            expires_at: Instant::now() + self.ttl,
+        };
+        let mut shard = self.shard(&key).lock();
+        let replaced = shard.push(key.clone(), entry);
+        drop(shard);
+
+        if replaced.is_some_and(|(evicted, _)| evicted != key) {
+            self.evictions.fetch_add(1, Ordering::Relaxed);
+        }
+    }
+
+    pub fn len(&self) -> usize {
+        self.shards.iter().map(|shard| shard.lock().len()).sum()
+    }
+
+    pub fn clear(&self) {
+        for shard in &self.shards {
+            shard.lock().clear();
+        }
+    }
+}
@@ -5,6 +5,8 @@ use std::{
 
 use pyo3::{prelude::*, types::PyDict};
 
+use super::typed_param::TypedParam;
+
 #[pyclass]
 #[derive(Debug, PartialEq, Eq, Hash)]
 pub enum MiddlewareType {
@@ -37,17 +39,27 @@ pub struct FunctionInfo {
     pub args: Py<PyDict>,
     #[pyo3(get, set)]
     pub kwargs: Py<PyDict>,
+    /// Path/query params coerced by the executor and passed as keyword arguments
+    #[pyo3(get, set)]
+    pub typed_params: Vec<Py<TypedParam>>,
+    /// Encodes the values the handler returns that aren't a response, str or
+    /// bytes; compiled from the route's `response_model`
+    #[pyo3(get, set)]
+    pub encoder: Option<Py<PyAny>>,
 }
 
 #[pymethods]
 impl FunctionInfo {
     #[new]
+    #[pyo3(signature = (handler, is_async, number_of_params, args, kwargs, typed_params=Vec::new(), encoder=None))]
     pub fn new(
         handler: Py<PyAny>,
         is_async: bool,
         number_of_params: u8,
         args: Py<PyDict>,
         kwargs: Py<PyDict>,
+        typed_params: Vec<Py<TypedParam>>,
+        encoder: Option<Py<PyAny>>,
     ) -> Self {
         Self {
             handler,
@@ -55,6 +67,8 @@ impl FunctionInfo {
             number_of_params,
             args,
             kwargs,
+            typed_params,
+            encoder,
         }
     }
 }
@@ -67,6 +81,12 @@ impl Clone for FunctionInfo {
             number_of_params: self.number_of_params,
             args: self.args.clone_ref(py),
             kwargs: self.kwargs.clone_ref(py),
+            typed_params: self
+                .typed_params
+                .iter()
+                .map(|param| param.clone_ref(py))
+                .collect(),
+            encoder: self.encoder.as_ref().map(|encoder| encoder.clone_ref(py)),
         })
     }
 }
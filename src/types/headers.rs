@@ -1,95 +1,130 @@
-use actix_http::header::HeaderMap;
-use dashmap::DashMap;
+use std::fmt;
+
+use actix_http::header::{HeaderMap, HeaderName, HeaderValue};
 use pyo3::prelude::*;
 use pyo3::types::{PyDict, PyList};
 use pyo3::IntoPyObject;
 
+/// A header name. Valid names are kept parsed, which costs nothing for the
+/// standard ones and a cheap reference count for the names actix parsed;
+/// anything else set from Python is kept lowercased, as given.
+#[derive(Clone, PartialEq, Eq)]
+enum Name {
+    Parsed(HeaderName),
+    Raw(Box<str>),
+}
+
+impl Name {
+    fn new(name: &str) -> Self {
+        // `HeaderName` lowercases the name while parsing it
+        match HeaderName::from_bytes(name.as_bytes()) {
+            Ok(name) => Name::Parsed(name),
+            Err(_) => Name::Raw(name.to_lowercase().into_boxed_str()),
+        }
+    }
+
+    fn as_str(&self) -> &str {
+        match self {
+            Name::Parsed(name) => name.as_str(),
+            Name::Raw(name) => name,
+        }
+    }
+
+    fn matches(&self, key: &str) -> bool {
+        if key.is_ascii() {
+            self.as_str().eq_ignore_ascii_case(key)
+        } else {
+            self.as_str() == key.to_lowercase()
+        }
+    }
+}
+
+/// A header value. Values that can be sent are kept as the `HeaderValue`
+/// written to the response; anything else set from Python is kept as given.
+#[derive(Clone, PartialEq, Eq)]
+enum Value {
+    Parsed(HeaderValue),
+    Raw(Box<str>),
+}
+
+impl Value {
+    fn new(value: String) -> Self {
+        if !value
+            .bytes()
+            .all(|byte| byte == b'\t' || (byte >= 0x20 && byte != 0x7f))
+        {
+            return Value::Raw(value.into_boxed_str());
+        }
+        // Takes over the string's buffer instead of copying it
+        Value::Parsed(HeaderValue::try_from(value).expect("header value checked above"))
+    }
+
+    fn as_str(&self) -> &str {
+        match self {
+            // Only built from strings, or from values `to_str` accepted
+            Value::Parsed(value) => std::str::from_utf8(value.as_bytes()).unwrap_or_default(),
+            Value::Raw(value) => value,
+        }
+    }
+}
+
 // Custom Multimap class
+//
+// The headers are kept in the order they were added, one entry per value,
+// like on the wire. A request or response has a few dozen headers at most,
+// so a linear scan finds one faster than hashing its name would, and the
+// whole map is a single allocation.
 #[pyclass(name = "Headers")]
-#[derive(Clone, Debug, Default)]
+#[derive(Clone, Default)]
 pub struct Headers {
-    pub headers: DashMap<String, Vec<String>>,
+    entries: Vec<(Name, Value)>,
 }
 
 #[pymethods]
 impl Headers {
     #[new]
     pub fn new(default_headers: Option<&Bound<'_, PyDict>>) -> Self {
-        match default_headers {
-            Some(default_headers) => {
-                let headers = DashMap::new();
-                for (key, value) in default_headers {
-                    let key = key.to_string().to_lowercase();
-
-                    let new_value = value.downcast::<PyList>();
-
-                    if let Ok(new_value) = new_value {
-                        let value: Vec<String> = new_value.iter().map(|x| x.to_string()).collect();
-                        headers.entry(key).or_insert_with(Vec::new).extend(value);
-                    } else {
-                        let value = value.to_string();
-                        headers.entry(key).or_insert_with(Vec::new).push(value);
-                    }
-                }
-                Headers { headers }
-            }
-            None => Headers {
-                headers: DashMap::new(),
-            },
+        let mut headers = Headers::default();
+        if let Some(default_headers) = default_headers {
+            headers.populate_from_dict(default_headers);
         }
+        headers
     }
 
     pub fn set(&mut self, key: String, value: String) {
-        self.headers.insert(key.to_lowercase(), vec![value]);
+        self.remove(&key);
+        self.entries.push((Name::new(&key), Value::new(value)));
     }
 
     pub fn append(&mut self, key: String, value: String) {
-        self.headers
-            .entry(key.to_lowercase())
-            .or_default()
-            .push(value);
+        self.entries.push((Name::new(&key), Value::new(value)));
     }
 
     pub fn get_all(&self, py: Python, key: String) -> Py<PyList> {
-        match self.headers.get(&key.to_lowercase()) {
-            Some(values) => {
-                let py_values = PyList::new(
-                    py,
-                    values
-                        .iter()
-                        .map(|value| value.into_pyobject(py).unwrap().into_any()),
-                );
-                py_values.expect("get-all failed").into()
-            }
-            None => PyList::empty(py).into(),
-        }
+        let py_values = PyList::new(
+            py,
+            self.values_of(&key)
+                .map(|value| value.into_pyobject(py).unwrap().into_any()),
+        );
+        py_values.expect("get-all failed").into()
     }
 
     pub fn get(&self, key: String) -> Option<String> {
         // return the last value
-        match self.headers.get(&key.to_lowercase()) {
-            Some(iter) => {
-                let (_, values) = iter.pair();
-                let last_value = values.last().unwrap();
-                Some(last_value.to_string())
-            }
-            None => None,
-        }
+        self.get_str(&key).map(str::to_string)
     }
 
     pub fn get_headers(&self, py: Python) -> Py<PyDict> {
         // return as a dict of lists
         let dict = PyDict::new(py);
-        for iter in self.headers.iter() {
-            let (key, values) = iter.pair();
+        for name in self.names() {
             let py_values: Bound<'_, PyList> = PyList::new(
                 py,
-                values
-                    .iter()
+                self.values_of(name)
                     .map(|value| value.into_pyobject(py).unwrap().into_any()),
             )
             .expect("get-all failed");
-            dict.set_item(key, py_values).unwrap();
+            dict.set_item(name, py_values).unwrap();
         }
         dict.into()
     }
@@ -99,94 +134,79 @@ impl Headers {
         // times its values are joined with ", " (per RFC 7230), mirroring the
         // ergonomics of QueryParams.to_dict so callers can use `.get(key, default)`.
         let dict = PyDict::new(py);
-        for iter in self.headers.iter() {
-            let (key, values) = iter.pair();
-            dict.set_item(key, values.join(", ")).unwrap();
+        for name in self.names() {
+            let values: Vec<&str> = self.values_of(name).collect();
+            dict.set_item(name, values.join(", ")).unwrap();
         }
         dict.into()
     }
 
     pub fn keys(&self, py: Python) -> Py<PyList> {
-        let keys: Vec<String> = self.headers.iter().map(|e| e.key().clone()).collect();
-        PyList::new(py, keys).expect("keys failed").into()
+        PyList::new(py, self.names()).expect("keys failed").into()
     }
 
     pub fn values(&self, py: Python) -> Py<PyList> {
         // last value per header, consistent with get()
-        let values: Vec<String> = self
-            .headers
-            .iter()
-            .filter_map(|e| e.value().last().cloned())
+        let values: Vec<&str> = self
+            .names()
+            .into_iter()
+            .filter_map(|name| self.get_str(name))
             .collect();
         PyList::new(py, values).expect("values failed").into()
     }
 
     pub fn items(&self) -> Vec<(String, String)> {
         // (name, last value) pairs, consistent with get()
-        self.headers
-            .iter()
-            .filter_map(|e| e.value().last().map(|v| (e.key().clone(), v.clone())))
+        self.names()
+            .into_iter()
+            .filter_map(|name| {
+                self.get_str(name)
+                    .map(|value| (name.to_string(), value.to_string()))
+            })
             .collect()
     }
 
     pub fn multi_items(&self) -> Vec<(String, String)> {
         // (name, value) for every value, preserving duplicate header names
-        let mut items = Vec::new();
-        for entry in self.headers.iter() {
-            for value in entry.value() {
-                items.push((entry.key().clone(), value.clone()));
-            }
-        }
-        items
+        self.iter()
+            .map(|(name, value)| (name.to_string(), value.to_string()))
+            .collect()
     }
 
     pub fn contains(&self, key: String) -> bool {
-        self.headers.contains_key(&key.to_lowercase())
+        self.contains_key(&key)
     }
 
     pub fn populate_from_dict(&mut self, headers: &Bound<PyDict>) {
         for (key, value) in headers.iter() {
-            let key = key.to_string().to_lowercase();
-            let new_value = value.downcast::<PyList>();
+            let name = Name::new(&key.to_string());
 
-            if let Ok(new_value) = new_value {
-                let value: Vec<String> = new_value.iter().map(|x| x.to_string()).collect();
-                self.headers.entry(key).or_default().extend(value);
+            if let Ok(values) = value.downcast::<PyList>() {
+                for value in values.iter() {
+                    self.entries
+                        .push((name.clone(), Value::new(value.to_string())));
+                }
             } else {
-                let value = value.to_string();
-                self.headers.entry(key).or_default().push(value);
+                self.entries.push((name, Value::new(value.to_string())));
             }
         }
     }
 
     pub fn is_empty(&self) -> bool {
-        self.headers.is_empty()
+        self.entries.is_empty()
     }
 
     fn __eq__(&self, other: &Headers) -> bool {
-        if self.headers.is_empty() && other.headers.is_empty() {
-            return true;
-        }
-
-        if self.headers.len() != other.headers.len() {
+        let names = self.names();
+        if names.len() != other.names().len() {
             return false;
         }
 
-        for iter in &self.headers {
-            let (key, values) = iter.pair();
-            match other.headers.get(key) {
-                Some(other_values) => {
-                    if values.len() != other_values.len()
-                        || !values.iter().all(|v| other_values.contains(v))
-                    {
-                        return false;
-                    }
-                }
-                None => return false,
-            }
-        }
-
-        true
+        names.into_iter().all(|name| {
+            let values: Vec<&str> = self.values_of(name).collect();
+            let other_values: Vec<&str> = other.values_of(name).collect();
+            values.len() == other_values.len() && values.iter().all(|v| other_values.contains(v))
+        })
     }
 
     pub fn __contains__(&self, key: String) -> bool {
@@ -194,7 +214,7 @@ impl Headers {
     }
 
     pub fn __repr__(&self) -> String {
-        format!("{:?}", self.headers)
+        format!("{:?}", self)
     }
 
     pub fn __setitem__(&mut self, key: String, value: String) {
@@ -207,46 +227,115 @@ impl Headers {
 }
 
 impl Headers {
+    /// Headers holding a single header with a static value.
+    pub fn from_static(name: HeaderName, value: &'static str) -> Self {
+        Headers {
+            entries: vec![(
+                Name::Parsed(name),
+                Value::Parsed(HeaderValue::from_static(value)),
+            )],
+        }
+    }
+
+    /// The last value of `key`, without copying it.
+    pub fn get_str(&self, key: &str) -> Option<&str> {
+        self.entries
+            .iter()
+            .rev()
+            .find(|(name, _)| name.matches(key))
+            .map(|(_, value)| value.as_str())
+    }
+
+    pub fn contains_key(&self, key: &str) -> bool {
+        self.entries.iter().any(|(name, _)| name.matches(key))
+    }
+
+    /// Every (name, value) pair, in the order they were added.
+    pub fn iter(&self) -> impl Iterator<Item = (&str, &str)> {
+        self.entries
+            .iter()
+            .map(|(name, value)| (name.as_str(), value.as_str()))
+    }
+
+    /// The headers that can be written to a response, skipping the names or
+    /// values set from Python that aren't valid HTTP.
+    pub fn header_pairs(&self) -> impl Iterator<Item = (&HeaderName, &HeaderValue)> {
+        self.entries.iter().filter_map(|entry| match entry {
+            (Name::Parsed(name), Value::Parsed(value)) => Some((name, value)),
+            (name, value) => {
+                log::debug!(
+                    "Skipping invalid header '{}: {}'",
+                    name.as_str(),
+                    value.as_str()
+                );
+                None
+            }
+        })
+    }
+
     pub fn remove(&mut self, key: &str) {
-        self.headers.remove(&key.to_lowercase());
+        self.entries.retain(|(name, _)| !name.matches(key));
     }
 
     pub fn clear(&mut self) {
-        self.headers.clear();
+        self.entries.clear();
     }
 
     pub fn extend(&mut self, headers: &Headers) {
-        for iter in headers.headers.iter() {
-            let (key, values) = iter.pair();
-            let mut entry = self.headers.entry(key.clone()).or_default();
-            entry.extend(values.iter().cloned());
-        }
+        self.entries.extend(headers.entries.iter().cloned());
     }
 
     /// Merge headers from `headers` into `self`, but only for keys not already present.
     /// This gives middleware-set headers precedence over global defaults,
     /// preventing duplicate `Access-Control-Allow-Origin` (and similar) violations.
     pub fn set_missing(&mut self, headers: &Headers) {
-        for iter in headers.headers.iter() {
-            let (key, values) = iter.pair();
-            self.headers
-                .entry(key.clone())
-                .or_insert_with(|| values.clone());
+        let present = self.entries.len();
+        for (name, value) in &headers.entries {
+            if !self.entries[..present].iter().any(|(own, _)| own == name) {
+                self.entries.push((name.clone(), value.clone()));
+            }
         }
     }
 
     pub fn from_actix_headers(req_headers: &HeaderMap) -> Self {
-        let headers = Headers::default();
-
-        for (key, value) in req_headers {
-            let key = key.to_string().to_lowercase();
-            let value = match value.to_str() {
-                Ok(value) => value.to_string(),
-                Err(_) => continue,
-            };
-            headers.headers.entry(key).or_default().push(value);
+        // Names and values share the buffers actix parsed them into
+        let mut entries = Vec::with_capacity(req_headers.len());
+        for (name, value) in req_headers {
+            if value.to_str().is_err() {
+                continue;
+            }
+            entries.push((Name::Parsed(name.clone()), Value::Parsed(value.clone())));
         }
 
-        headers
+        Headers { entries }
+    }
+
+    /// The distinct header names, in the order they were first added.
+    fn names(&self) -> Vec<&str> {
+        let mut names: Vec<&str> = Vec::with_capacity(self.entries.len());
+        for (name, _) in &self.entries {
+            let name = name.as_str();
+            if !names.contains(&name) {
+                names.push(name);
+            }
+        }
+        names
+    }
+
+    fn values_of<'a>(&'a self, key: &'a str) -> impl Iterator<Item = &'a str> {
+        self.entries
+            .iter()
+            .filter(move |(name, _)| name.matches(key))
+            .map(|(_, value)| value.as_str())
+    }
+}
+
+impl fmt::Debug for Headers {
+    fn fmt(&self, f: &mut fmt::Formatter<'_>) -> fmt::Result {
+        let mut map = f.debug_map();
+        for name in self.names() {
+            map.entry(&name, &self.values_of(name).collect::<Vec<_>>());
+        }
+        map.finish()
     }
 }
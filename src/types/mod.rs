@@ -5,6 +5,8 @@ use pyo3::{
     types::{PyBytes, PyString},
 };
 
+pub mod body_stream;
+pub mod cache_policy;
 pub mod cookie;
 pub mod function_info;
 pub mod headers;
@@ -12,10 +14,13 @@ pub mod identity;
 pub mod multimap;
 pub mod request;
 pub mod response;
+pub mod sse_hub;
+pub mod typed_param;
+pub mod upload_file;
 
 #[allow(clippy::large_enum_variant)]
 pub enum MiddlewareReturn {
-    Request(request::Request),
+    Request(Py<request::PyRequest>),
     Response(response::Response),
 }
 
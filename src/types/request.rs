@@ -4,33 +4,64 @@ use actix_web::{
     Error, HttpRequest,
 };
 use futures_util::StreamExt as _;
-use pyo3::types::{PyBytes, PyDict, PyList, PyString};
+use pyo3::sync::PyOnceLock;
+use pyo3::types::{PyBytes, PyDict, PyString};
 use pyo3::{exceptions::PyValueError, prelude::*, IntoPyObject};
-use serde_json::Value;
 use std::collections::HashMap;
+use tempfile::{NamedTempFile, TempPath};
+use tokio::io::AsyncWriteExt;
 
 use crate::types::{check_body_type, get_body_from_pyobject, Url};
 
-use super::{headers::Headers, identity::Identity, multimap::QueryParams};
+use super::{
+    body_stream::BodyStream,
+    headers::Headers,
+    identity::Identity,
+    multimap::QueryParams,
+    upload_file::{UploadFile, UploadedFile},
+};
 
-#[derive(Default, Debug, Clone, FromPyObject)]
+#[derive(Default, Debug, Clone)]
 pub struct Request {
     pub query_params: QueryParams,
     pub headers: Headers,
     pub method: String,
     pub path_params: HashMap<String, String>,
-    // https://pyo3.rs/v0.19.2/function.html?highlight=from_py_#per-argument-options
-    #[pyo3(from_py_with = get_body_from_pyobject)]
     pub body: Vec<u8>,
     pub url: Url,
     pub ip_addr: Option<String>,
     pub identity: Option<Identity>,
     pub form_data: Option<HashMap<String, String>>,
-    pub files: Option<HashMap<String, Vec<u8>>>,
+    pub files: Option<HashMap<String, UploadedFile>>,
     // A Python session object (robyn.session.Session) shared by reference across
     // the before_request / handler / after_request phases, so in-handler mutations
     // are visible when the cookie is written back. Set by configure_sessions().
     pub session: Option<Py<PyAny>>,
+    // An async iterator over the body chunks, set instead of `body` for routes
+    // registered with `stream_body=True`.
+    pub body_stream: Option<Py<PyAny>>,
+}
+
+impl From<Request> for PyRequest {
+    fn from(request: Request) -> Self {
+        // Headers, path params, body, form data and files stay Rust values
+        // until the handler reads them, see `Lazy`.
+        Self {
+            query_params: request.query_params,
+            path_params: Lazy::Pending(request.path_params),
+            headers: Lazy::Pending(request.headers),
+            body: Lazy::Pending(request.body),
+            method: request.method,
+            url: request.url,
+            ip_addr: request.ip_addr,
+            identity: request.identity,
+            form_data: Lazy::Pending(request.form_data),
+            files: Lazy::Pending(request.files),
+            session: request.session,
+            body_stream: request.body_stream,
+            json: None,
+        }
+    }
 }
 
 impl<'py> IntoPyObject<'py> for Request {
@@ -38,97 +69,250 @@ impl<'py> IntoPyObject<'py> for Request {
     type Output = Bound<'py, Self::Target>;
     type Error = PyErr;
     fn into_pyobject(self, py: Python<'py>) -> Result<Self::Output, Self::Error> {
-        let headers: Py<Headers> = self.headers.into_pyobject(py)?.extract()?;
-        let path_params = self.path_params.into_pyobject(py)?.extract()?;
+        Ok(Py::new(py, PyRequest::from(self))?
+            .into_bound(py)
+            .into_any())
+    }
+}
 
-        let body = if self.body.is_empty() {
-            PyString::new(py, "").into_any()
-        } else {
-            match std::str::from_utf8(&self.body) {
-                Ok(s) => PyString::new(py, s).into_any(),
-                Err(_) => PyBytes::new(py, &self.body).into_any(),
-            }
-        };
+/// A request on its way through the before middlewares, the handler and the
+/// after middlewares.
+///
+/// It stays Rust data until Python first needs it and is converted once:
+/// every later phase is handed the same Python `Request`, so middlewares
+/// neither copy it into Python nor extract it back on each call.
+pub enum SharedRequest {
+    Rust(Request),
+    Python(Py<PyRequest>),
+}
 
-        let form_data: Py<PyDict> = match self.form_data {
-            Some(data) if !data.is_empty() => {
-                let dict = PyDict::new(py);
-                // Use with_capacity equivalent by setting items directly
-                for (key, value) in data {
-                    dict.set_item(key, value)?;
-                }
-                dict.into()
-            }
-            _ => PyDict::new(py).into(),
-        };
+impl SharedRequest {
+    /// The Python request, converting the Rust one on first use.
+    pub fn to_py(&mut self, py: Python) -> PyResult<Py<PyRequest>> {
+        if let SharedRequest::Rust(request) = self {
+            let request = PyRequest::from(std::mem::take(request));
+            *self = SharedRequest::Python(Py::new(py, request)?);
+        }
+        match self {
+            SharedRequest::Python(request) => Ok(request.clone_ref(py)),
+            SharedRequest::Rust(_) => unreachable!(),
+        }
+    }
+}
 
-        let files: Py<PyDict> = match self.files {
-            Some(data) if !data.is_empty() => {
-                let dict = PyDict::new(py);
-                for (key, value) in data {
-                    let bytes = PyBytes::new(py, &value);
-                    dict.set_item(key, bytes)?;
-                }
-                dict.into()
-            }
-            _ => PyDict::new(py).into(),
-        };
+impl FromPyObject<'_, '_> for Request {
+    type Error = PyErr;
 
-        let request = PyRequest {
-            query_params: self.query_params,
-            path_params,
-            headers,
-            body: body.into(),
-            method: self.method,
-            url: self.url,
-            ip_addr: self.ip_addr,
-            identity: self.identity,
-            form_data,
-            files,
-            session: self.session,
+    fn extract(obj: pyo3::Borrowed<'_, '_, PyAny>) -> Result<Self, Self::Error> {
+        let py = obj.py();
+        let request = obj.downcast::<PyRequest>()?.try_borrow()?;
+
+        // Attributes Python never read are still Rust values and are cloned
+        // as they are, without a round trip through Python objects.
+        Ok(Self {
+            query_params: request.query_params.clone(),
+            headers: request.headers.extract_with(py, |obj| Ok(obj.extract()?))?,
+            method: request.method.clone(),
+            path_params: request
+                .path_params
+                .extract_with(py, |obj| Ok(obj.extract()?))?,
+            body: request.body.extract_with(py, get_body_from_pyobject)?,
+            url: request.url.clone(),
+            ip_addr: request.ip_addr.clone(),
+            identity: request.identity.clone(),
+            form_data: request
+                .form_data
+                .extract_with(py, |obj| Ok(Some(obj.extract()?)))?,
+            files: request
+                .files
+                .extract_with(py, |obj| Ok(Some(obj.extract()?)))?,
+            session: request
+                .session
+                .as_ref()
+                .map(|session| session.clone_ref(py)),
+            body_stream: request
+                .body_stream
+                .as_ref()
+                .map(|stream| stream.clone_ref(py)),
+        })
+    }
+}
+
+/// A request attribute that is kept as Rust data until Python first reads it.
+///
+/// Most handlers only look at one or two parts of the request, so converting
+/// the headers, body and multipart fields for every call is wasted work. The
+/// Python object is built on first access and cached, so repeated reads (and
+/// in-place mutations) see the same object.
+#[derive(Clone)]
+enum Lazy<T> {
+    Pending(T),
+    Ready(Py<PyAny>),
+}
+
+impl<T: Clone> Lazy<T> {
+    fn get_or_convert(
+        &mut self,
+        py: Python,
+        convert: impl FnOnce(Python, &T) -> PyResult<Py<PyAny>>,
+    ) -> PyResult<Py<PyAny>> {
+        let obj = match self {
+            Lazy::Ready(obj) => return Ok(obj.clone_ref(py)),
+            // Converted from a borrow, so the value stays pending if it fails
+            Lazy::Pending(value) => convert(py, value)?,
         };
-        Ok(Py::new(py, request)?.into_bound(py).into_any())
+        *self = Lazy::Ready(obj.clone_ref(py));
+        Ok(obj)
+    }
+
+    fn extract_with(
+        &self,
+        py: Python,
+        extract: impl FnOnce(&Bound<'_, PyAny>) -> PyResult<T>,
+    ) -> PyResult<T> {
+        match self {
+            Lazy::Pending(value) => Ok(value.clone()),
+            Lazy::Ready(obj) => extract(obj.bind(py)),
+        }
+    }
+}
+
+/// Cached `orjson.loads` callable, which builds the Python objects in the
+/// same pass that parses the body.
+static ORJSON_LOADS: PyOnceLock<Py<PyAny>> = PyOnceLock::new();
+
+fn orjson_loads<'py>(py: Python<'py>) -> PyResult<&'py Bound<'py, PyAny>> {
+    Ok(ORJSON_LOADS
+        .get_or_try_init(py, || -> PyResult<Py<PyAny>> {
+            Ok(py.import("orjson")?.getattr("loads")?.unbind())
+        })?
+        .bind(py))
+}
+
+fn body_to_py(py: Python, body: &[u8]) -> PyResult<Py<PyAny>> {
+    let body = if body.is_empty() {
+        PyString::new(py, "").into_any()
+    } else {
+        match std::str::from_utf8(body) {
+            Ok(s) => PyString::new(py, s).into_any(),
+            Err(_) => PyBytes::new(py, body).into_any(),
+        }
+    };
+    Ok(body.unbind())
+}
+
+fn form_data_to_py(py: Python, form_data: &Option<HashMap<String, String>>) -> PyResult<Py<PyAny>> {
+    let dict = PyDict::new(py);
+    for (key, value) in form_data.iter().flatten() {
+        dict.set_item(key, value)?;
     }
+    Ok(dict.into_any().unbind())
+}
+
+fn files_to_py(py: Python, files: &Option<HashMap<String, UploadedFile>>) -> PyResult<Py<PyAny>> {
+    let dict = PyDict::new(py);
+    for (key, value) in files.iter().flatten() {
+        match value {
+            UploadedFile::InMemory(content) => dict.set_item(key, PyBytes::new(py, content))?,
+            UploadedFile::Spooled(upload) => dict.set_item(key, Py::new(py, upload.clone())?)?,
+        }
+    }
+    Ok(dict.into_any().unbind())
+}
+
+/// Settings for reading multipart bodies.
+#[derive(Debug, Clone, Copy)]
+pub struct MultipartConfig {
+    /// Uploaded files larger than this many bytes are spooled to a temporary
+    /// file instead of being kept in memory.
+    pub spool_threshold: usize,
 }
 
 async fn handle_multipart(
     mut payload: Multipart,
-    files: &mut HashMap<String, Vec<u8>>,
+    config: &MultipartConfig,
+    files: &mut HashMap<String, UploadedFile>,
     form_data: &mut HashMap<String, String>,
-    body: &mut Vec<u8>,
 ) -> Result<(), Error> {
     // Iterate over multipart stream
 
     while let Some(item) = payload.next().await {
         let mut field = item?;
 
-        let mut data = Vec::new();
-        while let Some(chunk) = field.next().await {
-            let data_chunk = chunk?;
-            data.extend_from_slice(&data_chunk);
-        }
-
         let content_disposition = field.content_disposition();
-        let field_name = content_disposition.get_name().unwrap_or_default();
+        let field_name = content_disposition
+            .get_name()
+            .unwrap_or_default()
+            .to_string();
         let file_name = content_disposition.get_filename().map(|s| s.to_string());
+        let content_type = field.content_type().map(|mime| mime.to_string());
 
-        body.extend_from_slice(&data);
+        let Some(name) = file_name else {
+            let mut data = Vec::new();
+            while let Some(chunk) = field.next().await {
+                data.extend_from_slice(&chunk?);
+            }
+            if let Ok(text) = String::from_utf8(data) {
+                form_data.insert(field_name, text);
+            }
+            continue;
+        };
 
-        if let Some(name) = file_name {
-            files.insert(name, data);
-        } else if let Ok(text) = String::from_utf8(data) {
-            form_data.insert(field_name.to_string(), text);
+        // Files are buffered until they cross the threshold, then everything
+        // read so far and the rest of the field go to a temporary file.
+        let mut data = Vec::new();
+        let mut size = 0;
+        let mut spooled: Option<(tokio::fs::File, TempPath)> = None;
+        while let Some(chunk) = field.next().await {
+            let chunk = chunk?;
+            size += chunk.len() as u64;
+            match spooled.as_mut() {
+                Some((file, _)) => file.write_all(&chunk).await?,
+                None if data.len() + chunk.len() > config.spool_threshold => {
+                    let (file, path) = NamedTempFile::new()?.into_parts();
+                    let mut file = tokio::fs::File::from_std(file);
+                    file.write_all(&data).await?;
+                    file.write_all(&chunk).await?;
+                    data = Vec::new();
+                    spooled = Some((file, path));
+                }
+                None => data.extend_from_slice(&chunk),
+            }
         }
+
+        let upload = match spooled {
+            Some((mut file, path)) => {
+                file.flush().await?;
+                UploadedFile::Spooled(UploadFile::new(name.clone(), content_type, size, path))
+            }
+            None => UploadedFile::InMemory(data),
+        };
+        files.insert(name, upload);
     }
 
     Ok(())
 }
 
+/// The request path used for routing, without a trailing slash.
+pub fn route_path(path: &str) -> &str {
+    if path.ends_with('/') && path.len() > 1 {
+        &path[..path.len() - 1]
+    } else {
+        path
+    }
+}
+
 impl Request {
+    /// Build a request from the actix request and its payload.
+    ///
+    /// When `stream_body` is set the payload is not read here; it is exposed
+    /// to the handler as a `BodyStream` and `body` stays empty.
     pub async fn from_actix_request(
         req: &HttpRequest,
         mut payload: web::Payload,
         global_headers: &Headers,
+        stream_body: bool,
+        multipart_config: &MultipartConfig,
     ) -> Result<Self, Error> {
         let mut query_params: QueryParams = QueryParams::new();
         let mut form_data: HashMap<String, String> = HashMap::new();
@@ -148,17 +332,24 @@ impl Request {
         let mut headers = Headers::from_actix_headers(req.headers());
         headers.extend(global_headers);
 
-        let body: Vec<u8> = if headers.contains(String::from("content-type"))
-            && headers
-                .get(String::from("content-type"))
-                .is_some_and(|val| val.contains("multipart/form-data"))
+        let mut body_stream = None;
+        let body: Vec<u8> = if stream_body {
+            let stream = BodyStream::from_payload(payload);
+            body_stream = Some(
+                Python::with_gil(|py| Py::new(py, stream).map(|stream| stream.into_any()))
+                    .map_err(actix_web::error::ErrorInternalServerError)?,
+            );
+            Vec::new()
+        } else if headers
+            .get_str("content-type")
+            .is_some_and(|val| val.contains("multipart/form-data"))
         {
+            // The fields end up in `form_data` and `files`; the raw body is
+            // not kept around as well.
             let multipart = Multipart::new(req.headers(), payload);
-            let mut body_local: Vec<u8> = Vec::new();
+            handle_multipart(multipart, multipart_config, &mut files, &mut form_data).await?;
 
-            handle_multipart(multipart, &mut files, &mut form_data, &mut body_local).await?;
-
-            body_local
+            Vec::new()
         } else {
             let mut body_local = BytesMut::new();
             while let Some(chunk) = payload.next().await {
@@ -168,18 +359,10 @@ impl Request {
             body_local.freeze().to_vec()
         };
 
-        let route_path = {
-            let mut path = req.path();
-            if path.ends_with("/") && path.len() > 1 {
-                path = &path[..path.len() - 1]
-            }
-            path
-        };
-
         let url = Url::new(
             req.connection_info().scheme(),
             req.connection_info().host(),
-            route_path,
+            route_path(req.path()),
         );
         let ip_addr = req.peer_addr().map(|val| val.ip().to_string());
 
@@ -195,6 +378,7 @@ impl Request {
             form_data: Some(form_data),
             files: Some(files),
             session: None,
+            body_stream,
         })
     }
 }
@@ -204,32 +388,31 @@ impl Request {
 pub struct PyRequest {
     #[pyo3(get, set)]
     pub query_params: QueryParams,
-    #[pyo3(get, set)]
-    pub headers: Py<Headers>,
-    #[pyo3(get, set)]
-    pub path_params: Py<PyDict>,
+    headers: Lazy<Headers>,
+    path_params: Lazy<HashMap<String, String>>,
     #[pyo3(get, set)]
     pub identity: Option<Identity>,
-    #[pyo3(get)]
-    pub body: Py<PyAny>,
+    body: Lazy<Vec<u8>>,
     #[pyo3(get)]
     pub method: String,
     #[pyo3(get)]
     pub url: Url,
     #[pyo3(get)]
     pub ip_addr: Option<String>,
-    #[pyo3(get, set)]
-    pub form_data: Py<PyDict>,
-    #[pyo3(get, set)]
-    pub files: Py<PyDict>,
+    form_data: Lazy<Option<HashMap<String, String>>>,
+    files: Lazy<Option<HashMap<String, UploadedFile>>>,
     #[pyo3(get, set)]
     pub session: Option<Py<PyAny>>,
+    #[pyo3(get, set)]
+    pub body_stream: Option<Py<PyAny>>,
+    // The result of `json()`
+    json: Option<Py<PyAny>>,
 }
 
 #[pymethods]
 impl PyRequest {
     #[new]
-    #[pyo3(signature = (query_params, headers, path_params, body, method, url, form_data, files, identity, ip_addr, session=None))]
+    #[pyo3(signature = (query_params, headers, path_params, body, method, url, form_data, files, identity, ip_addr, session=None, body_stream=None))]
     #[allow(clippy::too_many_arguments)]
     pub fn new(
         query_params: QueryParams,
@@ -243,88 +426,122 @@ impl PyRequest {
         identity: Option<Identity>,
         ip_addr: Option<String>,
         session: Option<Py<PyAny>>,
+        body_stream: Option<Py<PyAny>>,
     ) -> Self {
         Self {
             query_params,
-            headers,
-            path_params,
+            headers: Lazy::Ready(headers.into_any()),
+            path_params: Lazy::Ready(path_params.into_any()),
             identity,
-            body,
+            body: Lazy::Ready(body),
             method,
             url,
-            form_data,
-            files,
+            form_data: Lazy::Ready(form_data.into_any()),
+            files: Lazy::Ready(files.into_any()),
             ip_addr,
             session,
+            body_stream,
+            json: None,
         }
     }
 
+    #[getter]
+    pub fn headers(&mut self, py: Python) -> PyResult<Py<PyAny>> {
+        self.headers.get_or_convert(py, |py, headers| {
+            Ok(Py::new(py, headers.clone())?.into_any())
+        })
+    }
+
+    #[setter]
+    pub fn set_headers(&mut self, headers: Py<Headers>) {
+        self.headers = Lazy::Ready(headers.into_any());
+    }
+
+    #[getter]
+    pub fn path_params(&mut self, py: Python) -> PyResult<Py<PyAny>> {
+        self.path_params.get_or_convert(py, |py, path_params| {
+            Ok(path_params.into_pyobject(py)?.into_any().unbind())
+        })
+    }
+
+    #[setter]
+    pub fn set_path_params(&mut self, path_params: Py<PyDict>) {
+        self.path_params = Lazy::Ready(path_params.into_any());
+    }
+
+    #[getter]
+    pub fn body(&mut self, py: Python) -> PyResult<Py<PyAny>> {
+        self.body
+            .get_or_convert(py, |py, body| body_to_py(py, body))
+    }
+
     #[setter]
     pub fn set_body(&mut self, py: Python, body: Py<PyAny>) -> PyResult<()> {
         check_body_type(py, &body)?;
-        self.body = body;
+        self.body = Lazy::Ready(body);
+        self.json = None;
         Ok(())
     }
 
-    pub fn json(&self, py: Python) -> PyResult<Py<PyAny>> {
-        let parsed: Value = if let Ok(python_string) = self.body.downcast_bound::<PyString>(py) {
-            serde_json::from_str(python_string.extract()?)
-        } else if let Ok(python_bytes) = self.body.downcast_bound::<PyBytes>(py) {
-            serde_json::from_slice(python_bytes.as_bytes())
-        } else {
-            return Err(PyValueError::new_err("Invalid JSON body"));
-        }
-        .map_err(|e| PyValueError::new_err(format!("Invalid JSON: {}", e)))?;
+    /// The body as `bytes`, without decoding it to a `str` like `body` does.
+    #[getter]
+    pub fn raw_body(&self, py: Python) -> PyResult<Py<PyAny>> {
+        let body = match &self.body {
+            Lazy::Pending(body) => PyBytes::new(py, body),
+            Lazy::Ready(body) => PyBytes::new(py, &get_body_from_pyobject(body.bind(py))?),
+        };
+        Ok(body.into_any().unbind())
+    }
 
-        json_value_to_py(py, &parsed)
+    #[getter]
+    pub fn form_data(&mut self, py: Python) -> PyResult<Py<PyAny>> {
+        self.form_data.get_or_convert(py, form_data_to_py)
     }
-}
 
-/// Maximum allowed recursion depth for JSON parsing to prevent stack overflow attacks.
-const MAX_JSON_DEPTH: usize = 128;
+    #[setter]
+    pub fn set_form_data(&mut self, form_data: Py<PyDict>) {
+        self.form_data = Lazy::Ready(form_data.into_any());
+    }
 
-/// Converts a serde_json::Value to a Python object with proper type preservation.
-/// This is a convenience wrapper that starts recursion with MAX_JSON_DEPTH.
-fn json_value_to_py(py: Python, value: &Value) -> PyResult<Py<PyAny>> {
-    json_value_to_py_with_depth(py, value, MAX_JSON_DEPTH)
-}
+    #[getter]
+    pub fn files(&mut self, py: Python) -> PyResult<Py<PyAny>> {
+        self.files.get_or_convert(py, files_to_py)
+    }
 
-/// Converts a serde_json::Value to a Python object with recursion depth limiting.
-fn json_value_to_py_with_depth(py: Python, value: &Value, depth: usize) -> PyResult<Py<PyAny>> {
-    if depth == 0 {
-        return Err(PyValueError::new_err(
-            "JSON nesting depth exceeds maximum allowed limit",
-        ));
+    #[setter]
+    pub fn set_files(&mut self, files: Py<PyDict>) {
+        self.files = Lazy::Ready(files.into_any());
     }
 
-    match value {
-        Value::Null => Ok(py.None()),
-        Value::Bool(b) => Ok(b.into_pyobject(py)?.to_owned().into_any().unbind()),
-        Value::Number(n) => {
-            if let Some(i) = n.as_i64() {
-                Ok(i.into_pyobject(py)?.into_any().unbind())
-            } else if let Some(u) = n.as_u64() {
-                Ok(u.into_pyobject(py)?.into_any().unbind())
-            } else if let Some(f) = n.as_f64() {
-                Ok(f.into_pyobject(py)?.into_any().unbind())
-            } else {
-                Err(PyValueError::new_err("Invalid number in JSON"))
-            }
-        }
-        Value::String(s) => Ok(s.as_str().into_pyobject(py)?.into_any().unbind()),
-        Value::Array(arr) => {
-            let list = PyList::empty(py);
-            for item in arr {
-                list.append(json_value_to_py_with_depth(py, item, depth - 1)?)?;
-            }
-            Ok(list.into_pyobject(py)?.into_any().unbind())
+    /// The body parsed as JSON, parsed once and cached until the body is
+    /// replaced.
+    pub fn json(&mut self, py: Python) -> PyResult<Py<PyAny>> {
+        if let Some(json) = &self.json {
+            return Ok(json.clone_ref(py));
         }
-        Value::Object(map) => {
-            let dict = PyDict::new(py);
-            for (k, v) in map {
-                dict.set_item(k, json_value_to_py_with_depth(py, v, depth - 1)?)?;
+        let loads = orjson_loads(py)?;
+        let parsed = match &self.body {
+            // Parse straight from the request bytes when Python never read the body.
+            Lazy::Pending(body) => loads.call1((PyBytes::new(py, body),)),
+            Lazy::Ready(body) => {
+                let body = body.bind(py);
+                if !(body.is_instance_of::<PyString>() || body.is_instance_of::<PyBytes>()) {
+                    return Err(PyValueError::new_err("Invalid JSON body"));
+                }
+                loads.call1((body,))
             }
-            Ok(dict.into_pyobject(py)?.into_any().unbind())
         }
+        .map_err(|e| PyValueError::new_err(format!("Invalid JSON: {}", e.value(py))))?
+        .unbind();
+
+        self.json = Some(parsed.clone_ref(py));
+        Ok(parsed)
+    }
+}
+
+impl PyRequest {
+    /// Replace the path params, e.g. with those of the matched route.
+    pub(crate) fn replace_path_params(&mut self, path_params: HashMap<String, String>) {
+        self.path_params = Lazy::Pending(path_params);
     }
 }
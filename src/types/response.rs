@@ -1,20 +1,28 @@
 use actix_http::{body::BoxBody, StatusCode};
-use actix_web::{web::Bytes, HttpRequest, HttpResponse, HttpResponseBuilder, Responder};
-use futures::Stream;
+use actix_web::{
+    http::header::{HeaderValue, CONTENT_TYPE, SET_COOKIE},
+    web::Bytes,
+    HttpRequest, HttpResponse, HttpResponseBuilder, Responder,
+};
+use futures::{future::BoxFuture, FutureExt, Stream};
 use pyo3::{
-    exceptions::{PyIOError, PyTypeError},
+    exceptions::{PyIOError, PyStopAsyncIteration, PyTypeError},
     prelude::*,
-    types::{PyBytes, PyDict, PyEllipsis},
+    types::{PyBytes, PyDict, PyEllipsis, PyList, PyString, PyTuple},
     Bound, IntoPyObject,
 };
+use pyo3_async_runtimes::TaskLocals;
 use std::pin::Pin;
 use tokio;
 
-use crate::io_helpers::{apply_hashmap_headers, read_file};
+use crate::asyncio::next_ready_helper;
+
+use crate::io_helpers::{apply_hashmap_headers, file_response};
 use crate::types::{check_body_type, check_description_type, get_description_from_pyobject};
 
 use super::cookie::{Cookie, Cookies};
 use super::headers::Headers;
+use super::sse_hub::SSESubscription;
 
 #[derive(Debug, Clone)]
 pub struct Response {
@@ -30,9 +38,28 @@ pub struct Response {
 pub struct StreamingResponse {
     pub status_code: u16,
     pub headers: Headers,
-    pub content_generator: Py<PyAny>,
+    pub source: StreamSource,
+}
+
+/// Where the chunks of a `StreamingResponse` come from.
+#[derive(Debug, Clone)]
+pub enum StreamSource {
+    /// A sync generator, advanced on a blocking thread
+    Generator(Py<PyAny>),
+    /// An async generator, awaited on the handler's event loop. With
+    /// `coalesce`, the items it has ready are sent as a single chunk
+    AsyncGenerator {
+        generator: Py<PyAny>,
+        event_loop: Py<PyAny>,
+        coalesce: bool,
+    },
+    /// The events of an `SSEHub` subscription, streamed without the GIL
+    Subscription(Py<SSESubscription>),
 }
 
+/// Upper bound on the number of items sent as one chunk when coalescing.
+const MAX_COALESCED_ITEMS: usize = 64;
+
 #[derive(Debug)]
 pub enum ResponseType {
     Standard(Response),
@@ -62,7 +89,11 @@ impl Responder for ResponseType {
 impl Responder for Response {
     type Body = BoxBody;
 
-    fn respond_to(self, _req: &HttpRequest) -> HttpResponse<Self::Body> {
+    fn respond_to(self, req: &HttpRequest) -> HttpResponse<Self::Body> {
+        if let Some(file_path) = self.file_path.clone() {
+            return self.respond_with_file(&file_path, req);
+        }
+
         let mut response_builder = HttpResponseBuilder::new(
             StatusCode::from_u16(self.status_code).unwrap_or(StatusCode::INTERNAL_SERVER_ERROR),
         );
@@ -85,11 +116,11 @@ impl Responder for Response {
 }
 
 impl StreamingResponse {
-    pub fn new(status_code: u16, headers: Headers, content_generator: Py<PyAny>) -> Self {
+    pub fn new(status_code: u16, headers: Headers, source: StreamSource) -> Self {
         Self {
             status_code,
             headers,
-            content_generator,
+            source,
         }
     }
 }
@@ -112,8 +143,21 @@ impl Responder for StreamingResponse {
             .append_header(("Pragma", "no-cache"))
             .append_header(("Expires", "0"));
 
-        // Create the optimized stream from the Python generator
-        let stream = create_python_stream(self.content_generator);
+        let stream: Pin<Box<dyn Stream<Item = Result<Bytes, actix_web::Error>> + Send>> =
+            match self.source {
+                StreamSource::Generator(generator) => create_python_stream(generator),
+                StreamSource::AsyncGenerator {
+                    generator,
+                    event_loop,
+                    coalesce,
+                } => create_async_python_stream(generator, event_loop, coalesce),
+                StreamSource::Subscription(subscription) => {
+                    subscription.get().take_stream().unwrap_or_else(|| {
+                        log::error!("SSE subscription is already being streamed; ending stream");
+                        Box::pin(futures::stream::empty())
+                    })
+                }
+            };
 
         // Build streaming response with optimized settings
         response_builder.streaming(stream)
@@ -130,18 +174,8 @@ fn create_python_stream(
 
                 match gen.call_method0("__next__") {
                     Ok(value) => {
-                        // Accept both `bytes` (used as-is) and `str` (UTF-8 encoded)
-                        // chunks, so binary streaming works too (#1236).
-                        if let Ok(py_bytes) = value.downcast::<PyBytes>() {
-                            Some((py_bytes.as_bytes().to_vec(), generator))
-                        } else if let Ok(s) = value.extract::<String>() {
-                            Some((s.into_bytes(), generator))
-                        } else {
-                            log::error!(
-                                "StreamingResponse generator yielded a value that is neither str nor bytes; ending stream"
-                            );
-                            None
-                        }
+                        let mut chunk = Vec::new();
+                        append_chunk(&mut chunk, &value).then_some((chunk, generator))
                     }
                     Err(e) => {
                         if !e.is_instance_of::<pyo3::exceptions::PyStopIteration>(py) {
@@ -160,6 +194,128 @@ fn create_python_stream(
     }))
 }
 
+/// Append a value yielded by a streaming generator to `chunk`.
+///
+/// Accepts both `bytes` (used as-is) and `str` (UTF-8 encoded) chunks, so
+/// binary streaming works too (#1236). Returns false for anything else.
+fn append_chunk(chunk: &mut Vec<u8>, value: &Bound<'_, PyAny>) -> bool {
+    if let Ok(py_bytes) = value.downcast::<PyBytes>() {
+        chunk.extend_from_slice(py_bytes.as_bytes());
+    } else if let Some(s) = value
+        .downcast::<PyString>()
+        .ok()
+        .and_then(|s| s.to_str().ok())
+    {
+        chunk.extend_from_slice(s.as_bytes());
+    } else {
+        log::error!(
+            "StreamingResponse generator yielded a value that is neither str nor bytes; ending stream"
+        );
+        return false;
+    }
+    true
+}
+
+/// An async generator being streamed, see `create_async_python_stream`.
+struct AsyncGeneratorStream {
+    iterator: Py<PyAny>,
+    locals: TaskLocals,
+    coalesce: bool,
+    // With `coalesce`, the task producing the item after the last chunk
+    pending: Option<Py<PyAny>>,
+    exhausted: bool,
+}
+
+impl AsyncGeneratorStream {
+    /// Start awaiting the next chunk's items on the generator's event loop.
+    fn next_items(&self, py: Python) -> PyResult<BoxFuture<'static, PyResult<Py<PyAny>>>> {
+        let awaitable = if self.coalesce {
+            let pending = self.pending.as_ref().map(|task| task.clone_ref(py));
+            next_ready_helper(py)?.call1((&self.iterator, pending, MAX_COALESCED_ITEMS))?
+        } else {
+            self.iterator.bind(py).call_method0("__anext__")?
+        };
+        Ok(pyo3_async_runtimes::into_future_with_locals(&self.locals, awaitable)?.boxed())
+    }
+
+    /// Turn what `next_items` resolved to into a chunk, or `None` when the
+    /// stream is over. The chunk is empty when the ready items all were.
+    fn take_chunk(&mut self, py: Python, output: Py<PyAny>) -> PyResult<Option<Vec<u8>>> {
+        let output = output.into_bound(py);
+        let mut chunk = Vec::new();
+        if !self.coalesce {
+            return Ok(append_chunk(&mut chunk, &output).then_some(chunk));
+        }
+
+        let output = output.downcast_into::<PyTuple>()?;
+        let items = output.get_item(0)?.downcast_into::<PyList>()?;
+        let pending = output.get_item(1)?;
+        self.pending = (!pending.is_none()).then(|| pending.unbind());
+        self.exhausted = output.get_item(2)?.is_truthy()?;
+        for item in items.iter() {
+            if !append_chunk(&mut chunk, &item) {
+                return Ok(None);
+            }
+        }
+        Ok((!(self.exhausted && chunk.is_empty())).then_some(chunk))
+    }
+}
+
+/// Stream an async generator, awaiting it directly on `event_loop`.
+///
+/// No thread blocks while the generator waits. With `coalesce`, the items it
+/// has ready are sent as one chunk, and converted under a single GIL
+/// acquisition.
+fn create_async_python_stream(
+    generator: Py<PyAny>,
+    event_loop: Py<PyAny>,
+    coalesce: bool,
+) -> Pin<Box<dyn Stream<Item = Result<Bytes, actix_web::Error>> + Send>> {
+    let state = Python::with_gil(|py| -> PyResult<_> {
+        Ok(AsyncGeneratorStream {
+            locals: TaskLocals::new(event_loop.into_bound(py)).copy_context(py)?,
+            iterator: generator.bind(py).call_method0("__aiter__")?.unbind(),
+            coalesce,
+            pending: None,
+            exhausted: false,
+        })
+    });
+    let state = match state {
+        Ok(state) => state,
+        Err(e) => {
+            log::error!("Failed to start streaming the async generator: {}", e);
+            return Box::pin(futures::stream::empty());
+        }
+    };
+
+    Box::pin(futures::stream::unfold(state, |mut state| async move {
+        loop {
+            if state.exhausted {
+                return None;
+            }
+            let chunk = match Python::with_gil(|py| state.next_items(py)) {
+                Ok(next_items) => match next_items.await {
+                    Ok(output) => Python::with_gil(|py| state.take_chunk(py, output)),
+                    Err(e) => Err(e),
+                },
+                Err(e) => Err(e),
+            };
+            match chunk {
+                // Only empty items were ready: wait for the next ones
+                Ok(Some(chunk)) if chunk.is_empty() => {}
+                Ok(Some(chunk)) => return Some((Ok(Bytes::from(chunk)), state)),
+                Ok(None) => return None,
+                Err(e) => {
+                    if !Python::with_gil(|py| e.is_instance_of::<PyStopAsyncIteration>(py)) {
+                        log::error!("Async generator error: {}", e);
+                    }
+                    return None;
+                }
+            }
+        }
+    }))
+}
+
 /// Default sentinel for the `description`/`body` constructor args.
 ///
 /// Python has no way to represent "argument omitted" as a value, so to support
@@ -176,10 +332,60 @@ fn missing_response_body() -> Py<PyAny> {
 }
 
 impl Response {
+    /// Stream the file at `file_path` from disk, then layer the handler's status,
+    /// headers and cookies on top of the file response.
+    fn respond_with_file(self, file_path: &str, req: &HttpRequest) -> HttpResponse {
+        let content_type = self.headers.get_str("content-type");
+        let mut response = match file_response(file_path, content_type, req) {
+            Ok(response) => response,
+            Err(e) if e.kind() == std::io::ErrorKind::NotFound => {
+                log::error!("File '{}' not found: {}", file_path, e);
+                return Response::not_found(None).respond_to(req);
+            }
+            Err(e) => {
+                log::error!("Failed to open file '{}': {}", file_path, e);
+                return Response::internal_server_error(None).respond_to(req);
+            }
+        };
+
+        // Only override a plain 200: conditional/partial statuses computed from
+        // the request headers (304, 206, 412, 416) must be preserved.
+        if response.status() == StatusCode::OK {
+            *response.status_mut() =
+                StatusCode::from_u16(self.status_code).unwrap_or(StatusCode::INTERNAL_SERVER_ERROR);
+        }
+
+        let response_headers = response.headers_mut();
+        // Content-Type was already applied by `file_response`, which may have
+        // to replace it with a multipart/byteranges type.
+        let handler_headers = || {
+            self.headers
+                .header_pairs()
+                .filter(|(name, _)| **name != CONTENT_TYPE)
+        };
+        // Handler headers win over the ones derived from the file.
+        for (name, _) in handler_headers() {
+            response_headers.remove(name);
+        }
+        for (name, value) in handler_headers() {
+            response_headers.append(name.clone(), value.clone());
+        }
+
+        for (name, cookie) in &self.cookies.cookies {
+            match cookie
+                .to_header_value(name)
+                .map(|value| HeaderValue::from_str(&value))
+            {
+                Ok(Ok(header_value)) => response_headers.append(SET_COOKIE, header_value),
+                _ => log::debug!("Skipping invalid cookie '{}'", name),
+            }
+        }
+
+        response
+    }
+
     fn default_text_headers() -> Headers {
-        let mut headers = Headers::new(None);
-        headers.set("Content-Type".to_string(), "text/plain".to_string());
-        headers
+        Headers::from_static(CONTENT_TYPE, "text/plain")
     }
 
     pub fn not_found(headers: Option<&Headers>) -> Self {
@@ -208,6 +414,19 @@ impl Response {
         }
     }
 
+    pub fn service_unavailable(headers: Option<&Headers>) -> Self {
+        const SERVICE_UNAVAILABLE_BYTES: &[u8] = b"Service unavailable";
+
+        Self {
+            status_code: 503,
+            response_type: "text".to_string(),
+            headers: headers.cloned().unwrap_or_else(Self::default_text_headers),
+            description: SERVICE_UNAVAILABLE_BYTES.to_vec(),
+            file_path: None,
+            cookies: Cookies::new(),
+        }
+    }
+
     pub fn method_not_allowed(headers: Option<&Headers>) -> Self {
         const METHOD_NOT_ALLOWED_BYTES: &[u8] = b"Method not allowed";
 
@@ -403,14 +622,19 @@ impl PyResponse {
 
     #[setter]
     pub fn set_file_path(&mut self, py: Python, file_path: &str) -> PyResult<()> {
-        self.response_type = "static_file".to_string();
-        self.file_path = Some(file_path.to_string());
-
-        match read_file(file_path) {
-            Ok(content) => {
-                self.description = PyBytes::new(py, &content).into();
+        // The file contents are streamed from disk when the response is sent,
+        // so only make sure the path points at a file here.
+        match std::fs::metadata(file_path) {
+            Ok(metadata) if metadata.is_file() => {
+                self.response_type = "static_file".to_string();
+                self.file_path = Some(file_path.to_string());
+                self.description = "".into_pyobject(py)?.into_any().unbind();
                 Ok(())
             }
+            Ok(_) => Err(PyIOError::new_err(format!(
+                "Failed to read file: {} is not a file",
+                file_path
+            ))),
             Err(e) => Err(PyIOError::new_err(format!("Failed to read file: {}", e))),
         }
     }
@@ -508,8 +732,23 @@ impl FromPyObject<'_, '_> for StreamingResponse {
             }
         }
 
-        let content: pyo3::Py<PyAny> = obj.getattr("content")?.unbind();
+        let content = obj.getattr("content")?;
+        let source = if let Ok(subscription) = content.downcast::<SSESubscription>() {
+            StreamSource::Subscription(subscription.clone().unbind())
+        } else if content.hasattr("__anext__")? {
+            // Async generators are driven on the loop the handler runs on
+            StreamSource::AsyncGenerator {
+                generator: content.unbind(),
+                event_loop: pyo3_async_runtimes::tokio::get_current_loop(obj.py())?.unbind(),
+                coalesce: match obj.getattr("coalesce") {
+                    Ok(coalesce) => coalesce.is_truthy()?,
+                    Err(_) => false,
+                },
+            }
+        } else {
+            StreamSource::Generator(content.unbind())
+        };
 
-        Ok(StreamingResponse::new(status_code, headers, content))
+        Ok(StreamingResponse::new(status_code, headers, source))
     }
 }
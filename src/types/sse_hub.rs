@@ -0,0 +1,444 @@
+use std::collections::{HashMap, VecDeque};
+use std::pin::Pin;
+use std::sync::atomic::{AtomicBool, Ordering};
+use std::sync::{Arc, Weak};
+use std::time::{Duration, Instant};
+
+use actix_web::web::Bytes;
+use futures::Stream;
+use parking_lot::Mutex;
+use pyo3::exceptions::{PyTypeError, PyValueError};
+use pyo3::prelude::*;
+use pyo3::types::{PyBytes, PyString};
+use tokio::sync::Notify;
+
+/// Sent when a subscriber has had no event for `keep_alive` seconds, so
+/// proxies don't close the idle connection.
+const KEEP_ALIVE_COMMENT: &[u8] = b": keep-alive\n\n";
+
+/// How often publishing or subscribing also sweeps the topics nobody is
+/// listening to anymore.
+const SWEEP_INTERVAL: Duration = Duration::from_secs(1);
+
+/// What happens to a subscriber whose buffer is full when an event arrives.
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+enum SlowConsumerPolicy {
+    /// Drop its oldest buffered event.
+    DropOldest,
+    /// End its stream. The client reconnects and catches up with
+    /// `Last-Event-ID`.
+    Disconnect,
+}
+
+impl SlowConsumerPolicy {
+    fn name(self) -> &'static str {
+        match self {
+            SlowConsumerPolicy::DropOldest => "drop_oldest",
+            SlowConsumerPolicy::Disconnect => "disconnect",
+        }
+    }
+}
+
+/// A connected client: the events not yet sent to it.
+struct Subscriber {
+    queue: Mutex<VecDeque<Bytes>>,
+    notify: Notify,
+    closed: AtomicBool,
+}
+
+impl Subscriber {
+    /// Buffer `message`. Returns false when the subscriber is too slow and
+    /// has been disconnected instead.
+    fn push(&self, message: Bytes, capacity: usize, policy: SlowConsumerPolicy) -> bool {
+        let mut queue = self.queue.lock();
+        if queue.len() >= capacity {
+            match policy {
+                SlowConsumerPolicy::DropOldest => {
+                    queue.pop_front();
+                }
+                SlowConsumerPolicy::Disconnect => {
+                    drop(queue);
+                    self.closed.store(true, Ordering::Release);
+                    self.notify.notify_one();
+                    return false;
+                }
+            }
+        }
+        queue.push_back(message);
+        drop(queue);
+        self.notify.notify_one();
+        true
+    }
+}
+
+#[derive(Default)]
+struct Topic {
+    subscribers: Vec<Weak<Subscriber>>,
+    // The last `replay_size` events with their ids and publish times, for
+    // `Last-Event-ID`
+    history: VecDeque<(String, Bytes, Instant)>,
+    next_id: u64,
+}
+
+impl Topic {
+    /// Forget the disconnected subscribers and the events older than
+    /// `replay_ttl`. Returns false once the topic has nothing left to keep.
+    fn prune(&mut self, now: Instant, replay_ttl: Duration) -> bool {
+        self.subscribers
+            .retain(|subscriber| subscriber.strong_count() > 0);
+        while self
+            .history
+            .front()
+            .is_some_and(|(_, _, published_at)| now.duration_since(*published_at) >= replay_ttl)
+        {
+            self.history.pop_front();
+        }
+        !self.subscribers.is_empty() || !self.history.is_empty()
+    }
+}
+
+struct Topics {
+    by_name: HashMap<String, Topic>,
+    swept_at: Instant,
+}
+
+impl Topics {
+    /// Drop the topics left without subscribers or retained events, at most
+    /// once per `SWEEP_INTERVAL`.
+    fn sweep(&mut self, now: Instant, replay_ttl: Duration) {
+        if now.duration_since(self.swept_at) >= SWEEP_INTERVAL {
+            self.by_name.retain(|_, topic| topic.prune(now, replay_ttl));
+            self.swept_at = now;
+        }
+    }
+}
+
+/// A subscriber as held by its subscription, then by its stream. Dropping it
+/// removes the subscriber from its topic, and the topic from the hub if
+/// nothing else is left in it.
+struct SubscriberHandle {
+    subscriber: Arc<Subscriber>,
+    topics: Weak<Mutex<Topics>>,
+    topic: String,
+}
+
+impl Drop for SubscriberHandle {
+    fn drop(&mut self) {
+        let Some(topics) = self.topics.upgrade() else {
+            return;
+        };
+        let mut topics = topics.lock();
+        let Some(topic) = topics.by_name.get_mut(&self.topic) else {
+            return;
+        };
+        let this = Arc::as_ptr(&self.subscriber);
+        topic
+            .subscribers
+            .retain(|subscriber| subscriber.as_ptr() != this && subscriber.strong_count() > 0);
+        if topic.subscribers.is_empty() && topic.history.is_empty() {
+            topics.by_name.remove(&self.topic);
+        }
+    }
+}
+
+/// Server-sent events published once and delivered to every subscriber of a
+/// topic: `return SSEResponse(hub.subscribe("news"))`, then
+/// `hub.publish("news", "...")`.
+///
+/// A publish formats the event once and queues the same bytes for each
+/// subscriber without holding the GIL, so its Python cost doesn't depend on
+/// the number of subscribers. Each subscriber buffers up to `buffer_size`
+/// events, after which `slow_consumer` decides between dropping its oldest
+/// event (`"drop_oldest"`) and closing its stream (`"disconnect"`). The last
+/// `replay_size` events of a topic, up to `replay_ttl` seconds old, are
+/// replayed to clients reconnecting with a `Last-Event-ID`, and idle streams
+/// get a comment every `keep_alive` seconds. A topic is forgotten once it has
+/// neither subscribers nor events to replay.
+///
+/// A hub only reaches the subscribers connected to its own process.
+#[pyclass(frozen)]
+pub struct SSEHub {
+    #[pyo3(get)]
+    pub buffer_size: usize,
+    #[pyo3(get)]
+    pub replay_size: usize,
+    #[pyo3(get)]
+    pub keep_alive: f64,
+    #[pyo3(get)]
+    pub replay_ttl: f64,
+    slow_consumer: SlowConsumerPolicy,
+    topics: Arc<Mutex<Topics>>,
+}
+
+#[pymethods]
+impl SSEHub {
+    #[new]
+    #[pyo3(signature = (buffer_size=256, replay_size=1024, slow_consumer="drop_oldest", keep_alive=15.0, replay_ttl=300.0))]
+    pub fn new(
+        buffer_size: usize,
+        replay_size: usize,
+        slow_consumer: &str,
+        keep_alive: f64,
+        replay_ttl: f64,
+    ) -> PyResult<Self> {
+        if buffer_size == 0 {
+            return Err(PyValueError::new_err("buffer_size must be greater than 0"));
+        }
+        if !(keep_alive > 0.0 && keep_alive.is_finite()) {
+            return Err(PyValueError::new_err(
+                "keep_alive must be a positive number of seconds",
+            ));
+        }
+        if !(replay_ttl > 0.0 && replay_ttl.is_finite()) {
+            return Err(PyValueError::new_err(
+                "replay_ttl must be a positive number of seconds",
+            ));
+        }
+        let slow_consumer = match slow_consumer {
+            "drop_oldest" => SlowConsumerPolicy::DropOldest,
+            "disconnect" => SlowConsumerPolicy::Disconnect,
+            _ => {
+                return Err(PyValueError::new_err(format!(
+                    "Unsupported slow_consumer policy: {} (expected drop_oldest or disconnect)",
+                    slow_consumer
+                )))
+            }
+        };
+        Ok(Self {
+            buffer_size,
+            replay_size,
+            keep_alive,
+            replay_ttl,
+            slow_consumer,
+            topics: Arc::new(Mutex::new(Topics {
+                by_name: HashMap::new(),
+                swept_at: Instant::now(),
+            })),
+        })
+    }
+
+    #[getter]
+    pub fn slow_consumer(&self) -> &'static str {
+        self.slow_consumer.name()
+    }
+
+    /// Publish an event to every subscriber of `topic` and return how many
+    /// it was queued for. Events without an `id` are numbered per topic.
+    #[pyo3(signature = (topic, data, event=None, id=None, retry=None))]
+    pub fn publish(
+        &self,
+        py: Python,
+        topic: &str,
+        data: &Bound<'_, PyAny>,
+        event: Option<&str>,
+        id: Option<String>,
+        retry: Option<u64>,
+    ) -> PyResult<usize> {
+        let data = if let Ok(data) = data.downcast::<PyString>() {
+            data.to_str()?.to_owned()
+        } else if let Ok(data) = data.downcast::<PyBytes>() {
+            String::from_utf8(data.as_bytes().to_vec())
+                .map_err(|_| PyValueError::new_err("data must be valid UTF-8"))?
+        } else {
+            return Err(PyTypeError::new_err("data must be str or bytes"));
+        };
+        // A line break would end the field and start another, or another event
+        for (name, value) in [("event", event), ("id", id.as_deref())] {
+            if value.is_some_and(|value| value.contains(['\r', '\n'])) {
+                return Err(PyValueError::new_err(format!(
+                    "{} must not contain line breaks",
+                    name
+                )));
+            }
+        }
+        Ok(py.detach(|| self.publish_event(topic, &data, event, id, retry)))
+    }
+
+    /// Subscribe to `topic`. Pass the result to `SSEResponse`. With the
+    /// client's `Last-Event-ID`, the retained events published after it are
+    /// sent first.
+    #[pyo3(signature = (topic, last_event_id=None))]
+    pub fn subscribe(&self, topic: &str, last_event_id: Option<&str>) -> SSESubscription {
+        let subscriber = Arc::new(Subscriber {
+            queue: Mutex::new(VecDeque::new()),
+            notify: Notify::new(),
+            closed: AtomicBool::new(false),
+        });
+
+        let now = Instant::now();
+        let replay_ttl = self.replay_ttl();
+        let mut topics = self.topics.lock();
+        topics.sweep(now, replay_ttl);
+        let entry = topics.by_name.entry(topic.to_string()).or_default();
+        entry.prune(now, replay_ttl);
+        if let Some(last_event_id) = last_event_id {
+            // An id that is no longer retained replays everything there is
+            let start = entry
+                .history
+                .iter()
+                .position(|(id, _, _)| id == last_event_id)
+                .map_or(0, |position| position + 1);
+            subscriber.queue.lock().extend(
+                entry
+                    .history
+                    .iter()
+                    .skip(start)
+                    .map(|(_, message, _)| message.clone()),
+            );
+        }
+        entry.subscribers.push(Arc::downgrade(&subscriber));
+        drop(topics);
+
+        SSESubscription {
+            subscriber: Mutex::new(Some(SubscriberHandle {
+                subscriber,
+                topics: Arc::downgrade(&self.topics),
+                topic: topic.to_string(),
+            })),
+            keep_alive: Duration::from_secs_f64(self.keep_alive),
+        }
+    }
+
+    /// The number of clients connected to `topic`.
+    pub fn subscriber_count(&self, topic: &str) -> usize {
+        self.topics.lock().by_name.get(topic).map_or(0, |topic| {
+            topic
+                .subscribers
+                .iter()
+                .filter(|subscriber| subscriber.strong_count() > 0)
+                .count()
+        })
+    }
+
+    /// The number of topics with subscribers or events to replay.
+    pub fn __len__(&self) -> usize {
+        self.topics.lock().by_name.len()
+    }
+
+    pub fn __repr__(&self) -> String {
+        format!(
+            "SSEHub(buffer_size={}, replay_size={}, slow_consumer={:?}, keep_alive={}, replay_ttl={})",
+            self.buffer_size,
+            self.replay_size,
+            self.slow_consumer.name(),
+            self.keep_alive,
+            self.replay_ttl
+        )
+    }
+}
+
+impl SSEHub {
+    fn replay_ttl(&self) -> Duration {
+        Duration::from_secs_f64(self.replay_ttl)
+    }
+
+    fn publish_event(
+        &self,
+        topic: &str,
+        data: &str,
+        event: Option<&str>,
+        id: Option<String>,
+        retry: Option<u64>,
+    ) -> usize {
+        let now = Instant::now();
+        let replay_ttl = self.replay_ttl();
+        let mut topics = self.topics.lock();
+        topics.sweep(now, replay_ttl);
+        let name = topic;
+        let topic = topics.by_name.entry(name.to_string()).or_default();
+        let id = id.unwrap_or_else(|| {
+            topic.next_id += 1;
+            topic.next_id.to_string()
+        });
+        let message = format_event(data, event, &id, retry);
+
+        if self.replay_size > 0 {
+            if topic.history.len() >= self.replay_size {
+                topic.history.pop_front();
+            }
+            topic.history.push_back((id, message.clone(), now));
+        }
+
+        let mut delivered = 0;
+        topic.subscribers.retain(|subscriber| {
+            let Some(subscriber) = subscriber.upgrade() else {
+                return false;
+            };
+            let queued = subscriber.push(message.clone(), self.buffer_size, self.slow_consumer);
+            delivered += usize::from(queued);
+            queued
+        });
+        if !topic.prune(now, replay_ttl) {
+            topics.by_name.remove(name);
+        }
+        delivered
+    }
+}
+
+/// Format an event the way `SSEMessage` does.
+fn format_event(data: &str, event: Option<&str>, id: &str, retry: Option<u64>) -> Bytes {
+    let mut message = String::with_capacity(data.len() + 32);
+    if let Some(event) = event.filter(|event| !event.is_empty()) {
+        message.push_str("event: ");
+        message.push_str(event);
+        message.push('\n');
+    }
+    message.push_str("id: ");
+    message.push_str(id);
+    message.push('\n');
+    if let Some(retry) = retry.filter(|retry| *retry > 0) {
+        message.push_str(&format!("retry: {}\n", retry));
+    }
+    if data.is_empty() {
+        message.push_str("data: \n");
+    } else {
+        for line in data.split("\r\n").flat_map(|line| line.split(['\r', '\n'])) {
+            message.push_str("data: ");
+            message.push_str(line);
+            message.push('\n');
+        }
+    }
+    message.push('\n');
+    Bytes::from(message)
+}
+
+/// A client's subscription to a topic of an `SSEHub`, streamed by returning
+/// it in an `SSEResponse`.
+#[pyclass(frozen)]
+pub struct SSESubscription {
+    // Taken by the response stream
+    subscriber: Mutex<Option<SubscriberHandle>>,
+    keep_alive: Duration,
+}
+
+impl SSESubscription {
+    /// The subscription's events as a response body. `None` if it is already
+    /// being streamed.
+    pub fn take_stream(
+        &self,
+    ) -> Option<Pin<Box<dyn Stream<Item = Result<Bytes, actix_web::Error>> + Send>>> {
+        let handle = self.subscriber.lock().take()?;
+        let keep_alive = self.keep_alive;
+        Some(Box::pin(futures::stream::unfold(
+            handle,
+            move |handle| async move {
+                let subscriber = &handle.subscriber;
+                loop {
+                    if subscriber.closed.load(Ordering::Acquire) {
+                        return None;
+                    }
+                    let message = subscriber.queue.lock().pop_front();
+                    if let Some(message) = message {
+                        return Some((Ok(message), handle));
+                    }
+                    if tokio::time::timeout(keep_alive, subscriber.notify.notified())
+                        .await
+                        .is_err()
+                    {
+                        return Some((Ok(Bytes::from_static(KEEP_ALIVE_COMMENT)), handle));
+                    }
+                }
+            },
+        )))
+    }
+}
@@ -0,0 +1,274 @@
+use pyo3::exceptions::PyValueError;
+use pyo3::prelude::*;
+use pyo3::types::{PyBool, PyInt, PyList, PyString};
+
+use std::collections::HashMap;
+
+use super::multimap::QueryParams;
+
+// Query string values that map to True/False for bool params
+const BOOL_TRUE_STRINGS: [&str; 4] = ["true", "1", "yes", "on"];
+const BOOL_FALSE_STRINGS: [&str; 5] = ["false", "0", "no", "off", ""];
+
+/// The scalar types that are coerced in Rust, before the handler is called.
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum ParamKind {
+    Str,
+    Int,
+    Float,
+    Bool,
+}
+
+impl ParamKind {
+    fn type_name(self) -> &'static str {
+        match self {
+            ParamKind::Str => "str",
+            ParamKind::Int => "int",
+            ParamKind::Float => "float",
+            ParamKind::Bool => "bool",
+        }
+    }
+}
+
+/// A handler parameter resolved from the path or the query string, computed
+/// once when the route is registered.
+///
+/// Mirrors `robyn._param_utils.resolve_individual_params` for `str`, `int`,
+/// `float`, `bool`, `list[T]` and `Optional[T]` parameters, so the executor
+/// can reject invalid input with a 400 without entering Python.
+#[pyclass(frozen)]
+#[derive(Debug)]
+pub struct TypedParam {
+    #[pyo3(get)]
+    pub name: String,
+    pub kind: ParamKind,
+    #[pyo3(get)]
+    pub from_path: bool,
+    #[pyo3(get)]
+    pub is_list: bool,
+    #[pyo3(get)]
+    pub is_optional: bool,
+    pub default: Option<Py<PyAny>>,
+}
+
+#[pymethods]
+impl TypedParam {
+    #[new]
+    #[pyo3(signature = (name, kind, from_path, is_list=false, is_optional=false, default=None, has_default=false))]
+    #[allow(clippy::too_many_arguments)]
+    pub fn new(
+        py: Python,
+        name: String,
+        kind: &str,
+        from_path: bool,
+        is_list: bool,
+        is_optional: bool,
+        default: Option<Py<PyAny>>,
+        has_default: bool,
+    ) -> PyResult<Self> {
+        let kind = match kind {
+            "str" => ParamKind::Str,
+            "int" => ParamKind::Int,
+            "float" => ParamKind::Float,
+            "bool" => ParamKind::Bool,
+            _ => {
+                return Err(PyValueError::new_err(format!(
+                    "Unsupported parameter type: {}",
+                    kind
+                )))
+            }
+        };
+        let default = if has_default {
+            Some(default.unwrap_or_else(|| py.None()))
+        } else {
+            None
+        };
+        Ok(Self {
+            name,
+            kind,
+            from_path,
+            is_list,
+            is_optional,
+            default,
+        })
+    }
+
+    #[getter]
+    pub fn kind(&self) -> &'static str {
+        self.kind.type_name()
+    }
+
+    pub fn __repr__(&self) -> String {
+        format!(
+            "TypedParam(name={:?}, kind={:?}, from_path={}, is_list={}, is_optional={})",
+            self.name,
+            self.kind.type_name(),
+            self.from_path,
+            self.is_list,
+            self.is_optional
+        )
+    }
+}
+
+/// A coerced parameter value, built without holding the GIL.
+pub enum ParamValue {
+    Str(String),
+    Int(i64),
+    // Valid integer literal that does not fit in an i64
+    BigInt(String),
+    Float(f64),
+    Bool(bool),
+    List(Vec<ParamValue>),
+    Default,
+    None,
+}
+
+impl ParamValue {
+    pub fn into_py_value(self, py: Python, param: &TypedParam) -> PyResult<Py<PyAny>> {
+        Ok(match self {
+            ParamValue::Str(value) => PyString::new(py, &value).into_any().unbind(),
+            ParamValue::Int(value) => value.into_pyobject(py)?.into_any().unbind(),
+            ParamValue::BigInt(value) => py.get_type::<PyInt>().call1((value,))?.unbind(),
+            ParamValue::Float(value) => value.into_pyobject(py)?.into_any().unbind(),
+            ParamValue::Bool(value) => PyBool::new(py, value).to_owned().into_any().unbind(),
+            ParamValue::List(values) => {
+                let list = PyList::empty(py);
+                for value in values {
+                    list.append(value.into_py_value(py, param)?)?;
+                }
+                list.into_any().unbind()
+            }
+            ParamValue::Default => match &param.default {
+                Some(default) => default.clone_ref(py),
+                None => py.None(),
+            },
+            ParamValue::None => py.None(),
+        })
+    }
+}
+
+/// Resolve every typed parameter from the request's path and query params.
+///
+/// On failure returns the same message `QueryParamValidationError` would
+/// carry, for a 400 response.
+pub fn resolve_typed_params<'a>(
+    params: &'a [Py<TypedParam>],
+    path_params: &HashMap<String, String>,
+    query_params: &QueryParams,
+) -> Result<Vec<(&'a TypedParam, ParamValue)>, String> {
+    params
+        .iter()
+        .map(|param| {
+            let param = param.get();
+            resolve_typed_param(param, path_params, query_params).map(|value| (param, value))
+        })
+        .collect()
+}
+
+fn resolve_typed_param(
+    param: &TypedParam,
+    path_params: &HashMap<String, String>,
+    query_params: &QueryParams,
+) -> Result<ParamValue, String> {
+    let mut raw_value = None;
+
+    // 1. Check path params first
+    if param.from_path {
+        raw_value = path_params.get(&param.name);
+    }
+
+    // 2. Check query params
+    if raw_value.is_none() {
+        if let Some(values) = query_params.queries.get(&param.name) {
+            if param.is_list {
+                return values
+                    .iter()
+                    .map(|value| coerce_value(value, param))
+                    .collect::<Result<_, _>>()
+                    .map(ParamValue::List);
+            }
+            raw_value = values.last();
+        }
+    }
+
+    // 3. Got a value — coerce it
+    if let Some(value) = raw_value {
+        return coerce_value(value, param);
+    }
+
+    // 4. Use default value if available, 5. Optional with no default -> None
+    if param.default.is_some() {
+        Ok(ParamValue::Default)
+    } else if param.is_optional {
+        Ok(ParamValue::None)
+    } else {
+        Err(format!("Missing required parameter: '{}'", param.name))
+    }
+}
+
+/// Coerce a raw value following the rules of Python's `int()`/`float()` for
+/// ASCII input, which is all a raw path segment or query string carries.
+fn coerce_value(value: &str, param: &TypedParam) -> Result<ParamValue, String> {
+    let coerced = match param.kind {
+        ParamKind::Str => Some(ParamValue::Str(value.to_string())),
+        ParamKind::Int => coerce_int(value),
+        ParamKind::Float => coerce_float(value),
+        ParamKind::Bool => {
+            let lower = value.to_lowercase();
+            if BOOL_TRUE_STRINGS.contains(&lower.as_str()) {
+                Some(ParamValue::Bool(true))
+            } else if BOOL_FALSE_STRINGS.contains(&lower.as_str()) {
+                Some(ParamValue::Bool(false))
+            } else {
+                None
+            }
+        }
+    };
+    coerced.ok_or_else(|| {
+        format!(
+            "Invalid value '{}' for parameter '{}': expected {}",
+            value,
+            param.name,
+            param.kind.type_name()
+        )
+    })
+}
+
+/// Strip the underscores Python allows between digits (`1_000`), rejecting
+/// leading, trailing or repeated ones.
+fn strip_digit_underscores(value: &str) -> Option<String> {
+    let bytes = value.as_bytes();
+    for (i, byte) in bytes.iter().enumerate() {
+        if *byte == b'_'
+            && !(i > 0
+                && i + 1 < bytes.len()
+                && bytes[i - 1].is_ascii_digit()
+                && bytes[i + 1].is_ascii_digit())
+        {
+            return None;
+        }
+    }
+    Some(value.replace('_', ""))
+}
+
+fn coerce_int(value: &str) -> Option<ParamValue> {
+    let value = value.trim();
+    let digits = value.strip_prefix(['+', '-']).unwrap_or(value);
+    if digits.is_empty() || !digits.bytes().all(|b| b.is_ascii_digit() || b == b'_') {
+        return None;
+    }
+    let value = strip_digit_underscores(value)?;
+    Some(match value.parse::<i64>() {
+        Ok(int) => ParamValue::Int(int),
+        Err(_) => ParamValue::BigInt(value),
+    })
+}
+
+fn coerce_float(value: &str) -> Option<ParamValue> {
+    let value = value.trim();
+    if !value.is_ascii() {
+        return None;
+    }
+    let value = strip_digit_underscores(value)?;
+    value.parse::<f64>().ok().map(ParamValue::Float)
+}
@@ -0,0 +1,126 @@
+use std::fs::File;
+use std::io::{Read, Seek, SeekFrom};
+use std::sync::Arc;
+
+use pyo3::exceptions::{PyIOError, PyValueError};
+use pyo3::prelude::*;
+use pyo3::types::PyBytes;
+use tempfile::TempPath;
+
+/// An uploaded multipart file that was larger than the spool threshold and
+/// has been written to a temporary file instead of being kept in memory.
+///
+/// Exposed to Python as a read-only file-like object. The temporary file is
+/// removed once the last reference to it is dropped.
+#[pyclass]
+#[derive(Debug, Clone)]
+pub struct UploadFile {
+    #[pyo3(get)]
+    pub filename: String,
+    #[pyo3(get)]
+    pub content_type: Option<String>,
+    #[pyo3(get)]
+    pub size: u64,
+    path: Arc<TempPath>,
+    position: u64,
+}
+
+impl UploadFile {
+    pub fn new(filename: String, content_type: Option<String>, size: u64, path: TempPath) -> Self {
+        Self {
+            filename,
+            content_type,
+            size,
+            path: Arc::new(path),
+            position: 0,
+        }
+    }
+}
+
+fn io_error(e: std::io::Error) -> PyErr {
+    PyIOError::new_err(format!("Failed to read uploaded file: {}", e))
+}
+
+#[pymethods]
+impl UploadFile {
+    /// The path of the temporary file holding the upload.
+    #[getter]
+    pub fn path(&self) -> String {
+        self.path.to_string_lossy().into_owned()
+    }
+
+    /// Read up to `size` bytes from the current position, or everything left
+    /// when `size` is negative.
+    #[pyo3(signature = (size=-1))]
+    pub fn read<'py>(&mut self, py: Python<'py>, size: i64) -> PyResult<Bound<'py, PyBytes>> {
+        let remaining = self.size.saturating_sub(self.position);
+        let to_read = if size < 0 {
+            remaining
+        } else {
+            remaining.min(size as u64)
+        };
+
+        let path = Arc::clone(&self.path);
+        let position = self.position;
+        let content = py
+            .detach(move || -> std::io::Result<Vec<u8>> {
+                let mut file = File::open(&*path)?;
+                file.seek(SeekFrom::Start(position))?;
+                let mut content = Vec::with_capacity(to_read as usize);
+                file.take(to_read).read_to_end(&mut content)?;
+                Ok(content)
+            })
+            .map_err(io_error)?;
+
+        self.position += content.len() as u64;
+        Ok(PyBytes::new(py, &content))
+    }
+
+    /// Move the read position, following `io.IOBase.seek` semantics.
+    #[pyo3(signature = (offset, whence=0))]
+    pub fn seek(&mut self, offset: i64, whence: u8) -> PyResult<u64> {
+        let base = match whence {
+            0 => 0,
+            1 => self.position as i64,
+            2 => self.size as i64,
+            _ => {
+                return Err(PyValueError::new_err(format!(
+                    "invalid whence ({})",
+                    whence
+                )))
+            }
+        };
+        let position = base + offset;
+        if position < 0 {
+            return Err(PyValueError::new_err(format!(
+                "negative seek position {}",
+                position
+            )));
+        }
+        self.position = position as u64;
+        Ok(self.position)
+    }
+
+    pub fn tell(&self) -> u64 {
+        self.position
+    }
+
+    pub fn __len__(&self) -> usize {
+        self.size as usize
+    }
+
+    pub fn __repr__(&self) -> String {
+        format!(
+            "UploadFile(filename={:?}, content_type={:?}, size={})",
+            self.filename, self.content_type, self.size
+        )
+    }
+}
+
+/// A file from a multipart request: kept in memory below the spool threshold,
+/// spooled to disk above it.
+#[derive(Debug, Clone, FromPyObject)]
+pub enum UploadedFile {
+    InMemory(Vec<u8>),
+    Spooled(UploadFile),
+}
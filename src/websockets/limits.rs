@@ -0,0 +1,246 @@
+use std::sync::atomic::{AtomicBool, AtomicU64, AtomicUsize, Ordering};
+use std::sync::Arc;
+
+use pyo3::exceptions::PyValueError;
+use pyo3::prelude::*;
+use pyo3::types::PyDict;
+
+/// What happens to a message arriving at a full queue.
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum OverflowPolicy {
+    /// Stop reading from the client until there is room again.
+    Block,
+    /// Drop the message.
+    Drop,
+    /// Close the connection.
+    Close,
+}
+
+impl OverflowPolicy {
+    fn parse(setting: &str, policy: &str, allowed: &[OverflowPolicy]) -> PyResult<Self> {
+        let parsed = match policy {
+            "block" => Some(OverflowPolicy::Block),
+            "drop" => Some(OverflowPolicy::Drop),
+            "close" => Some(OverflowPolicy::Close),
+            _ => None,
+        };
+        parsed
+            .filter(|parsed| allowed.contains(parsed))
+            .ok_or_else(|| {
+                let expected: Vec<&str> = allowed.iter().map(|policy| policy.name()).collect();
+                PyValueError::new_err(format!(
+                    "Unsupported {}: {} (expected {})",
+                    setting,
+                    policy,
+                    expected.join(" or ")
+                ))
+            })
+    }
+
+    fn name(self) -> &'static str {
+        match self {
+            OverflowPolicy::Block => "block",
+            OverflowPolicy::Drop => "drop",
+            OverflowPolicy::Close => "close",
+        }
+    }
+}
+
+#[derive(Debug, Default)]
+pub struct WebSocketStats {
+    pub dropped_inbound: AtomicU64,
+    pub dropped_outbound: AtomicU64,
+    pub closed: AtomicU64,
+}
+
+/// Queue limits for WebSocket connections:
+/// `app.configure_websocket_limits(inbound_queue=256)`.
+///
+/// `inbound_queue` bounds the messages received from a client that its
+/// handler has not read yet, and `outbound_queue` the messages sent to a
+/// client that have not been handed to its socket yet, because the client
+/// reads them too slowly. When the inbound
+/// queue is full, the server stops reading from the client until the handler
+/// catches up (`"block"`), drops the message (`"drop"`) or closes the
+/// connection with 1008 (`"close"`). When the outbound queue is full, the
+/// message is dropped (`"drop"`) or the connection closed with 1013
+/// (`"close"`). The counters cover every connection of the current process.
+#[pyclass(frozen)]
+#[derive(Debug, Clone)]
+pub struct WebSocketLimits {
+    #[pyo3(get)]
+    pub inbound_queue: usize,
+    #[pyo3(get)]
+    pub outbound_queue: usize,
+    pub inbound_policy: OverflowPolicy,
+    pub outbound_policy: OverflowPolicy,
+    pub stats: Arc<WebSocketStats>,
+}
+
+impl Default for WebSocketLimits {
+    fn default() -> Self {
+        Self {
+            inbound_queue: 1024,
+            outbound_queue: 1024,
+            inbound_policy: OverflowPolicy::Block,
+            outbound_policy: OverflowPolicy::Close,
+            stats: Arc::default(),
+        }
+    }
+}
+
+#[pymethods]
+impl WebSocketLimits {
+    #[new]
+    #[pyo3(signature = (inbound_queue=1024, outbound_queue=1024, inbound_policy="block", outbound_policy="close"))]
+    pub fn new(
+        inbound_queue: usize,
+        outbound_queue: usize,
+        inbound_policy: &str,
+        outbound_policy: &str,
+    ) -> PyResult<Self> {
+        if inbound_queue == 0 {
+            return Err(PyValueError::new_err(
+                "inbound_queue must be greater than 0",
+            ));
+        }
+        if outbound_queue == 0 {
+            return Err(PyValueError::new_err(
+                "outbound_queue must be greater than 0",
+            ));
+        }
+        // A send never waits for the recipient, so one slow client can't
+        // stall a broadcast: outbound messages can't block
+        Ok(Self {
+            inbound_queue,
+            outbound_queue,
+            inbound_policy: OverflowPolicy::parse(
+                "inbound_policy",
+                inbound_policy,
+                &[
+                    OverflowPolicy::Block,
+                    OverflowPolicy::Drop,
+                    OverflowPolicy::Close,
+                ],
+            )?,
+            outbound_policy: OverflowPolicy::parse(
+                "outbound_policy",
+                outbound_policy,
+                &[OverflowPolicy::Drop, OverflowPolicy::Close],
+            )?,
+            stats: Arc::default(),
+        })
+    }
+
+    #[getter]
+    pub fn inbound_policy(&self) -> &'static str {
+        self.inbound_policy.name()
+    }
+
+    #[getter]
+    pub fn outbound_policy(&self) -> &'static str {
+        self.outbound_policy.name()
+    }
+
+    /// The messages dropped from full queues and the connections closed
+    /// because of one.
+    pub fn stats<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyDict>> {
+        let stats = PyDict::new(py);
+        stats.set_item(
+            "dropped_inbound",
+            self.stats.dropped_inbound.load(Ordering::Relaxed),
+        )?;
+        stats.set_item(
+            "dropped_outbound",
+            self.stats.dropped_outbound.load(Ordering::Relaxed),
+        )?;
+        stats.set_item("closed", self.stats.closed.load(Ordering::Relaxed))?;
+        Ok(stats)
+    }
+
+    pub fn __repr__(&self) -> String {
+        format!(
+            "WebSocketLimits(inbound_queue={}, outbound_queue={}, inbound_policy={:?}, outbound_policy={:?})",
+            self.inbound_queue,
+            self.outbound_queue,
+            self.inbound_policy.name(),
+            self.outbound_policy.name()
+        )
+    }
+}
+
+/// The messages queued for one connection: the registry reserves a slot for
+/// each message it forwards, and the slot is freed once the message's frame
+/// is handed to the socket, not when the connection writes it to its buffer.
+pub struct Outbox {
+    capacity: usize,
+    close_when_full: bool,
+    pending: AtomicUsize,
+    /// Messages written to the connection's buffer but not handed over yet.
+    buffered: AtomicUsize,
+    closing: AtomicBool,
+    stats: Arc<WebSocketStats>,
+}
+
+impl Outbox {
+    pub fn new(limits: &WebSocketLimits) -> Self {
+        Self {
+            capacity: limits.outbound_queue,
+            close_when_full: limits.outbound_policy == OverflowPolicy::Close,
+            pending: AtomicUsize::new(0),
+            buffered: AtomicUsize::new(0),
+            closing: AtomicBool::new(false),
+            stats: Arc::clone(&limits.stats),
+        }
+    }
+
+    /// Reserve a slot for a message. When the queue is full, the message is
+    /// counted as dropped or the connection marked as closing, and false is
+    /// returned.
+    pub fn offer(&self) -> bool {
+        if self.is_closing() {
+            return false;
+        }
+        let reserved = self
+            .pending
+            .fetch_update(Ordering::AcqRel, Ordering::Acquire, |pending| {
+                (pending < self.capacity).then_some(pending + 1)
+            })
+            .is_ok();
+        if !reserved {
+            if !self.close_when_full {
+                self.stats.dropped_outbound.fetch_add(1, Ordering::Relaxed);
+            } else if !self.closing.swap(true, Ordering::AcqRel) {
+                self.stats.closed.fetch_add(1, Ordering::Relaxed);
+            }
+        }
+        reserved
+    }
+
+    /// Reserve a slot regardless of the limit, for control messages.
+    pub fn reserve(&self) {
+        self.pending.fetch_add(1, Ordering::AcqRel);
+    }
+
+    /// Free the slot of a message that won't be written.
+    pub fn release(&self) {
+        self.pending.fetch_sub(1, Ordering::AcqRel);
+    }
+
+    /// Note that a message was written to the connection's buffer. Its slot
+    /// is freed by the next `flushed`.
+    pub fn buffered(&self) {
+        self.buffered.fetch_add(1, Ordering::AcqRel);
+    }
+
+    /// Free the slots of the messages buffered so far, once the buffer was
+    /// handed to the socket.
+    pub fn flushed(&self) {
+        let flushed = self.buffered.swap(0, Ordering::AcqRel);
+        self.pending.fetch_sub(flushed, Ordering::AcqRel);
+    }
+
+    pub fn is_closing(&self) -> bool {
+        self.closing.load(Ordering::Acquire)
+    }
+}
@@ -1,21 +1,33 @@
+pub mod limits;
 pub mod registry;
 
 use crate::executors::web_socket_executors::execute_ws_function;
 use crate::types::function_info::FunctionInfo;
 use crate::types::multimap::QueryParams;
-use registry::{Close, SendBinary, SendBinaryToAll, SendMessageToAll, SendText};
+use limits::{Outbox, OverflowPolicy, WebSocketLimits};
+use registry::{
+    Close, FellBehind, Frame, JoinRoom, LeaveRoom, SendBinary, SendBinaryToAll, SendFrame,
+    SendMessageToAll, SendText, SendToRoom, Unregister,
+};
 
 use actix::prelude::*;
 use actix::{Actor, AsyncContext, StreamHandler};
-use actix_web::{web, Error, HttpRequest, HttpResponse};
+use actix_web::{web, web::Bytes, Error, HttpRequest, HttpResponse};
 use actix_web_actors::ws;
+use bytestring::ByteString;
+use futures::stream::{LocalBoxStream, Stream, StreamExt};
 use log::debug;
 use once_cell::sync::OnceCell;
 use parking_lot::RwLock;
+use pyo3::exceptions::PyTypeError;
 use pyo3::prelude::*;
+use pyo3::types::{PyBytes, PyString};
 use pyo3::IntoPyObject;
 use pyo3_async_runtimes::TaskLocals;
+use std::pin::Pin;
+use std::sync::atomic::Ordering;
 use std::sync::Arc;
+use std::task::Poll;
 use tokio::sync::mpsc;
 use uuid::Uuid;
 
@@ -36,7 +48,7 @@ pub enum WsPayload {
 /// the connection is closed.
 #[pyclass]
 pub struct WebSocketChannel {
-    receiver: Arc<tokio::sync::Mutex<mpsc::UnboundedReceiver<Option<WsPayload>>>>,
+    receiver: Arc<tokio::sync::Mutex<mpsc::Receiver<Option<WsPayload>>>>,
 }
 
 #[pymethods]
@@ -70,12 +82,74 @@ pub struct WebSocketConnector {
     pub task_locals: TaskLocals,
     pub registry_addr: Addr<WebSocketRegistry>,
     pub query_params: QueryParams,
+    pub limits: WebSocketLimits,
+    /// Messages queued for this client by the registry.
+    pub outbox: Arc<Outbox>,
     /// Sender side of the message channel (stays in the Actix actor).
-    pub message_sender: Option<mpsc::UnboundedSender<Option<WsPayload>>>,
+    pub message_sender: Option<mpsc::Sender<Option<WsPayload>>>,
     /// Receiver side exposed to Python via WebSocketChannel.
     pub message_channel: Option<Py<WebSocketChannel>>,
 }
 
+/// Send a close frame with `code` and stop the actor.
+fn close_connection(
+    ctx: &mut ws::WebsocketContext<WebSocketConnector>,
+    code: ws::CloseCode,
+    description: &str,
+) {
+    ctx.close(Some(ws::CloseReason {
+        code,
+        description: Some(description.to_string()),
+    }));
+    ctx.stop();
+}
+
+impl WebSocketConnector {
+    /// Queue a received message for the Python handler, following the
+    /// inbound policy when its queue is full.
+    fn forward(&mut self, payload: WsPayload, ctx: &mut ws::WebsocketContext<Self>) {
+        let Some(sender) = self.message_sender.clone() else {
+            return;
+        };
+        let payload = match sender.try_send(Some(payload)) {
+            Ok(()) | Err(mpsc::error::TrySendError::Closed(_)) => return,
+            Err(mpsc::error::TrySendError::Full(payload)) => payload,
+        };
+        match self.limits.inbound_policy {
+            OverflowPolicy::Block => {
+                // Stops reading from the client until the handler catches up
+                ctx.wait(
+                    async move {
+                        let _ = sender.send(payload).await;
+                    }
+                    .into_actor(self),
+                );
+            }
+            OverflowPolicy::Drop => {
+                self.limits
+                    .stats
+                    .dropped_inbound
+                    .fetch_add(1, Ordering::Relaxed);
+            }
+            OverflowPolicy::Close => {
+                self.limits.stats.closed.fetch_add(1, Ordering::Relaxed);
+                self.message_sender.take();
+                close_connection(ctx, ws::CloseCode::Policy, "Inbound message queue is full");
+            }
+        }
+    }
+
+    /// Whether to write a message from the registry. Messages queued before
+    /// the connection fell behind are dropped, freeing their outbox slots.
+    fn take_outgoing(&mut self) -> bool {
+        if self.outbox.is_closing() {
+            self.outbox.release();
+            return false;
+        }
+        true
+    }
+}
+
 // By default mailbox capacity is 16 messages.
 impl Actor for WebSocketConnector {
     type Context = ws::WebsocketContext<Self>;
@@ -85,9 +159,10 @@ impl Actor for WebSocketConnector {
         self.registry_addr.do_send(Register {
             id: self.id,
             addr: addr.clone(),
+            outbox: Arc::clone(&self.outbox),
         });
 
-        let (tx, rx) = mpsc::unbounded_channel::<Option<WsPayload>>();
+        let (tx, rx) = mpsc::channel::<Option<WsPayload>>(self.limits.inbound_queue);
         self.message_sender = Some(tx);
         self.message_channel = Python::with_gil(|py| {
             Some(
@@ -111,6 +186,7 @@ impl Actor for WebSocketConnector {
 
     fn stopped(&mut self, ctx: &mut Self::Context) {
         self.message_sender.take();
+        self.registry_addr.do_send(Unregister { id: self.id });
 
         match self.router.get("close") {
             Some(function) => execute_ws_function(function, &self.task_locals, ctx, self),
@@ -130,6 +206,8 @@ impl Clone for WebSocketConnector {
             task_locals: task_locals_clone,
             registry_addr: self.registry_addr.clone(),
             query_params: self.query_params.clone(),
+            limits: self.limits.clone(),
+            outbox: Arc::clone(&self.outbox),
             message_sender: self.message_sender.clone(),
             message_channel: Python::with_gil(|py| {
                 self.message_channel.as_ref().map(|c| c.clone_ref(py))
@@ -142,12 +220,18 @@ impl Handler<SendText> for WebSocketConnector {
     type Result = ();
 
     fn handle(&mut self, msg: SendText, ctx: &mut Self::Context) {
+        if !self.take_outgoing() {
+            return;
+        }
         if self.id == msg.recipient_id {
             ctx.text(msg.message.clone());
+            self.outbox.buffered();
             if msg.message == "Connection closed" {
                 // Close the WebSocket connection
                 ctx.stop();
             }
+        } else {
+            self.outbox.release();
         }
     }
 }
@@ -156,9 +240,74 @@ impl Handler<SendBinary> for WebSocketConnector {
     type Result = ();
 
     fn handle(&mut self, msg: SendBinary, ctx: &mut Self::Context) {
+        if !self.take_outgoing() {
+            return;
+        }
         if self.id == msg.recipient_id {
             ctx.binary(msg.data);
+            self.outbox.buffered();
+        } else {
+            self.outbox.release();
+        }
+    }
+}
+
+impl Handler<SendFrame> for WebSocketConnector {
+    type Result = ();
+
+    fn handle(&mut self, msg: SendFrame, ctx: &mut Self::Context) {
+        if !self.take_outgoing() {
+            return;
+        }
+        match msg.frame {
+            Frame::Text(text) => ctx.text(text),
+            Frame::Binary(data) => ctx.binary(data),
         }
+        self.outbox.buffered();
+    }
+}
+
+impl Handler<FellBehind> for WebSocketConnector {
+    type Result = ();
+
+    fn handle(&mut self, _msg: FellBehind, ctx: &mut Self::Context) {
+        self.message_sender.take();
+        close_connection(ctx, ws::CloseCode::Again, "Outbound message queue is full");
+    }
+}
+
+/// The encoded frames of a connection, on their way to the socket. The HTTP
+/// dispatcher only pulls the next chunk once its write buffer has room, that
+/// is once the client read enough of the previous ones.
+struct OutgoingFrames {
+    frames: LocalBoxStream<'static, Result<Bytes, Error>>,
+    outbox: Arc<Outbox>,
+}
+
+impl Stream for OutgoingFrames {
+    type Item = Result<Bytes, Error>;
+
+    fn poll_next(
+        mut self: Pin<&mut Self>,
+        cx: &mut std::task::Context<'_>,
+    ) -> Poll<Option<Self::Item>> {
+        let next = self.frames.poll_next_unpin(cx);
+        if let Poll::Ready(Some(Ok(_))) = next {
+            // A chunk holds every frame the actor has written so far
+            self.outbox.flushed();
+        }
+        next
+    }
+}
+
+/// A text frame for `str`, a binary frame for `bytes`.
+fn frame_from_py(data: &Bound<'_, PyAny>) -> PyResult<Frame> {
+    if let Ok(text) = data.downcast::<PyString>() {
+        Ok(Frame::Text(ByteString::from(text.to_str()?)))
+    } else if let Ok(data) = data.downcast::<PyBytes>() {
+        Ok(Frame::Binary(Bytes::copy_from_slice(data.as_bytes())))
+    } else {
+        Err(PyTypeError::new_err("message must be str or bytes"))
     }
 }
 
@@ -175,17 +324,13 @@ impl StreamHandler<Result<ws::Message, ws::ProtocolError>> for WebSocketConnecto
             }
             Ok(ws::Message::Text(text)) => {
                 debug!("Text message received {:?}", text);
-                if let Some(ref sender) = self.message_sender {
-                    let _ = sender.send(Some(WsPayload::Text(text.to_string())));
-                }
+                self.forward(WsPayload::Text(text.to_string()), ctx);
             }
             Ok(ws::Message::Binary(bin)) => {
                 debug!("Binary message received ({} bytes)", bin.len());
-                if let Some(ref sender) = self.message_sender {
-                    // Forward the raw bytes to the Python handler as-is, so
-                    // arbitrary (non-UTF-8) binary frames are delivered intact.
-                    let _ = sender.send(Some(WsPayload::Binary(bin.to_vec())));
-                }
+                // Forward the raw bytes to the Python handler as-is, so
+                // arbitrary (non-UTF-8) binary frames are delivered intact.
+                self.forward(WsPayload::Binary(bin.to_vec()), ctx);
             }
             Ok(ws::Message::Close(_close_reason)) => {
                 debug!("Socket was closed");
@@ -357,6 +502,66 @@ impl WebSocketConnector {
         Ok(awaitable.into_pyobject(py)?.into_any().into())
     }
 
+    /// Add this connection to `room`. Rooms belong to the endpoint.
+    pub fn join_room(&self, room: String) {
+        self.registry_addr.do_send(JoinRoom { id: self.id, room });
+    }
+
+    pub fn leave_room(&self, room: String) {
+        self.registry_addr.do_send(LeaveRoom { id: self.id, room });
+    }
+
+    #[pyo3(signature = (room, message, exclude_self=false))]
+    pub fn sync_send_to_room(
+        &self,
+        room: String,
+        message: &Bound<'_, PyAny>,
+        exclude_self: bool,
+    ) -> PyResult<()> {
+        match self.registry_addr.try_send(SendToRoom {
+            room,
+            frame: frame_from_py(message)?,
+            sender_id: self.id,
+            exclude_sender: exclude_self,
+        }) {
+            Ok(_) => log::debug!("Room message sent successfully"),
+            Err(e) => log::error!("Failed to send room message: {}", e),
+        }
+        Ok(())
+    }
+
+    /// Send `message` to every member of `room`. The awaitable resolves to
+    /// the number of members it was queued for.
+    #[pyo3(signature = (room, message, exclude_self=false))]
+    pub fn async_send_to_room(
+        &self,
+        py: Python,
+        room: String,
+        message: &Bound<'_, PyAny>,
+        exclude_self: bool,
+    ) -> PyResult<Py<PyAny>> {
+        let registry = self.registry_addr.clone();
+        let msg = SendToRoom {
+            room,
+            frame: frame_from_py(message)?,
+            sender_id: self.id,
+            exclude_sender: exclude_self,
+        };
+
+        let awaitable = pyo3_async_runtimes::tokio::future_into_py(py, async move {
+            // Waits for room in the registry's mailbox instead of failing
+            match registry.send(msg).await {
+                Ok(delivered) => Ok(delivered),
+                Err(e) => {
+                    log::error!("Failed to send room message: {}", e);
+                    Ok(0)
+                }
+            }
+        })?;
+
+        Ok(awaitable.unbind())
+    }
+
     pub fn close(&self) {
         self.registry_addr.do_send(Close { id: self.id });
     }
@@ -408,6 +613,7 @@ pub async fn start_web_socket(
     task_locals: TaskLocals,
     endpoint: String,
     max_frame_size: usize,
+    limits: WebSocketLimits,
 ) -> Result<HttpResponse, Error> {
     let registry_addr = get_or_init_registry_for_endpoint(endpoint);
 
@@ -424,19 +630,21 @@ pub async fn start_web_socket(
         }
     }
 
-    ws::WsResponseBuilder::new(
-        WebSocketConnector {
-            router,
-            task_locals,
-            id: Uuid::new_v4(),
-            registry_addr,
-            query_params,
-            message_sender: None,
-            message_channel: None,
-        },
-        &req,
-        stream,
-    )
-    .frame_size(max_frame_size)
-    .start()
+    let outbox = Arc::new(Outbox::new(&limits));
+    let connector = WebSocketConnector {
+        router,
+        task_locals,
+        id: Uuid::new_v4(),
+        registry_addr,
+        query_params,
+        outbox: Arc::clone(&outbox),
+        limits,
+        message_sender: None,
+        message_channel: None,
+    };
+
+    let mut response = ws::handshake(&req)?;
+    let codec = ws::Codec::new().max_size(max_frame_size);
+    let frames = ws::WebsocketContext::with_codec(connector, stream, codec).boxed_local();
+    Ok(response.streaming(OutgoingFrames { frames, outbox }))
 }
@@ -1,17 +1,45 @@
 use actix::prelude::*;
 use actix::Actor;
+use actix_web::web::Bytes;
+use bytestring::ByteString;
 use pyo3::prelude::*;
 use uuid::Uuid;
 
-use std::collections::HashMap;
+use std::collections::{HashMap, HashSet};
+use std::sync::Arc;
 
+use crate::websockets::limits::Outbox;
 use crate::websockets::WebSocketConnector;
 
+/// A connected client: its actor, its outbound queue and the rooms it joined.
+pub struct Client {
+    addr: Addr<WebSocketConnector>,
+    outbox: Arc<Outbox>,
+    rooms: HashSet<String>,
+}
+
+impl Client {
+    /// Forward `msg` if the client's outbound queue has room. Returns false
+    /// once the client is being closed for falling behind.
+    fn deliver<M>(&self, msg: M) -> bool
+    where
+        M: Message<Result = ()> + Send + 'static,
+        WebSocketConnector: Handler<M>,
+    {
+        if self.outbox.offer() {
+            self.addr.do_send(msg);
+        }
+        !self.outbox.is_closing()
+    }
+}
+
 #[derive(Default)]
 #[pyclass]
 pub struct WebSocketRegistry {
-    // A map of client IDs to their Actor addresses.
-    clients: HashMap<Uuid, Addr<WebSocketConnector>>,
+    // A map of client IDs to their actors.
+    clients: HashMap<Uuid, Client>,
+    // The members of each room of this endpoint
+    rooms: HashMap<String, HashSet<Uuid>>,
 }
 
 impl actix::Supervised for WebSocketRegistry {}
@@ -25,6 +53,7 @@ impl Actor for WebSocketRegistry {
 pub struct Register {
     pub id: Uuid,
     pub addr: Addr<WebSocketConnector>,
+    pub outbox: Arc<Outbox>,
 }
 
 impl Message for Register {
@@ -35,7 +64,30 @@ impl Handler<Register> for WebSocketRegistry {
     type Result = ();
 
     fn handle(&mut self, msg: Register, _ctx: &mut Self::Context) {
-        self.clients.insert(msg.id, msg.addr);
+        self.clients.insert(
+            msg.id,
+            Client {
+                addr: msg.addr,
+                outbox: msg.outbox,
+                rooms: HashSet::new(),
+            },
+        );
+    }
+}
+
+pub struct Unregister {
+    pub id: Uuid,
+}
+
+impl Message for Unregister {
+    type Result = ();
+}
+
+impl Handler<Unregister> for WebSocketRegistry {
+    type Result = ();
+
+    fn handle(&mut self, msg: Unregister, _ctx: &mut Self::Context) {
+        self.remove_client(&msg.id);
     }
 }
 
@@ -50,16 +102,91 @@ impl Message for SendText {
     type Result = ();
 }
 
+/// A frame sent to many clients. Each recipient gets a reference to the same
+/// payload rather than a copy of it.
+#[derive(Clone)]
+pub enum Frame {
+    Text(ByteString),
+    Binary(Bytes),
+}
+
+// Send a shared frame to a client that is already known to the registry
+pub struct SendFrame {
+    pub frame: Frame,
+}
+
+impl Message for SendFrame {
+    type Result = ();
+}
+
+// Tell a client its outbound queue overflowed, so it closes with 1013
+pub struct FellBehind;
+
+impl Message for FellBehind {
+    type Result = ();
+}
+
 impl WebSocketRegistry {
     pub fn new() -> Self {
         Self {
             clients: HashMap::new(),
+            rooms: HashMap::new(),
         }
     }
 
     pub fn start() -> Addr<Self> {
         Self::from_registry()
     }
+
+    /// Forget a client and its room memberships.
+    fn remove_client(&mut self, id: &Uuid) -> Option<Client> {
+        let client = self.clients.remove(id)?;
+        for room in &client.rooms {
+            if let Some(members) = self.rooms.get_mut(room) {
+                members.remove(id);
+                if members.is_empty() {
+                    self.rooms.remove(room);
+                }
+            }
+        }
+        Some(client)
+    }
+
+    /// Forget a client whose outbound queue overflowed and have it close.
+    fn drop_lagging(&mut self, id: &Uuid) {
+        if let Some(client) = self.remove_client(id) {
+            client.addr.do_send(FellBehind);
+        }
+    }
+}
+
+/// Queue `frame` for each of `recipients` except `excluded`. Returns how many
+/// it was queued for, and the clients being closed for falling behind.
+fn send_frame<'a>(
+    clients: &HashMap<Uuid, Client>,
+    recipients: impl Iterator<Item = &'a Uuid>,
+    frame: &Frame,
+    excluded: Option<Uuid>,
+) -> (usize, Vec<Uuid>) {
+    let mut delivered = 0;
+    let mut closing = Vec::new();
+    for id in recipients {
+        if Some(*id) == excluded {
+            continue;
+        }
+        let Some(client) = clients.get(id) else {
+            continue;
+        };
+        if client.outbox.offer() {
+            client.addr.do_send(SendFrame {
+                frame: frame.clone(),
+            });
+            delivered += 1;
+        } else if client.outbox.is_closing() {
+            closing.push(*id);
+        }
+    }
+    (delivered, closing)
 }
 
 impl Handler<SendText> for WebSocketRegistry {
@@ -68,10 +195,13 @@ impl Handler<SendText> for WebSocketRegistry {
     fn handle(&mut self, msg: SendText, _ctx: &mut Self::Context) {
         let recipient_id = msg.recipient_id;
 
-        if let Some(client_addr) = self.clients.get(&recipient_id) {
-            client_addr.do_send(msg);
-        } else {
-            log::warn!("No client found for id: {}", recipient_id);
+        match self.clients.get(&recipient_id) {
+            Some(client) => {
+                if !client.deliver(msg) {
+                    self.drop_lagging(&recipient_id);
+                }
+            }
+            None => log::warn!("No client found for id: {}", recipient_id),
         }
     }
 }
@@ -89,12 +219,10 @@ impl Handler<SendMessageToAll> for WebSocketRegistry {
     type Result = ();
 
     fn handle(&mut self, msg: SendMessageToAll, _ctx: &mut Self::Context) {
-        for (id, client) in &self.clients {
-            client.do_send(SendText {
-                recipient_id: *id,
-                message: msg.message.clone(),
-                sender_id: msg.sender_id,
-            });
+        let frame = Frame::Text(ByteString::from(msg.message));
+        let (_, closing) = send_frame(&self.clients, self.clients.keys(), &frame, None);
+        for id in &closing {
+            self.drop_lagging(id);
         }
     }
 }
@@ -116,10 +244,13 @@ impl Handler<SendBinary> for WebSocketRegistry {
     fn handle(&mut self, msg: SendBinary, _ctx: &mut Self::Context) {
         let recipient_id = msg.recipient_id;
 
-        if let Some(client_addr) = self.clients.get(&recipient_id) {
-            client_addr.do_send(msg);
-        } else {
-            log::warn!("No client found for id: {}", recipient_id);
+        match self.clients.get(&recipient_id) {
+            Some(client) => {
+                if !client.deliver(msg) {
+                    self.drop_lagging(&recipient_id);
+                }
+            }
+            None => log::warn!("No client found for id: {}", recipient_id),
         }
     }
 }
@@ -138,13 +269,89 @@ impl Handler<SendBinaryToAll> for WebSocketRegistry {
     type Result = ();
 
     fn handle(&mut self, msg: SendBinaryToAll, _ctx: &mut Self::Context) {
-        for (id, client) in &self.clients {
-            client.do_send(SendBinary {
-                recipient_id: *id,
-                data: msg.data.clone(),
-                sender_id: msg.sender_id,
-            });
+        let frame = Frame::Binary(Bytes::from(msg.data));
+        let (_, closing) = send_frame(&self.clients, self.clients.keys(), &frame, None);
+        for id in &closing {
+            self.drop_lagging(id);
+        }
+    }
+}
+
+// Add a client to a room of its endpoint
+pub struct JoinRoom {
+    pub id: Uuid,
+    pub room: String,
+}
+
+impl Message for JoinRoom {
+    type Result = ();
+}
+
+impl Handler<JoinRoom> for WebSocketRegistry {
+    type Result = ();
+
+    fn handle(&mut self, msg: JoinRoom, _ctx: &mut Self::Context) {
+        let Some(client) = self.clients.get_mut(&msg.id) else {
+            log::warn!("No client found for id: {}", msg.id);
+            return;
+        };
+        if client.rooms.insert(msg.room.clone()) {
+            self.rooms.entry(msg.room).or_default().insert(msg.id);
+        }
+    }
+}
+
+pub struct LeaveRoom {
+    pub id: Uuid,
+    pub room: String,
+}
+
+impl Message for LeaveRoom {
+    type Result = ();
+}
+
+impl Handler<LeaveRoom> for WebSocketRegistry {
+    type Result = ();
+
+    fn handle(&mut self, msg: LeaveRoom, _ctx: &mut Self::Context) {
+        if let Some(client) = self.clients.get_mut(&msg.id) {
+            client.rooms.remove(&msg.room);
+        }
+        if let Some(members) = self.rooms.get_mut(&msg.room) {
+            members.remove(&msg.id);
+            if members.is_empty() {
+                self.rooms.remove(&msg.room);
+            }
+        }
+    }
+}
+
+// Send a frame to every member of a room, answering with the number of
+// members it was queued for
+pub struct SendToRoom {
+    pub room: String,
+    pub frame: Frame,
+    pub sender_id: Uuid,
+    pub exclude_sender: bool,
+}
+
+impl Message for SendToRoom {
+    type Result = usize;
+}
+
+impl Handler<SendToRoom> for WebSocketRegistry {
+    type Result = usize;
+
+    fn handle(&mut self, msg: SendToRoom, _ctx: &mut Self::Context) -> usize {
+        let Some(members) = self.rooms.get(&msg.room) else {
+            return 0;
+        };
+        let excluded = msg.exclude_sender.then_some(msg.sender_id);
+        let (delivered, closing) = send_frame(&self.clients, members.iter(), &msg.frame, excluded);
+        for id in &closing {
+            self.drop_lagging(id);
         }
+        delivered
     }
 }
 
@@ -160,9 +367,10 @@ impl Handler<Close> for WebSocketRegistry {
     type Result = ();
 
     fn handle(&mut self, msg: Close, _ctx: &mut Self::Context) {
-        if let Some(client) = self.clients.remove(&msg.id) {
+        if let Some(client) = self.remove_client(&msg.id) {
             // Send a close message to the client before removing it
-            client.do_send(SendText {
+            client.outbox.reserve();
+            client.addr.do_send(SendText {
                 recipient_id: msg.id,
                 message: "Connection closed".to_string(),
                 sender_id: msg.id,
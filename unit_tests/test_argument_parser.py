@@ -0,0 +1,37 @@
+import pytest
+
+from robyn.argument_parser import Config
+
+
+def make_config(monkeypatch, *args: str) -> Config:
+    monkeypatch.setattr("sys.argv", ["app.py", *args])
+    return Config()
+
+
+def test_event_loops_default_to_one(monkeypatch):
+    assert make_config(monkeypatch).event_loops == 1
+    assert make_config(monkeypatch, "--fast").event_loops == 1
+
+
+def test_event_loops_flag(monkeypatch):
+    config = make_config(monkeypatch, "--workers", "4", "--event-loops", "4")
+    assert (config.workers, config.event_loops) == (4, 4)
+
+
+def test_event_loops_cannot_exceed_workers(monkeypatch):
+    with pytest.raises(ValueError, match="--event-loops"):
+        make_config(monkeypatch, "--workers", "2", "--event-loops", "3")
+
+
+def test_fast_mode_uses_one_process_without_the_gil(monkeypatch):
+    monkeypatch.setattr("os.cpu_count", lambda: 8)
+    monkeypatch.setattr("sys._is_gil_enabled", lambda: False, raising=False)
+    config = make_config(monkeypatch, "--fast")
+    assert (config.processes, config.workers, config.event_loops) == (1, 8, 8)
+
+
+def test_fast_mode_uses_processes_with_the_gil(monkeypatch):
+    monkeypatch.setattr("os.cpu_count", lambda: 8)
+    monkeypatch.setattr("sys._is_gil_enabled", lambda: True, raising=False)
+    config = make_config(monkeypatch, "--fast")
+    assert (config.processes, config.workers, config.event_loops) == (17, 2, 1)
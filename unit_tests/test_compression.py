@@ -0,0 +1,36 @@
+import pytest
+
+from robyn import Compression, Robyn
+
+
+def test_compression_is_off_by_default():
+    app = Robyn(__file__)
+    assert app.compression is None
+
+
+def test_configure_compression_records_defaults():
+    app = Robyn(__file__)
+    compression = app.configure_compression()
+
+    assert app.compression is compression
+    assert compression.algorithms == ["br", "zstd", "gzip"]
+    assert compression.level is None
+    assert compression.min_size == 1024
+    assert "application/json" in compression.content_types
+    assert "text/*" in compression.content_types
+
+
+def test_configure_compression_normalizes_settings():
+    app = Robyn(__file__)
+    compression = app.configure_compression(algorithms=["GZIP", "br", "gzip"], level=5, min_size=0, content_types=[" Text/HTML "])
+
+    assert compression.algorithms == ["gzip", "br"]
+    assert compression.level == 5
+    assert compression.min_size == 0
+    assert compression.content_types == ["text/html"]
+
+
+@pytest.mark.parametrize("algorithms", [["deflate"], []])
+def test_compression_rejects_unknown_algorithms(algorithms):
+    with pytest.raises(ValueError):
+        Compression(algorithms=algorithms)
@@ -59,6 +59,23 @@ def test_headers_multi_items_preserves_duplicates():
     assert sorted(headers.multi_items()) == [("x-trace", "a"), ("x-trace", "b")]
 
 
+def test_headers_set_replaces_every_value():
+    headers = Headers({"X-Trace": ["a", "b"]})
+    headers.append("x-trace", "c")
+    assert headers.get_all("X-TRACE") == ["a", "b", "c"]
+
+    headers.set("X-Trace", "d")
+    assert headers.get_all("x-trace") == ["d"]
+    assert "X-Trace" in headers
+
+
+def test_headers_keep_values_that_are_not_valid_http():
+    # Kept as given for Python, only skipped when writing the response
+    headers = Headers({"X Custom": "first\nsecond"})
+    assert headers.get("x custom") == "first\nsecond"
+    assert headers.items() == [("x custom", "first\nsecond")]
+
+
 def test_query_params_keys_values_items():
     params = QueryParams()
     params.set("q", "robyn")
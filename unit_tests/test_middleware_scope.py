@@ -0,0 +1,85 @@
+import pytest
+
+from robyn import ALLOW_CORS, Robyn
+from robyn import testing
+
+
+def _app_with_tracing_middleware(**kwargs):
+    app = Robyn(__file__)
+    seen = []
+
+    @app.before_request(**kwargs)
+    def trace(request):
+        seen.append(request.url.path)
+        return request
+
+    @app.get("/const", const=True)
+    def const_route():
+        return "const"
+
+    @app.get("/health")
+    def health():
+        return "ok"
+
+    @app.get("/static/:name")
+    def static(name: str):
+        return name
+
+    @app.get("/items")
+    def items():
+        return "items"
+
+    return app, seen
+
+
+def test_global_middleware_runs_everywhere_by_default():
+    app, seen = _app_with_tracing_middleware()
+    with testing.TestClient(app) as client:
+        for path in ("/const", "/health", "/static/app.js", "/items"):
+            assert client.get(path).status_code == 200
+
+    assert seen == ["/const", "/health", "/static/app.js", "/items"]
+
+
+def test_global_middleware_exclude():
+    app, seen = _app_with_tracing_middleware(exclude=["health", "/static/:name"])
+    with testing.TestClient(app) as client:
+        for path in ("/const", "/health", "/static/app.js", "/items"):
+            assert client.get(path).status_code == 200
+
+    assert seen == ["/const", "/items"]
+    assert app.middleware_router.get_global_middlewares()[0].exclude == ("/health", "/static/:name")
+
+
+def test_global_middleware_skip_const_routes():
+    app, seen = _app_with_tracing_middleware(skip_const_routes=True)
+    with testing.TestClient(app) as client:
+        assert client.get("/const").text == "const"
+        assert client.get("/items").text == "items"
+
+    assert seen == ["/items"]
+
+
+def test_route_middleware_rejects_global_only_options():
+    app = Robyn(__file__)
+
+    with pytest.raises(ValueError, match="global middlewares"):
+        app.before_request("/items", exclude=["/health"])
+
+    with pytest.raises(ValueError, match="global middlewares"):
+        app.after_request("/items", skip_const_routes=True)
+
+
+def test_sessions_skip_const_routes():
+    app = Robyn(__file__)
+    app.configure_sessions("secret")
+
+    assert [mw.skip_const_routes for mw in app.middleware_router.get_global_middlewares()] == [True, True]
+
+
+@pytest.mark.parametrize(("origins", "skips_const_routes"), [("*", True), (["https://example.com"], False)])
+def test_cors_skips_const_routes_only_for_any_origin(origins, skips_const_routes):
+    app = Robyn(__file__)
+    ALLOW_CORS(app, origins)
+
+    assert app.middleware_router.get_global_middlewares()[0].skip_const_routes is skips_const_routes
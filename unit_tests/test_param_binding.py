@@ -0,0 +1,152 @@
+import asyncio
+import inspect
+from enum import Enum
+from typing import Optional
+
+from robyn._param_utils import typed_param_spec
+from robyn.robyn import Headers, HttpMethod, QueryParams, Request, Url
+from robyn.router import Router, compile_param_binders
+from robyn.types import Body, JsonBody, PathParams
+
+
+class Color(Enum):
+    RED = "red"
+
+
+INJECTED_DEPENDENCIES = {"router_dependencies": {"db": "router-db"}, "global_dependencies": {"cache": "global-cache"}}
+
+
+def make_request(body=b"", path_params=None, query=None):
+    query_params = QueryParams()
+    for key, value in (query or {}).items():
+        query_params.set(key, value)
+    return Request(
+        query_params,
+        Headers({"x-test": "1"}),
+        path_params or {},
+        body,
+        "POST",
+        Url("http", "localhost", "/items"),
+        {},
+        {},
+        None,
+        "127.0.0.1",
+    )
+
+
+def route_function(handler, endpoint="/items/:item_id"):
+    router = Router()
+    router.add_route(
+        route_type=HttpMethod.POST,
+        endpoint=endpoint,
+        handler=handler,
+        is_const=False,
+        auth_required=False,
+        openapi_name="",
+        openapi_tags=[],
+        exception_handler=None,
+        injected_dependencies=INJECTED_DEPENDENCIES,
+    )
+    return router.routes[-1].function.handler
+
+
+def test_binders_follow_precedence():
+    def handler(payload: JsonBody, request, headers, item_id: int, global_dependencies, raw: Body):
+        pass
+
+    binders, individual_params = compile_param_binders(inspect.signature(handler).parameters, {}, INJECTED_DEPENDENCIES)
+
+    assert [name for name, _ in binders] == ["payload", "raw", "request", "headers", "global_dependencies"]
+    assert list(individual_params) == ["item_id"]
+
+
+def description_text(response):
+    description = response.description
+    return description.decode() if isinstance(description, bytes) else description
+
+
+def test_bound_arguments():
+    bound = []
+
+    def handler(request, path_data: PathParams, body, item_id: int, limit: int = 10, router_dependencies=None):
+        bound.extend([request, path_data, body, item_id, limit, router_dependencies])
+        return "ok"
+
+    request = make_request(body="hello", path_params={"item_id": "7"}, query={"limit": "3"})
+    route_function(handler)(request)
+    bound_request, path_data, body, item_id, limit, router_dependencies = bound
+
+    assert bound_request is request
+    assert path_data == {"item_id": "7"}
+    assert body == "hello"
+    assert (item_id, limit) == (7, 3)
+    assert router_dependencies == {"db": "router-db"}
+
+
+def test_json_body_binding():
+    def handler(data: JsonBody):
+        return data
+
+    assert route_function(handler, "/items")(make_request(body=b'{"name": "robyn"}')) == {"name": "robyn"}
+
+
+def test_invalid_json_body_is_a_bad_request():
+    def handler(data: JsonBody):
+        return data
+
+    response = route_function(handler, "/items")(make_request(body=b"{not json"))
+    assert response.status_code == 400
+    assert "Invalid JSON body" in description_text(response)
+
+
+def test_invalid_json_body_is_a_bad_request_for_async_handlers():
+    async def handler(data: JsonBody):
+        return data
+
+    response = asyncio.run(route_function(handler, "/items")(make_request(body=b"{not json")))
+    assert response.status_code == 400
+
+
+def test_invalid_individual_param_is_a_bad_request():
+    def handler(item_id: int):
+        return item_id
+
+    response = route_function(handler)(make_request(path_params={"item_id": "seven"}))
+    assert response.status_code == 400
+
+
+def typed_params_of(handler, route_param_names=frozenset()):
+    params = inspect.signature(handler).parameters.values()
+    return [typed_param_spec(param, set(route_param_names)) for param in params]
+
+
+def test_typed_param_specs():
+    def handler(item_id: int, q, price: Optional[float], tags: list[int], active: bool = True):
+        pass
+
+    item_id, q, price, tags, active = typed_params_of(handler, {"item_id"})
+
+    assert (item_id.name, item_id.kind, item_id.from_path) == ("item_id", "int", True)
+    assert (q.kind, q.from_path) == ("str", False)
+    assert (price.kind, price.is_optional) == ("float", True)
+    assert (tags.kind, tags.is_list) == ("int", True)
+    assert active.kind == "bool"
+
+
+def test_typed_param_specs_leave_other_types_to_python():
+    def handler(kind: Color, tags: list[int]):
+        pass
+
+    assert typed_params_of(handler, {"tags"}) == [None, None]
+
+
+def test_executor_resolved_params_are_not_resolved_again():
+    bound = []
+
+    def handler(item_id: int, limit: int = 10):
+        bound.extend([item_id, limit])
+        return "ok"
+
+    # The executor already coerced both params; the raw values must not be used.
+    route_function(handler)(make_request(path_params={"item_id": "not-an-int"}), item_id=7, limit=3)
+    assert bound == [7, 3]
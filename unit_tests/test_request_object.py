@@ -42,3 +42,30 @@ def test_request_json_accepts_bytes_body():
     )
 
     assert request.json() == {"hello": "world", "count": 1}
+
+
+def test_request_attributes_are_cached_and_reassignable():
+    request = Request(
+        query_params=QueryParams(),
+        headers=Headers({"Content-Type": "text/plain"}),
+        path_params={"id": "1"},
+        body="hello",
+        method="POST",
+        url=Url(scheme="https", host="localhost", path="/user/1"),
+        ip_addr=None,
+        identity=None,
+        form_data={},
+        files={},
+    )
+
+    assert request.headers is request.headers
+    assert request.path_params is request.path_params
+    request.headers.set("x-added", "1")
+    assert request.headers.get("x-added") == "1"
+
+    request.headers = Headers({"x-replaced": "yes"})
+    request.path_params = {"id": "2"}
+    request.body = "replaced"
+    assert request.headers.get("x-replaced") == "yes"
+    assert request.path_params == {"id": "2"}
+    assert request.body == "replaced"
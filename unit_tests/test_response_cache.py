@@ -0,0 +1,42 @@
+import pytest
+
+from robyn import CachePolicy, Robyn
+from robyn.robyn import HttpMethod
+
+
+def test_cache_policy_is_recorded_on_the_route():
+    app = Robyn(__file__)
+    policy = CachePolicy(ttl=30, vary=["Accept-Encoding"], max_entries=100)
+
+    @app.get("/items/:id", cache=policy)
+    def item(id: int):
+        return {"id": id}
+
+    @app.get("/plain")
+    def plain():
+        return ""
+
+    routes = {route.route: route for route in app.router.get_routes()}
+    assert routes["/items/:id"].cache is policy
+    assert routes["/plain"].cache is None
+    assert policy.vary == ["accept-encoding"]
+
+
+@pytest.mark.parametrize("kwargs", [{"ttl": 0}, {"ttl": -1}, {"ttl": 10, "max_entries": 0}])
+def test_cache_policy_rejects_invalid_limits(kwargs):
+    with pytest.raises(ValueError):
+        CachePolicy(**kwargs)
+
+
+def test_cache_rejects_const_routes():
+    app = Robyn(__file__)
+
+    with pytest.raises(ValueError, match="const"):
+        app.add_route(HttpMethod.GET, "/items", lambda: "", is_const=True, cache=CachePolicy(ttl=10))
+
+
+def test_cache_rejects_unsafe_methods():
+    app = Robyn(__file__)
+
+    with pytest.raises(ValueError, match="Only GET and HEAD"):
+        app.add_route(HttpMethod.POST, "/items", lambda: "", cache=CachePolicy(ttl=10))
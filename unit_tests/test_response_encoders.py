@@ -0,0 +1,153 @@
+import datetime
+import uuid
+from dataclasses import dataclass
+from decimal import Decimal
+from enum import Enum
+from typing import Any, TypedDict
+
+import orjson
+import pytest
+
+from robyn.encoders import compile_response_encoder
+from robyn.router import Router
+
+
+class Status(Enum):
+    OPEN = "open"
+
+
+@dataclass
+class Line:
+    sku: uuid.UUID
+    price: Decimal
+
+
+@dataclass
+class Order:
+    id: int
+    status: Status
+    created_at: datetime.datetime
+    lines: list[Line]
+    labels: set[str]
+
+
+class Summary(TypedDict):
+    count: int
+    by_day: dict[datetime.date, int]
+
+
+ORDER = Order(
+    id=1,
+    status=Status.OPEN,
+    created_at=datetime.datetime(2024, 5, 1, 12, 30),
+    lines=[Line(sku=uuid.UUID(int=1), price=Decimal("9.99"))],
+    labels={"gift"},
+)
+
+
+@pytest.mark.parametrize("response_model", [None, Any, str, bytes])
+def test_no_encoder_for_plain_models(response_model):
+    assert compile_response_encoder(response_model) is None
+
+
+def test_no_encoder_for_pydantic_models():
+    pydantic = pytest.importorskip("pydantic")
+
+    class User(pydantic.BaseModel):
+        name: str
+
+    assert compile_response_encoder(User) is None
+    assert compile_response_encoder(list[User]) is None
+
+
+def test_dataclass_encoder():
+    encoder = compile_response_encoder(Order)
+
+    assert orjson.loads(encoder(ORDER)) == {
+        "id": 1,
+        "status": "open",
+        "created_at": "2024-05-01T12:30:00",
+        "lines": [{"sku": "00000000-0000-0000-0000-000000000001", "price": "9.99"}],
+        "labels": ["gift"],
+    }
+    assert orjson.loads(compile_response_encoder(list[Order])([ORDER])) == [orjson.loads(encoder(ORDER))]
+
+
+def test_typeddict_encoder_with_non_str_keys():
+    encoder = compile_response_encoder(Summary)
+
+    assert orjson.loads(encoder({"count": 2, "by_day": {datetime.date(2024, 5, 1): 2}})) == {"count": 2, "by_day": {"2024-05-01": 2}}
+
+
+def test_encoder_rejects_unknown_types():
+    with pytest.raises(TypeError):
+        compile_response_encoder(Order)(object())
+
+
+def test_numpy_encoder():
+    numpy = pytest.importorskip("numpy")
+    encoder = compile_response_encoder(dict[str, Any])
+
+    matrix = numpy.arange(6).reshape(2, 3)
+    assert orjson.loads(encoder({"rows": matrix, "columns": matrix.T, "mean": matrix.mean()})) == {
+        "rows": [[0, 1, 2], [3, 4, 5]],
+        "columns": [[0, 3], [1, 4], [2, 5]],
+        "mean": 2.5,
+    }
+
+
+def test_msgspec_struct_encoder():
+    msgspec = pytest.importorskip("msgspec")
+
+    class Point(msgspec.Struct):
+        x: int
+        y: Decimal
+
+    encoder = compile_response_encoder(list[Point])
+    assert encoder([Point(x=1, y=Decimal("0.5"))]) == b'[{"x":1,"y":"0.5"}]'
+
+
+def test_add_route_hands_the_encoder_to_the_executor():
+    from robyn.openapi import RouteOpenAPIMeta
+    from robyn.robyn import HttpMethod
+
+    router = Router()
+    handler = router.add_route(HttpMethod.GET, "/order", lambda: ORDER, False, False, "order", [], None, {}, RouteOpenAPIMeta(response_model=Order))
+
+    assert handler() is ORDER
+
+
+def test_encode_response_applies_status_code():
+    router = Router()
+    encoder = compile_response_encoder(Order)
+
+    assert router._encode_response(ORDER, encoder, None) is ORDER
+    response = router._encode_response(ORDER, encoder, 201)
+    assert response.status_code == 201
+    assert response.headers.get("Content-Type") == "application/json"
+    assert orjson.loads(bytes(response.description)) == orjson.loads(encoder(ORDER))
+
+
+def test_test_client_encodes_with_the_response_model():
+    from robyn import Robyn
+    from robyn.testing import TestClient
+
+    app = Robyn(__file__)
+    seen = []
+
+    @app.get("/order", response_model=Order)
+    def order():
+        return ORDER
+
+    @app.after_request("/order")
+    def after(response):
+        seen.append(response.headers.get("Content-Type"))
+        return response
+
+    with TestClient(app) as client:
+        response = client.get("/order")
+
+    assert response.status_code == 200
+    assert response.headers.get("Content-Type") == "application/json"
+    assert response.json() == orjson.loads(compile_response_encoder(Order)(ORDER))
+    assert seen == ["application/json"]
@@ -0,0 +1,40 @@
+import pytest
+
+from robyn import Robyn
+from robyn.robyn import HttpMethod
+
+
+def test_stream_body_route_is_recorded():
+    app = Robyn(__file__)
+
+    @app.post("/upload", stream_body=True)
+    async def upload(request):
+        return ""
+
+    @app.post("/plain")
+    async def plain(request):
+        return ""
+
+    routes = {route.route: route for route in app.router.get_routes()}
+    assert routes["/upload"].stream_body is True
+    assert routes["/plain"].stream_body is False
+
+
+def test_stream_body_requires_async_handler():
+    app = Robyn(__file__)
+
+    def upload(request):
+        return ""
+
+    with pytest.raises(ValueError, match="must be async"):
+        app.add_route(HttpMethod.POST, "/upload", upload, stream_body=True)
+
+
+def test_stream_body_rejects_const_routes():
+    app = Robyn(__file__)
+
+    async def upload(request):
+        return ""
+
+    with pytest.raises(ValueError, match="const"):
+        app.add_route(HttpMethod.POST, "/upload", upload, is_const=True, stream_body=True)
@@ -2,7 +2,7 @@ import asyncio
 
 import pytest
 
-from robyn.responses import AsyncGeneratorWrapper
+from robyn.responses import AsyncGeneratorWrapper, StreamingResponse
 
 
 def test_wrapper_drives_generator_on_constructing_loop():
@@ -93,3 +93,29 @@ def test_owned_loop_thread_is_cleaned_up_when_dropped_early():
 
     thread.join(timeout=3)
     assert not thread.is_alive()
+
+
+def test_async_generator_is_kept_in_async_handlers():
+    """With a running loop the server awaits the generator itself, so it is
+    not wrapped."""
+
+    async def gen():
+        yield "a"
+
+    async def main():
+        content = gen()
+        return content, StreamingResponse(content, coalesce=True)
+
+    content, response = asyncio.run(main())
+    assert response.content is content
+    assert response.coalesce is True
+
+
+def test_async_generator_is_wrapped_in_sync_handlers():
+    async def gen():
+        yield "a"
+
+    response = StreamingResponse(gen())
+    assert isinstance(response.content, AsyncGeneratorWrapper)
+    assert response.coalesce is False
+    assert list(response.content) == ["a"]
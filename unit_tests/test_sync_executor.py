@@ -0,0 +1,27 @@
+import pytest
+
+from robyn import Robyn, SyncExecutor
+
+
+def test_sync_executor_is_off_by_default():
+    app = Robyn(__file__)
+    assert app.sync_executor is None
+
+
+def test_configure_sync_executor_records_settings():
+    app = Robyn(__file__)
+    executor = app.configure_sync_executor(max_threads=8, idle_timeout=10, queue_depth=64)
+
+    assert app.sync_executor is executor
+    assert (executor.max_threads, executor.idle_timeout, executor.queue_depth) == (8, 10, 64)
+
+
+def test_configure_sync_executor_defaults():
+    executor = Robyn(__file__).configure_sync_executor()
+    assert (executor.max_threads, executor.idle_timeout, executor.queue_depth) == (32, 30, 1024)
+
+
+@pytest.mark.parametrize("kwargs", [{"max_threads": 0}, {"queue_depth": 0}])
+def test_sync_executor_rejects_empty_limits(kwargs):
+    with pytest.raises(ValueError):
+        SyncExecutor(**kwargs)